@@ -14,13 +14,19 @@ redundancy_res_dir: str = os.path.join(res_dir, 'redundancy')
 solutions_res_dir: str = os.path.join(res_dir, 'solutions')
 test_scenario_res_dir: str = os.path.join(res_dir, 'test_scenario')
 flow_routes_repetition_degree_dir: str = os.path.join(res_dir, 'flow_routes_repetition_degree')
+benchmark_res_dir: str = os.path.join(res_dir, 'benchmark')
 json_dir: str = os.path.join(src_dir, 'json')
 flows_filename: str = os.path.join(json_dir, 'flows.json')
 template_dir: str = os.path.join(src_dir, 'templates')
+template_cache_dir: str = None  # directory of compiled templates, None for a directory under system temp directory
 
 GRAPH_CONFIG = {
     'min-flow-size': 64 * 8,  # minimum frame size = 64B, [unit: Byte]
     'hyper-period': int(3e5),  # 300us = 3e5ns, [unit: ns],
+    'auto-hyper-period': False,  # use exact lcm of flow periods as hyper period
+    'harmonize-periods': False,  # harmonize periods whose lcm needs more than max-time-slot-num slots
+    'max-time-slot-num': int(1e6),  # maximum number of time slots on each edge
+    'phase-folding': False,  # check slot-aligned periodic reservations by residue arithmetic instead of all phases
     'all-bandwidth': int(1e0),  # 1Gbps = 1bit/ns, [unit: bpns]
     'max-bandwidth': int(1e0),  # maximum bandwidth of all edges
     'all-propagation-delay': 1e2,  # propagation delay of all edges
@@ -84,6 +90,7 @@ OPTIMIZATION = {
     'max_iterations': 50,  # maximum iteration times
     'max_no_improve': 10,  # maximum local search width
     'k': 0.3,  # ratio of removed flows
+    'repair-time-limit': 10,  # time limit of exact repair of failed flows, [unit: s]
     'results-root-path': '/src/json/'  # root path of results
 }
 
@@ -94,6 +101,8 @@ XML_CONFIG = {
     'multicast-model': True,  # whether all flow follow multicast transmission mode or not
     'static': True,  # whether static forwarding or not
     'enhancement-tsn-switch-enable': True,  # whether enable enhancement function of tsn switch or not
+    'gcl-compaction': False,  # whether merge adjacent entries of gate control lists of switches or not
+    'gcl-min-gap': 0,  # non-tsn gaps shorter than it are given to the previous tsn window when compacting, [unit: ns]
 }
 
 TESTING = {
@@ -108,3 +117,7 @@ TESTING = {
     'generate-flows': False,
     'simulation-time': 1.2  #s
 }
+
+LOGGING_CONFIG = {
+    'quiet': False,  # quiet/perf mode, skip structured dumps (allocators, flows, nodes, xml contents) entirely
+}
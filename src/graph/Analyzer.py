@@ -5,6 +5,7 @@ import math
 import numpy as np
 from typing import List, Dict, Tuple, Set
 
+from src import config
 from src.graph.Edge import Edge
 from src.graph.Flow import Flow
 from src.graph.Graph import Graph
@@ -19,9 +20,11 @@ class Analyzer(object):
 
     @staticmethod
     def calculate_e2e_delay(graph: Graph, flow: Flow) -> int:
-        destinations: List[NodeId] = flow.destinations
-        edges: List[Edge] = list(graph.edge_mapper.values())
-        destination_edges: List[Edge] = list(filter(lambda e: e.out_node.node_id in destinations, edges))
+        # inbound edges of destinations which the flow walks through, looked up by edge -> flows index
+        _edge_flows: Dict[EdgeId, Set[FlowId]] = graph.get_edge_flows()
+        destination_edges: List[Edge] = sorted(
+            [_e for _nid in set(flow.destinations) for _e in graph.node_mapper[_nid].in_edge
+             if flow.flow_id in _edge_flows.get(_e.edge_id, ())], key=lambda e: e.edge_id)
         delay_list: List[int] = []
         for edge in destination_edges:
             for block in edge.time_slot_allocator.flow_times_mapper[flow.flow_id]:
@@ -32,13 +35,25 @@ class Analyzer(object):
             return int(np.mean(delay_list))
 
     @staticmethod
-    def calculate_guard_band_on_edge(allocator: TimeSlotAllocator) -> int:
+    def calculate_guard_band_on_edge(allocator: TimeSlotAllocator, min_gap: int = None) -> int:
+        '''
+        number of guard bands between merged allocation blocks
+        :param allocator:
+        :param min_gap: gaps shorter than it are coalesced into tsn windows by gcl compaction and need no guard band,
+            default is gcl-min-gap of xml config if gcl compaction is enabled, [unit: ns]
+        :return:
+        '''
+        if min_gap is None:
+            min_gap = config.XML_CONFIG['gcl-min-gap'] if config.XML_CONFIG['gcl-compaction'] else 0
         total_guard_band: int = 0
         block_num = len(allocator.allocation_blocks_m)
         for i in range(block_num):
             if i + 1 < block_num and allocator.allocation_blocks_m[i].interval.upper + 1 != \
                     allocator.allocation_blocks_m[i + 1].interval.lower:
-                total_guard_band += 1
+                _gap: int = allocator.allocation_blocks_m[i + 1].interval.lower - \
+                            allocator.allocation_blocks_m[i].interval.upper - 1
+                if not 0 < _gap * allocator.time_slot_len < min_gap:
+                    total_guard_band += 1
         return total_guard_band
 
     @staticmethod
@@ -200,7 +215,7 @@ class Analyzer(object):
                         edge_repetition_dict
                     )
                 )
-        logger.info('analyze end-to-end routes of flow: {}'.format(res))
+        logger.info('analyze end-to-end routes of flow: %s', res)
         # save result to json
         if target_filename is not None:
             with open(target_filename + '.json', 'w') as file:
@@ -215,3 +230,31 @@ class Analyzer(object):
         :return:
         '''
         pass
+
+    @staticmethod
+    def analyze_profile(solution: Solution, target_filename: str = None):
+        '''
+        analyze timing breakdown and counters recorded by profiler of solver,
+        rows are [solution name, kind, name, key, count, total time, max time]
+        :param solution:
+        :param target_filename: result is appended to <target_filename>_profile.csv next to other metrics
+        :return:
+        '''
+        if len(solution.profile) == 0:
+            logger.info('solution [%s] has no profile, profiling is disabled', solution.solution_name)
+            return
+        lines: List[list] = []
+        for name, stat in solution.profile['spans'].items():
+            lines.append([solution.solution_name, 'span', name, '', stat['count'], stat['total'], stat['max']])
+        for name, value in solution.profile['counters'].items():
+            lines.append([solution.solution_name, 'counter', name, '', value, '', ''])
+        for name, records in solution.profile['records'].items():
+            for key, total in records.items():
+                lines.append([solution.solution_name, 'record', name, key, '', total, ''])
+        for line in lines[:len(solution.profile['spans'])]:
+            logger.info('%s: %s calls, %.6fs in total', line[2], line[4], line[5])
+        # save file
+        if target_filename is not None:
+            with open(target_filename + '_profile.csv', 'a', newline='') as file:
+                writer: csv.writer = csv.writer(file)
+                writer.writerows(lines)
@@ -3,6 +3,7 @@ from enum import Enum
 from .Node import Node
 from .TimeSlotArray import TimeSlotArray
 from .TimeSlotAllocator import TimeSlotAllocator
+from .RunConfig import RunConfig
 
 EdgeColor = Enum('EdgeColor', ('RED', 'WHITE'))
 EdgeType = Enum('EdgeType', ('HOST_TO_SWITCH', 'SWITCH_TO_SWITCH'))
@@ -23,10 +24,12 @@ class Edge:
     time_slot_array: TimeSlotArray  # time slots on edge, deprecated
     time_slot_allocator: TimeSlotAllocator  # time slot allocator
     type: int  # type, [host-to-switch or switch-to-switch]
+    failed: bool  # failed edges are never used by routing
     __hyper_period: int  # hyper period of all flows
+    run_config: RunConfig
 
     def __init__(self, edge_id: int, in_node: Node, out_node: Node, b: float = 0, e_rate: float = 0, prop_d: int = 0,
-                 proc_d: int = 0, hp: int = 0):
+                 proc_d: int = 0, hp: int = 0, run_config: RunConfig = None):
         '''
         :param edge_id: edge id [required]
         :param in_node: inbound node [required]
@@ -34,6 +37,7 @@ class Edge:
         :param b: bandwidth [default=0]
         :param e_rate: error rate [default=0]
         :param p_delay: propagation delay [default=0]
+        :param run_config: run config, default is a snapshot of global config
         '''
         self.edge_id = edge_id
         self.in_node = in_node
@@ -47,13 +51,18 @@ class Edge:
         self.weight_c = 0
         self.color = EdgeColor.RED
         self.type = EdgeType.HOST_TO_SWITCH
+        self.failed = False
         self.__hyper_period = hp
+        self.run_config = run_config if run_config is not None else RunConfig.from_config()
         self.init_time_slot_allocator()  # initialize time slot allocator
         # self.init_time_slot_array()
 
     def init_time_slot_allocator(self):
         self.time_slot_allocator = TimeSlotAllocator(self.edge_id, hp=self.__hyper_period, b=self.bandwidth,
-                                                     prop_d=self.propagation_delay, proc_d=self.process_delay)
+                                                     s=self.run_config.min_flow_size,
+                                                     prop_d=self.propagation_delay, proc_d=self.process_delay,
+                                                     max_b=self.run_config.max_bandwidth,
+                                                     phase_folding=self.run_config.phase_folding)
 
     def init_time_slot_array(self):
         self.time_slot_array = TimeSlotArray(self.edge_id, hp=self.__hyper_period, b=self.bandwidth)
@@ -3,6 +3,7 @@ import logging
 from typing import List, Set, Tuple, Dict
 
 from src.utils.Visualizer import Visualizer
+from src.utils.logs import dump_enabled
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +22,7 @@ class Flow:
     # routes_delay: Dict[int, float]  # end-to-end delay of routes, e.g., [(d1, e2e_d), ...]
     walked_edges: Set[int]  # the edge flow walked
     negative_walked_edges: Set[int]  # negative walked set used for flow sorting during routing phase
+    _graph: 'Graph' = None  # graph which indexes routes of flow, set when flow is added to graph
 
     def __init__(self, fid: int, s: int, p: int, src: int, dest: list, rl: float, dl: int):
         self.flow_id = fid
@@ -37,10 +39,22 @@ class Flow:
         self.negative_walked_edges = set()
         self.color = Visualizer.random_color()
 
+    def assign_routes(self, routes: List[List[List[int]]]):
+        '''
+        assign routes, and update reverse indexes of graph which holds flow
+        :param routes: routes of flow
+        :return:
+        '''
+        self.routes = routes
+        if self._graph is not None:
+            self._graph.index_flow(self)
+
     def get_routes(self) -> List[List[List[int]]]:
         return self.routes
 
     def to_string(self):
+        if not dump_enabled(logger):
+            return
         o = {
             'flow id': self.flow_id,
             'size': str(self.size) + ' b',
@@ -1,18 +1,130 @@
-import copy
 import logging
 import random
 
 import networkx as nx
 import numpy as np
 import json
-from typing import List, Dict
+from typing import List, Dict, Iterator, Tuple
 from math import floor
 
 from src import config
 from src.graph.Flow import Flow
 from src.type import NodeId
+from src.utils.logs import dump_enabled
 
 logger = logging.getLogger(__name__)
+FLOW_CHUNK: int = 65536  # number of flows drawn at once by iter_flows
+SAMPLE_CELLS: int = 1 << 20  # number of random keys drawn at once when sampling destinations
+
+
+class DestinationCandidates:
+    '''
+    candidate destinations of each source edge node, computed once per graph:
+    edge nodes except source, and edge nodes attached at the same core node as source (neighbors),
+    of which only ceil((1 - un-neighbors_degree) * number of neighbors) are candidates of each flow
+    '''
+    edge_nodes: np.ndarray
+    bases: Dict[NodeId, np.ndarray]  # source -> candidates which are not neighbors
+    neighbors: Dict[NodeId, np.ndarray]  # source -> neighbors
+
+    def __init__(self, graph: nx.Graph, edge_nodes: List[NodeId]):
+        self.edge_nodes = np.asarray(edge_nodes)
+        self.bases = {}
+        self.neighbors = {}
+        for _o in sorted(set(edge_nodes)):
+            source_neighbor: int = next(iter(graph.neighbors(_o)))
+            _neighbors: List[int] = sorted(_n for _n in graph.neighbors(source_neighbor)
+                                           if _n != _o and graph.degree(_n) == 1)
+            self.bases[_o] = np.array(sorted(set(edge_nodes) - {_o} - set(_neighbors)), dtype=self.edge_nodes.dtype)
+            self.neighbors[_o] = np.array(_neighbors, dtype=self.edge_nodes.dtype)
+
+    def sample(self, sources: np.ndarray, dest_nums: np.ndarray,
+               rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        '''
+        sample distinct destinations of all flows at once, flows of the same source are sampled together in chunks
+        by partially ranking random keys of their candidates
+        :param sources: source of each flow
+        :param dest_nums: number of destinations of each flow
+        :param rng:
+        :return: destinations of all flows as flat array, and offsets of each flow in it
+        '''
+        _max_dn: int = int(dest_nums.max()) if len(dest_nums) != 0 else 0
+        _D: np.ndarray = np.zeros((len(sources), _max_dn), dtype=self.edge_nodes.dtype)
+        for _o in np.unique(sources):
+            _rows: np.ndarray = np.flatnonzero(sources == _o)
+            _base: np.ndarray = self.bases[_o.item()]
+            _neighbors: np.ndarray = self.neighbors[_o.item()]
+            _candidates: np.ndarray = np.concatenate((_base, _neighbors))
+            _n: int = int(np.ceil((1 - config.FLOW_CONFIG['un-neighbors_degree']) * len(_neighbors)))
+            if len(_base) + _n < int(dest_nums[_rows].max()):
+                raise RuntimeError('too less destinations of source [{}]'.format(_o))
+            # keys of a chunk of flows at once, memory does not grow with number of flows
+            _chunk: int = max(1, SAMPLE_CELLS // max(len(_candidates), 1))
+            for _start in range(0, len(_rows), _chunk):
+                _chunk_rows: np.ndarray = _rows[_start:_start + _chunk]
+                _keys: np.ndarray = rng.random((len(_chunk_rows), len(_candidates)))
+                if len(_neighbors) != 0:
+                    # only the n neighbors of the smallest keys are candidates
+                    _neighbor_keys: np.ndarray = rng.random((len(_chunk_rows), len(_neighbors)))
+                    if _n < len(_neighbors):
+                        _excluded: np.ndarray = np.argpartition(_neighbor_keys, _n, axis=1)[:, _n:]
+                        np.put_along_axis(_keys[:, len(_base):], _excluded, np.inf, axis=1)
+                _D[_chunk_rows, :min(_max_dn, len(_candidates))] = _candidates[smallest(_keys, _max_dn)]
+        _mask: np.ndarray = np.arange(_max_dn)[None, :] < dest_nums[:, None]
+        return _D[_mask], np.concatenate(([0], np.cumsum(dest_nums))).astype(np.int64)
+
+
+def smallest(keys: np.ndarray, k: int) -> np.ndarray:
+    '''
+    positions of k smallest keys of each row in ascending order of keys, only k keys of each row are sorted
+    :param keys: 2d array
+    :param k:
+    :return: positions, at most k of each row
+    '''
+    if k >= keys.shape[1]:
+        return np.argsort(keys, axis=1)
+    _positions: np.ndarray = np.argpartition(keys, k - 1, axis=1)[:, :k] if k != 0 else \
+        np.zeros((keys.shape[0], 0), dtype=np.int64)
+    _order: np.ndarray = np.argsort(np.take_along_axis(keys, _positions, axis=1), axis=1)
+    return np.take_along_axis(_positions, _order, axis=1)
+
+
+class FlowSet:
+    '''
+    properties of flows as arrays, flow objects are materialized on demand
+    '''
+    flow_ids: np.ndarray
+    sizes: np.ndarray
+    periods: np.ndarray
+    sources: np.ndarray
+    destinations: np.ndarray  # destinations of all flows
+    destination_offsets: np.ndarray  # destinations of flow i are destinations[offsets[i]:offsets[i + 1]]
+    reliabilities: np.ndarray
+    deadlines: np.ndarray
+
+    def __init__(self, flow_ids: np.ndarray, sizes: np.ndarray, periods: np.ndarray, sources: np.ndarray,
+                 destinations: np.ndarray, destination_offsets: np.ndarray, reliabilities: np.ndarray,
+                 deadlines: np.ndarray):
+        self.flow_ids = flow_ids
+        self.sizes = sizes
+        self.periods = periods
+        self.sources = sources
+        self.destinations = destinations
+        self.destination_offsets = destination_offsets
+        self.reliabilities = reliabilities
+        self.deadlines = deadlines
+
+    def __len__(self) -> int:
+        return len(self.flow_ids)
+
+    def __getitem__(self, i: int) -> Flow:
+        return Flow(self.flow_ids[i].item(), self.sizes[i].item(), self.periods[i].item(), self.sources[i].item(),
+                    self.destinations[self.destination_offsets[i]:self.destination_offsets[i + 1]].tolist(),
+                    self.reliabilities[i].item(), self.deadlines[i].item())
+
+    def __iter__(self) -> Iterator[Flow]:
+        for _i in range(len(self)):
+            yield self[_i]
 
 
 class FlowGenerator:
@@ -23,10 +135,8 @@ class FlowGenerator:
 
     @classmethod
     def compute_hyper_period(cls, flows: List[Flow]):
-        # TODO compute hyper period of flows
-        # fake method here
-        _F: List[Flow] = sorted(flows, key=lambda f: f.period)
-        return _F[-1].period
+        from src.graph.HyperPeriodPlanner import HyperPeriodPlanner
+        return HyperPeriodPlanner.compute_hyper_period([_f.period for _f in flows])
 
     @staticmethod
     def generate_flow_properties(flow_num: int = 0) -> List[Dict]:
@@ -64,6 +174,7 @@ class FlowGenerator:
             raise RuntimeError('too less edge nodes')
         _F: List[Flow] = []
         _fid = flow_id
+        _candidates: Dict[NodeId, Tuple[List[int], List[int]]] = {}  # computed once per source
         for _i in range(flow_num):
             if 'flow_properties' in kwargs.keys():
                 _s: int = kwargs['flow_properties'][_i]['size']
@@ -85,14 +196,10 @@ class FlowGenerator:
                     config.FLOW_CONFIG['dest-num-set'][random.randint(0, len(config.FLOW_CONFIG['dest-num-set'])) - 1]
             _o: int = \
                 edge_nodes[random.randint(0, len(edge_nodes)) - 1]
-            _D: List[int] = []
-            _edge_nodes_t: List[int] = copy.deepcopy(edge_nodes)
-            _edge_nodes_t.remove(_o)
-            source_neighbor: int = list(graph.neighbors(_o))[0]
-            neighbors: List[int] = list(graph.neighbors(source_neighbor))
-            neighbors.remove(_o)
-            neighbors = list(filter(lambda n: list(graph.neighbors(n)).__len__() == 1, neighbors))
-            _edge_nodes_t = list(set(_edge_nodes_t) - set(neighbors))
+            if _o not in _candidates:
+                _candidates[_o] = FlowGenerator.legacy_destination_candidates(graph, edge_nodes, _o)
+            _base, neighbors = _candidates[_o]
+            _edge_nodes_t: List[int] = list(_base)
             if neighbors.__len__() >= 1:
                 _t: List[int] = random.sample(neighbors, int(
                     np.ceil((1 - config.FLOW_CONFIG['un-neighbors_degree']) * len(neighbors))))
@@ -101,9 +208,81 @@ class FlowGenerator:
             _f: Flow = Flow(_fid, _s, _p, _o, _D, _rl, _dl)
             _F.append(_f)
             _fid += 1
-            logger.info(_f)
+            if dump_enabled(logger):
+                logger.info('%s', _f)
         return _F
 
+    @staticmethod
+    def legacy_destination_candidates(graph: nx.Graph, edge_nodes: List[NodeId],
+                                      source: NodeId) -> Tuple[List[int], List[int]]:
+        '''
+        candidate destinations of generate_flows, in the same order as they were computed for each flow before
+        :param graph:
+        :param edge_nodes:
+        :param source:
+        :return: edge nodes except source and edge nodes attached at the same core node as source, and the latter
+        '''
+        _edge_nodes_t: List[int] = list(edge_nodes)
+        _edge_nodes_t.remove(source)
+        source_neighbor: int = list(graph.neighbors(source))[0]
+        neighbors: List[int] = list(graph.neighbors(source_neighbor))
+        neighbors.remove(source)
+        neighbors = list(filter(lambda n: list(graph.neighbors(n)).__len__() == 1, neighbors))
+        return list(set(_edge_nodes_t) - set(neighbors)), neighbors
+
+    @staticmethod
+    def generate_flow_set(edge_nodes: List[NodeId] = None, graph: nx.Graph = None, flow_num: int = None,
+                          flow_id: int = 1, seed: int = None, rng: np.random.Generator = None,
+                          candidates: 'DestinationCandidates' = None) -> 'FlowSet':
+        '''
+        draw properties of all flows as arrays at once from a numpy random generator, flows are materialized on
+        demand by the returned flow set, global random state is not used
+        :param edge_nodes: arrival source nodes
+        :param graph:
+        :param flow_num: number of flows, default is flow-num of config
+        :param flow_id: id of the first flow
+        :param seed: seed of random generator
+        :param rng: random generator, seed is ignored if it is given
+        :param candidates: candidate destinations precomputed for graph and edge nodes
+        :return: flow set
+        '''
+        if flow_num is None:
+            flow_num = config.FLOW_CONFIG['flow-num']
+        if len(config.FLOW_CONFIG['dest-num-set']) + 1 > len(edge_nodes):
+            raise RuntimeError('too less edge nodes')
+        _rng: np.random.Generator = rng if rng is not None else np.random.default_rng(seed)
+        if candidates is None:
+            candidates = DestinationCandidates(graph, edge_nodes)
+        _sets: List[np.ndarray] = [np.asarray(config.FLOW_CONFIG[_k]) for _k in
+                                   ['size-set', 'period-set', 'reliability-set', 'deadline-set', 'dest-num-set']]
+        _s, _p, _rl, _dl, _dn = [_set[_rng.integers(len(_set), size=flow_num)] for _set in _sets]
+        _o: np.ndarray = candidates.edge_nodes[_rng.integers(len(candidates.edge_nodes), size=flow_num)]
+        _D, _D_offsets = candidates.sample(_o, _dn, _rng)
+        return FlowSet(np.arange(flow_id, flow_id + flow_num, dtype=np.int64), _s, _p, _o, _D, _D_offsets, _rl, _dl)
+
+    @staticmethod
+    def iter_flows(edge_nodes: List[NodeId] = None, graph: nx.Graph = None, flow_num: int = None,
+                   flow_id: int = 1, seed: int = None, rng: np.random.Generator = None) -> Iterator[Flow]:
+        '''
+        generate flows lazily chunk by chunk, so flows can be streamed into FlowWriter or solver without being held
+        in memory
+        :param edge_nodes: arrival source nodes
+        :param graph:
+        :param flow_num: number of flows, default is flow-num of config
+        :param flow_id: id of the first flow
+        :param seed: seed of random generator
+        :param rng: random generator, seed is ignored if it is given
+        :return: flows
+        '''
+        if flow_num is None:
+            flow_num = config.FLOW_CONFIG['flow-num']
+        _rng: np.random.Generator = rng if rng is not None else np.random.default_rng(seed)
+        _candidates: DestinationCandidates = DestinationCandidates(graph, edge_nodes)
+        for _start in range(0, flow_num, FLOW_CHUNK):
+            yield from FlowGenerator.generate_flow_set(
+                edge_nodes, graph, flow_num=min(FLOW_CHUNK, flow_num - _start), flow_id=flow_id + _start,
+                rng=_rng, candidates=_candidates)
+
     @staticmethod
     def smooth_period(hp: int, p: int) -> int:
         # TODO smooth period of all flows
@@ -169,19 +348,23 @@ class FlowGenerator:
             setattr(obj, key, value)
         return obj
 
+    @staticmethod
+    def _flow2dict(flow: Flow) -> Dict:
+        # private attributes, e.g. the graph indexing routes of flow, are not serialized
+        return {_k: _v for _k, _v in flow.__dict__.items() if not _k.startswith('_')}
+
     @classmethod
-    def flow2json(cls, flow: Flow):
-        json.dumps(flow.__dict__, default=cls._obj2json_helper)
+    def flow2json(cls, flow: Flow) -> str:
+        return json.dumps(cls._flow2dict(flow), default=cls._obj2json_helper)
 
     @classmethod
     def flows2json(cls, flows: List[Flow]) -> str:
         _F: Dict[str] = dict()
         for _i, flow in enumerate(flows):
-            flow.routes_reliability = dict()
-            flow.routes = []
-            flow.walked_edges = set()
-            flow.negative_walked_edges = set()
-            _F['f' + str(_i)] = json.dumps(flow.__dict__, default=cls._obj2json_helper)
+            # routing state is not saved, flows themselves are left untouched
+            _d: Dict = cls._flow2dict(flow)
+            _d.update(routes_reliability=dict(), routes=[], walked_edges=set(), negative_walked_edges=set())
+            _F['f' + str(_i)] = json.dumps(_d, default=cls._obj2json_helper)
         return json.dumps(_F)
 
     @classmethod
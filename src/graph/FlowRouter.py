@@ -9,6 +9,7 @@ from src.graph.reliability_strategy.MultiRoutesReliabilityStrategy import MultiR
 from src.graph.reliability_strategy.ReliabilityStrategy import ReliabilityStrategy
 from src.graph.routing_strategy.BackTrackingRedundantRoutingStrategy import BackTrackingRedundantRoutingStrategy
 from src.graph.routing_strategy.RoutingStrategy import RoutingStrategy
+from src.graph.RunConfig import RunConfig
 from src.type import FlowId
 
 logger = logging.getLogger(__name__)
@@ -29,7 +30,7 @@ class FlowRouter:
     __reliability_strategy: ReliabilityStrategy
 
     def __init__(self, nodes: List[int], edges: List[int], flows: List[int], node_mapper: Dict[int, Node],
-                 edge_mapper: Dict[int, Edge], flow_mapper: Dict[int, Flow]):
+                 edge_mapper: Dict[int, Edge], flow_mapper: Dict[int, Flow], run_config: RunConfig = None):
         self.nodes = nodes
         self.edges = edges
         self.flows = flows
@@ -41,9 +42,11 @@ class FlowRouter:
         self.init_flow_walked_edges()
         # default routing strategy is Long-Routes-First Redundant Routing Strategy
         self.__routing_strategy = \
-            BackTrackingRedundantRoutingStrategy(nodes, edges, flows, node_mapper, edge_mapper, flow_mapper)
+            BackTrackingRedundantRoutingStrategy(nodes, edges, flows, node_mapper, edge_mapper, flow_mapper,
+                                                 run_config=run_config)
         self.__reliability_strategy = \
-            MultiRoutesReliabilityStrategy(nodes, edges, flows, node_mapper, edge_mapper, flow_mapper)
+            MultiRoutesReliabilityStrategy(nodes, edges, flows, node_mapper, edge_mapper, flow_mapper,
+                                           run_config=run_config)
         self.__routing_strategy.reliability_strategy = self.__reliability_strategy
 
     @staticmethod
@@ -58,7 +61,7 @@ class FlowRouter:
 
     @property
     def routing_strategy(self):
-        return self.routing_strategy
+        return self.__routing_strategy
 
     @routing_strategy.setter
     def routing_strategy(self, routing_strategy: RoutingStrategy):
@@ -109,10 +112,10 @@ class FlowRouter:
             if not self.route_single_flow(self.flow_mapper[fid]):
                 self.recover_weight()
                 self.failure_queue.add(fid)
-                logger.info('routing failure ,and add flow [' + str(fid) + '] into failure queue')
+                logger.info('routing failure ,and add flow [%s] into failure queue', fid)
             else:
-                logger.info(self.flow_mapper[fid].to_string())
-        logger.info('FAILURE QUEUE:' + str(self.failure_queue))
+                self.flow_mapper[fid].to_string()
+        logger.info('FAILURE QUEUE:%s', self.failure_queue)
 
     def route_flows_incrementally(self, flows: List[int]):
         self.route_flows(flows)
@@ -123,10 +126,10 @@ class FlowRouter:
     def route_single_flow(self, flow: Flow) -> bool:
         _b: float = flow.size / flow.period
         if self.route_one2many(flow.flow_id, flow.source, flow.destinations, _b):
-            logger.info('routing for flow [' + str(flow.flow_id) + '] succeed')
+            logger.info('routing for flow [%s] succeed', flow.flow_id)
             return True
         else:
-            logger.info('routing for flow [' + str(flow.flow_id) + '] failure')
+            logger.info('routing for flow [%s] failure', flow.flow_id)
             return False
 
     def route_one2many(self, fid: int, src: int, dest: List[int], b: float) -> bool:
@@ -147,7 +150,7 @@ class FlowRouter:
             _routes.append(__routes)  # add one-to-one routes set to one-to-many routes set
             self.flow_mapper[fid].negative_walked_edges = set()  # recover negative walked set
             # TODO set redundancy degree for source-destination pair
-        self.flow_mapper[fid].routes = _routes  # assign routes to flow
+        self.flow_mapper[fid].assign_routes(_routes)  # assign routes to flow
         # if all are successful, then add walked edge to walked edges set
         for _d_routes in _routes:
             for _route in _d_routes:
@@ -15,6 +15,7 @@ from src.graph.allocating_strategy.AllocatingStrategy import AllocatingStrategy
 from src.graph.scheduling_strategy.LRFRedundantScheduling import LRFRedundantSchedulingStrategy
 from src.graph.scheduling_strategy.SchedulingStrategy import SchedulingStrategy
 from src.type import FlowId
+from src.utils.logs import dump_enabled
 
 logger = logging.getLogger(__name__)
 
@@ -88,7 +89,8 @@ class FlowScheduler:
         """
         # TODO sort routes of flow
         _routes = sorted(routes, key=lambda r: len(r), reverse=True)
-        logger.info('sorted routes: ' + str(json.dumps(_routes)))
+        if dump_enabled(logger):
+            logger.info('sorted routes: %s', json.dumps(_routes))
         return _routes
 
     def schedule_flows(self, flows: List[int], is_sort: bool = True):
@@ -97,8 +99,8 @@ class FlowScheduler:
         for _fid in flows:
             if not self.schedule_single_flow(self.flow_mapper[_fid]):
                 self.failure_queue.add(_fid)
-                logger.info('add flow [' + str(_fid) + '] into failure queue')
-        logger.info('FAILURE QUEUE:' + str(self.failure_queue))
+                logger.info('add flow [%s] into failure queue', _fid)
+        logger.info('FAILURE QUEUE:%s', self.failure_queue)
 
     # deprecated
     def schedule_all_flows(self):
@@ -109,7 +111,7 @@ class FlowScheduler:
         self.schedule_flows(flows)
 
     def schedule_single_flow(self, flow: Flow) -> bool:
-        logger.info('schedule flow [' + str(flow.flow_id) + ']...')
+        logger.info('schedule flow [%s]...', flow.flow_id)
         _all_routes: List[List[List[int]]] = flow.get_routes()
         _union_routes: List[List[int]] = []
         for _e2e_routes in _all_routes:
@@ -119,7 +121,7 @@ class FlowScheduler:
         _ER: List[int] = []  # recover list
         for _e2e_route in _union_routes:
             if not self.schedule_end2end(flow, _e2e_route):
-                logger.info('scheduling flow [' + str(flow.flow_id) + '] failure')
+                logger.info('scheduling flow [%s] failure', flow.flow_id)
                 # TODO recover time slots allocation on edge
                 for __e2e_route in _ER:
                     for _eid in __e2e_route:
@@ -127,7 +129,7 @@ class FlowScheduler:
                 return False
             else:
                 _ER.append(_e2e_route)
-        logger.info('scheduling flow [' + str(flow.flow_id) + '] successful')
+        logger.info('scheduling flow [%s] successful', flow.flow_id)
         return True
 
     def schedule_end2end(self, flow: Flow, route: List[int]) -> bool:
@@ -168,9 +170,9 @@ class FlowScheduler:
                     allocator.allocate(flow, arrival_time_offset, _send_time_offset, phase_num, allocation_num)
                     _flag = True
                 else:
-                    logger.error('allocate time slots error on edge [' + str(allocator.edge_id) + ']')
-                    logger.error('send time offset: ' + str(_send_time_offset))
-                    logger.error('error interval: ' + str([_b.interval.lower, _b.interval.upper]))
+                    logger.error('allocate time slots error on edge [%s]', allocator.edge_id)
+                    logger.error('send time offset: %s', _send_time_offset)
+                    logger.error('error interval: [%s, %s]', _b.interval.lower, _b.interval.upper)
                     # self.to_string()
                     return -1
         if _flag is False:
@@ -184,7 +186,7 @@ class FlowScheduler:
                 _send_time_offset += allocator.time_slot_len
         # allocation failure
         if _flag is False:
-            logger.info('allocate time slots for flow [' + str(flow.flow_id) + '] failure')
+            logger.info('allocate time slots for flow [%s] failure', flow.flow_id)
             return -1
         else:
             _next_arrival_time_offset = _send_time_offset + (allocation_num * allocator.time_slot_len) + \
@@ -0,0 +1,107 @@
+import json
+import logging
+from itertools import islice
+from typing import List, Dict, Iterable, Iterator
+
+import numpy as np
+
+from src.graph.Flow import Flow
+
+logger = logging.getLogger(__name__)
+
+FLOW_FIELDS: List[str] = ['flow_id', 'size', 'period', 'source', 'destinations', 'reliability', 'deadline']
+REQUIRED_FLOW_FIELDS: List[str] = ['flow_id', 'size', 'period', 'source', 'destinations']
+
+
+def _plain(obj):
+    # numpy scalars, e.g. node ids drawn by numpy, are written as plain numbers
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError('{} is not JSON serializable'.format(type(obj).__name__))
+
+
+def flow2record(flow: Flow) -> Dict:
+    '''
+    definition of flow without routing and scheduling state
+    :param flow:
+    :return: record of flow
+    '''
+    return {_k: getattr(flow, _k) for _k in FLOW_FIELDS}
+
+
+def record2flow(d: Dict) -> Flow:
+    for _k in REQUIRED_FLOW_FIELDS:
+        if _k not in d:
+            raise RuntimeError('miss parameter "{}"'.format(_k))
+    return Flow(d['flow_id'], d['size'], d['period'], d['source'], d['destinations'],
+                d.get('reliability', 0.0), d.get('deadline', 0))
+
+
+def batched(iterable: Iterable, n: int) -> Iterator[List]:
+    '''
+    split iterable into lists of at most n items lazily
+    :param iterable:
+    :param n: batch size
+    :return:
+    '''
+    if n <= 0:
+        raise RuntimeError('batch size must be positive')
+    _iterator: Iterator = iter(iterable)
+    while True:
+        _batch: List = list(islice(_iterator, n))
+        if len(_batch) == 0:
+            return
+        yield _batch
+
+
+class FlowWriter:
+    '''
+    sink of flow records, one json object per line, so a flow set can be appended to and read lazily
+    '''
+    filename: str
+
+    def __init__(self, filename: str, append: bool = True):
+        self.filename = filename
+        self.__file = open(filename, 'a' if append else 'w')
+
+    def write(self, flow: Flow):
+        self.__file.write(json.dumps(flow2record(flow), default=_plain) + '\n')
+
+    def write_all(self, flows: Iterable[Flow]) -> int:
+        _n: int = 0
+        for _flow in flows:
+            self.write(_flow)
+            _n += 1
+        return _n
+
+    def close(self):
+        self.__file.close()
+
+    def __enter__(self) -> 'FlowWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class FlowReader:
+    '''
+    source of flow records written by FlowWriter, flows are read line by line and never loaded whole
+    '''
+    filename: str
+
+    def __init__(self, filename: str):
+        self.filename = filename
+
+    def records(self) -> Iterator[Dict]:
+        with open(self.filename, 'r') as f:
+            for _line in f:
+                if len(_line.strip()) != 0:
+                    yield json.loads(_line)
+
+    def __iter__(self) -> Iterator[Flow]:
+        for _record in self.records():
+            yield record2flow(_record)
+
+    def batches(self, batch_size: int) -> Iterator[List[Flow]]:
+        return batched(self, batch_size)
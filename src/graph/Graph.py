@@ -8,6 +8,7 @@ from .Node import Node
 from .Edge import Edge
 from .Flow import Flow
 from .FlowRouter import FlowRouter
+from .RunConfig import RunConfig
 from src.utils.Visualizer import Visualizer, GanttEntry, GanttBlock
 import logging
 
@@ -29,8 +30,13 @@ class Graph:
     flow_router: FlowRouter
     flow_scheduler: FlowScheduler
     failure_queue: Set[int]
+    run_config: RunConfig
+    edge_flows: Dict[int, Set[int]]  # edge -> flows reverse index, maintained whenever routes of flows change
+    node_flows: Dict[int, Set[int]]  # node -> flows reverse index
+    flow_edges: Dict[int, Set[int]]  # edges of each flow as currently indexed
 
-    def __init__(self, nx_graph: nx.Graph = None, nodes: List[int] = None, edges: List[int] = None, hp: int = 0):
+    def __init__(self, nx_graph: nx.Graph = None, nodes: List[int] = None, edges: List[int] = None, hp: int = 0,
+                 run_config: RunConfig = None):
         self.nx_graph = nx_graph
         self.nodes = nodes
         self.edges = edges
@@ -39,15 +45,31 @@ class Graph:
         self.node_mapper = {}
         self.edge_mapper = {}
         self.flow_mapper = {}
+        self.edge_flows = {}
+        self.node_flows = {}
+        self.flow_edges = {}
         self.hyper_period = hp
+        self.run_config = run_config if run_config is not None else RunConfig.from_config()
         self.flow_router = \
-            FlowRouter(self.nodes, self.edges, self.flows, self.node_mapper, self.edge_mapper, self.flow_mapper)
+            FlowRouter(self.nodes, self.edges, self.flows, self.node_mapper, self.edge_mapper, self.flow_mapper,
+                       run_config=self.run_config)
         self.flow_scheduler = \
             FlowScheduler(self.nodes, self.edges, self.flows, self.node_mapper, self.edge_mapper, self.flow_mapper)
         self.init_nodes()
         self.init_edges()
         # self.print_nodes()
 
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if 'edge_flows' not in state:
+            # graph pickled without reverse indexes, rebuild them from routes of flows
+            self.edge_flows = {}
+            self.node_flows = {}
+            self.flow_edges = {}
+            for _f in self.flow_mapper.values():
+                _f._graph = self
+                self.index_flow(_f)
+
     def get_node_num(self):
         return self.nodes.__len__()
 
@@ -60,26 +82,27 @@ class Graph:
 
     def init_nodes(self) -> bool:
         if self.nodes is None or self.nodes == []:
-            logging.info('there is no nodes')
+            logger.info('there is no nodes')
             return False
         for node_id in self.nodes:
-            logger.info('initialize node [' + str(node_id) + ']')
+            logger.info('initialize node [%s]', node_id)
             node: Node = Node(node_id)
             self.node_mapper[node_id] = node
         return True
 
     def init_edges(self) -> bool:
         if self.edges is None or self.edges == []:
-            logging.info('there is no edges')
+            logger.info('there is no edges')
             return False
         edge_id = 1  # start from 1
         for edge_tuple in self.edges:
-            logger.info(
-                'initialize edge [' + str(edge_id) + '] <' + str(edge_tuple[0]) + '->' + str(edge_tuple[1]) + '>')
+            logger.info('initialize edge [%s] <%s->%s>', edge_id, edge_tuple[0], edge_tuple[1])
             in_node: int = edge_tuple[0]
             out_node: int = edge_tuple[1]
+            # allocator is sized once with configured bandwidth and hyper period
             _e: Edge = Edge(
-                edge_id, in_node=self.node_mapper[in_node], out_node=self.node_mapper[out_node], hp=self.hyper_period)
+                edge_id, in_node=self.node_mapper[in_node], out_node=self.node_mapper[out_node],
+                b=self.run_config.all_bandwidth, hp=self.hyper_period, run_config=self.run_config)
             self.edge_mapper[edge_id] = _e
             self.node_mapper[in_node].append_out_edge(_e)
             self.node_mapper[out_node].append_in_edge(_e)
@@ -136,11 +159,84 @@ class Graph:
         for _f in flows:
             self.flows.append(_f.flow_id)
             self.flow_mapper[_f.flow_id] = _f
+            _f._graph = self
+            self.index_flow(_f)
+
+    def remove_flow(self, flow_id: int):
+        # remove flow from flow list, flow mapper, reverse indexes and failure queues
+        if flow_id in self.flow_mapper:
+            self.unindex_flow(flow_id)
+            self.flow_mapper[flow_id]._graph = None
+            self.flows.remove(flow_id)
+            del self.flow_mapper[flow_id]
+        self.failure_queue.discard(flow_id)
+        self.flow_router.failure_queue.discard(flow_id)
+        self.flow_scheduler.failure_queue.discard(flow_id)
+
+    @staticmethod
+    def get_flow_edges(flow: Flow) -> Set[int]:
+        # edges of all routes of flow
+        _edges: Set[int] = set()
+        for _o2o_routes in flow.routes:
+            for _route in _o2o_routes:
+                _edges.update(_route)
+        return _edges
+
+    def index_flow(self, flow: Flow):
+        '''
+        update edge -> flows and node -> flows indexes after routes of flow are assigned or released
+        :param flow: flow of graph
+        :return:
+        '''
+        self.unindex_flow(flow.flow_id)
+        _edges: Set[int] = self.get_flow_edges(flow)
+        if len(_edges) == 0:
+            return
+        self.flow_edges[flow.flow_id] = _edges
+        for _eid in _edges:
+            self.edge_flows.setdefault(_eid, set()).add(flow.flow_id)
+            _e: Edge = self.edge_mapper[_eid]
+            self.node_flows.setdefault(_e.in_node.node_id, set()).add(flow.flow_id)
+            self.node_flows.setdefault(_e.out_node.node_id, set()).add(flow.flow_id)
+
+    def unindex_flow(self, flow_id: int):
+        _edges: Set[int] = self.flow_edges.pop(flow_id, None)
+        if _edges is None:
+            return
+        for _eid in _edges:
+            self.edge_flows[_eid].discard(flow_id)
+            _e: Edge = self.edge_mapper[_eid]
+            self.node_flows[_e.in_node.node_id].discard(flow_id)
+            self.node_flows[_e.out_node.node_id].discard(flow_id)
+
+    def get_edge_flows(self) -> Dict[int, Set[int]]:
+        return self.edge_flows
+
+    def get_node_flows(self) -> Dict[int, Set[int]]:
+        return self.node_flows
+
+    def fail_edges(self, edge_ids: List[int]) -> Set[int]:
+        for _eid in edge_ids:
+            self.edge_mapper[_eid].failed = True
+            logger.info('edge [%s] fails', _eid)
+        return set(edge_ids)
+
+    def fail_nodes(self, node_ids: List[int]) -> Set[int]:
+        # all inbound and outbound edges of failed nodes fail
+        _edge_ids: Set[int] = set()
+        for _nid in node_ids:
+            _node: Node = self.node_mapper[_nid]
+            _edge_ids |= {_e.edge_id for _e in _node.in_edge + _node.out_edge}
+        return self.fail_edges(sorted(_edge_ids))
+
+    def repair_edges(self, edge_ids: List[int]):
+        for _eid in edge_ids:
+            self.edge_mapper[_eid].failed = False
 
     def compute_hyper_period(self):
         p = [flow.period for flow in self.flow_mapper.values()]
-        from src.utils.computing import lcm_m
-        self.hyper_period = int(lcm_m(p))
+        from src.graph.HyperPeriodPlanner import HyperPeriodPlanner
+        self.hyper_period = HyperPeriodPlanner.compute_hyper_period(p)
         for edge in self.edge_mapper.values():
             edge.hyper_period = self.hyper_period
 
@@ -171,7 +267,7 @@ class Graph:
         :return:
         '''
         self.failure_queue = self.flow_router.failure_queue.union(self.flow_scheduler.failure_queue)
-        logger.info('WHOLE FAILURE QUEUE:' + str(self.failure_queue))
+        logger.info('WHOLE FAILURE QUEUE:%s', self.failure_queue)
 
     # draw gantt chart for merged time slots allocation blocks
     # def draw_gantt(self):
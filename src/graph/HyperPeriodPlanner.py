@@ -0,0 +1,175 @@
+import json
+import logging
+from math import ceil, isqrt
+from typing import List, Dict
+
+from src.graph.Flow import Flow
+from src.graph.RunConfig import RunConfig
+from src.utils.computing import lcm_m
+
+logger = logging.getLogger(__name__)
+
+BLOCK_BYTES: int = 1500  # memory of one allocation block with its merged copy, [unit: B]
+SECONDS_PER_CHECK: float = 7e-5  # time of checking one phase against one allocation block, [unit: s]
+
+
+class HyperPeriodPlan:
+    hyper_period: int  # [unit: ns]
+    periods: Dict[int, int]  # original period -> planned period, [unit: ns]
+    harmonized: bool  # whether periods have been harmonized
+    time_slot_len: int  # [unit: ns]
+    time_slot_num: int  # number of time slots of each allocator
+    phase_num: int  # number of phases of all flows within hyper period
+    block_num: int  # estimated number of allocation blocks of all edges
+    memory: int  # estimated memory of allocation blocks, [unit: B]
+    runtime: float  # estimated time of checking allocations once per edge, [unit: s]
+    warnings: List[str]
+
+    def __init__(self, hyper_period: int, periods: Dict[int, int], time_slot_len: int, harmonized: bool = False):
+        self.hyper_period = hyper_period
+        self.periods = periods
+        self.harmonized = harmonized
+        self.time_slot_len = time_slot_len
+        self.time_slot_num = hyper_period // time_slot_len if time_slot_len != 0 else 0
+        self.phase_num = 0
+        self.block_num = 0
+        self.memory = 0
+        self.runtime = 0.0
+        self.warnings = []
+
+    def to_dict(self) -> Dict:
+        return {
+            'hyper_period': self.hyper_period,
+            'periods': {str(_p): _q for _p, _q in self.periods.items()},
+            'harmonized': self.harmonized,
+            'time_slot_len': self.time_slot_len,
+            'time_slot_num': self.time_slot_num,
+            'phase_num': self.phase_num,
+            'block_num': self.block_num,
+            'memory': self.memory,
+            'runtime': self.runtime,
+            'warnings': self.warnings,
+        }
+
+    def to_string(self):
+        logger.info('hyper period plan: %s', json.dumps(self.to_dict()))
+        for _warning in self.warnings:
+            logger.warning(_warning)
+
+
+class HyperPeriodPlanner:
+    '''
+    plan hyper period of a flow set before allocators are sized, i.e. exact lcm of periods,
+    and harmonize periods if the lcm needs more time slots than allowed
+    '''
+    time_slot_len: int  # [unit: ns]
+    max_time_slot_num: int  # maximum number of time slots of each allocator
+
+    def __init__(self, time_slot_len: int = 0, max_time_slot_num: int = 0):
+        self.time_slot_len = time_slot_len
+        self.max_time_slot_num = max_time_slot_num
+
+    @classmethod
+    def from_run_config(cls, run_config: RunConfig) -> 'HyperPeriodPlanner':
+        # time slot length is based on maximum bandwidth, the same as time slot allocator
+        return cls(ceil(run_config.min_flow_size / run_config.max_bandwidth), run_config.max_time_slot_num)
+
+    @staticmethod
+    def compute_hyper_period(periods: List[int]) -> int:
+        '''
+        exact least common multiple of periods
+        :param periods: [unit: ns]
+        :return: hyper period, [unit: ns]
+        '''
+        if len(periods) == 0:
+            return 0
+        return lcm_m(sorted(set(periods)))
+
+    @staticmethod
+    def harmonize_period(hp: int, p: int, min_period: int = 1) -> int:
+        '''
+        largest divisor of hyper period which does not exceed period, so flow is sent at least as often as required,
+        unlike FlowGenerator.smooth_period which may lengthen period and returns non-divisors,
+        divisors shorter than half of period or than min period are refused and period is kept then
+        :param hp: target hyper period
+        :param p: period
+        :param min_period: shortest acceptable period, e.g. one time slot
+        :return: harmonized period, period itself if no divisor is acceptable
+        '''
+        if p >= hp:
+            return hp
+        _lower: int = max(ceil(p / 2), min_period, 1)
+        _best: int = 0
+        # divisors come in pairs (i, hp // i), so only i <= sqrt(hp) is enumerated
+        for _i in range(1, isqrt(hp) + 1):
+            if hp % _i == 0:
+                for _d in (_i, hp // _i):
+                    if _lower <= _d <= p and _d > _best:
+                        _best = _d
+        return _best if _best != 0 else p
+
+    def plan(self, periods: List[int], harmonize: bool = False, hyper_period: int = None,
+             edge_num: int = 0, route_edge_num: int = 1) -> HyperPeriodPlan:
+        '''
+        plan hyper period and estimate memory and time of allocation
+        :param periods: periods of all flows, [unit: ns]
+        :param harmonize: harmonize periods to divisors of maximum period if lcm needs too many time slots
+        :param hyper_period: configured hyper period, warned about if flows are not strictly periodic within it
+        :param edge_num: number of edges, used by estimation
+        :param route_edge_num: (upper bound of) number of edges each flow walks through, used by estimation
+        :return: plan
+        '''
+        _hp: int = self.compute_hyper_period(periods)
+        _warnings: List[str] = []
+        _planned: Dict[int, int] = {_p: _p for _p in set(periods)}
+        _harmonized: bool = False
+        if self.time_slot_len != 0 and self.max_time_slot_num != 0 and \
+                _hp // self.time_slot_len > self.max_time_slot_num:
+            _warnings.append('hyper period {} ns of periods {} needs {} time slots, more than {}'.format(
+                _hp, sorted(set(periods)), _hp // self.time_slot_len, self.max_time_slot_num))
+            if harmonize:
+                _max_period: int = max(periods)
+                _planned = {_p: self.harmonize_period(_max_period, _p, self.time_slot_len) for _p in set(periods)}
+                _hp = self.compute_hyper_period(list(_planned.values()))
+                _harmonized = any(_p != _q for _p, _q in _planned.items())
+                if _harmonized:
+                    _warnings.append('periods are harmonized to {}'.format(
+                        {_p: _q for _p, _q in sorted(_planned.items()) if _p != _q}))
+                _kept: List[int] = sorted(_p for _p, _q in _planned.items() if _max_period % _q != 0)
+                if len(_kept) != 0:
+                    _warnings.append('periods {} are kept, {} ns has no divisor between half of them and them'.format(
+                        _kept, _max_period))
+        if hyper_period is not None and _hp != 0 and hyper_period % _hp != 0:
+            _warnings.append('configured hyper period {} ns is not a multiple of hyper period {} ns of flows'.format(
+                hyper_period, _hp))
+        plan: HyperPeriodPlan = HyperPeriodPlan(_hp, _planned, self.time_slot_len, harmonized=_harmonized)
+        plan.warnings = _warnings
+        self.estimate(plan, [_planned[_p] for _p in periods], hyper_period, edge_num, route_edge_num)
+        return plan
+
+    @staticmethod
+    def estimate(plan: HyperPeriodPlan, periods: List[int], hyper_period: int = None,
+                 edge_num: int = 0, route_edge_num: int = 1):
+        # allocators are sized by the configured hyper period if it is given
+        _hp: int = hyper_period if hyper_period is not None else plan.hyper_period
+        plan.phase_num = sum(ceil(_hp / _p) for _p in periods)
+        plan.block_num = plan.phase_num * route_edge_num
+        plan.memory = plan.block_num * BLOCK_BYTES
+        # each flow checks all its phases against blocks of edges half full on average
+        _blocks_per_edge: float = plan.block_num / edge_num if edge_num != 0 else 0
+        plan.runtime = plan.block_num * _blocks_per_edge / 2 * SECONDS_PER_CHECK
+
+    @staticmethod
+    def apply(plan: HyperPeriodPlan, flows: List[Flow]):
+        '''
+        rewrite periods and bandwidth requirements of flows according to plan
+        :param plan:
+        :param flows:
+        :return:
+        '''
+        for _f in flows:
+            _p: int = plan.periods.get(_f.period, _f.period)
+            if _p != _f.period:
+                logger.info('period of flow [%s] is harmonized from %s to %s', _f.flow_id, _f.period, _p)
+                _f.period = _p
+                _f.bandwidth = _f.size / _p
@@ -2,6 +2,8 @@ import json
 import logging
 from typing import List
 
+from src.utils.logs import dump_enabled
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,6 +24,8 @@ class Node:
         self.color = 0  # RED = 1, WHITE = 0
 
     def to_string(self):
+        if not dump_enabled(logger):
+            return
         _in_edges: List[int] = []
         _out_edges: List[int] = []
         for _e in self.in_edge:
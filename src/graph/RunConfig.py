@@ -0,0 +1,73 @@
+import dataclasses
+from dataclasses import dataclass
+
+from src import config
+from src.type import TIME_GRANULARITY
+
+
+@dataclass(frozen=True)
+class RunConfig:
+    '''
+    immutable configuration of one solver run, it is threaded through solver -> graph -> edges/strategies,
+    global config dicts only serve as defaults when a run config is created
+    '''
+    hyper_period: int  # [unit: ns]
+    auto_hyper_period: bool  # size allocators by planned hyper period of flows instead of hyper_period
+    harmonize_periods: bool  # harmonize periods if hyper period of flows needs more than max_time_slot_num slots
+    max_time_slot_num: int
+    min_flow_size: int  # [unit: b]
+    all_bandwidth: float  # [unit: bpns]
+    max_bandwidth: float  # [unit: bpns]
+    all_propagation_delay: float  # [unit: ns]
+    all_process_delay: float  # [unit: ns]
+    all_per: float
+    overlapped_routing: bool
+    phase_folding: bool  # check slot-aligned periodic reservations by residue arithmetic instead of all phases
+    time_granularity: TIME_GRANULARITY
+    redundancy_degree: int
+    max_redundancy_degree: int
+    max_hops: int
+    max_iterations: int
+    max_no_improve: int
+    k: float
+    repair_time_limit: float  # [unit: s]
+
+    @classmethod
+    def from_config(cls, **kwargs) -> 'RunConfig':
+        '''
+        snapshot current global config dicts
+        :param kwargs: fields to override
+        :return: run config
+        '''
+        _fields: dict = {
+            'hyper_period': config.GRAPH_CONFIG['hyper-period'],
+            'auto_hyper_period': config.GRAPH_CONFIG['auto-hyper-period'],
+            'harmonize_periods': config.GRAPH_CONFIG['harmonize-periods'],
+            'max_time_slot_num': config.GRAPH_CONFIG['max-time-slot-num'],
+            'min_flow_size': config.GRAPH_CONFIG['min-flow-size'],
+            'all_bandwidth': config.GRAPH_CONFIG['all-bandwidth'],
+            'max_bandwidth': config.GRAPH_CONFIG['max-bandwidth'],
+            'all_propagation_delay': config.GRAPH_CONFIG['all-propagation-delay'],
+            'all_process_delay': config.GRAPH_CONFIG['all-process-delay'],
+            'all_per': config.GRAPH_CONFIG['all-per'],
+            'overlapped_routing': config.GRAPH_CONFIG['overlapped-routing'],
+            'phase_folding': config.GRAPH_CONFIG['phase-folding'],
+            'time_granularity': config.GRAPH_CONFIG['time-granularity'],
+            'redundancy_degree': config.FLOW_CONFIG['redundancy_degree'],
+            'max_redundancy_degree': config.FLOW_CONFIG['max-redundancy-degree'],
+            'max_hops': config.FLOW_CONFIG['max-hops'],
+            'max_iterations': config.OPTIMIZATION['max_iterations'],
+            'max_no_improve': config.OPTIMIZATION['max_no_improve'],
+            'k': config.OPTIMIZATION['k'],
+            'repair_time_limit': config.OPTIMIZATION['repair-time-limit'],
+        }
+        _fields.update(kwargs)
+        return cls(**_fields)
+
+    def replace(self, **kwargs) -> 'RunConfig':
+        '''
+        derive a new run config
+        :param kwargs: fields to override
+        :return: new run config
+        '''
+        return dataclasses.replace(self, **kwargs)
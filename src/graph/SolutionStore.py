@@ -0,0 +1,384 @@
+import dataclasses
+import json
+import logging
+import os
+import pickle
+import struct
+import zipfile
+from typing import List, Dict, Tuple, Iterable
+
+import networkx as nx
+import numpy as np
+from intervals import IntInterval
+
+from src.graph.Flow import Flow
+from src.graph.Graph import Graph
+from src.graph.RunConfig import RunConfig
+from src.graph.Solver import Solution
+from src.graph.TimeSlotAllocator import TimeSlotAllocator, AllocationBlock, Reservation
+from src.type import TOPO_STRATEGY, ROUTING_STRATEGY, SCHEDULING_STRATEGY, ALLOCATING_STRATEGY, \
+    RELIABILITY_STRATEGY, TIME_GRANULARITY
+
+logger = logging.getLogger(__name__)
+
+FORMAT_NAME: str = 'tsn-solution'
+FORMAT_VERSION: int = 1
+ZIP_MAGIC: bytes = b'PK\x03\x04'
+ZIP_LOCAL_HEADER: struct.Struct = struct.Struct('<4s5H3L2H')  # local file header of zip member
+STRATEGIES: Dict[str, type] = {
+    'topo_strategy': TOPO_STRATEGY,
+    'routing_strategy': ROUTING_STRATEGY,
+    'scheduling_strategy': SCHEDULING_STRATEGY,
+    'allocating_strategy': ALLOCATING_STRATEGY,
+    'reliability_strategy': RELIABILITY_STRATEGY,
+}
+
+
+def column(values: Iterable) -> np.ndarray:
+    # integer column unless some value is not integer, e.g. offsets with float delays
+    _values: list = list(values)
+    if all(isinstance(_v, (int, np.integer)) for _v in _values):
+        return np.array(_values, dtype=np.int64)
+    return np.array(_values, dtype=np.float64)
+
+
+def offsets(lengths: Iterable[int]) -> np.ndarray:
+    # offsets of variable-length rows in flat column, row i is [offsets[i], offsets[i + 1])
+    return np.concatenate(([0], np.cumsum(np.array(list(lengths), dtype=np.int64)))).astype(np.int64)
+
+
+def split(flat: np.ndarray, _offsets: np.ndarray) -> List[list]:
+    _values: list = flat.tolist()
+    _offsets: list = _offsets.tolist()
+    return [_values[_offsets[_i]:_offsets[_i + 1]] for _i in range(len(_offsets) - 1)]
+
+
+class SolutionReader:
+    '''
+    reader of solution store, arrays are memory-mapped and only arrays which are accessed are read,
+    e.g. flows only or schedule of one edge
+    '''
+    filename: str
+    mmap: bool
+    meta: Dict
+    index: Dict[str, Tuple[int, np.dtype, tuple, bool]]  # array name -> (offset, dtype, shape, fortran order)
+
+    def __init__(self, filename: str, mmap: bool = True):
+        self.filename = filename
+        self.mmap = mmap
+        self.index = self.build_index(filename)
+        self.meta = json.loads(bytes(self.array('meta')).decode('utf-8'))
+        if self.meta.get('format') != FORMAT_NAME:
+            raise RuntimeError('{} is not a solution store'.format(filename))
+        if self.meta.get('version', 0) > FORMAT_VERSION:
+            raise RuntimeError('version {} of solution store {} is not supported, latest version is {}'.format(
+                self.meta.get('version'), filename, FORMAT_VERSION))
+
+    @staticmethod
+    def build_index(filename: str) -> Dict[str, Tuple[int, np.dtype, tuple, bool]]:
+        # arrays are stored without compression, so each of them is a contiguous range of file
+        _index: Dict[str, Tuple[int, np.dtype, tuple, bool]] = {}
+        with zipfile.ZipFile(filename) as _zip, open(filename, 'rb') as f:
+            for _info in _zip.infolist():
+                if _info.compress_type != zipfile.ZIP_STORED:
+                    raise RuntimeError('array {} of {} is compressed'.format(_info.filename, filename))
+                f.seek(_info.header_offset)
+                _header: tuple = ZIP_LOCAL_HEADER.unpack(f.read(ZIP_LOCAL_HEADER.size))
+                f.seek(_info.header_offset + ZIP_LOCAL_HEADER.size + _header[-2] + _header[-1])
+                _version: Tuple[int, int] = np.lib.format.read_magic(f)
+                if _version == (1, 0):
+                    _shape, _fortran, _dtype = np.lib.format.read_array_header_1_0(f)
+                else:
+                    _shape, _fortran, _dtype = np.lib.format.read_array_header_2_0(f)
+                _index[_info.filename[:-len('.npy')]] = (f.tell(), _dtype, _shape, _fortran)
+        return _index
+
+    def keys(self) -> List[str]:
+        return list(self.index.keys())
+
+    def array(self, name: str) -> np.ndarray:
+        if name not in self.index:
+            raise RuntimeError('miss array "{}" in {}'.format(name, self.filename))
+        _offset, _dtype, _shape, _fortran = self.index[name]
+        _order: str = 'F' if _fortran else 'C'
+        if int(np.prod(_shape)) == 0:
+            return np.empty(_shape, dtype=_dtype, order=_order)
+        if self.mmap:
+            return np.memmap(self.filename, dtype=_dtype, mode='r', offset=_offset, shape=_shape, order=_order)
+        with open(self.filename, 'rb') as f:
+            f.seek(_offset)
+            return np.fromfile(f, dtype=_dtype, count=int(np.prod(_shape))).reshape(_shape, order=_order)
+
+    def read_flows(self) -> List[Flow]:
+        '''
+        read flows with their routes, without graph and schedule
+        :return: flows
+        '''
+        _ids: list = self.array('flow_ids').tolist()
+        _sizes: list = self.array('flow_sizes').tolist()
+        _periods: list = self.array('flow_periods').tolist()
+        _sources: list = self.array('flow_sources').tolist()
+        _reliabilities: list = self.array('flow_reliabilities').tolist()
+        _deadlines: list = self.array('flow_deadlines').tolist()
+        _destinations: List[list] = split(self.array('flow_destinations'), self.array('flow_destination_offsets'))
+        _walked_edges: List[list] = split(self.array('flow_walked_edges'), self.array('flow_walked_edge_offsets'))
+        _route_edges: List[list] = split(self.array('route_edges'), self.array('route_edge_offsets'))
+        _groups: List[list] = split(np.arange(len(_route_edges)), self.array('group_route_offsets'))
+        _flow_groups: List[list] = split(np.arange(len(_groups)), self.array('flow_group_offsets'))
+        _reliability_keys: List[list] = split(self.array('routes_reliability_keys'),
+                                              self.array('routes_reliability_offsets'))
+        _reliability_values: List[list] = split(self.array('routes_reliability_values'),
+                                                self.array('routes_reliability_offsets'))
+        flows: List[Flow] = []
+        for _i, _fid in enumerate(_ids):
+            _flow: Flow = Flow(_fid, _sizes[_i], _periods[_i], _sources[_i], _destinations[_i], _reliabilities[_i],
+                               _deadlines[_i])
+            _flow.routes = [[_route_edges[_r] for _r in _groups[_g]] for _g in _flow_groups[_i]]
+            _flow.routes_reliability = dict(zip(_reliability_keys[_i], _reliability_values[_i]))
+            _flow.walked_edges = set(_walked_edges[_i])
+            flows.append(_flow)
+        return flows
+
+    def read_edge_schedule(self, edge_id: int) -> Dict[str, np.ndarray]:
+        '''
+        read allocation blocks of one edge, only rows of the edge are touched
+        :param edge_id:
+        :return: columns of allocation blocks, e.g. flow_id, lower, upper
+        '''
+        _positions: np.ndarray = np.flatnonzero(self.array('edge_ids') == edge_id)
+        if len(_positions) == 0:
+            raise RuntimeError('edge [{}] does not exist in {}'.format(edge_id, self.filename))
+        _offsets: np.ndarray = self.array('edge_block_offsets')
+        _lower, _upper = int(_offsets[_positions[0]]), int(_offsets[_positions[0] + 1])
+        return {_name[len('block_'):]: self.array(_name)[_lower:_upper]
+                for _name in self.index if _name.startswith('block_')}
+
+    def read_solution(self) -> Solution:
+        '''
+        rebuild solution with graph, flows and schedule
+        :return: solution
+        '''
+        # fields unknown to current run config are dropped, missing fields fall back to global config
+        _fields: set = set(_f.name for _f in dataclasses.fields(RunConfig))
+        _run_config: Dict = {_k: _v for _k, _v in self.meta['run_config'].items() if _k in _fields}
+        _run_config['time_granularity'] = TIME_GRANULARITY[_run_config['time_granularity']]
+        run_config: RunConfig = RunConfig.from_config(**_run_config)
+        _nodes: list = self.array('node_ids').tolist()
+        _edge_ids: list = self.array('edge_ids').tolist()
+        _edges: List[tuple] = list(zip(self.array('edge_in_nodes').tolist(), self.array('edge_out_nodes').tolist()))
+        nx_graph: nx.Graph = nx.DiGraph() if self.meta['directed'] else nx.Graph()
+        nx_graph.add_nodes_from(_nodes)
+        nx_graph.add_edges_from(_edges)
+        graph: Graph = Graph(nx_graph=nx_graph, nodes=_nodes, edges=_edges, hp=self.meta['hyper_period'],
+                             run_config=run_config)
+        self.read_edges(graph, _edge_ids)
+        flows: List[Flow] = self.read_flows()
+        graph.add_flows(flows)
+        graph.failure_queue = set(self.array('graph_failure_queue').tolist())
+        graph.flow_router.failure_queue = set(self.array('router_failure_queue').tolist())
+        graph.flow_scheduler.failure_queue = set(self.array('scheduler_failure_queue').tolist())
+        _strategies: Dict = {_name: _enum[self.meta[_name]] if self.meta[_name] is not None else None
+                             for _name, _enum in STRATEGIES.items()}
+        solution: Solution = Solution(graph, flows, **_strategies)
+        solution.solution_name = self.meta['solution_name']
+        solution.runtime = self.meta['runtime']
+        solution.profile = self.meta['profile']
+        solution.failure_flows = self.array('failure_flows').tolist()
+        return solution
+
+    def read_edges(self, graph: Graph, edge_ids: List[int]):
+        _columns: Dict[str, list] = {_name: self.array(_name).tolist() for _name in self.index
+                                     if _name.startswith('edge_') or _name.startswith('allocator_')
+                                     or _name.startswith('block_') or _name.startswith('reservation_')}
+        for _i, _eid in enumerate(edge_ids):
+            _edge = graph.edge_mapper[_eid]
+            _edge.set_bandwidth(_columns['edge_bandwidths'][_i])
+            _edge.set_error_rate(_columns['edge_error_rates'][_i])
+            _edge.set_propagation_delay(_columns['edge_propagation_delays'][_i])
+            _edge.set_process_delay(_columns['edge_process_delays'][_i])
+            _edge.failed = bool(_columns['edge_failed'][_i])
+            # bandwidth load checked by routing when flows are admitted later
+            _edge.weight = _edge.weight_c = _columns['edge_weights'][_i]
+            _allocator: TimeSlotAllocator = _edge.time_slot_allocator
+            _allocator.propagation_delay = _columns['allocator_propagation_delays'][_i]
+            _allocator.process_delay = _columns['allocator_process_delays'][_i]
+            _allocator.flow_num = _columns['allocator_flow_nums'][_i]
+            _allocator.flow_segment_num = _columns['allocator_flow_segment_nums'][_i]
+            _positioned: List[Tuple[int, AllocationBlock]] = []
+            for _j in range(_columns['edge_block_offsets'][_i], _columns['edge_block_offsets'][_i + 1]):
+                _block: AllocationBlock = AllocationBlock(
+                    _columns['block_flow_id'][_j],
+                    IntInterval.closed(_columns['block_lower'][_j], _columns['block_upper'][_j]),
+                    at_offset=_columns['block_arrival_time_offset'][_j],
+                    st_offset=_columns['block_send_time_offset'][_j], phase=_columns['block_phase'][_j])
+                if _columns['block_mapped'][_j]:
+                    _allocator.flow_times_mapper.setdefault(_block.flow_id, []).append(_block)
+                if _columns['block_position'][_j] != -1:
+                    _positioned.append((_columns['block_position'][_j], _block))
+            _allocator.allocation_blocks = [_block for _, _block in sorted(_positioned, key=lambda x: x[0])]
+            if _columns['edge_reserved'][_i]:
+                for _j in range(_columns['edge_reservation_offsets'][_i],
+                                _columns['edge_reservation_offsets'][_i + 1]):
+                    _allocator.reservations.setdefault(_columns['reservation_flow_id'][_j], []).append(Reservation(
+                        _columns['reservation_flow_id'][_j], _columns['reservation_offset'][_j],
+                        _columns['reservation_length'][_j], _columns['reservation_period'][_j],
+                        _columns['reservation_send_time_offset'][_j], _columns['reservation_phase_num'][_j]))
+                _allocator.invalidate_reservations()
+            else:
+                # reservations are unknown, phases are always expanded
+                _allocator.reservations = None
+                _allocator.phase_folding = False
+            _allocator.occupancy = None
+            _allocator.update_allocation_state()
+
+
+class SolutionStore:
+    '''
+    versioned columnar on-disk format of solutions, i.e. uncompressed npz of flat arrays:
+    routes are flat edge ids with offsets and allocation blocks are int columns grouped by edge,
+    derived state such as scene copies, merged blocks and colors is not stored
+    '''
+
+    @staticmethod
+    def is_store(filename: str) -> bool:
+        with open(filename, 'rb') as f:
+            return f.read(len(ZIP_MAGIC)) == ZIP_MAGIC
+
+    @staticmethod
+    def open(filename: str, mmap: bool = True) -> SolutionReader:
+        return SolutionReader(filename, mmap=mmap)
+
+    @staticmethod
+    def load(filename: str, mmap: bool = True) -> Solution:
+        '''
+        load solution, pickled solutions saved before solution store existed are still supported
+        :param filename:
+        :param mmap: memory-map arrays
+        :return: solution
+        '''
+        if not SolutionStore.is_store(filename):
+            logger.info('load pickled solution %s', filename)
+            with open(filename, 'rb') as f:
+                return pickle.load(f)
+        return SolutionReader(filename, mmap=mmap).read_solution()
+
+    @staticmethod
+    def save(solution: Solution, filename: str):
+        '''
+        save solution into solution store
+        :param solution:
+        :param filename: file name, no suffix is appended
+        :return:
+        '''
+        _arrays: Dict[str, np.ndarray] = SolutionStore.to_arrays(solution)
+        _tmp: str = filename + '.tmp'
+        with open(_tmp, 'wb') as f:
+            np.savez(f, **_arrays)
+        os.replace(_tmp, filename)
+
+    @staticmethod
+    def to_arrays(solution: Solution) -> Dict[str, np.ndarray]:
+        graph: Graph = solution.graph
+        # solutions saved before run config existed fall back to global config
+        run_config: RunConfig = getattr(graph, 'run_config', None) or RunConfig.from_config()
+        _run_config: Dict = dict(run_config.__dict__)
+        _run_config['time_granularity'] = run_config.time_granularity.name
+        _meta: Dict = {
+            'format': FORMAT_NAME,
+            'version': FORMAT_VERSION,
+            'solution_name': solution.solution_name,
+            'runtime': solution.runtime,
+            'profile': getattr(solution, 'profile', {}),
+            'directed': graph.nx_graph is None or graph.nx_graph.is_directed(),
+            'hyper_period': graph.hyper_period,
+            'run_config': _run_config,
+        }
+        _meta.update({_name: getattr(solution, _name).name if getattr(solution, _name) is not None else None
+                      for _name in STRATEGIES})
+        _arrays: Dict[str, np.ndarray] = {
+            'meta': np.frombuffer(json.dumps(_meta, default=str).encode('utf-8'), dtype=np.uint8),
+            'node_ids': column(graph.nodes),
+            'failure_flows': column(solution.failure_flows),
+            'graph_failure_queue': column(sorted(graph.failure_queue)),
+            'router_failure_queue': column(sorted(graph.flow_router.failure_queue)),
+            'scheduler_failure_queue': column(sorted(graph.flow_scheduler.failure_queue)),
+        }
+        _arrays.update(SolutionStore.flows_to_arrays(solution.flows))
+        _arrays.update(SolutionStore.edges_to_arrays(graph))
+        return _arrays
+
+    @staticmethod
+    def flows_to_arrays(flows: List[Flow]) -> Dict[str, np.ndarray]:
+        _groups: List[List[List[int]]] = [_group for _f in flows for _group in _f.routes]
+        _routes: List[List[int]] = [_route for _group in _groups for _route in _group]
+        return {
+            'flow_ids': column(_f.flow_id for _f in flows),
+            'flow_sizes': column(_f.size for _f in flows),
+            'flow_periods': column(_f.period for _f in flows),
+            'flow_sources': column(_f.source for _f in flows),
+            'flow_reliabilities': np.array([_f.reliability for _f in flows], dtype=np.float64),
+            'flow_deadlines': column(_f.deadline for _f in flows),
+            'flow_destinations': column(_d for _f in flows for _d in _f.destinations),
+            'flow_destination_offsets': offsets(len(_f.destinations) for _f in flows),
+            'flow_walked_edges': column(_e for _f in flows for _e in sorted(_f.walked_edges)),
+            'flow_walked_edge_offsets': offsets(len(_f.walked_edges) for _f in flows),
+            'flow_group_offsets': offsets(len(_f.routes) for _f in flows),
+            'group_route_offsets': offsets(len(_group) for _group in _groups),
+            'route_edge_offsets': offsets(len(_route) for _route in _routes),
+            'route_edges': column(_eid for _route in _routes for _eid in _route),
+            'routes_reliability_offsets': offsets(len(_f.routes_reliability) for _f in flows),
+            'routes_reliability_keys': column(_k for _f in flows for _k in _f.routes_reliability.keys()),
+            'routes_reliability_values': np.array(
+                [_v for _f in flows for _v in _f.routes_reliability.values()], dtype=np.float64),
+        }
+
+    @staticmethod
+    def edges_to_arrays(graph: Graph) -> Dict[str, np.ndarray]:
+        _edges: list = list(graph.edge_mapper.values())
+        _allocators: List[TimeSlotAllocator] = [_e.time_slot_allocator for _e in _edges]
+        _blocks: List[List[Tuple[AllocationBlock, bool, int]]] = []  # (block, mapped, position) of each edge
+        _reservations: List[List[Reservation]] = []
+        for _allocator in _allocators:
+            _positions: Dict[int, int] = {id(_b): _i for _i, _b in enumerate(_allocator.allocation_blocks)}
+            _mapped: List[AllocationBlock] = [_b for _B in _allocator.flow_times_mapper.values() for _b in _B]
+            _mapped_ids = set(id(_b) for _b in _mapped)
+            _blocks.append([(_b, True, _positions.get(id(_b), -1)) for _b in _mapped] +
+                           [(_b, False, _positions[id(_b)]) for _b in _allocator.allocation_blocks
+                            if id(_b) not in _mapped_ids])
+            _reserved: Dict = getattr(_allocator, 'reservations', None) or {}
+            _reservations.append([_r for _R in _reserved.values() for _r in _R])
+        _rows: List[Tuple[AllocationBlock, bool, int]] = [_row for _edge_blocks in _blocks for _row in _edge_blocks]
+        _R: List[Reservation] = [_r for _edge_reservations in _reservations for _r in _edge_reservations]
+        return {
+            'edge_ids': column(_e.edge_id for _e in _edges),
+            'edge_in_nodes': column(_e.in_node.node_id for _e in _edges),
+            'edge_out_nodes': column(_e.out_node.node_id for _e in _edges),
+            'edge_bandwidths': np.array([_e.bandwidth for _e in _edges], dtype=np.float64),
+            'edge_error_rates': np.array([_e.error_rate for _e in _edges], dtype=np.float64),
+            'edge_weights': np.array([_e.weight for _e in _edges], dtype=np.float64),
+            'edge_propagation_delays': column(_e.propagation_delay for _e in _edges),
+            'edge_process_delays': column(_e.process_delay for _e in _edges),
+            'edge_failed': np.array([getattr(_e, 'failed', False) for _e in _edges], dtype=bool),
+            'edge_reserved': np.array([getattr(_a, 'reservations', None) is not None for _a in _allocators],
+                                      dtype=bool),
+            'edge_block_offsets': offsets(len(_edge_blocks) for _edge_blocks in _blocks),
+            'edge_reservation_offsets': offsets(len(_edge_reservations) for _edge_reservations in _reservations),
+            'allocator_propagation_delays': column(_a.propagation_delay for _a in _allocators),
+            'allocator_process_delays': column(_a.process_delay for _a in _allocators),
+            'allocator_flow_nums': column(_a.flow_num for _a in _allocators),
+            'allocator_flow_segment_nums': column(_a.flow_segment_num for _a in _allocators),
+            'block_flow_id': column(_b.flow_id for _b, _, _ in _rows),
+            'block_phase': column(_b.phase for _b, _, _ in _rows),
+            'block_lower': column(_b.interval.lower for _b, _, _ in _rows),
+            'block_upper': column(_b.interval.upper for _b, _, _ in _rows),
+            'block_arrival_time_offset': column(_b.arrival_time_offset for _b, _, _ in _rows),
+            'block_send_time_offset': column(_b.send_time_offset for _b, _, _ in _rows),
+            'block_mapped': np.array([_m for _, _m, _ in _rows], dtype=bool),
+            'block_position': column(_p for _, _, _p in _rows),
+            'reservation_flow_id': column(_r.flow_id for _r in _R),
+            'reservation_offset': column(_r.offset for _r in _R),
+            'reservation_length': column(_r.length for _r in _R),
+            'reservation_period': column(_r.period for _r in _R),
+            'reservation_send_time_offset': column(_r.send_time_offset for _r in _R),
+            'reservation_phase_num': column(_r.phase_num for _r in _R),
+        }
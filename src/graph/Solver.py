@@ -4,7 +4,7 @@ import os
 import pickle
 import random
 import time
-from typing import List, Tuple, Set, Dict
+from typing import List, Tuple, Set, Dict, Iterable
 
 from math import floor, ceil
 
@@ -12,7 +12,10 @@ import networkx as nx
 
 from src.graph.Edge import Edge
 from src.graph.Flow import Flow
+from src.graph.FlowStream import batched
 from src.graph.Graph import Graph
+from src.graph.HyperPeriodPlanner import HyperPeriodPlanner, HyperPeriodPlan
+from src.graph.RunConfig import RunConfig
 from src import config
 from src.graph.TimeSlotAllocator import TimeSlotAllocator, AllocationBlock
 from src.graph.allocating_strategy.AEAPAllocatingStrategy import AEAPAllocatingStrategy
@@ -29,6 +32,7 @@ from src.graph.scheduling_strategy.SchedulingStrategyFactory import SchedulingSt
 from src.graph.topo_strategy.TopoStrategy import TopoStrategy
 from src.type import FlowId, TOPO_STRATEGY, ROUTING_STRATEGY, SCHEDULING_STRATEGY, ALLOCATING_STRATEGY, \
     RELIABILITY_STRATEGY, NodeId, EdgeId
+from src.utils.Profiler import Profiler, NULL_PROFILER
 from src.utils.Singleton import SingletonDecorator
 
 logger = logging.getLogger(__name__)
@@ -45,6 +49,7 @@ class Solution:
     scheduling_strategy: SCHEDULING_STRATEGY
     allocating_strategy: ALLOCATING_STRATEGY
     reliability_strategy: RELIABILITY_STRATEGY
+    profile: Dict  # timing breakdown and counters of profiler, empty if profiling is disabled
 
     def __init__(self, graph: Graph = None, flows: List[Flow] = None,
                  topo_strategy: TOPO_STRATEGY = None,
@@ -63,6 +68,7 @@ class Solution:
         self.reliability_strategy = reliability_strategy
         self.solution_name = self.generate_solution_name()
         self.runtime = 0.0
+        self.profile = {}
 
     def generate_solution_name(self, prefix: str = '', postfix: str = '', name: str = None) -> str:
         solution_name: str = str(self.topo_strategy) + \
@@ -85,9 +91,33 @@ class Solution:
         return self.solution_name
 
 
+class RecoveryReport:
+    failed_edges: List[EdgeId]
+    affected_flows: List[FlowId]  # flows walking through failed edges
+    recovered_flows: List[FlowId]  # flows rerouted and rescheduled successfully
+    unrecovered_flows: List[FlowId]  # flows without feasible routes or schedule
+    skipped_flows: List[FlowId]  # flows not attempted because time budget is exhausted
+    delay_changes: Dict[FlowId, int]  # change of averaged end-to-end delay of recovered flows, [unit: ns]
+    runtime: float
+
+    def __init__(self, failed_edges: List[EdgeId] = None, affected_flows: List[FlowId] = None):
+        self.failed_edges = [] if failed_edges is None else failed_edges
+        self.affected_flows = [] if affected_flows is None else affected_flows
+        self.recovered_flows = []
+        self.unrecovered_flows = []
+        self.skipped_flows = []
+        self.delay_changes = {}
+        self.runtime = 0.0
+
+
 class Solver:
     final_solution: Solution
     runtime: float
+    run_config: RunConfig
+    profiler: Profiler
+    strategies_initialized: bool
+    flow_weights: Dict[FlowId, Dict[EdgeId, float]]  # weights added to edges by admitted flows
+    hyper_period_plan: HyperPeriodPlan
 
     def __init__(self, nx_graph: nx.Graph = None,
                  flows: List[Flow] = None,
@@ -96,25 +126,76 @@ class Solver:
                  scheduling_strategy: SCHEDULING_STRATEGY = None,
                  allocating_strategy: ALLOCATING_STRATEGY = None,
                  reliability_strategy: RELIABILITY_STRATEGY = None,
-                 solution_name: str = 'BaseSolution'):
+                 solution_name: str = 'BaseSolution',
+                 run_config: RunConfig = None,
+                 profiler: Profiler = None):
+        # run config is fixed for the whole run, global config only serves as default
+        self.run_config = run_config if run_config is not None else RunConfig.from_config()
+        self.profiler = profiler if profiler is not None else NULL_PROFILER
+        self.hyper_period_plan = self.plan_hyper_period(nx_graph, flows)
         graph: Graph = Graph(nx_graph=nx_graph,
                              nodes=list(nx_graph.nodes),
                              edges=list(nx_graph.edges),
-                             hp=config.GRAPH_CONFIG['hyper-period'])
+                             hp=self.run_config.hyper_period,
+                             run_config=self.run_config)
         # TODO set bandwidth to edges
-        graph.set_all_edges_bandwidth(config.GRAPH_CONFIG['all-bandwidth'])  # set bandwidth
+        graph.set_all_edges_bandwidth(self.run_config.all_bandwidth)  # set bandwidth
         # TODO set error rate to edges
-        graph.set_all_error_rate(config.GRAPH_CONFIG['all-per'])  # set error rate
+        graph.set_all_error_rate(self.run_config.all_per)  # set error rate
         # TODO set propagation delay to edges
-        graph.set_all_edges_process_delay(config.GRAPH_CONFIG['all-propagation-delay'])
+        graph.set_all_edges_process_delay(self.run_config.all_propagation_delay)
         # TODO set process delay to edges
-        graph.set_all_edges_process_delay(config.GRAPH_CONFIG['all-process-delay'])
+        graph.set_all_edges_process_delay(self.run_config.all_process_delay)
         graph.add_flows(flows)
         self.final_solution = Solution(graph, flows,
                                        topo_strategy=topo_strategy, routing_strategy=routing_strategy,
                                        scheduling_strategy=scheduling_strategy, allocating_strategy=allocating_strategy,
                                        reliability_strategy=reliability_strategy, solution_name=solution_name)
         self.runtime = 0.0
+        self.strategies_initialized = False
+        self.flow_weights = {}
+
+    def plan_hyper_period(self, nx_graph: nx.Graph, flows: List[Flow]) -> HyperPeriodPlan:
+        '''
+        plan hyper period of flows and report estimated memory and time before allocators are sized,
+        run config is replaced if planned hyper period is used
+        :param nx_graph:
+        :param flows:
+        :return: plan
+        '''
+        _flows: List[Flow] = flows if flows is not None else []
+        _planner: HyperPeriodPlanner = HyperPeriodPlanner.from_run_config(self.run_config)
+        plan: HyperPeriodPlan = _planner.plan(
+            [_f.period for _f in _flows], harmonize=self.run_config.harmonize_periods,
+            hyper_period=None if self.run_config.auto_hyper_period else self.run_config.hyper_period,
+            edge_num=nx_graph.number_of_edges(),
+            route_edge_num=self.run_config.max_redundancy_degree * self.run_config.max_hops)
+        if plan.harmonized:
+            HyperPeriodPlanner.apply(plan, _flows)
+        if self.run_config.auto_hyper_period and plan.hyper_period != 0:
+            self.run_config = self.run_config.replace(hyper_period=plan.hyper_period)
+        plan.to_string()
+        return plan
+
+    @classmethod
+    def from_solution(cls, solution: Solution, profiler: Profiler = None) -> 'Solver':
+        '''
+        wrap an existing (e.g. unpickled) solution into a solver, so that flows can be admitted incrementally
+        :param solution: solution with routed and scheduled flows
+        :param profiler: profiler of solver
+        :return: solver
+        '''
+        solver: Solver = cls.__new__(cls)
+        # solutions saved before run config existed fall back to global config
+        solver.run_config = getattr(solution.graph, 'run_config', None) or RunConfig.from_config()
+        solution.graph.run_config = solver.run_config
+        solver.profiler = profiler if profiler is not None else NULL_PROFILER
+        solver.final_solution = solution
+        solver.runtime = solution.runtime
+        solver.strategies_initialized = False
+        solver.flow_weights = {}
+        solver.hyper_period_plan = None
+        return solver
 
     @staticmethod
     def objective_function(s: Solution) -> float:
@@ -139,11 +220,12 @@ class Solver:
         self.final_solution.flows = flows
         self.final_solution.graph.flows = flows
 
-    def generate_init_solution(self) -> Solution:
+    def init_strategies(self):
+        '''
+        create strategies of final solution and attach them to flow router and flow scheduler of its graph
+        :return:
+        '''
         _g: Graph = self.final_solution.graph
-        _F_r: List[int] = [_flow.flow_id for _flow in self.final_solution.flows]
-        logger.info('route ' + str(_F_r) + '...')
-        # initialize strategies
         _routing_strategy: RoutingStrategy = \
             RoutingStrategyFactory.get_instance(self.final_solution.routing_strategy, _g)
         _scheduling_strategy: SchedulingStrategy = \
@@ -152,30 +234,219 @@ class Solver:
             AllocatingStrategyFactory.get_instance(self.final_solution.allocating_strategy)
         _reliability_strategy: ReliabilityStrategy = \
             ReliabilityStrategyFactory.get_instance(self.final_solution.reliability_strategy, _g)
-        # set routing strategy and route flows
+        _routing_strategy.profiler = self.profiler
+        _scheduling_strategy.profiler = self.profiler
+        _reliability_strategy.profiler = self.profiler
         _g.flow_router.routing_strategy = _routing_strategy
         _g.flow_router.reliability_strategy = _reliability_strategy
-        _g.flow_router.overlapped = config.GRAPH_CONFIG['overlapped-routing']
+        _g.flow_router.overlapped = self.run_config.overlapped_routing
+        _g.flow_scheduler.scheduling_strategy = _scheduling_strategy
+        _g.flow_scheduler.allocating_strategy = _allocating_strategy
+        self.strategies_initialized = True
+
+    def generate_init_solution(self) -> Solution:
+        _g: Graph = self.final_solution.graph
+        _F_r: List[int] = [_flow.flow_id for _flow in self.final_solution.flows]
+        logger.info('route %s...', _F_r)
+        # initialize strategies
+        self.init_strategies()
+        # route flows
         start_time: time.process_time = time.perf_counter()  # start time
-        _g.flow_router.route(_F_r)  # route
+        with self.profiler.span('routing'):
+            _g.flow_router.route(_F_r)  # route
         _F_s = [_fid for _fid in _F_r if
                 _fid not in _g.flow_router.failure_queue]  # select successful flows after routing
-        logger.info('schedule ' + str(_F_s) + '...')
-        # set scheduling and allocating strategy and schedule flows
-        _g.flow_scheduler.scheduling_strategy = _scheduling_strategy
-        _g.flow_scheduler.allocating_strategy = _allocating_strategy
-        _g.flow_scheduler.schedule(_F_s)  # schedule
+        logger.info('schedule %s...', _F_s)
+        # schedule flows
+        _try_allocate_num: int = self.count_try_allocate(_g)
+        with self.profiler.span('scheduling'):
+            _g.flow_scheduler.schedule(_F_s)  # schedule
         end_time: time.process_time = time.perf_counter()  # end time
+        self.profiler.count('allocator.try_allocate', self.count_try_allocate(_g) - _try_allocate_num)
         self.runtime = end_time - start_time
         self.final_solution.runtime = self.runtime
         _g.combine_failure_queue()
         self.final_solution.failure_flows = list(_g.failure_queue)
+        self.final_solution.profile = self.profiler.to_dict() if self.profiler.enabled else {}
         return self.final_solution
 
+    def count_try_allocate(self, graph: Graph) -> int:
+        if not self.profiler.enabled:
+            return 0
+        return sum(_e.time_slot_allocator.try_allocate_num for _e in graph.edge_mapper.values())
+
+    def admit_flow(self, flow: Flow) -> bool:
+        '''
+        route and schedule a new flow against existing reservations, other flows are never rerouted or rescheduled,
+        a rejected flow leaves no time slots, edge weights or failure records behind
+        :param flow: new flow
+        :return: True if flow is admitted
+        '''
+        if flow.flow_id in self.final_solution.graph.flow_mapper:
+            raise RuntimeError('flow [{}] already exists'.format(flow.flow_id))
+        self.add_flow(flow)
+        with self.profiler.span('admission', key=flow.flow_id):
+            _admitted: bool = self.place_flow(flow)
+        if not _admitted:
+            self.remove_flow(flow)
+            logger.info('flow [%s] is rejected', flow.flow_id)
+            return False
+        logger.info('flow [%s] is admitted', flow.flow_id)
+        return True
+
+    def admit_flows(self, flows: List[Flow]) -> List[FlowId]:
+        '''
+        admit a batch of new flows one by one, rejected flows do not affect later flows of the batch
+        :param flows: new flows
+        :return: id list of admitted flows
+        '''
+        return [_flow.flow_id for _flow in flows if self.admit_flow(_flow)]
+
+    def admit_flow_stream(self, flows: Iterable[Flow], batch_size: int = 1000) -> List[FlowId]:
+        '''
+        admit flows of a stream, e.g. a recorded flow trace read by FlowReader, batch by batch,
+        so the stream is never loaded whole
+        :param flows: iterable of new flows
+        :param batch_size: number of flows taken from stream at once
+        :return: id list of admitted flows
+        '''
+        _admitted: List[FlowId] = []
+        for _batch in batched(flows, batch_size):
+            _batch_admitted: List[FlowId] = self.admit_flows(_batch)
+            logger.info('%s of %s flows of batch are admitted', len(_batch_admitted), len(_batch))
+            _admitted += _batch_admitted
+        return _admitted
+
+    def withdraw_flow(self, flow_id: FlowId) -> bool:
+        '''
+        withdraw an admitted flow, its time slots and edge weights are released
+        :param flow_id: flow id
+        :return: False if flow does not exist
+        '''
+        _flow: Flow = self.final_solution.graph.flow_mapper.get(flow_id)
+        if _flow is None:
+            return False
+        self.release_reservations(_flow)
+        self.remove_flow(_flow)
+        logger.info('flow [%s] is withdrawn', flow_id)
+        return True
+
+    def place_flow(self, flow: Flow) -> bool:
+        '''
+        route and schedule one flow of graph against existing reservations,
+        reservations of flow are released again if it fails
+        :param flow: flow without routes
+        :return: True if flow is routed and scheduled
+        '''
+        if not self.strategies_initialized:
+            self.init_strategies()
+        _g: Graph = self.final_solution.graph
+        _weights: Dict[EdgeId, float] = {_eid: _e.weight for _eid, _e in _g.edge_mapper.items()}
+        _g.flow_router.route([flow.flow_id])
+        _placed: bool = flow.flow_id not in _g.flow_router.failure_queue
+        if _placed:
+            _g.flow_scheduler.schedule([flow.flow_id])
+            _placed = flow.flow_id not in _g.flow_scheduler.failure_queue
+        if not _placed:
+            for _eid, _e in _g.edge_mapper.items():
+                _e.time_slot_allocator.release_flow(flow.flow_id)
+                _e.weight = _weights[_eid]
+            self.reset_flow(flow)
+            return False
+        self.flow_weights[flow.flow_id] = \
+            {_eid: _e.weight - _weights[_eid] for _eid, _e in _g.edge_mapper.items() if _e.weight != _weights[_eid]}
+        return True
+
+    def release_reservations(self, flow: Flow):
+        '''
+        release time slots and edge weights of a routed flow, flow stays in solution without routes
+        :param flow: flow to release
+        :return:
+        '''
+        _g: Graph = self.final_solution.graph
+        if flow.flow_id in self.flow_weights:
+            for _eid, _w in self.flow_weights.pop(flow.flow_id).items():
+                _g.edge_mapper[_eid].weight -= _w
+        else:
+            # flow of initial solution, recover weight as perturbation does
+            for _eid in flow.walked_edges:
+                _g.edge_mapper[_eid].weight -= flow.bandwidth / _g.edge_mapper[_eid].bandwidth
+        for _eid in Graph.get_flow_edges(flow):
+            _g.edge_mapper[_eid].time_slot_allocator.release_flow(flow.flow_id)
+        self.reset_flow(flow)
+
+    @staticmethod
+    def reset_flow(flow: Flow):
+        flow.assign_routes([])
+        flow.walked_edges = set()
+        flow.negative_walked_edges = set()
+        flow.routes_reliability = dict()
+
+    def remove_flow(self, flow: Flow):
+        _g: Graph = self.final_solution.graph
+        _g.remove_flow(flow.flow_id)
+        self.final_solution.flows.remove(flow)
+        if flow.flow_id in self.final_solution.failure_flows:
+            self.final_solution.failure_flows.remove(flow.flow_id)
+
+    def recover(self, failed_edges: List[EdgeId] = None, failed_nodes: List[NodeId] = None,
+                time_budget: float = None) -> 'RecoveryReport':
+        '''
+        mark edges or nodes as failed, then release, reroute and reschedule only the flows walking through them,
+        reservations of all other flows are kept
+        :param failed_edges: id list of failed edges
+        :param failed_nodes: id list of failed nodes, all their edges fail
+        :param time_budget: flows still pending when budget is exhausted are left unrecovered, [unit: s]
+        :return: recovery report
+        '''
+        from src.graph.Analyzer import Analyzer
+        start_time: float = time.perf_counter()
+        _g: Graph = self.final_solution.graph
+        _failed_edges: Set[EdgeId] = _g.fail_edges(failed_edges if failed_edges is not None else [])
+        _failed_edges |= _g.fail_nodes(failed_nodes if failed_nodes is not None else [])
+        _edge_flows: Dict[EdgeId, Set[FlowId]] = _g.get_edge_flows()
+        _affected: Set[FlowId] = set()
+        for _eid in _failed_edges:
+            _affected |= _edge_flows.get(_eid, set())
+        _affected -= _g.failure_queue
+        report: RecoveryReport = RecoveryReport(sorted(_failed_edges), sorted(_affected))
+        _delays: Dict[FlowId, int] = {}
+        for _fid in report.affected_flows:
+            _flow: Flow = _g.flow_mapper[_fid]
+            _delays[_fid] = Analyzer.calculate_e2e_delay(_g, _flow)
+            self.release_reservations(_flow)
+        if not self.strategies_initialized:
+            self.init_strategies()
+        for _fid in _g.flow_router.routing_strategy.sort_flows_id_list(report.affected_flows):
+            if time_budget is not None and time.perf_counter() - start_time > time_budget:
+                report.skipped_flows.append(_fid)
+                _g.flow_router.failure_queue.add(_fid)
+                continue
+            _flow: Flow = _g.flow_mapper[_fid]
+            with self.profiler.span('recovery', key=_fid):
+                _recovered: bool = self.place_flow(_flow)
+            if _recovered:
+                report.recovered_flows.append(_fid)
+                report.delay_changes[_fid] = Analyzer.calculate_e2e_delay(_g, _flow) - _delays[_fid]
+            else:
+                report.unrecovered_flows.append(_fid)
+        _g.combine_failure_queue()
+        self.final_solution.failure_flows = list(_g.failure_queue)
+        report.runtime = time.perf_counter() - start_time
+        logger.info('recover %s of %s flows in %ss', len(report.recovered_flows), len(report.affected_flows),
+                    report.runtime)
+        return report
+
     def optimize(self,
-                 max_iterations: int = config.OPTIMIZATION['max_iterations'],
-                 max_no_improve: int = config.OPTIMIZATION['max_no_improve'],
-                 k: int = config.OPTIMIZATION['k']) -> Solution:
+                 max_iterations: int = None,
+                 max_no_improve: int = None,
+                 k: int = None) -> Solution:
+        if max_iterations is None:
+            max_iterations = self.run_config.max_iterations
+        if max_no_improve is None:
+            max_no_improve = self.run_config.max_no_improve
+        if k is None:
+            k = self.run_config.k
         allocation_strategies: List[AllocatingStrategy] = [
             AllocatingStrategyFactory.get_instance(ALLOCATING_STRATEGY.AEAP_ALLOCATING_STRATEGY),
             AllocatingStrategyFactory.get_instance(ALLOCATING_STRATEGY.AEAPBF_ALLOCATING_STRATEGY),
@@ -184,15 +455,20 @@ class Solver:
         start_time: time.process_time = time.perf_counter()
         _o: float = self.objective_function(self.final_solution)
         for i in range(max_iterations):
-            _s: Solution = self.perturbate(k)  # perturbation to generate a new solution
-            _s_hat: Solution = self.local_search(_s, max_no_improve, allocation_strategies)
-            logger.info('local search objective function value = ' + str(self.objective_function(_s_hat)))
+            with self.profiler.span('optimize.perturbation'):
+                _s: Solution = self.perturbate(k)  # perturbation to generate a new solution
+            with self.profiler.span('optimize.local_search'):
+                _s_hat: Solution = self.local_search(_s, max_no_improve, allocation_strategies)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info('local search objective function value = %s', self.objective_function(_s_hat))
             self.apply_acceptance_criterion(_s_hat)
         end_time: time.process_time = time.perf_counter()
         self.runtime = end_time - start_time
         self.final_solution.runtime = self.runtime
-        logger.info('initial objective function value = ' + str(_o))
-        logger.info('final objective function value = ' + str(self.objective_function(self.final_solution)))
+        self.final_solution.profile = self.profiler.to_dict() if self.profiler.enabled else {}
+        logger.info('initial objective function value = %s', _o)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info('final objective function value = %s', self.objective_function(self.final_solution))
         return self.final_solution
 
     def local_search(self, _s: Solution, max_no_improve: int,
@@ -204,7 +480,7 @@ class Solver:
         for _i in range(max_no_improve):
             _sc: Solution = copy.deepcopy(_s)
             random.shuffle(_F)  # shuffle the list
-            logger.info('reroute and reschedule flows: ' + str(_F))
+            logger.info('reroute and reschedule flows: %s', _F)
             # reset failure queue
             _sc.graph.failure_queue = set()
             _sc.graph.flow_router.failure_queue = set()
@@ -214,7 +490,9 @@ class Solver:
             _F = [_fid for _fid in _F if _fid not in _s.graph.flow_router.failure_queue]
             # rescheduling
             _sc.graph.flow_scheduler.allocating_strategy = random.choice(allocation_strategies)
+            _try_allocate_num: int = self.count_try_allocate(_sc.graph)
             _sc.graph.flow_scheduler.schedule(_F)  # scheduling
+            self.profiler.count('allocator.try_allocate', self.count_try_allocate(_sc.graph) - _try_allocate_num)
             # recombination failure queue
             _sc.graph.combine_failure_queue()
             if _o == 0:
@@ -235,14 +513,18 @@ class Solver:
         _F: List[Flow] = [_flow for _flow in _s.flows if _flow.flow_id not in _s.graph.failure_queue]
         _remove_flows: List[Flow] = random.sample(_F, floor(_s.flows.__len__() * k))
         _s.graph.failure_queue = _s.graph.failure_queue.union(set([_flow.flow_id for _flow in _remove_flows]))
-        logger.info('randomly remove flows: ' + str([_flow.flow_id for _flow in _remove_flows]))
-        logger.info('WHOLE FAILURE QUEUE:' + str(_s.graph.failure_queue))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info('randomly remove flows: %s', [_flow.flow_id for _flow in _remove_flows])
+        logger.info('WHOLE FAILURE QUEUE:%s', _s.graph.failure_queue)
         for _flow in _remove_flows:
-            for _eid in _flow.walked_edges:
+            # edges reserved by flow: walked edges, plus route edges looked up by edge -> flows index
+            _edges: Set[EdgeId] = _flow.walked_edges | _s.graph.flow_edges.get(_flow.flow_id, set())
+            for _eid in sorted(_edges):
                 _e: Edge = _s.graph.edge_mapper[_eid]
                 _allocator: TimeSlotAllocator = _e.time_slot_allocator
                 # recover weight on edge
-                _e.weight -= _flow.bandwidth / _e.bandwidth
+                if _eid in _flow.walked_edges:
+                    _e.weight -= _flow.bandwidth / _e.bandwidth
                 # recover flow time slots without merging operation mapper and time slots list without merging operation
                 if _flow.flow_id in _allocator.flow_times_mapper:
                     _flow_time_slots: List[AllocationBlock] = \
@@ -250,6 +532,11 @@ class Solver:
                     del _allocator.flow_times_mapper[_flow.flow_id]
                     for _ts in _flow_time_slots:
                         _allocator.allocation_blocks.remove(_ts)
+                    _allocator.release_reservations(_flow.flow_id)
+                    _allocator.invalidate_occupancy()
+                    # recover number of flow
+                    _allocator.flow_num -= 1
+                    _allocator.flow_segment_num -= len(_flow_time_slots)
                 # recover load, time slots used and flow time slots with merging operation
                 _time_slots_m: List[AllocationBlock] = _allocator.allocation_blocks_m.copy()  # deep copy
                 _flow_time_slots_m: List[AllocationBlock] = []
@@ -261,10 +548,8 @@ class Solver:
                 _allocator.load = _allocator.time_slot_used / _allocator.time_slot_num
                 for _ts_m in _flow_time_slots_m:
                     _allocator.allocation_blocks_m.remove(_ts_m)
-                # recover number of flow
-                _allocator.flow_num -= 1
             # recover routes of flow
-            _flow.routes = []  # empty routes of flow
+            _flow.assign_routes([])  # empty routes of flow
             # recover walked edges of flow
             _flow.walked_edges = set()
         return _s
@@ -279,15 +564,14 @@ class Solver:
 
     def save_solution(self, solution: Solution = None, filename: str = None):
         import os
-        import pickle
+        from src.graph.SolutionStore import SolutionStore
         if solution is None:
             solution: Solution = self.final_solution
         if filename is None:
             filename = os.path.join(config.solutions_res_dir, solution.solution_name)
         else:
             filename = os.path.join(config.solutions_res_dir, filename)
-        with open(filename, 'wb') as f:
-            pickle.dump(solution, f)
+        SolutionStore.save(solution, filename)
 
     def draw_gantt_chart(self, solution: Solution):
         solution.graph.draw_gantt()
@@ -1,17 +1,24 @@
+import abc
+import bisect
 import logging
 import json
 import copy
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
 from math import ceil
 from math import floor
+from math import gcd
+import numpy as np
 from intervals import IntInterval
 
 from src import config
 from src.graph.Flow import Flow
+from src.utils.logs import dump_enabled
 
 logger = logging.getLogger(__name__)
 MinFrameSize = 64 * 8  # minimal frame size = 64B, unit: Byte
+DENSE_FILL_RATIO = 0.1  # number of blocks per time slot above which dense occupancy takes less memory than sparse
+SPARSE_FILL_RATIO = DENSE_FILL_RATIO / 2  # number of blocks per time slot below which dense occupancy turns sparse
 
 
 class AllocationBlock:
@@ -29,6 +36,255 @@ class AllocationBlock:
         self.phase = phase
 
 
+class Reservation:
+    '''
+    strictly periodic reservation of a flow on edge, which stands for all its phases within hyper period
+    '''
+    flow_id: int
+    offset: int  # first time slot of phase 0
+    length: int  # number of time slots of each phase
+    period: int  # [unit: ns]
+    send_time_offset: int  # send time offset of phase 0, [unit: ns]
+    phase_num: int
+
+    def __init__(self, flow_id: int, offset: int, length: int, period: int, st_offset: int, phase_num: int):
+        self.flow_id = flow_id
+        self.offset = offset
+        self.length = length
+        self.period = period
+        self.send_time_offset = st_offset
+        self.phase_num = phase_num
+
+
+def gallop_left(a: List[int], x: int, hint: int = 0) -> int:
+    '''
+    leftmost insertion position of x in sorted list a, galloping from hint, so successive queries close to each other
+    cost O(log d) where d is the distance to hint
+    :param a: sorted list
+    :param x:
+    :param hint: position to start from
+    :return: insertion position
+    '''
+    _n: int = len(a)
+    hint = min(max(hint, 0), _n)
+    if hint < _n and a[hint] < x:
+        # gallop right
+        _lo, _step = hint + 1, 1
+        while _lo + _step - 1 < _n and a[_lo + _step - 1] < x:
+            _lo += _step
+            _step <<= 1
+        return bisect.bisect_left(a, x, _lo, min(_lo + _step - 1, _n))
+    # gallop left
+    _hi, _step = hint, 1
+    while _hi - _step >= 0 and a[_hi - _step] >= x:
+        _hi -= _step
+        _step <<= 1
+    return bisect.bisect_left(a, x, max(_hi - _step, 0), _hi)
+
+
+class Occupancy(metaclass=abc.ABCMeta):
+    '''
+    occupancy of time slots on edge, it answers whether an interval of time slots conflicts with allocated blocks
+    '''
+    slot_num: int
+    block_num: int
+    mixed: bool  # blocks of different flows overlap, which only sparse representation holds
+
+    def __init__(self, slot_num: int):
+        self.slot_num = slot_num
+        self.block_num = 0
+        self.mixed = False
+
+    @staticmethod
+    def build(blocks: List[AllocationBlock], slot_num: int) -> 'Occupancy':
+        '''
+        build occupancy from blocks, dense representation is picked if blocks fill time slots enough
+        :param blocks: allocation blocks
+        :param slot_num: number of time slots
+        :return: occupancy
+        '''
+        if slot_num != 0 and len(blocks) / slot_num >= DENSE_FILL_RATIO:
+            occupancy: Occupancy = DenseOccupancy(slot_num)
+            for _block in blocks:
+                occupancy.insert(_block)
+            if not occupancy.mixed:
+                return occupancy
+            _mixed: bool = True
+        else:
+            _mixed: bool = False
+        occupancy: Occupancy = SparseOccupancy(slot_num)
+        for _block in blocks:
+            occupancy.insert(_block)
+        occupancy.mixed = _mixed
+        return occupancy
+
+    @abc.abstractmethod
+    def insert(self, block: AllocationBlock):
+        pass
+
+    @abc.abstractmethod
+    def remove(self, block: AllocationBlock):
+        '''
+        remove block which has been inserted, its interval must not be changed since insertion
+        :param block:
+        :return:
+        '''
+        pass
+
+    @abc.abstractmethod
+    def conflict(self, lower: int, upper: int, flow_id: int = None, time_offset: int = 0,
+                 allocation_num: int = 0) -> bool:
+        '''
+        whether interval [lower, upper] overlaps any block, if flow id is given,
+        blocks of the same flow whose send time offset is close enough are allowed to overlap
+        :param lower:
+        :param upper:
+        :param flow_id:
+        :param time_offset:
+        :param allocation_num:
+        :return:
+        '''
+        pass
+
+    @abc.abstractmethod
+    def runs(self) -> Tuple[List[int], List[int]]:
+        '''
+        occupied time slots as sorted disjoint runs [starts[i], ends[i]]
+        :return: starts and ends
+        '''
+        pass
+
+    def adapt(self) -> 'Occupancy':
+        # switch to dense representation once blocks fill time slots enough
+        return self
+
+
+class SparseOccupancy(Occupancy):
+    '''
+    sorted runs of (start, end, block), memory is proportional to number of blocks instead of time slots
+    '''
+    starts: List[int]
+    ends: List[int]
+    blocks: List[AllocationBlock]
+    max_length: int  # maximum length of runs, runs starting before lower - max_length cannot overlap lower
+    hint: int  # position of last query
+
+    def __init__(self, slot_num: int):
+        super().__init__(slot_num)
+        self.starts = []
+        self.ends = []
+        self.blocks = []
+        self.max_length = 0
+        self.hint = 0
+
+    def insert(self, block: AllocationBlock):
+        _i: int = bisect.bisect_right(self.starts, block.interval.lower)
+        self.starts.insert(_i, block.interval.lower)
+        self.ends.insert(_i, block.interval.upper)
+        self.blocks.insert(_i, block)
+        self.max_length = max(self.max_length, block.interval.upper - block.interval.lower + 1)
+        self.block_num += 1
+
+    def remove(self, block: AllocationBlock):
+        # max length is kept, it is still an upper bound of lengths of runs
+        _i: int = gallop_left(self.starts, block.interval.lower, self.hint)
+        while self.blocks[_i] is not block:
+            _i += 1
+        del self.starts[_i]
+        del self.ends[_i]
+        del self.blocks[_i]
+        self.block_num -= 1
+
+    def conflict(self, lower: int, upper: int, flow_id: int = None, time_offset: int = 0,
+                 allocation_num: int = 0) -> bool:
+        _i: int = gallop_left(self.starts, lower - self.max_length + 1, self.hint)
+        self.hint = _i
+        while _i < self.block_num and self.starts[_i] <= upper:
+            if self.ends[_i] >= lower:
+                if flow_id is None:
+                    return True
+                _block: AllocationBlock = self.blocks[_i]
+                if not TimeSlotAllocator._is_same_flow(_block.flow_id, flow_id, time_offset,
+                                                       _block.send_time_offset, allocation_num):
+                    return True
+            _i += 1
+        return False
+
+    def runs(self) -> Tuple[List[int], List[int]]:
+        # merge overlapping and adjacent runs of blocks, O(number of blocks)
+        _starts: List[int] = []
+        _ends: List[int] = []
+        for _start, _end in zip(self.starts, self.ends):
+            if len(_ends) != 0 and _start <= _ends[-1] + 1:
+                _ends[-1] = max(_ends[-1], _end)
+            else:
+                _starts.append(_start)
+                _ends.append(_end)
+        return _starts, _ends
+
+    def adapt(self) -> Occupancy:
+        if not self.mixed and self.slot_num != 0 and self.block_num / self.slot_num >= DENSE_FILL_RATIO:
+            return Occupancy.build(self.blocks, self.slot_num)
+        return self
+
+
+class DenseOccupancy(Occupancy):
+    '''
+    owner and number of blocks per time slot, it only holds blocks of different flows which do not overlap
+    '''
+    counts: np.ndarray
+    owners: np.ndarray
+    flow_blocks: Dict[int, List[AllocationBlock]]
+
+    def __init__(self, slot_num: int):
+        super().__init__(slot_num)
+        self.counts = np.zeros(slot_num, dtype=np.int32)
+        self.owners = np.zeros(slot_num, dtype=np.int64)
+        self.flow_blocks = {}
+
+    def insert(self, block: AllocationBlock):
+        _lower, _upper = block.interval.lower, block.interval.upper + 1
+        if np.any((self.counts[_lower:_upper] != 0) & (self.owners[_lower:_upper] != block.flow_id)):
+            self.mixed = True
+        self.counts[_lower:_upper] += 1
+        self.owners[_lower:_upper] = block.flow_id
+        self.flow_blocks.setdefault(block.flow_id, []).append(block)
+        self.block_num += 1
+
+    def remove(self, block: AllocationBlock):
+        _lower, _upper = block.interval.lower, block.interval.upper + 1
+        self.counts[_lower:_upper] -= 1
+        self.owners[_lower:_upper][self.counts[_lower:_upper] == 0] = 0
+        _B: List[AllocationBlock] = self.flow_blocks[block.flow_id]
+        del _B[next(_i for _i, _b in enumerate(_B) if _b is block)]
+        if len(_B) == 0:
+            del self.flow_blocks[block.flow_id]
+        self.block_num -= 1
+
+    def conflict(self, lower: int, upper: int, flow_id: int = None, time_offset: int = 0,
+                 allocation_num: int = 0) -> bool:
+        _occupied: np.ndarray = self.counts[lower:upper + 1] != 0
+        if not _occupied.any():
+            return False
+        if flow_id is None or np.any(self.owners[lower:upper + 1][_occupied] != flow_id):
+            return True
+        for _block in self.flow_blocks[flow_id]:
+            if _block.interval.lower <= upper and _block.interval.upper >= lower and \
+                    not TimeSlotAllocator._is_same_flow(_block.flow_id, flow_id, time_offset,
+                                                        _block.send_time_offset, allocation_num):
+                return True
+        return False
+
+    def runs(self) -> Tuple[List[int], List[int]]:
+        _edges: np.ndarray = np.diff(np.concatenate(([0], (self.counts != 0).astype(np.int8), [0])))
+        return np.flatnonzero(_edges == 1).tolist(), (np.flatnonzero(_edges == -1) - 1).tolist()
+
+    def adapt(self) -> Occupancy:
+        if self.mixed or self.block_num < self.slot_num * SPARSE_FILL_RATIO:
+            return Occupancy.build([_b for _B in self.flow_blocks.values() for _b in _B], self.slot_num)
+        return self
+
+
 class TimeSlotAllocator:
     edge_id: int
     __hyper_period: int  # hyper period of all flows, [unit: us]
@@ -36,6 +292,7 @@ class TimeSlotAllocator:
     propagation_delay: int
     process_delay: int
     min_flow_size: int  # minimal flow size, [unit: b]
+    max_bandwidth: float  # maximum bandwidth of all edges, time slot length is based on it
     flow_times_mapper: Dict[int, List[AllocationBlock]]
     flow_times_mapper_c: Dict[int, List[AllocationBlock]]
     allocation_blocks: List[AllocationBlock]  # time windows without merging operation
@@ -53,17 +310,43 @@ class TimeSlotAllocator:
     flow_num_c: int
     flow_segment_num: int  # number of continuous flow traversed on edge
     flow_segment_num_c: int
+    try_allocate_num: int  # number of try_allocate calls, read by profiler of solver
+    reservations: Dict[int, List[Reservation]]  # periodic reservations of flows, None if unknown
+    reservations_c: Dict[int, List[Reservation]]
+    phase_folding: bool  # check periodic reservations by residue arithmetic instead of expanding phases
+    aligned_cache: Dict[Tuple[int, int], bool]  # Dict[(phase num, period), aligned or not]
+    misaligned_num: int  # number of reservations not aligned to hyper period, None if it has to be recounted
+    occupancy: Occupancy  # index of allocation blocks, None if it has to be rebuilt
+    occupancy_enabled: bool  # check conflicts by occupancy instead of scanning all allocation blocks
 
-    def __init__(self, edge_id: int, hp: int = 0, b: float = 0, s: int = config.GRAPH_CONFIG['min-flow-size'],
-                 prop_d: int = 0, proc_d: int = 0):
+    def __init__(self, edge_id: int, hp: int = 0, b: float = 0, s: int = None,
+                 prop_d: int = 0, proc_d: int = 0, max_b: float = None, phase_folding: bool = None):
         self.edge_id = edge_id
         self.__hyper_period = hp
         self.bandwidth = b
-        self.min_flow_size = s
+        self.min_flow_size = s if s is not None else config.GRAPH_CONFIG['min-flow-size']
+        self.max_bandwidth = max_b if max_b is not None else config.GRAPH_CONFIG['max-bandwidth']
         self.propagation_delay = prop_d
         self.process_delay = proc_d
+        self.try_allocate_num = 0
+        self.phase_folding = phase_folding if phase_folding is not None else config.GRAPH_CONFIG['phase-folding']
+        self.occupancy_enabled = True
         self.reset()
 
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if 'reservations' not in state:
+            # pickled before reservations are recorded, always expand phases
+            self.reservations = None
+            self.reservations_c = None
+            self.phase_folding = False
+        if 'misaligned_num' not in state:
+            self.aligned_cache = {}
+            self.misaligned_num = None
+        if 'occupancy' not in state:
+            self.occupancy = None
+            self.occupancy_enabled = True
+
     @property
     def hyper_period(self):
         return self.__hyper_period
@@ -73,11 +356,13 @@ class TimeSlotAllocator:
         if hyper_period != self.__hyper_period:
             self.__hyper_period = hyper_period
             self.reset()
-            logger.info('time slots allocation on edge [' + str(self.edge_id) + '] has been reset')
+            logger.info('time slots allocation on edge [%s] has been reset', self.edge_id)
         else:
-            logger.info('time slots of edge [' + str(self.edge_id) + '] has no change')
+            logger.info('time slots of edge [%s] has no change', self.edge_id)
 
     def to_string(self):
+        if not dump_enabled(logger):
+            return
         _B: List[List[int]] = []
         for _block in self.allocation_blocks:
             _interval: IntInterval = _block.interval
@@ -121,6 +406,7 @@ class TimeSlotAllocator:
         self.flow_segment_num_c = self.flow_segment_num
         self.load_c = self.load
         self.time_slot_used_c = self.time_slot_used
+        self.reservations_c = self.copy_reservations(self.reservations)
 
     def recover_scene(self):
         self.allocation_blocks = self.allocation_blocks_c.copy()
@@ -130,8 +416,20 @@ class TimeSlotAllocator:
         self.flow_segment_num = self.flow_segment_num_c
         self.load = self.load_c
         self.time_slot_used = self.time_slot_used_c
+        self.reservations = self.copy_reservations(self.reservations_c)
+        self.misaligned_num = None
+        self.occupancy = None
+
+    @staticmethod
+    def copy_reservations(reservations: Dict[int, List[Reservation]]) -> Dict[int, List[Reservation]]:
+        if reservations is None:
+            return None
+        return {_fid: _R.copy() for _fid, _R in reservations.items()}
 
     def reset(self):
+        if len(self.__dict__.get('allocation_blocks', [])) != 0:
+            logger.warning('%s allocation blocks on edge [%s] are discarded by reset',
+                           len(self.allocation_blocks), self.edge_id)
         self.flow_times_mapper = {}  # clear flow-time-slots mapper when hyper period changes
         self.allocation_blocks = []  # clear time slot allocation
         self.allocation_blocks_m = []  # clear merged time slot allocation
@@ -144,10 +442,15 @@ class TimeSlotAllocator:
         self.flow_num = 0
         self.flow_num_c = 0
         self.flow_segment_num = 0
+        self.reservations = {}
+        self.reservations_c = {}
+        self.aligned_cache = {}
+        self.misaligned_num = 0
+        self.occupancy = None
         if self.bandwidth != 0 and self.min_flow_size != 0 and self.__hyper_period:
             self.time_slot_len = ceil(self.min_flow_size / self.bandwidth)
             # self.time_slot_num = floor(self.__hyper_period / self.time_slot_len)
-            self.time_slot_len = ceil(self.min_flow_size / config.GRAPH_CONFIG['max-bandwidth'])  # TODO fix bug here
+            self.time_slot_len = ceil(self.min_flow_size / self.max_bandwidth)  # TODO fix bug here
             self.time_slot_num = floor(self.__hyper_period / self.time_slot_len)
             self.free_intervals = [IntInterval.closed(0, self.time_slot_num - 1)]
         else:
@@ -165,9 +468,9 @@ class TimeSlotAllocator:
         if b != self.bandwidth:
             self.bandwidth = b
             self.reset()
-            logger.info('time slots allocation on edge [' + str(self.edge_id) + '] has been reset')
+            logger.info('time slots allocation on edge [%s] has been reset', self.edge_id)
         else:
-            logger.info('time slots of edge [' + str(self.edge_id) + '] has no change')
+            logger.info('time slots of edge [%s] has no change', self.edge_id)
 
     def set_hyper_period(self, hp: int):
         '''
@@ -178,13 +481,14 @@ class TimeSlotAllocator:
         if hp != self.__hyper_period:
             self.__hyper_period = hp
             self.reset()
-            logger.info('time slots allocation on edge [' + str(self.edge_id) + '] has been reset')
+            logger.info('time slots allocation on edge [%s] has been reset', self.edge_id)
         else:
-            logger.info('time slots of edge [' + str(self.edge_id) + '] has no change')
+            logger.info('time slots of edge [%s] has no change', self.edge_id)
 
     def merge_allocation_blocks(self) -> List[AllocationBlock]:
         # self.allocation_blocks.sort(key=lambda b: b.interval.lower)
         merged_allocation_blocks: List[AllocationBlock] = []
+        _raw_last: AllocationBlock = None  # raw block appended as it is, not a copy
         for block in self.allocation_blocks:
             if not merged_allocation_blocks or merged_allocation_blocks[-1].interval.upper < block.interval.lower:
                 _block: AllocationBlock = copy.deepcopy(block)
@@ -194,11 +498,19 @@ class TimeSlotAllocator:
                                     merged_allocation_blocks[-1].send_time_offset,
                                     block.send_time_offset,
                                     block.interval.upper - block.interval.lower + 1):
-                merged_allocation_blocks[-1].interval.upper = max(merged_allocation_blocks[-1].interval.upper,
-                                                                  block.interval.upper)
+                _last: AllocationBlock = merged_allocation_blocks[-1]
+                if block.interval.upper > _last.interval.upper:
+                    if self.occupancy is not None and _last is _raw_last:
+                        # raw block is extended by merging, index it again with its new interval
+                        self.occupancy.remove(_last)
+                        _last.interval.upper = block.interval.upper
+                        self.occupancy.insert(_last)
+                    else:
+                        _last.interval.upper = block.interval.upper
             else:
                 _block: AllocationBlock = copy.deepcopy(block)
                 merged_allocation_blocks.append(block)
+                _raw_last = block
         return merged_allocation_blocks
 
     def calculate_free_blocks(self) -> List[IntInterval]:
@@ -213,6 +525,12 @@ class TimeSlotAllocator:
         return free_blocks
 
     def allocate(self, flow: Flow, arrival_time_offset, send_time_offset: int, phase_num: int, allocation_num: int):
+        if self.reservations is not None:
+            self.reservations.setdefault(flow.flow_id, []).append(Reservation(
+                flow.flow_id, floor(send_time_offset % self.hyper_period / self.time_slot_len), allocation_num,
+                flow.period, send_time_offset, phase_num))
+            if self.misaligned_num is not None and not self.is_aligned(phase_num, flow.period):
+                self.misaligned_num += 1
         for _phase in range(phase_num):
             _block_num: int = len(self.allocation_blocks)
             _block_m_num: int = len(self.allocation_blocks_m)
@@ -246,6 +564,8 @@ class TimeSlotAllocator:
                 logger.error('fuck damn!')
             # insert directly without merge operation
             for __block in _blocks:
+                if self.occupancy is not None:
+                    self.occupancy.insert(__block)
                 if len(self.allocation_blocks) == 0:
                     self.allocation_blocks.append(__block)
                 else:
@@ -260,6 +580,10 @@ class TimeSlotAllocator:
             if _phase == 0:
                 _next_arrival_time_offset = \
                     send_time_offset + flow.period + self.propagation_delay + self.process_delay
+            # if flow not exit, then the number of flow add 1
+            if flow.flow_id not in self.flow_times_mapper:
+                self.flow_num += 1
+            self.flow_segment_num += len(_blocks)
             # add blocks to flow-time-slots mapper
             if flow.flow_id in self.flow_times_mapper:
                 for __block in _blocks:
@@ -292,11 +616,17 @@ class TimeSlotAllocator:
             #                         __block.interval.lower = _pre_block_m.interval.lower
             #                         del self.allocation_blocks_m[_i]
             #                     break
-            # if flow not exit, then the number of flow add 1
-            if flow.flow_id not in self.flow_times_mapper:
-                self.flow_num += 1
             # add to next phase
             send_time_offset += flow.period
+        if self.occupancy is not None:
+            self.occupancy = self.occupancy.adapt()
+        self.update_allocation_state()
+
+    def update_allocation_state(self):
+        '''
+        recalculate merged allocation blocks, free intervals, time slots used and load from raw allocation blocks
+        :return:
+        '''
         # calculate merged allocation blocks
         self.allocation_blocks_m = self.merge_allocation_blocks()
         # calculate free allocation blocks
@@ -317,6 +647,61 @@ class TimeSlotAllocator:
         # calculate payload
         self.load = self.time_slot_used / self.time_slot_num
 
+    def release_flow(self, flow_id: int) -> bool:
+        '''
+        release all time slots allocated to flow
+        :param flow_id: flow id
+        :return: False if flow has no allocation on edge
+        '''
+        if flow_id not in self.flow_times_mapper:
+            return False
+        self.flow_segment_num -= len(self.flow_times_mapper.pop(flow_id))
+        self.flow_num -= 1
+        self.release_reservations(flow_id)
+        _allocation_blocks: List[AllocationBlock] = []
+        for _block in self.allocation_blocks:
+            if _block.flow_id != flow_id:
+                _allocation_blocks.append(_block)
+            elif self.occupancy is not None:
+                self.occupancy.remove(_block)
+        self.allocation_blocks = _allocation_blocks
+        if self.occupancy is not None:
+            self.occupancy = self.occupancy.adapt()
+        self.update_allocation_state()
+        return True
+
+    def get_occupancy(self) -> Occupancy:
+        if self.occupancy is None:
+            self.occupancy = Occupancy.build(self.allocation_blocks, self.time_slot_num)
+        return self.occupancy
+
+    def get_occupied_runs(self) -> Tuple[List[int], List[int]]:
+        # occupied time slots as sorted disjoint runs, cost of sparse occupancy does not depend on time slots
+        return self.get_occupancy().runs()
+
+    def get_occupied_mask(self) -> np.ndarray:
+        # occupied time slots of allocation blocks
+        if isinstance(self.occupancy, DenseOccupancy):
+            return self.occupancy.counts != 0
+        _mask: np.ndarray = np.zeros(self.time_slot_num, dtype=bool)
+        for _block in self.allocation_blocks:
+            _mask[_block.interval.lower:_block.interval.upper + 1] = True
+        return _mask
+
+    def invalidate_occupancy(self):
+        # allocation blocks have been changed directly, e.g. by perturbation
+        self.occupancy = None
+
+    def release_reservations(self, flow_id: int):
+        if self.reservations is not None:
+            _R: List[Reservation] = self.reservations.pop(flow_id, [])
+            if self.misaligned_num is not None:
+                self.misaligned_num -= sum(not self.is_aligned(_r.phase_num, _r.period) for _r in _R)
+
+    def invalidate_reservations(self):
+        # reservations have been changed directly, e.g. by loading solution
+        self.misaligned_num = None
+
     # def allocate_aeap_overlap(self, flow: Flow, arrival_time_offset: int) -> int:
     #     allocation_num: int = ceil(flow.size / self.bandwidth / self.time_slot_len)  # needed time slots
     #     phase_num: int = ceil(self.hyper_period / flow.period)  # number of repetitions
@@ -404,12 +789,15 @@ class TimeSlotAllocator:
         :param bp:
         :return:
         '''
+        self.try_allocate_num += 1
         if self.time_slot_num == 0:
-            logger.error('time slots on edge [' + str(self.edge_id) + '] does not initialize')
+            logger.error('time slots on edge [%s] does not initialize', self.edge_id)
             return False
         if bp < allocation_num:
             logger.error('required time slots exceed base period')
             return False
+        if self.can_fold(flow_id, phase_num, bp, overlaped):
+            return self.try_allocate_smart(time_offset, flow_id, allocation_num, phase_num, bp)
         for phase in range(phase_num):
             # _lower: int = floor(time_offset % self.hyper_period / self.time_slot_len)
             _lower: int = floor(time_offset % (self.time_slot_num * self.time_slot_len) / self.time_slot_len)
@@ -431,7 +819,13 @@ class TimeSlotAllocator:
             else:
                 logger.error('lower bound exceed number of time slots')
                 return False
-            if overlaped is True:
+            if self.occupancy_enabled:
+                for __interval in _intervals:
+                    if self.get_occupancy().conflict(__interval.lower, __interval.upper,
+                                                     flow_id if overlaped is True else None,
+                                                     time_offset, allocation_num):
+                        return False
+            elif overlaped is True:
                 for __interval in _intervals:
                     for block in self.allocation_blocks:
                         fid = block.flow_id
@@ -465,9 +859,39 @@ class TimeSlotAllocator:
             time_offset += bp
         return True
 
+    def is_aligned(self, phase_num: int, bp: int) -> bool:
+        # phases of period bp repeat exactly on time slot grid of hyper period
+        _aligned: bool = self.aligned_cache.get((phase_num, bp))
+        if _aligned is None:
+            _hyper_period: int = self.time_slot_num * self.time_slot_len
+            _aligned = _hyper_period == self.hyper_period and bp % self.time_slot_len == 0 and \
+                _hyper_period % bp == 0 and phase_num == _hyper_period // bp
+            self.aligned_cache[(phase_num, bp)] = _aligned
+        return _aligned
+
+    def can_fold(self, flow_id: int, phase_num: int, bp: int, overlaped: bool = False) -> bool:
+        '''
+        phases can be folded if new reservation and all existing reservations are aligned to hyper period,
+        overlapping with reservations of the same flow is left to brute force method
+        :param flow_id:
+        :param phase_num:
+        :param bp:
+        :param overlaped:
+        :return:
+        '''
+        if not self.phase_folding or self.reservations is None or not self.is_aligned(phase_num, bp):
+            return False
+        if overlaped is True and flow_id in self.reservations:
+            return False
+        if self.misaligned_num is None:
+            self.misaligned_num = sum(not self.is_aligned(_r.phase_num, _r.period)
+                                      for _R in self.reservations.values() for _r in _R)
+        return self.misaligned_num == 0
+
     def try_allocate_smart(self, time_offset: int, flow_id: int, allocation_num: int, phase_num: int, bp: int) -> bool:
         '''
-        smart method to check whether flow can be allocated or not
+        smart method to check whether flow can be allocated or not, two strictly periodic reservations conflict
+        iff their offsets collide modulo gcd of their periods, so each reservation is checked in O(1)
         :param time_offset:
         :param flow_id:
         :param allocation_num:
@@ -475,4 +899,12 @@ class TimeSlotAllocator:
         :param bp:
         :return:
         '''
-        pass
+        _offset: int = floor(time_offset % self.hyper_period / self.time_slot_len)
+        _period: int = bp // self.time_slot_len
+        for _R in self.reservations.values():
+            for _r in _R:
+                _gcd: int = gcd(_period, _r.period // self.time_slot_len)
+                _d: int = (_r.offset - _offset) % _gcd
+                if _d < allocation_num or _gcd - _d < _r.length:
+                    return False
+        return True
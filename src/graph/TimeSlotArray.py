@@ -27,7 +27,7 @@ class TimeSlotArray:
             logger.info('lack of some necessary properties for the initialization of time slots')
             return False
         n = floor(self.hyper_period * self.bandwidth / self.flow_size)
-        logger.info('number of time slots of edge [' + str(self.edge_id) + '] = ' + str(n))
+        logger.info('number of time slots of edge [%s] = %s', self.edge_id, n)
         self.time_slot_array = [0] * n
 
     def set_bandwidth(self, b):
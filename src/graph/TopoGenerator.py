@@ -2,7 +2,6 @@ import logging
 from typing import Dict, List, Set
 
 import networkx as nx
-import matplotlib.pyplot as plt
 
 from src import config
 from src.graph.topo_strategy.ErdosRenyiStrategy import ErdosRenyiStrategy
@@ -107,6 +106,7 @@ class TopoGenerator(object):
 
     @staticmethod
     def draw(graph: nx.Graph):
+        import matplotlib.pyplot as plt
         options: dict = {
             'with_labels': True,
             'font_weight': 'bold',
@@ -1,20 +1,27 @@
+import bisect
 import logging
-from typing import List
+from typing import List, Tuple, Union
 
+import numpy as np
 from math import ceil
 
 from src.graph.Flow import Flow
-from src.graph.TimeSlotAllocator import TimeSlotAllocator, AllocationBlock
+from src.graph.TimeSlotAllocator import TimeSlotAllocator, AllocationBlock, DenseOccupancy
 from src.graph.allocating_strategy.AllocatingStrategy import AllocatingStrategy
 
 logger = logging.getLogger(__name__)
+CANDIDATE_CHUNK = 1024  # number of candidate send time offsets checked at once
 
 
 class AEAPAllocatingStrategy(AllocatingStrategy):
 
     @staticmethod
-    def attempt_synchronize(flow: Flow, allocator: TimeSlotAllocator,
-                            arrival_time_offset: int, allocation_num: int, phase_num: int) -> int:
+    def find_synchronized_offset(flow: Flow, allocator: TimeSlotAllocator,
+                                 arrival_time_offset: int, allocation_num: int, phase_num: int) -> int:
+        '''
+        find send time offset which makes flow overlapped fully with its own blocks, e.g. of other redundant routes
+        :return: send time offset, -1 if there is none
+        '''
         _B: List[AllocationBlock] = allocator.flow_times_mapper.get(flow.flow_id)
         if _B is None or _B.__len__() == 0:
             return -1
@@ -25,14 +32,22 @@ class AEAPAllocatingStrategy(AllocatingStrategy):
                     _send_time_offset: int = _b.send_time_offset
                     if allocator.try_allocate(_send_time_offset, flow.flow_id, allocation_num, phase_num, flow.period,
                                               overlaped=True):
-                        allocator.allocate(flow, arrival_time_offset, _send_time_offset, phase_num, allocation_num)
                         return _send_time_offset
                     else:
-                        logger.error('allocate time slots error on edge [' + str(allocator.edge_id) + ']')
-                        logger.error('send time offset: ' + str(_send_time_offset))
-                        logger.error('error interval: ' + str([_b.interval.lower, _b.interval.upper]))
+                        logger.error('allocate time slots error on edge [%s]', allocator.edge_id)
+                        logger.error('send time offset: %s', _send_time_offset)
+                        logger.error('error interval: [%s, %s]', _b.interval.lower, _b.interval.upper)
         return -1
 
+    @staticmethod
+    def attempt_synchronize(flow: Flow, allocator: TimeSlotAllocator,
+                            arrival_time_offset: int, allocation_num: int, phase_num: int) -> int:
+        _send_time_offset: int = AEAPAllocatingStrategy.find_synchronized_offset(
+            flow, allocator, arrival_time_offset, allocation_num, phase_num)
+        if _send_time_offset != -1:
+            allocator.allocate(flow, arrival_time_offset, _send_time_offset, phase_num, allocation_num)
+        return _send_time_offset
+
     @staticmethod
     def _allocate(flow: Flow, allocator: TimeSlotAllocator,
                   arrival_time_offset: int, allocation_num: int, phase_num: int) -> int:
@@ -45,6 +60,126 @@ class AEAPAllocatingStrategy(AllocatingStrategy):
             _send_time_offset += allocator.time_slot_len
         return -1
 
+    @staticmethod
+    def find_earliest_offset(flow: Flow, allocator: TimeSlotAllocator, occupied: np.ndarray,
+                             arrival_time_offset: int, allocation_num: int, phase_num: int) -> int:
+        '''
+        vectorized version of _allocate without allocation, all candidate send time offsets and all phases are
+        checked against occupied mask at once
+        :param flow:
+        :param allocator:
+        :param occupied: occupied time slots of allocator
+        :param arrival_time_offset:
+        :param allocation_num: needed time slots
+        :param phase_num: number of repetitions
+        :return: earliest send time offset, -1 if there is none
+        '''
+        _slot_num: int = allocator.time_slot_num
+        _slot_len: int = allocator.time_slot_len
+        _candidate_num: int = _slot_num - allocation_num
+        if _slot_num == 0 or flow.period < allocation_num or _candidate_num <= 0:
+            return -1
+        # occupied time slots of window [lower, lower + allocation_num - 1], windows wrap around hyper period
+        _prefix: np.ndarray = np.concatenate(([0], np.cumsum(np.concatenate((occupied, occupied)))))
+        _phases: np.ndarray = np.arange(phase_num, dtype=np.int64) * flow.period
+        for _start in range(0, _candidate_num, CANDIDATE_CHUNK):
+            _offsets: np.ndarray = arrival_time_offset + \
+                np.arange(_start, min(_start + CANDIDATE_CHUNK, _candidate_num), dtype=np.int64) * _slot_len
+            _lowers: np.ndarray = (_offsets[:, None] + _phases[None, :]) % (_slot_num * _slot_len) // _slot_len
+            _free: np.ndarray = np.all(_prefix[_lowers + allocation_num] - _prefix[_lowers] == 0, axis=1)
+            if _free.any():
+                return int(_offsets[np.argmax(_free)])
+        return -1
+
+    @staticmethod
+    def find_earliest_offset_in_runs(flow: Flow, allocator: TimeSlotAllocator, runs: Tuple[List[int], List[int]],
+                                     arrival_time_offset: int, allocation_num: int, phase_num: int) -> int:
+        '''
+        same as find_earliest_offset, but candidates are skipped past occupied runs instead of checked slot by slot,
+        so its cost depends on number of runs and phases instead of number of time slots
+        :param flow:
+        :param allocator:
+        :param runs: sorted disjoint occupied runs of allocator
+        :param arrival_time_offset:
+        :param allocation_num: needed time slots
+        :param phase_num: number of repetitions
+        :return: earliest send time offset, -1 if there is none
+        '''
+        _slot_num: int = allocator.time_slot_num
+        _slot_len: int = allocator.time_slot_len
+        _candidate_num: int = _slot_num - allocation_num
+        if _slot_num == 0 or flow.period < allocation_num or _candidate_num <= 0:
+            return -1
+        # window of phase p at candidate i starts at time slot (lowers[p] + i) % slot num
+        _lowers: List[int] = [(arrival_time_offset + _p * flow.period) % (_slot_num * _slot_len) // _slot_len
+                              for _p in range(phase_num)]
+        # runs of next hyper period are appended, so windows wrapping around hyper period need no special case
+        _starts: List[int] = runs[0] + [_start + _slot_num for _start in runs[0]]
+        _ends: List[int] = runs[1] + [_end + _slot_num for _end in runs[1]]
+        _i: int = 0
+        while _i < _candidate_num:
+            for _lower in _lowers:
+                _window_lower: int = (_lower + _i) % _slot_num
+                _k: int = bisect.bisect_right(_starts, _window_lower + allocation_num - 1) - 1
+                if _k >= 0 and _ends[_k] >= _window_lower:
+                    # candidates before the end of the run overlap it as well
+                    _i += _ends[_k] + 1 - _window_lower
+                    break
+            else:
+                return arrival_time_offset + _i * _slot_len
+        return -1
+
+    def plan_route(self, flow: Flow, allocators: List[TimeSlotAllocator]) -> Tuple[List[Tuple[int, int]], bool]:
+        '''
+        earliest chain of send time offsets along route, arrival time offset of each hop depends on previous hop
+        :param flow:
+        :param allocators: time slot allocators of edges on route
+        :return: (arrival time offset, send time offset) of hops reached, and whether route is feasible
+        '''
+        # dense occupancy is checked by mask, sparse one by its runs, so long hyper periods cost no mask of slots
+        _occupied: List[Union[np.ndarray, Tuple[List[int], List[int]]]] = [
+            _allocator.get_occupied_mask() if isinstance(_allocator.get_occupancy(), DenseOccupancy)
+            else _allocator.get_occupied_runs() for _allocator in allocators]
+        _chain: List[Tuple[int, int]] = []
+        _arrival_time_offset: int = 0
+        for _allocator, _occupied_slots in zip(allocators, _occupied):
+            allocation_num: int = ceil(flow.size / _allocator.bandwidth / _allocator.time_slot_len)
+            phase_num: int = ceil(_allocator.hyper_period / flow.period)
+            _send_time_offset: int = self.find_synchronized_offset(
+                flow, _allocator, _arrival_time_offset, allocation_num, phase_num)
+            if _send_time_offset == -1 and isinstance(_occupied_slots, np.ndarray):
+                _send_time_offset = self.find_earliest_offset(
+                    flow, _allocator, _occupied_slots, _arrival_time_offset, allocation_num, phase_num)
+            elif _send_time_offset == -1:
+                _send_time_offset = self.find_earliest_offset_in_runs(
+                    flow, _allocator, _occupied_slots, _arrival_time_offset, allocation_num, phase_num)
+            _chain.append((_arrival_time_offset, _send_time_offset))
+            if _send_time_offset == -1:
+                logger.info('allocate time slots for flow [%s] failure', flow.flow_id)
+                return _chain, False
+            _arrival_time_offset = _send_time_offset + (allocation_num * _allocator.time_slot_len) + \
+                _allocator.propagation_delay + _allocator.process_delay
+            if _arrival_time_offset > flow.deadline:
+                return _chain, False
+        return _chain, True
+
+    def allocate_route(self, flow: Flow, allocators: List[TimeSlotAllocator]) -> bool:
+        if type(self)._allocate is not AEAPAllocatingStrategy._allocate:
+            # strategies with other search orders allocate hop by hop
+            return super().allocate_route(flow, allocators)
+        _chain, _feasible = self.plan_route(flow, allocators)
+        # scenes of reached edges are saved as hop by hop allocation does, flow-level rollback relies on them
+        for _allocator in allocators[:len(_chain)]:
+            _allocator.save_scene()
+        if not _feasible:
+            return False
+        # commit all hops
+        for _allocator, (_arrival_time_offset, _send_time_offset) in zip(allocators, _chain):
+            _allocator.allocate(flow, _arrival_time_offset, _send_time_offset,
+                                ceil(_allocator.hyper_period / flow.period),
+                                ceil(flow.size / _allocator.bandwidth / _allocator.time_slot_len))
+        return True
+
     def allocate(self, flow: Flow, allocator: TimeSlotAllocator, arrival_time_offset: int, *args, **kwargs):
         allocation_num: int = ceil(flow.size / allocator.bandwidth / allocator.time_slot_len)  # needed time slots
         phase_num: int = ceil(allocator.hyper_period / flow.period)  # number of repetitions
@@ -59,10 +194,10 @@ class AEAPAllocatingStrategy(AllocatingStrategy):
         if _send_time_offset != -1:
             _next_arrival_time_offset = _send_time_offset + (allocation_num * allocator.time_slot_len) + \
                                         allocator.propagation_delay + allocator.process_delay
-            logger.info(allocator.to_string())
+            allocator.to_string()
             return _next_arrival_time_offset
         else:
-            logger.info('allocate time slots for flow [' + str(flow.flow_id) + '] failure')
+            logger.info('allocate time slots for flow [%s] failure', flow.flow_id)
             return -1
 
         # _B: List[AllocationBlock] = allocator.flow_times_mapper.get(flow.flow_id)
@@ -99,7 +234,7 @@ class AEAPAllocatingStrategy(AllocatingStrategy):
         #             break
         #         _send_time_offset += allocator.time_slot_len
         # if _flag is False:  # allocation failure
-        #     logger.info('allocate time slots for flow [' + str(flow.flow_id) + '] failure')
+        #     logger.info('allocate time slots for flow [%s] failure', flow.flow_id)
         #     return -1
         # else:
         #     _next_arrival_time_offset = _send_time_offset + (allocation_num * allocator.time_slot_len) + \
@@ -1,4 +1,5 @@
 import abc
+from typing import List
 
 from src.graph.Flow import Flow
 from src.graph.TimeSlotAllocator import TimeSlotAllocator
@@ -9,3 +10,22 @@ class AllocatingStrategy(metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def allocate(self, flow: Flow, allocator: TimeSlotAllocator, arrival_time_offset: int, *args, **kwargs):
         pass
+
+    def allocate_route(self, flow: Flow, allocators: List[TimeSlotAllocator]) -> bool:
+        '''
+        allocate time slots on all hops of route hop by hop, allocations are recovered
+        if any hop fails or arrives after deadline of flow
+        :param flow:
+        :param allocators: time slot allocators of edges on route
+        :return: whether route is allocated
+        '''
+        _arrival_time_offset: int = 0
+        for _i, _allocator in enumerate(allocators):
+            _allocator.save_scene()  # save scene
+            _arrival_time_offset = self.allocate(flow, _allocator, _arrival_time_offset)
+            if _arrival_time_offset == -1 or _arrival_time_offset > flow.deadline:
+                # recover scene
+                for __allocator in allocators[:_i + 1]:
+                    __allocator.recover_scene()
+                return False
+        return True
@@ -1,7 +1,6 @@
 import copy
 from typing import List, Set, Tuple
 
-from src import config
 from src.graph.Edge import Edge
 from src.graph.Graph import Graph
 from src.graph.reliability_strategy.ReliabilityStrategy import ReliabilityStrategy
@@ -19,7 +18,7 @@ class EnumerationMethodReliabilityStrategy(ReliabilityStrategy):
         if 'fid' not in kwargs.keys():
             raise RuntimeError('miss parameter "fid: FlowId"')
         reliability_value: float = self.compute_e2e_reliability(routes, src, dest)
-        if config.FLOW_CONFIG['redundancy_degree'] <= len(routes) <= config.FLOW_CONFIG['max-redundancy-degree'] and \
+        if self.redundancy_degree <= len(routes) <= self.max_redundancy_degree and \
                 self.flow_mapper[kwargs['fid']].reliability <= reliability_value:
             self.flow_mapper[kwargs['fid']].routes_reliability[dest] = reliability_value
             return True
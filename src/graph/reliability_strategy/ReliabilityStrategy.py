@@ -6,7 +6,9 @@ from typing import List, Dict, Set, Tuple
 from src.graph.Edge import Edge
 from src.graph.Flow import Flow
 from src.graph.Node import Node
+from src.graph.RunConfig import RunConfig
 from src.type import FlowId, EdgeId, NodeId
+from src.utils.Profiler import Profiler, NULL_PROFILER
 
 
 class ReliabilityStrategy(metaclass=abc.ABCMeta):
@@ -17,9 +19,13 @@ class ReliabilityStrategy(metaclass=abc.ABCMeta):
     edge_mapper: Dict[int, Edge]
     flow_mapper: Dict[int, Flow]
     failure_queue: Set[FlowId]
+    run_config: RunConfig
+    redundancy_degree: int
+    max_redundancy_degree: int
+    profiler: Profiler = NULL_PROFILER
 
     def __init__(self, nodes: List[int], edges: List[int], flows: List[int], node_mapper: Dict[int, Node],
-                 edge_mapper: Dict[int, Edge], flow_mapper: Dict[int, Flow]):
+                 edge_mapper: Dict[int, Edge], flow_mapper: Dict[int, Flow], run_config: RunConfig = None):
         self.nodes = nodes
         self.edges = edges
         self.flows = flows
@@ -27,6 +33,9 @@ class ReliabilityStrategy(metaclass=abc.ABCMeta):
         self.edge_mapper = edge_mapper
         self.flow_mapper = flow_mapper
         self.failure_queue = set()
+        self.run_config = run_config if run_config is not None else RunConfig.from_config()
+        self.redundancy_degree = self.run_config.redundancy_degree
+        self.max_redundancy_degree = self.run_config.max_redundancy_degree
 
     @abc.abstractmethod
     def check_e2e_reliability(self, routes: List[List[EdgeId]], src: NodeId, dest: NodeId, *args, **kwargs) -> bool:
@@ -45,6 +54,13 @@ class ReliabilityStrategy(metaclass=abc.ABCMeta):
         # when routes list is empty
         if len(routes) == 0:
             return False
+        if not self.profiler.enabled:
+            return self._compute_e2e_reliability(routes, src, dest)
+        self.profiler.count('reliability.evaluation')
+        with self.profiler.span('reliability'):
+            return self._compute_e2e_reliability(routes, src, dest)
+
+    def _compute_e2e_reliability(self, routes: List[List[EdgeId]], src: NodeId, dest: NodeId) -> float:
         # walked edges
         walked_edges: Set[EdgeId] = set()
         for e2e_route in routes:
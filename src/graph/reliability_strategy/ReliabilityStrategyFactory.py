@@ -12,12 +12,13 @@ class ReliabilityStrategyFactory(object):
     def get_instance(strategy_name: str, graph: Graph, *args, **kwargs) -> ReliabilityStrategy:
         if strategy_name == RELIABILITY_STRATEGY.MULTI_ROUTES_RELIABILITY_STRATEGY:
             return MultiRoutesReliabilityStrategy(graph.nodes, graph.edges, graph.flows, graph.node_mapper,
-                                                  graph.edge_mapper, graph.flow_mapper)
+                                                  graph.edge_mapper, graph.flow_mapper, run_config=graph.run_config)
         elif strategy_name == RELIABILITY_STRATEGY.ENUMERATION_METHOD_RELIABILITY_STRATEGY:
             return EnumerationMethodReliabilityStrategy(graph.nodes, graph.edges, graph.flows, graph.node_mapper,
-                                                        graph.edge_mapper, graph.flow_mapper)
+                                                        graph.edge_mapper, graph.flow_mapper,
+                                                        run_config=graph.run_config)
         elif strategy_name == RELIABILITY_STRATEGY.UNI_ROUTES_RELIABILITY_STRATEGY:
             return UniRoutesReliabilityStrategy(graph.nodes, graph.edges, graph.flows, graph.node_mapper,
-                                                graph.edge_mapper, graph.flow_mapper)
+                                                graph.edge_mapper, graph.flow_mapper, run_config=graph.run_config)
         else:
             raise RuntimeError("reliability strategy doesn't exist")
@@ -1,6 +1,5 @@
 from typing import List
 
-from src import config
 from src.graph.reliability_strategy.ReliabilityStrategy import ReliabilityStrategy
 from src.type import EdgeId, FlowId, NodeId
 
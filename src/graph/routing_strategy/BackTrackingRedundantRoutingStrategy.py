@@ -1,12 +1,12 @@
 import logging
 from typing import List, Dict, Set
 
-from src import config
 from src.graph.Edge import Edge
 from src.graph.Flow import Flow
 from src.graph.Node import Node
 from src.graph.routing_strategy.RedundantRoutingStrategy import RedundantRoutingStrategy
 from src.graph.routing_strategy.RoutingStrategy import RoutingStrategy
+from src.graph.RunConfig import RunConfig
 from src.type import FlowId, EdgeId
 
 logger = logging.getLogger(__name__)
@@ -15,10 +15,16 @@ logger = logging.getLogger(__name__)
 class BackTrackingRedundantRoutingStrategy(RedundantRoutingStrategy):
     __overlapped: bool
     __flow_walked_edges: Dict[int, Set[int]]
+    max_hops: int
+    link_bandwidth: float
+    overlapped_routing: bool
 
     def __init__(self, nodes: List[int], edges: List[int], flows: List[int], node_mapper: Dict[int, Node],
-                 edge_mapper: Dict[int, Edge], flow_mapper: Dict[int, Flow]):
-        super().__init__(nodes, edges, flows, node_mapper, edge_mapper, flow_mapper)
+                 edge_mapper: Dict[int, Edge], flow_mapper: Dict[int, Flow], run_config: RunConfig = None):
+        super().__init__(nodes, edges, flows, node_mapper, edge_mapper, flow_mapper, run_config=run_config)
+        self.max_hops = self.run_config.max_hops
+        self.link_bandwidth = self.run_config.all_bandwidth
+        self.overlapped_routing = self.run_config.overlapped_routing
         self.__overlapped = False
         self.__flow_walked_edges = dict()
         for _fid in self.flows:
@@ -33,13 +39,16 @@ class BackTrackingRedundantRoutingStrategy(RedundantRoutingStrategy):
             flow_id_list = self.sort_flows_id_list(flow_id_list)
         for fid in flow_id_list:
             self.save_weight()
-            if not self.route_single_flow(self.flow_mapper[fid]):
+            with self.profiler.span('routing.flow', key=fid):
+                _routed: bool = self.route_single_flow(self.flow_mapper[fid])
+            if not _routed:
                 self.recover_weight()
+                self.profiler.count('routing.rollback')
                 self.failure_queue.add(fid)
-                logger.info('routing failure ,and add flow [' + str(fid) + '] into failure queue')
+                logger.info('routing failure ,and add flow [%s] into failure queue', fid)
             else:
-                logger.info(self.flow_mapper[fid].to_string())
-        logger.info('FAILURE QUEUE:' + str(self.failure_queue))
+                self.flow_mapper[fid].to_string()
+        logger.info('FAILURE QUEUE:%s', self.failure_queue)
         return self.failure_queue
 
     @property
@@ -62,10 +71,10 @@ class BackTrackingRedundantRoutingStrategy(RedundantRoutingStrategy):
         _b: float = flow.size / flow.period
         if self.route_one2many(flow.flow_id, flow.source, flow.destinations, _b,
                                size=flow.size, deadline=flow.deadline):
-            logger.info('routing for flow [' + str(flow.flow_id) + '] succeed')
+            logger.info('routing for flow [%s] succeed', flow.flow_id)
             return True
         else:
-            logger.info('routing for flow [' + str(flow.flow_id) + '] failure')
+            logger.info('routing for flow [%s] failure', flow.flow_id)
             return False
 
     def route_one2many(self, fid: int, src: int, dest: List[int], b: float,
@@ -83,15 +92,15 @@ class BackTrackingRedundantRoutingStrategy(RedundantRoutingStrategy):
                     for _eid in _route:
                         self.flow_mapper[fid].negative_walked_edges.add(_eid)  # add walked edge to negative walked set
                 else:
-                    logger.info('end-to-end reliability of flow [{}] cannot be met'.format(fid))
-                    logger.info('failed routes: {}'.format(self.flow_mapper[fid].routes_reliability))
+                    logger.info('end-to-end reliability of flow [%s] cannot be met', fid)
+                    logger.info('failed routes: %s', self.flow_mapper[fid].routes_reliability)
                     self.flow_mapper[fid].routes_reliability = dict()  # recover routes_reliability
                     return False  # there is no path left
             __routes = self.find_all_e2e_routes(src, _d, __routes)  # extend routes set for one-to-one
             _routes.append(__routes)  # add one-to-one routes set to one-to-many routes set
             self.flow_mapper[fid].negative_walked_edges = set()  # recover negative walked set
             # TODO set redundancy degree for source-destination pair
-        self.flow_mapper[fid].routes = _routes  # assign routes to flow
+        self.flow_mapper[fid].assign_routes(_routes)  # assign routes to flow
         # if all are successful, then add walked edge to walked edges set
         for _d_routes in _routes:
             for _route in _d_routes:
@@ -107,12 +116,15 @@ class BackTrackingRedundantRoutingStrategy(RedundantRoutingStrategy):
         # get destination edge
         dest_node: Node = self.node_mapper[dest]
         dest_edge: Edge = dest_node.in_edge[0]  # destination node has only one inbound edge
+        if src_edge.failed or dest_edge.failed:
+            logger.info('access edge of flow [%s] fails', fid)
+            return []
         # weight list of all edges
         weight: List[List[int]] = []  # final weight
         # back tracing to find a end-to-end route
         route: List[List[int]] = []  # final route
         _route: List[int] = []  # back-tracing stack
-        _hops: int = self.compute_hops(link_bandwidth=config.GRAPH_CONFIG['all-bandwidth'],
+        _hops: int = self.compute_hops(link_bandwidth=self.link_bandwidth,
                                        flow_size=size, flow_deadline=deadline)  # hops of routes
         self.back_trace(
             fid, route, _route, src_edge.edge_id, 0, dest_edge.edge_id, b, weight, walked_edges, hops=_hops, hop=1)
@@ -132,14 +144,14 @@ class BackTrackingRedundantRoutingStrategy(RedundantRoutingStrategy):
                     flag = True
                     break
             if flag is False:
-                logging.info('there is no more end-to-end to search')
+                logger.info('there is no more end-to-end to search')
                 return []
             # update walked edges
             for _eid in route[0]:
                 walked_edges.add(_eid)
             return route[0]
         else:
-            logging.info('cannot find any route')
+            logger.info('cannot find any route')
             return []
 
     def compute_hops(self, link_bandwidth: float = 0, flow_size: int = 0, flow_deadline: int = 0) -> int:
@@ -148,9 +160,9 @@ class BackTrackingRedundantRoutingStrategy(RedundantRoutingStrategy):
             if flow_size is not Node or flow_size != 0:
                 if flow_deadline is not None or flow_deadline != 0:
                     hops: int = math.ceil(flow_deadline / (flow_size / link_bandwidth))
-                    if hops < config.FLOW_CONFIG['max-hops']:
+                    if hops < self.max_hops:
                         return hops
-        return config.FLOW_CONFIG['max-hops']  # max hops
+        return self.max_hops  # max hops
 
     def back_trace(self, fid: int, route: List[List[int]], _route: List[int], eid: int, n: int, dest_e: int, b: float,
                    weight: List[List[int]], walked_edges: Set[int], hops: int = 0, hop: int = 0):
@@ -203,7 +215,7 @@ class BackTrackingRedundantRoutingStrategy(RedundantRoutingStrategy):
                 if len(route) != 0:
                     break
             if eid in walked_edges:
-                if config.GRAPH_CONFIG['overlapped-routing'] is False:
+                if self.overlapped_routing is False:
                     _e.weight -= _w  # recover weight on edge
             else:
                 _e.weight -= _w  # recover weight on edge
@@ -257,13 +269,15 @@ class BackTrackingRedundantRoutingStrategy(RedundantRoutingStrategy):
         if 'walked_edges' not in kwargs.keys():
             raise RuntimeError('miss parameter "walked_edges: Set(EdgeId)"')
         edge: Edge = kwargs['edge']
+        if edge.failed:
+            return False  # failed edge
         if edge.out_node.color == 1:
             # logger.info('unavailable node [{}]'.format(edge.out_node.node_id))
             return False  # unavailable node
         hops: int = kwargs['hops']
         hop: int = kwargs['hop']
         if hops < hop + 1 or hops == 0:
-            logger.info('edge [{}] out of hops "{}"'.format(edge.edge_id, hops))
+            logger.info('edge [%s] out of hops "%s"', edge.edge_id, hops)
             return False  # out of hops constraint
         walked_edge: Set[EdgeId] = kwargs['walked_edges']
         bandwidth: float = kwargs['bandwidth']
@@ -272,11 +286,11 @@ class BackTrackingRedundantRoutingStrategy(RedundantRoutingStrategy):
         if edge.edge_id in walked_edge:
             if self.__overlapped is False:
                 if appended_weight > 1:
-                    logger.info('edge [{}] out of bandwidth'.format(edge.edge_id))
+                    logger.info('edge [%s] out of bandwidth', edge.edge_id)
                     return False  # out of bandwidth
         else:
             if appended_weight > 1:
-                logger.info('edge [{}] out of bandwidth'.format(edge.edge_id))
+                logger.info('edge [%s] out of bandwidth', edge.edge_id)
                 return False  # out of bandwidth
         return True
 
@@ -315,7 +329,7 @@ class BackTrackingRedundantRoutingStrategy(RedundantRoutingStrategy):
         # TODO filter feasible state
         # TODO compute reliability
 
-        if len(routes) == config.FLOW_CONFIG['redundancy_degree']:
+        if len(routes) == self.run_config.redundancy_degree:
             return True
         return False
 
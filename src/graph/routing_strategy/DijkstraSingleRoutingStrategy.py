@@ -1,5 +1,5 @@
 import logging
-from typing import List, Set, Dict
+from typing import List, Set, Dict, Tuple
 
 import networkx as nx
 
@@ -7,6 +7,7 @@ from src.graph.Edge import Edge
 from src.graph.Flow import Flow
 from src.graph.Node import Node
 from src.graph.routing_strategy.SingleRoutingStrategy import SingleRoutingStrategy
+from src.graph.RunConfig import RunConfig
 from src.type import FlowId, NodeId, EdgeId
 
 logger = logging.getLogger(__name__)
@@ -16,37 +17,57 @@ class DijkstraSingleRoutingStrategy(SingleRoutingStrategy):
     graph: nx.Graph
 
     def __init__(self, nodes: List[int], edges: List[int], flows: List[int], node_mapper: Dict[int, Node],
-                 edge_mapper: Dict[int, Edge], flow_mapper: Dict[int, Flow], nx_graph: nx.Graph = None):
-        super().__init__(nodes, edges, flows, node_mapper, edge_mapper, flow_mapper)
+                 edge_mapper: Dict[int, Edge], flow_mapper: Dict[int, Flow], nx_graph: nx.Graph = None,
+                 run_config: RunConfig = None):
+        super().__init__(nodes, edges, flows, node_mapper, edge_mapper, flow_mapper, run_config=run_config)
         self.graph = nx_graph
 
     def route(self, flow_id_list: List[FlowId], *args, **kwargs) -> Set[FlowId]:
+        weight = self.get_weight_function()
         for fid in flow_id_list:
             routes: List[List[List[int]]] = []  # routes of flow
             source: NodeId = self.flow_mapper[fid].source
             targets: List[NodeId] = self.flow_mapper[fid].destinations
             flag: bool = True
-            for target in targets:
-                dijkstra_path_n: List[NodeId] = nx.dijkstra_path(self.graph, source=source, target=target)
-                dijkstra_path_e: List[EdgeId] = self.nodes_to_edges(dijkstra_path_n)
-                if self.check_e2e_reliability([dijkstra_path_e], source, target, fid=fid):
-                    routes.append([dijkstra_path_e])
-                else:
-                    flag = False
-                    break
+            with self.profiler.span('routing.flow', key=fid):
+                for target in targets:
+                    try:
+                        dijkstra_path_n: List[NodeId] = nx.dijkstra_path(self.graph, source=source, target=target,
+                                                                         weight=weight)
+                    except nx.NetworkXNoPath:
+                        flag = False
+                        break
+                    dijkstra_path_e: List[EdgeId] = self.nodes_to_edges(dijkstra_path_n)
+                    if self.check_e2e_reliability([dijkstra_path_e], source, target, fid=fid):
+                        routes.append([dijkstra_path_e])
+                    else:
+                        flag = False
+                        break
             if flag is False:
                 self.failure_queue.add(fid)
-                logger.info('routing for flow [{}] failed'.format(fid))
-                logger.info('end-to-end reliability of flow [{}] cannot be met'.format(fid))
-                logger.info('failed flow: {}'.format(self.flow_mapper[fid]))
+                logger.info('routing for flow [%s] failed', fid)
+                logger.info('end-to-end reliability of flow [%s] cannot be met', fid)
+                logger.info('failed flow: %s', self.flow_mapper[fid])
                 self.flow_mapper[fid].routes_reliability = dict()  # recover routes_reliability
                 continue
             else:
-                self.flow_mapper[fid].routes = routes
-                logger.info('routing for flow [{}] successful: {}'.format(fid, self.flow_mapper[fid].to_string()))
-                logger.info('succeed flow: {}'.format(self.flow_mapper[fid]))
+                self.flow_mapper[fid].assign_routes(routes)
+                logger.info('routing for flow [%s] successful', fid)
+                self.flow_mapper[fid].to_string()
+                logger.info('succeed flow: %s', self.flow_mapper[fid])
         return self.failure_queue
 
+    def get_weight_function(self):
+        '''
+        weight of dijkstra, failed edges are hidden
+        :return: name of edge attribute if no edge fails, otherwise a weight function
+        '''
+        _failed: Set[Tuple[NodeId, NodeId]] = {(_e.in_node.node_id, _e.out_node.node_id)
+                                               for _e in self.edge_mapper.values() if _e.failed}
+        if len(_failed) == 0:
+            return 'weight'
+        return lambda u, v, d: None if (u, v) in _failed else d.get('weight', 1)
+
     def nodes_to_edges(self, node_id_list: List[NodeId]) -> List[EdgeId]:
         edge_id_list: List[EdgeId] = []
         in_node_id: NodeId = None
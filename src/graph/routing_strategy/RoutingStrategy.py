@@ -7,7 +7,9 @@ from src.graph.Flow import Flow
 from src.graph.Node import Node
 from src.graph.reliability_strategy.MultiRoutesReliabilityStrategy import MultiRoutesReliabilityStrategy
 from src.graph.reliability_strategy.ReliabilityStrategy import ReliabilityStrategy
+from src.graph.RunConfig import RunConfig
 from src.type import FlowId, EdgeId, NodeId
+from src.utils.Profiler import Profiler, NULL_PROFILER
 
 
 class RoutingStrategy(metaclass=abc.ABCMeta):
@@ -19,9 +21,11 @@ class RoutingStrategy(metaclass=abc.ABCMeta):
     flow_mapper: Dict[int, Flow]
     failure_queue: Set[FlowId]
     _reliability_strategy: ReliabilityStrategy
+    run_config: RunConfig
+    profiler: Profiler = NULL_PROFILER
 
     def __init__(self, nodes: List[int], edges: List[int], flows: List[int], node_mapper: Dict[int, Node],
-                 edge_mapper: Dict[int, Edge], flow_mapper: Dict[int, Flow]):
+                 edge_mapper: Dict[int, Edge], flow_mapper: Dict[int, Flow], run_config: RunConfig = None):
         self.nodes = nodes
         self.edges = edges
         self.flows = flows
@@ -30,6 +34,7 @@ class RoutingStrategy(metaclass=abc.ABCMeta):
         self.flow_mapper = flow_mapper
         self.failure_queue = set()
         self._reliability_strategy = None
+        self.run_config = run_config if run_config is not None else RunConfig.from_config()
 
     @property
     def reliability_strategy(self):
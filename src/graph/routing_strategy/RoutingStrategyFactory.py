@@ -11,10 +11,11 @@ class RoutingStrategyFactory(object):
     def get_instance(strategy_name: str, graph: Graph, *args, **kwargs) -> RoutingStrategy:
         if strategy_name == ROUTING_STRATEGY.BACKTRACKING_REDUNDANT_ROUTING_STRATEGY:
             return BackTrackingRedundantRoutingStrategy(
-                graph.nodes, graph.edges, graph.flows, graph.node_mapper, graph.edge_mapper, graph.flow_mapper)
+                graph.nodes, graph.edges, graph.flows, graph.node_mapper, graph.edge_mapper, graph.flow_mapper,
+                run_config=graph.run_config)
         elif strategy_name == ROUTING_STRATEGY.DIJKSTRA_SINGLE_ROUTING_STRATEGY:
             return DijkstraSingleRoutingStrategy(
                 graph.nodes, graph.edges, graph.flows, graph.node_mapper, graph.edge_mapper, graph.flow_mapper,
-                nx_graph=graph.nx_graph)
+                nx_graph=graph.nx_graph, run_config=graph.run_config)
         else:
             raise RuntimeError("routing strategy doesn't exist")
@@ -0,0 +1,198 @@
+import logging
+import time
+from typing import List, Set, Dict, Iterator
+
+import numpy as np
+from math import ceil
+
+from src.graph.Flow import Flow
+from src.graph.TimeSlotAllocator import TimeSlotAllocator
+from src.graph.allocating_strategy.AEAPAllocatingStrategy import CANDIDATE_CHUNK
+from src.graph.scheduling_strategy.LRFRedundantScheduling import LRFRedundantSchedulingStrategy
+from src.type import FlowId
+
+logger = logging.getLogger(__name__)
+
+
+class RepairHop:
+    edge_id: int
+    allocator: TimeSlotAllocator
+    allocation_num: int  # needed time slots
+    phase_num: int  # number of repetitions
+    latency: float  # transmission, propagation and process delay of hop, [unit: ns]
+    rest_latency: float  # latency of this and all following hops of route, [unit: ns]
+    first: bool  # whether hop is the first hop of its route
+
+    def __init__(self, edge_id: int, allocator: TimeSlotAllocator, flow: Flow):
+        self.edge_id = edge_id
+        self.allocator = allocator
+        self.allocation_num = ceil(flow.size / allocator.bandwidth / allocator.time_slot_len)
+        self.phase_num = ceil(allocator.hyper_period / flow.period)
+        self.latency = self.allocation_num * allocator.time_slot_len + \
+            allocator.propagation_delay + allocator.process_delay
+        self.rest_latency = self.latency
+        self.first = False
+
+
+# long-routes-first scheduling whose failed flows are repaired by exact search
+class ExactRepairSchedulingStrategy(LRFRedundantSchedulingStrategy):
+    '''
+    time slot assignment of a failed flow is a constraint problem over send time offsets of all its hops:
+    all phases on an edge must not overlap time slots of other flows, a hop cannot send before packet arrives
+    from previous hop, and last hop must arrive before deadline. hops of redundant routes of the same flow on the
+    same edge either share send time offset, i.e. overlap fully, or do not overlap at all.
+    it is solved by depth-first branch-and-bound over all feasible send time offsets, and searching starts from
+    the earliest offsets chosen by heuristic, other flows are kept fixed so runtime is bounded by failed flows only
+    '''
+    time_limit: float  # time limit of repairing all failed flows, [unit: s]
+    node_num: int  # number of visited search nodes
+
+    def __init__(self, *args, time_limit: float = 10, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.time_limit = time_limit
+        self.node_num = 0
+
+    def schedule(self, flow_id_list: List[FlowId], *args, **kwargs) -> Set[FlowId]:
+        super().schedule(flow_id_list, *args, **kwargs)
+        self.repair([_fid for _fid in flow_id_list if _fid in self.failure_queue])
+        return self.failure_queue
+
+    def repair(self, flow_id_list: List[FlowId]) -> Set[FlowId]:
+        '''
+        repair failed flows one by one within time limit
+        :param flow_id_list: failed flows
+        :return: repaired flows
+        '''
+        _repaired: Set[FlowId] = set()
+        _expiration: float = time.perf_counter() + self.time_limit
+        for _fid in self.sort_flows_id_list(flow_id_list):
+            if time.perf_counter() >= _expiration:
+                logger.info('repairing time limit exceeded')
+                break
+            with self.profiler.span('scheduling.repair', key=_fid):
+                _scheduled: bool = self.repair_single_flow(self.flow_mapper[_fid], _expiration)
+            if _scheduled:
+                self.failure_queue.discard(_fid)
+                _repaired.add(_fid)
+                self.profiler.count('scheduling.repaired')
+                logger.info('remove flow [%s] from failure queue', _fid)
+        logger.info('REPAIRED:%s', _repaired)
+        return _repaired
+
+    def repair_single_flow(self, flow: Flow, expiration: float) -> bool:
+        logger.info('repair flow [%s]...', flow.flow_id)
+        _union_routes: List[List[int]] = [_e2e_route for _e2e_routes in flow.get_routes() for _e2e_route in
+                                          _e2e_routes]
+        _union_routes = LRFRedundantSchedulingStrategy.sort_route(_union_routes)
+        _hops: List[RepairHop] = []
+        for _e2e_route in _union_routes:
+            _route_hops: List[RepairHop] = [RepairHop(_eid, self.edge_mapper[_eid].time_slot_allocator, flow)
+                                            for _eid in _e2e_route]
+            if len(_route_hops) == 0:
+                continue
+            _route_hops[0].first = True
+            for _i in range(len(_route_hops) - 2, -1, -1):
+                _route_hops[_i].rest_latency += _route_hops[_i + 1].rest_latency
+            _hops.extend(_route_hops)
+        # drop time slots left by failed scheduling
+        for _hop in _hops:
+            _hop.allocator.release_flow(flow.flow_id)
+        _occupied: Dict[int, np.ndarray] = {_hop.edge_id: _hop.allocator.get_occupied_mask().astype(np.int64)
+                                            for _hop in _hops}
+        _synchronized: Dict[int, Dict[int, int]] = {_hop.edge_id: dict() for _hop in _hops}  # send offset -> hops
+        _chain: List[tuple] = []  # (arrival time offset, send time offset) of hops
+        # edges of following hops, choice on edge which is not used any more only affects arrival time offset
+        _following_edges: List[Set[int]] = [set(_hop.edge_id for _hop in _hops[_i + 1:]) for _i in range(len(_hops))]
+
+        def search(i: int, arrival_time_offset: float) -> bool:
+            if i == len(_hops):
+                return True
+            self.node_num += 1
+            if time.perf_counter() >= expiration:
+                return False
+            _hop: RepairHop = _hops[i]
+            if _hop.first:
+                arrival_time_offset = 0
+            # bound: following hops cannot take less than their latency
+            _latest: float = flow.deadline - _hop.rest_latency
+            if arrival_time_offset > _latest:
+                return False
+            # dominance: if send time offset fails, later ones fail too as they only delay following hops
+            _dominated: bool = _hop.edge_id not in _following_edges[i]
+            _failed: float = float('inf')
+            _sync: Dict[int, int] = _synchronized[_hop.edge_id]
+            for _send_time_offset in sorted(_o for _o in _sync if arrival_time_offset <= _o <= _latest):
+                _sync[_send_time_offset] += 1
+                _chain.append((arrival_time_offset, _send_time_offset))
+                if search(i + 1, _send_time_offset + _hop.latency):
+                    return True
+                _chain.pop()
+                _sync[_send_time_offset] -= 1
+                if _dominated:
+                    _failed = _send_time_offset
+                    break
+            for _send_time_offset in self.iter_free_offsets(flow, _hop, _occupied[_hop.edge_id],
+                                                            arrival_time_offset, _latest):
+                if _send_time_offset >= _failed or time.perf_counter() >= expiration:
+                    break
+                _slots: np.ndarray = self.occupy(flow, _hop, _occupied[_hop.edge_id], _send_time_offset)
+                _sync[_send_time_offset] = 1
+                _chain.append((arrival_time_offset, _send_time_offset))
+                if search(i + 1, _send_time_offset + _hop.latency):
+                    return True
+                _chain.pop()
+                del _sync[_send_time_offset]
+                np.subtract.at(_occupied[_hop.edge_id], _slots, 1)
+                if _dominated:
+                    break
+            return False
+
+        if not search(0, 0):
+            logger.info('repairing flow [%s] failure', flow.flow_id)
+            return False
+        for _hop, (_arrival_time_offset, _send_time_offset) in zip(_hops, _chain):
+            _hop.allocator.allocate(flow, _arrival_time_offset, _send_time_offset, _hop.phase_num,
+                                    _hop.allocation_num)
+        logger.info('repairing flow [%s] successful', flow.flow_id)
+        return True
+
+    @staticmethod
+    def occupy(flow: Flow, hop: RepairHop, occupied: np.ndarray, send_time_offset: float) -> np.ndarray:
+        # occupied time slots of all phases
+        _allocator: TimeSlotAllocator = hop.allocator
+        _lowers: np.ndarray = (send_time_offset + np.arange(hop.phase_num, dtype=np.int64) * flow.period) % \
+            (_allocator.time_slot_num * _allocator.time_slot_len) // _allocator.time_slot_len
+        _slots: np.ndarray = ((_lowers[:, None] + np.arange(hop.allocation_num)[None, :]) %
+                              _allocator.time_slot_num).ravel().astype(np.int64)
+        np.add.at(occupied, _slots, 1)
+        return _slots
+
+    @staticmethod
+    def iter_free_offsets(flow: Flow, hop: RepairHop, occupied: np.ndarray,
+                          arrival_time_offset: float, latest_time_offset: float) -> Iterator[int]:
+        '''
+        all send time offsets without overlapping, in ascending order, the same candidates as AEAP searches
+        :param flow:
+        :param hop:
+        :param occupied: number of allocations of each time slot
+        :param arrival_time_offset:
+        :param latest_time_offset: latest send time offset which still meets deadline
+        :return:
+        '''
+        _allocator: TimeSlotAllocator = hop.allocator
+        _slot_num: int = _allocator.time_slot_num
+        _slot_len: int = _allocator.time_slot_len
+        _candidate_num: int = _slot_num - hop.allocation_num
+        if _slot_num == 0 or flow.period < hop.allocation_num or _candidate_num <= 0:
+            return
+        _candidate_num = min(_candidate_num, int((latest_time_offset - arrival_time_offset) // _slot_len) + 1)
+        _prefix: np.ndarray = np.concatenate(([0], np.cumsum(np.concatenate((occupied, occupied)) != 0)))
+        _phases: np.ndarray = np.arange(hop.phase_num, dtype=np.int64) * flow.period
+        for _start in range(0, _candidate_num, CANDIDATE_CHUNK):
+            _offsets: np.ndarray = arrival_time_offset + \
+                np.arange(_start, min(_start + CANDIDATE_CHUNK, _candidate_num), dtype=np.int64) * _slot_len
+            _lowers: np.ndarray = ((_offsets[:, None] + _phases[None, :]) % (_slot_num * _slot_len) //
+                                   _slot_len).astype(np.int64)
+            _free: np.ndarray = np.all(_prefix[_lowers + hop.allocation_num] - _prefix[_lowers] == 0, axis=1)
+            for _offset in _offsets[_free]:
+                yield _offset.item()
@@ -36,14 +36,16 @@ class LRFRedundantSchedulingStrategy(RedundantSchedulingStrategy):
         if sorting_enabled:
             flow_id_list = self.sort_flows_id_list(flow_id_list)
         for _fid in flow_id_list:
-            if not self.schedule_single_flow(self.flow_mapper[_fid]):
+            with self.profiler.span('scheduling.flow', key=_fid):
+                _scheduled: bool = self.schedule_single_flow(self.flow_mapper[_fid])
+            if not _scheduled:
                 self.failure_queue.add(_fid)
-                logger.info('add flow [' + str(_fid) + '] into failure queue')
-        logger.info('FAILURE QUEUE:' + str(self.failure_queue))
+                logger.info('add flow [%s] into failure queue', _fid)
+        logger.info('FAILURE QUEUE:%s', self.failure_queue)
         return self.failure_queue
 
     def schedule_single_flow(self, flow: Flow) -> bool:
-        logger.info('schedule flow [' + str(flow.flow_id) + ']...')
+        logger.info('schedule flow [%s]...', flow.flow_id)
         _all_routes: List[List[List[int]]] = flow.get_routes()
         _union_routes: List[List[int]] = []
         for _e2e_routes in _all_routes:
@@ -53,35 +55,23 @@ class LRFRedundantSchedulingStrategy(RedundantSchedulingStrategy):
         _ER: List[int] = []  # recover list
         for _e2e_route in _union_routes:
             if not self.schedule_end2end(flow, _e2e_route):
-                logger.info('scheduling flow [' + str(flow.flow_id) + '] failure')
+                logger.info('scheduling flow [%s] failure', flow.flow_id)
                 # TODO recover time slots allocation on edge
+                self.profiler.count('scheduling.rollback')
                 for __e2e_route in _ER:
                     for _eid in __e2e_route:
                         self.edge_mapper[_eid].time_slot_allocator.recover_scene()
                 return False
             else:
                 _ER.append(_e2e_route)
-        logger.info('scheduling flow [' + str(flow.flow_id) + '] successful')
+        logger.info('scheduling flow [%s] successful', flow.flow_id)
         return True
 
     def schedule_end2end(self, flow: Flow, route: List[int]) -> bool:
-        _arrival_time_offset: int = 0
-        _E: List[Edge] = []
-        for _eid in route:
-            _e: Edge = self.edge_mapper[_eid]  # get edge
-            _E.append(_e)
-            _allocator: TimeSlotAllocator = _e.time_slot_allocator  # get time slot allocator
-            _allocator.save_scene()  # save scene
-            # _arrival_time_offset: int = self.allocate_aeap_overlap(flow, _allocator, _arrival_time_offset)
-            _arrival_time_offset: int = self.allocate(flow, _allocator, _arrival_time_offset)
-            # _arrival_time_offset: int = _allocator.allocate_aeap_overlap(flow, _arrival_time_offset)
-            # _arrival_time_offset: int = _allocator.allocate_aeap(flow, _arrival_time_offset)
-            # TODO fix bug here
-            if _arrival_time_offset == -1 or _arrival_time_offset > flow.deadline:
-                # recover scene
-                for _e in _E:
-                    _e.time_slot_allocator.recover_scene()
-                return False
+        # all hops of route are allocated by one call
+        if not self.allocate_route(flow, route):
+            self.profiler.count('scheduling.e2e_rollback')
+            return False
         return True
 
     # def allocate_aeap_overlap(self, flow: Flow, allocator: TimeSlotAllocator, arrival_time_offset: int) -> int:
@@ -9,6 +9,7 @@ from src.graph.TimeSlotAllocator import TimeSlotAllocator
 from src.graph.allocating_strategy.AEAPAllocatingStrategy import AEAPAllocatingStrategy
 from src.graph.allocating_strategy.AllocatingStrategy import AllocatingStrategy
 from src.type import FlowId
+from src.utils.Profiler import Profiler, NULL_PROFILER
 
 
 class SchedulingStrategy(metaclass=abc.ABCMeta):
@@ -20,6 +21,7 @@ class SchedulingStrategy(metaclass=abc.ABCMeta):
     flow_mapper: Dict[int, Flow]
     failure_queue: Set[FlowId]
     __allocating_strategy: AllocatingStrategy  # allocating strategy
+    profiler: Profiler = NULL_PROFILER
 
     def __init__(self, nodes: List[int], edges: List[int], flows: List[int], node_mapper: Dict[int, Node],
                  edge_mapper: Dict[int, Edge], flow_mapper: Dict[int, Flow]):
@@ -37,7 +39,17 @@ class SchedulingStrategy(metaclass=abc.ABCMeta):
         pass
 
     def allocate(self, flow: Flow, allocator: TimeSlotAllocator, arrival_time_offset: int) -> int:
-        return self.__allocating_strategy.allocate(flow, allocator, arrival_time_offset)
+        if not self.profiler.enabled:
+            return self.__allocating_strategy.allocate(flow, allocator, arrival_time_offset)
+        with self.profiler.span('allocating.' + type(self.__allocating_strategy).__name__):
+            return self.__allocating_strategy.allocate(flow, allocator, arrival_time_offset)
+
+    def allocate_route(self, flow: Flow, route: List[int]) -> bool:
+        _allocators: List[TimeSlotAllocator] = [self.edge_mapper[_eid].time_slot_allocator for _eid in route]
+        if not self.profiler.enabled:
+            return self.__allocating_strategy.allocate_route(flow, _allocators)
+        with self.profiler.span('allocating.' + type(self.__allocating_strategy).__name__):
+            return self.__allocating_strategy.allocate_route(flow, _allocators)
 
     def sort_flows_id_list(self, flows: List[int]) -> List[int]:
         '''
@@ -1,4 +1,5 @@
 from src.graph.Graph import Graph
+from src.graph.scheduling_strategy.ExactRepairScheduling import ExactRepairSchedulingStrategy
 from src.graph.scheduling_strategy.LRFRedundantScheduling import LRFRedundantSchedulingStrategy
 from src.graph.scheduling_strategy.SchedulingStrategy import SchedulingStrategy
 from src.type import  SCHEDULING_STRATEGY
@@ -11,5 +12,9 @@ class SchedulingStrategyFactory(object):
         if strategy_name == SCHEDULING_STRATEGY.LRF_REDUNDANT_SCHEDULING_STRATEGY:
             return LRFRedundantSchedulingStrategy(
                 graph.nodes, graph.edges, graph.flows, graph.node_mapper, graph.edge_mapper, graph.flow_mapper)
+        elif strategy_name == SCHEDULING_STRATEGY.EXACT_REPAIR_SCHEDULING_STRATEGY:
+            return ExactRepairSchedulingStrategy(
+                graph.nodes, graph.edges, graph.flows, graph.node_mapper, graph.edge_mapper, graph.flow_mapper,
+                time_limit=graph.run_config.repair_time_limit)
         else:
             raise RuntimeError("scheduling strategy doesn't exist")
@@ -10,7 +10,7 @@ logger = logging.getLogger(__name__)
 
 
 class ErdosRenyiStrategy(TopoStrategy):
-    ER_TYPE = Enum('ER_TYPE', ('GNM', 'GNP'))  # Gnm or Gnp type
+    ER_TYPE = Enum('ER_TYPE', ('GNM', 'GNP'), qualname='ErdosRenyiStrategy.ER_TYPE')  # Gnm or Gnp type, picklable
     __type: ER_TYPE.GNM  # type of Erdos-Renyi model
     __n: int  # number of nodes
     __m: int  # number of edges
@@ -1,9 +1,9 @@
 import abc
 import os
-import pickle
 from typing import List, Dict
 
 from src.graph.Graph import Graph
+from src.graph.SolutionStore import SolutionStore
 from src.graph.Solver import Solution
 from src.net_envs.network.Network import Network
 from src.net_envs.network.NetworkFactoryInterface import NetworkFactoryInterface
@@ -21,8 +21,7 @@ class NetworkFactory(NetworkFactoryInterface, metaclass=SingletonABC):
 
     def get_solution(self, filename: str):
         filename = os.path.join(config.solutions_res_dir, filename)
-        with open(filename, 'rb') as f:
-            self.solution: Solution = pickle.load(f)
+        self.solution: Solution = SolutionStore.load(filename)
 
     def parse_node_edge_mac_info(self, solution: Solution):
         # get mac-list, edge-mac-dict and node-mac-dict
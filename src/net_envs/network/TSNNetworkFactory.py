@@ -1,9 +1,12 @@
 import abc
+import logging
 from typing import List
 
+from src import config
 from src.net_envs.network.EthernetNetwork import EthernetNetwork
 from src.net_envs.network.EthernetNetworkFactory import EthernetNetworkFactory
 from src.net_envs.network.TSNNetwork import TSNNetwork
+from src.net_envs.network_component.GateControlList import GateControlListCompaction
 from src.net_envs.network_configurator.TSNHostConfigurator import TSNHostConfigurator
 from src.net_envs.network_configurator.TSNSwitchConfigurator import TSNSwitchConfigurator
 from src.net_envs.network_element.Host import Host
@@ -14,8 +17,11 @@ from src.net_envs.network_element.TSNHost import TSNHost
 from src.net_envs.network_element.TSNSwitch import TSNSwitch
 from src.type import NodeId
 
+logger = logging.getLogger(__name__)
+
 
 class TSNNetworkFactory(EthernetNetworkFactory):
+    gcl_compaction: GateControlListCompaction  # report of gcl compaction of switches of last product
 
     def product(self, *args, **kwargs) -> TSNNetwork:
         assert kwargs['enhancement_enable'], "parameter 'enhancement_enable' is required"
@@ -71,5 +77,8 @@ class TSNNetworkFactory(EthernetNetworkFactory):
             enhancement_enable=enhancement_enable)
         for tsn_switch in tsn_switch_list:
             tsn_switch.accept_configurator(tsn_switch_configurator)
+        self.gcl_compaction = tsn_switch_configurator.compaction
+        if config.XML_CONFIG['gcl-compaction']:
+            logger.info('compact gate control lists: %s', self.gcl_compaction)
 
         return tsn_network
@@ -1,5 +1,6 @@
-from typing import List
+from typing import List, Tuple
 
+import numpy as np
 from bitarray import bitarray
 
 from src.type import SimTime, FlowId
@@ -11,6 +12,34 @@ EXCLUSIVE_TSN_GATE_STATES: bitarray = bitarray([0, 0, 0, 0, 0, 0, 0, 1])  # excl
 EXCLUSIVE_NON_TSN_GATE_STATES: bitarray = bitarray([0, 1, 1, 1, 1, 1, 1, 1])  # exclusive non-tsn open
 
 
+def sweep_gate_entries(lowers: np.ndarray, uppers: np.ndarray, time_slot_len: int,
+                       hyper_period: int) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    gate entries of reserved time slot intervals in one sweep: an exclusive non-tsn entry before each interval
+    which does not start right after the previous one, an exclusive tsn entry of each interval, and an exclusive
+    non-tsn entry of the rest of hyper period
+    :param lowers: lower time slots of intervals, sorted
+    :param uppers: upper time slots of intervals, closed
+    :param time_slot_len:
+    :param hyper_period:
+    :return: lengths of entries, and index of interval of each entry which is -1 if entry is non-tsn
+    '''
+    _n: int = len(lowers)
+    _gaps: np.ndarray = np.empty(_n, dtype=np.int64)
+    _gaps[:1] = lowers[:1]
+    _gaps[1:] = lowers[1:] - uppers[:-1] - 1
+    # row i is the entry before interval i and the entry of interval i
+    _lengths: np.ndarray = np.stack([_gaps, uppers - lowers + 1], axis=1) * time_slot_len
+    _indexes: np.ndarray = np.stack([np.full(_n, -1), np.arange(_n)], axis=1)
+    _kept: np.ndarray = np.stack([_gaps > 0, np.ones(_n, dtype=bool)], axis=1)
+    _lengths, _indexes = _lengths[_kept], _indexes[_kept]
+    _tail: int = hyper_period - (int(uppers[-1]) + 1) * time_slot_len if _n != 0 else hyper_period
+    if _tail > 0:
+        _lengths = np.append(_lengths, _tail)
+        _indexes = np.append(_indexes, -1)
+    return _lengths, _indexes
+
+
 class GateControlListItem(object):
     time: SimTime  # length of time
     gate_states: bitarray  # gate state bit array
@@ -31,6 +60,37 @@ class EnhancementGateControlListItem(GateControlListItem):
         self.phase = phase
 
 
+class GateControlListCompaction(object):
+    '''
+    report of gate control list compaction
+    '''
+    entries_before: int  # number of entries before compaction
+    entries_after: int  # number of entries after compaction
+    coalesced_gaps: int  # number of non-tsn gaps given to tsn windows
+    coalesced_time: SimTime  # total time of coalesced gaps
+
+    def __init__(self, entries_before: int = 0, entries_after: int = 0, coalesced_gaps: int = 0,
+                 coalesced_time: SimTime = 0):
+        self.entries_before = entries_before
+        self.entries_after = entries_after
+        self.coalesced_gaps = coalesced_gaps
+        self.coalesced_time = coalesced_time
+
+    @property
+    def reduction(self) -> int:
+        return self.entries_before - self.entries_after
+
+    def merge(self, other: 'GateControlListCompaction'):
+        self.entries_before += other.entries_before
+        self.entries_after += other.entries_after
+        self.coalesced_gaps += other.coalesced_gaps
+        self.coalesced_time += other.coalesced_time
+
+    def __str__(self) -> str:
+        return '{} -> {} gate control list entries ({} removed), {} gaps of {} in total coalesced'.format(
+            self.entries_before, self.entries_after, self.reduction, self.coalesced_gaps, self.coalesced_time)
+
+
 class GateControlList(object):
     items: List[GateControlListItem]
 
@@ -40,6 +100,48 @@ class GateControlList(object):
     def add_item(self, item: GateControlListItem):
         self.items.append(item)
 
+    def is_mergeable(self, item1: GateControlListItem, item2: GateControlListItem) -> bool:
+        # adjacent entries of the same gate states are one entry
+        return item1.gate_states == item2.gate_states
+
+    def compact(self, min_gap: SimTime = 0) -> GateControlListCompaction:
+        '''
+        merge adjacent mergeable entries, and give each exclusive non-tsn gap shorter than min_gap between two
+        tsn windows to the previous window, start time of every other entry is unchanged
+        :param min_gap: gaps shorter than it can not transmit any non-tsn frame, [unit: ns]
+        :return: report
+        '''
+        _report: GateControlListCompaction = GateControlListCompaction(entries_before=len(self.items))
+        _items: List[GateControlListItem] = []
+        for _i, _item in enumerate(self.items):
+            if len(_items) != 0 and _item.gate_states == EXCLUSIVE_NON_TSN_GATE_STATES and _item.time < min_gap and \
+                    _items[-1].gate_states == EXCLUSIVE_TSN_GATE_STATES and _i + 1 < len(self.items) and \
+                    self.items[_i + 1].gate_states == EXCLUSIVE_TSN_GATE_STATES:
+                _items[-1].time += _item.time
+                _report.coalesced_gaps += 1
+                _report.coalesced_time += _item.time
+            elif len(_items) != 0 and self.is_mergeable(_items[-1], _item):
+                _items[-1].time += _item.time
+            else:
+                _items.append(_item)
+        self.items = _items
+        _report.entries_after = len(self.items)
+        return _report
+
+    def add_items(self, lengths: np.ndarray, indexes: np.ndarray, flow_ids: List[FlowId] = None,
+                  phases: List[int] = None):
+        '''
+        add entries swept by sweep_gate_entries
+        :param lengths: lengths of entries
+        :param indexes: index of interval of each entry, -1 if entry is non-tsn
+        :param flow_ids: unused, entries of plain list do not carry flow
+        :param phases: unused
+        :return:
+        '''
+        self.items.extend(
+            GateControlListItem(_time, EXCLUSIVE_NON_TSN_GATE_STATES if _i < 0 else EXCLUSIVE_TSN_GATE_STATES)
+            for _time, _i in zip(lengths.tolist(), indexes.tolist()))
+
     def product_and_add_item(self, time: SimTime = 0.0, gate_states: bitarray = ALL_OPEN_GATE_STATES):
         self.items.append(GateControlListItem(time, gate_states))
 
@@ -48,6 +150,24 @@ class EnhancementGateControlList(GateControlList):
     def __init__(self):
         super().__init__()
 
+    def is_mergeable(self, item1: EnhancementGateControlListItem, item2: EnhancementGateControlListItem) -> bool:
+        # windows of different flows or phases are kept apart, they are identified by switches and hosts
+        return super().is_mergeable(item1, item2) and item1.flow_id == item2.flow_id and item1.phase == item2.phase
+
     def product_and_add_item(self, time: SimTime = 0.0, gate_states: bitarray = ALL_OPEN_GATE_STATES,
                              flow_id: FlowId = FlowId(0), phase: int = 0):
         self.items.append(EnhancementGateControlListItem(time, gate_states, flow_id, phase))
+
+    def add_items(self, lengths: np.ndarray, indexes: np.ndarray, flow_ids: List[FlowId], phases: List[int]):
+        '''
+        add entries swept by sweep_gate_entries
+        :param lengths: lengths of entries
+        :param indexes: index of interval of each entry, -1 if entry is non-tsn
+        :param flow_ids: flow of each interval
+        :param phases: phase of each interval
+        :return:
+        '''
+        self.items.extend(
+            EnhancementGateControlListItem(_time, EXCLUSIVE_NON_TSN_GATE_STATES, FlowId(0), 0) if _i < 0 else
+            EnhancementGateControlListItem(_time, EXCLUSIVE_TSN_GATE_STATES, flow_ids[_i], phases[_i])
+            for _time, _i in zip(lengths.tolist(), indexes.tolist()))
@@ -1,13 +1,14 @@
 import abc
 from typing import List, Tuple, Dict, Set
 
-from src import config
+import numpy as np
+
 from src.graph.Flow import Flow
 from src.graph.Graph import Graph
 from src.graph.TimeSlotAllocator import TimeSlotAllocator, AllocationBlock
 from src.net_envs.network_component.FilteringDatabase import FilteringDatabase
-from src.net_envs.network_component.GateControlList import GateControlList, GateControlListItem, \
-    EXCLUSIVE_NON_TSN_GATE_STATES, EXCLUSIVE_TSN_GATE_STATES, EnhancementGateControlList, EnhancementGateControlListItem
+from src.net_envs.network_component.GateControlList import GateControlList, EnhancementGateControlList, \
+    sweep_gate_entries
 from src.net_envs.network_component.Mac import MAC_TYPE
 from src.net_envs.network_element.NetworkDevice import Port
 from src.net_envs.network_element.TSNHost import TSNFlowInfo
@@ -56,67 +57,62 @@ class FilteringDatabaseConfigurationInfo(ConfigurationInfo):
         self.switch_id = switch_id
         self.filtering_database = FilteringDatabase()
 
-    # TODO 这是什么魔鬼代码
     def parse(self, **kwargs):
-        assert kwargs['node_edge_mac_info']
-        assert kwargs['route_immediate_entity']
-        node_edge_mac_info: MAG.NodeEdgeMacInfo = kwargs['node_edge_mac_info']
-        route_immediate_entity: RG.RouteImmediateEntity = kwargs['route_immediate_entity']
-        port_macs_dict: Dict[PortNo, List[MacAddress]] = {}  # {port1: [mac1, mac2, ...], ...}
-        mac_ports_dict: Dict[MacAddress, List[PortNo]] = {}  # {mac1: [port1, port2, ...], ...}
-        _flow_routes_dict: Dict[FlowId, RG.FlowRoutes] = route_immediate_entity.flow_routes_dict
-        for flow_id, flow_routes in _flow_routes_dict.items():
-            _group_mac: MacAddress = _flow_routes_dict[flow_id].group_mac
-            _flow_routes: Dict[NodeId, RG.OneToOneRedundantRoutes] = flow_routes.flow_routes
-            for dest_node_id, one_to_one_redundant_routes in _flow_routes.items():
-                _one_to_one_redundant_routes: List[RG.OneToOneRoute] = one_to_one_redundant_routes.redundant_routes
-                for one_to_one_route in _one_to_one_redundant_routes:
+        '''
+        parse forwarding table of switch, the slice of node_mac_ports_dict is used if it is given, otherwise
+        forwarding tables of all nodes are built
+        :param kwargs: node_edge_mac_info, route_immediate_entity and optional node_mac_ports_dict
+        :return:
+        '''
+        node_mac_ports_dict: Dict[NodeId, Dict[MacAddress, List[PortNo]]] = kwargs.get('node_mac_ports_dict')
+        if node_mac_ports_dict is None:
+            assert kwargs['node_edge_mac_info']
+            assert kwargs['route_immediate_entity']
+            node_mac_ports_dict = FilteringDatabaseConfigurationInfo.build_node_mac_ports_dict(
+                kwargs['node_edge_mac_info'], kwargs['route_immediate_entity'])
+        mac_ports_dict: Dict[MacAddress, List[PortNo]] = node_mac_ports_dict.get(self.switch_id, {})
+        for mac, port_list in mac_ports_dict.items():
+            self.filtering_database.product_and_add_item(mac, port_list, MAG.MacAddressGenerator.parse_mac_type(mac))
+
+    @staticmethod
+    def build_node_mac_ports_dict(node_edge_mac_info: MAG.NodeEdgeMacInfo,
+                                  route_immediate_entity: RG.RouteImmediateEntity) \
+            -> Dict[NodeId, Dict[MacAddress, List[PortNo]]]:
+        '''
+        build forwarding tables of all nodes in one pass over routes, each node of a route forwards destination mac
+        and group mac of flow to the port of its outbound edge in route
+        :param node_edge_mac_info:
+        :param route_immediate_entity:
+        :return: {node1: {mac1: [port1, port2, ...], ...}, ...}
+        '''
+        # {node1: {mac1: port1, ...}, ...}, the first port wins as a linear search over port mac pair list does
+        node_mac_port_dict: Dict[NodeId, Dict[MacAddress, PortNo]] = {}
+        for node_id, node_mac_mapper in node_edge_mac_info.node_mac_dict.items():
+            mac_port_dict: Dict[MacAddress, PortNo] = {}
+            for port_no, mac in node_mac_mapper.port_mac_pair_list:
+                mac_port_dict.setdefault(mac, port_no)
+            node_mac_port_dict[node_id] = mac_port_dict
+        _edge_mac_dict: Dict[EdgeId, MAG.EdgeMacMapper] = node_edge_mac_info.edge_mac_dict
+        node_mac_ports_dict: Dict[NodeId, Dict[MacAddress, List[PortNo]]] = {}
+        for flow_id, flow_routes in route_immediate_entity.flow_routes_dict.items():
+            _group_mac: MacAddress = flow_routes.group_mac
+            for dest_node_id, one_to_one_redundant_routes in flow_routes.flow_routes.items():
+                for one_to_one_route in one_to_one_redundant_routes.redundant_routes:
                     _dest_mac: MacAddress = one_to_one_route.dest_mac
-                    _node_route: List[NodeId] = one_to_one_route.node_route
-                    _edge_route: List[EdgeId] = one_to_one_route.edge_route
-                    if self.switch_id in _node_route:
-                        _edge_mac_dict: Dict[EdgeId, MAG.EdgeMacMapper] = node_edge_mac_info.edge_mac_dict
-                        _edge_id_list: List[EdgeId] = list(filter(
-                            lambda _eid: self.switch_id == _edge_mac_dict[_eid].node_pair[0], _edge_mac_dict))
-                        assert _edge_id_list.__len__() != 0
-                        outbound_edge_list: List[EdgeId] = list(set(_edge_route).intersection(set(_edge_id_list)))
-                        assert outbound_edge_list.__len__() != 0
-                        outbound_edge: EdgeId = outbound_edge_list[0]
+                    _visited: Set[NodeId] = set()
+                    # node_route[i] is the in node of edge_route[i]
+                    for node_id, outbound_edge in zip(one_to_one_route.node_route, one_to_one_route.edge_route):
+                        if node_id in _visited:
+                            continue
+                        _visited.add(node_id)
                         outbound_mac: MacAddress = _edge_mac_dict[outbound_edge].mac_pair[0]  # outbound mac
-                        _node_mac_mapper: MAG.NodeMacMapper = node_edge_mac_info.node_mac_dict[self.switch_id]
-                        _port_mac_pair_list: List[Tuple[PortNo, MacAddress]] = _node_mac_mapper.port_mac_pair_list
-                        outbound_port: PortNo = [_port_mac_pair[0] for _port_mac_pair in _port_mac_pair_list if
-                                                 outbound_mac == _port_mac_pair[1]][0]  # outbound port
-                        # add port-macs-dict
-                        if outbound_port in port_macs_dict.keys():
-                            _mac_list: List[MacAddress] = port_macs_dict[outbound_port]
-                            if _dest_mac not in _mac_list:
-                                _mac_list.append(_dest_mac)
-                        else:
-                            port_macs_dict[outbound_port] = [_dest_mac]
-                        # add port-macs-dict
-                        if outbound_port in port_macs_dict.keys():
-                            _mac_list: List[MacAddress] = port_macs_dict[outbound_port]
-                            if _group_mac not in _mac_list:
-                                _mac_list.append(_group_mac)
-                        else:
-                            port_macs_dict[outbound_port] = [_group_mac]
-                        # add mac-ports-dict
-                        if _dest_mac in mac_ports_dict.keys():
-                            _port_list: List[PortNo] = mac_ports_dict[_dest_mac]
-                            if outbound_port not in _port_list:
-                                _port_list.append(outbound_port)
-                        else:
-                            mac_ports_dict[_dest_mac] = [outbound_port]
-                        # add mac-ports-dict
-                        if _group_mac in mac_ports_dict.keys():
-                            _port_list: List[PortNo] = mac_ports_dict[_group_mac]
+                        outbound_port: PortNo = node_mac_port_dict[node_id][outbound_mac]  # outbound port
+                        mac_ports_dict: Dict[MacAddress, List[PortNo]] = node_mac_ports_dict.setdefault(node_id, {})
+                        for mac in [_dest_mac, _group_mac]:
+                            _port_list: List[PortNo] = mac_ports_dict.setdefault(mac, [])
                             if outbound_port not in _port_list:
                                 _port_list.append(outbound_port)
-                        else:
-                            mac_ports_dict[_group_mac] = [outbound_port]
-        for mac, port_list in mac_ports_dict.items():
-            self.filtering_database.product_and_add_item(mac, port_list, MAG.MacAddressGenerator.parse_mac_type(mac))
+        return node_mac_ports_dict
 
 
 # gate-control-list-configuration-information
@@ -135,65 +131,58 @@ class GateControlListConfigurationInfo(ConfigurationInfo):
         #     self.edge_port_pair_list = []
         self.edge_port_pair_list = []
 
-    # TODO 这又是什么魔鬼代码
     def parse(self, **kwargs):
+        '''
+        gate control lists of egress edges of node, entries of each edge are swept from its merged allocation
+        blocks which are kept sorted by allocator
+        :param kwargs: graph, node_edge_mac_info, route_immediate_entity and ports
+        :return:
+        '''
         assert kwargs['graph']
         assert kwargs['node_edge_mac_info']
         assert kwargs['route_immediate_entity']
         graph: Graph = kwargs['graph']
         node_edge_mac_info: MAG.NodeEdgeMacInfo = kwargs['node_edge_mac_info']
         route_immediate_entity: RG.RouteImmediateEntity = kwargs['route_immediate_entity']
-        _port_mac_pair_list: List[Tuple[PortNo, MacAddress]] = \
-            node_edge_mac_info.node_mac_dict[self.switch_id].port_mac_pair_list
-        _edge_mac_dict: Dict[EdgeId, MAG.EdgeMacMapper] = node_edge_mac_info.edge_mac_dict
-        self.edge_port_pair_list = \
-            GateControlListConfigurationInfo.generate_edge_port_pair_list(
-                self.switch_id, node_edge_mac_info, route_immediate_entity)
-        for edge_id, edge in graph.edge_mapper.items():
+        self.edge_port_pair_list = GateControlListConfigurationInfo.generate_edge_port_pair_list(
+            self.switch_id, node_edge_mac_info, route_immediate_entity, ports=kwargs.get('ports'))
+        _edge_port_dict: Dict[EdgeId, PortNo] = self.get_edge_port_dict()
+        _edge_flows: Dict[EdgeId, Set[FlowId]] = graph.get_edge_flows()
+        for edge in graph.node_mapper[self.switch_id].out_edge:
+            edge_id: EdgeId = edge.edge_id
             _time_slot_allocator: TimeSlotAllocator = edge.time_slot_allocator
+            hyper_period: int = _time_slot_allocator.hyper_period  # planned hyper period if it is automatic
             _allocation_blocks_m: List[AllocationBlock] = _time_slot_allocator.allocation_blocks_m
-            gate_control_list: GateControlList = GateControlList()
-            port_no: PortNo = list(filter(lambda p: p[0] == edge_id, self.edge_port_pair_list))[0]
+            gate_control_list: GateControlList = self.create_gate_control_list()
+            port_no: PortNo = _edge_port_dict.get(edge_id)
             self.port_gate_control_list[port_no] = gate_control_list
             self.edge_gate_control_list[edge_id] = gate_control_list
-            hyper_period: float = config.GRAPH_CONFIG['hyper-period']
-            time: SimTime = SimTime(hyper_period)  # initial time length
-            gate_control_list_item: GateControlListItem = GateControlListItem(time, EXCLUSIVE_NON_TSN_GATE_STATES)
-            if _allocation_blocks_m.__len__() != 0:  # no block has been allocated
-                gate_control_list.add_item(gate_control_list_item)
-            else:
-                sorted_allocation_blocks_m: List[AllocationBlock] = \
-                    sorted(_allocation_blocks_m, key=lambda b: b.send_time_offset)
-                # note that the order of following code is very important
-                for i, block in enumerate(sorted_allocation_blocks_m):
-                    # the first one block
-                    if i == 0 and block.send_time_offset > 0:
-                        next_block: AllocationBlock = sorted_allocation_blocks_m[1]
-                        time = SimTime(next_block.send_time_offset)
-                        gate_control_list_item = GateControlListItem(time, EXCLUSIVE_NON_TSN_GATE_STATES)
-                        gate_control_list.add_item(gate_control_list_item)
-                    # the tsn block
-                    if block.flow_id != 0:
-                        # the block before tsn block
-                        if i >= 1 and sorted_allocation_blocks_m[i - 1].send_time_offset + \
-                                sorted_allocation_blocks_m[i - 1].interval < block.send_time_offset:
-                            time = block.send_time_offset - (sorted_allocation_blocks_m[i - 1].send_time_offset +
-                                                             sorted_allocation_blocks_m[i - 1].interval)
-                            gate_control_list_item = GateControlListItem(time, EXCLUSIVE_NON_TSN_GATE_STATES)
-                            gate_control_list.add_item(gate_control_list_item)
-                        time = block.interval
-                        gate_control_list_item = GateControlListItem(time, EXCLUSIVE_TSN_GATE_STATES)
-                        gate_control_list.add_item(gate_control_list_item)
-                    else:
-                        assert block.flow_id != 0
-                    # the last one block
-                    if i == sorted_allocation_blocks_m.__len__() - 1 and \
-                            sorted_allocation_blocks_m[i - 1].send_time_offset + \
-                            sorted_allocation_blocks_m[i - 1].interval < hyper_period:
-                        time = hyper_period - sorted_allocation_blocks_m[i - 1].send_time_offset + \
-                               sorted_allocation_blocks_m[i - 1].interval
-                        gate_control_list_item = GateControlListItem(time, EXCLUSIVE_NON_TSN_GATE_STATES)
-                        gate_control_list.add_item(gate_control_list_item)
+            if len(_edge_flows.get(edge_id, ())) == 0 or _allocation_blocks_m.__len__() == 0:  # no flow on edge
+                gate_control_list.add_items(np.array([hyper_period]), np.array([-1]), [], [])
+                continue
+            lowers: np.ndarray = np.fromiter((b.interval.lower for b in _allocation_blocks_m), dtype=np.int64,
+                                             count=len(_allocation_blocks_m))
+            if np.any(lowers[1:] < lowers[:-1]):
+                # merged blocks are sorted unless they are set from outside of allocator
+                _allocation_blocks_m = _time_slot_allocator.sort_allocation_blocks(_allocation_blocks_m)
+                lowers = np.sort(lowers, kind='stable')
+            uppers: np.ndarray = np.fromiter((b.interval.upper for b in _allocation_blocks_m), dtype=np.int64,
+                                             count=len(_allocation_blocks_m))
+            assert all(b.flow_id != 0 for b in _allocation_blocks_m)
+            lengths, indexes = sweep_gate_entries(lowers, uppers, _time_slot_allocator.time_slot_len, hyper_period)
+            gate_control_list.add_items(lengths, indexes, [b.flow_id for b in _allocation_blocks_m],
+                                        [b.phase for b in _allocation_blocks_m])
+            # TODO 处理首尾相连的情况
+
+    def create_gate_control_list(self) -> GateControlList:
+        return GateControlList()
+
+    def get_edge_port_dict(self) -> Dict[EdgeId, PortNo]:
+        # the first pair wins as a linear search over edge port pair list does
+        _edge_port_dict: Dict[EdgeId, PortNo] = {}
+        for edge_id, port_no in self.edge_port_pair_list:
+            _edge_port_dict.setdefault(edge_id, port_no)
+        return _edge_port_dict
 
     # TODO fix bugs here ! this is important
     @staticmethod
@@ -205,8 +194,7 @@ class GateControlListConfigurationInfo(ConfigurationInfo):
 
         for port in ports:
             mac: MacAddress = port.mac
-            edge_id: EdgeId = list(filter(lambda eid: node_edge_mac_info.edge_mac_dict[eid].mac_pair[0] == mac,
-                                          node_edge_mac_info.edge_mac_dict))[0]
+            edge_id: EdgeId = node_edge_mac_info.get_edge_by_mac(mac)
             edge_port_pair_list.append((edge_id, port.port_id))
 
         # edge_port_pair_set: Set[Tuple[EdgeId, PortNo]] = set()
@@ -254,86 +242,12 @@ class EnhancementGateControlListConfigurationInfo(GateControlListConfigurationIn
         #     self.port_enhancement_gate_control_list = []
         #     self.edge_enhancement_gate_control_list = []
 
-    # TODO 这又又是什么魔鬼代码
     def parse(self, **kwargs):
-        assert kwargs['graph']
-        assert kwargs['node_edge_mac_info']
-        assert kwargs['route_immediate_entity']
         assert kwargs['ports']
-        graph: Graph = kwargs['graph']
-        node_edge_mac_info: MAG.NodeEdgeMacInfo = kwargs['node_edge_mac_info']
-        route_immediate_entity: RG.RouteImmediateEntity = kwargs['route_immediate_entity']
-        ports: List[Port] = kwargs['ports']
-        _port_mac_pair_list: List[Tuple[PortNo, MacAddress]] = \
-            node_edge_mac_info.node_mac_dict[self.switch_id].port_mac_pair_list
-        _edge_mac_dict: Dict[EdgeId, MAG.EdgeMacMapper] = node_edge_mac_info.edge_mac_dict
-        self.edge_port_pair_list = GateControlListConfigurationInfo.generate_edge_port_pair_list(
-            self.switch_id, node_edge_mac_info, route_immediate_entity, ports=ports)
-        for edge_id, edge in graph.edge_mapper.items():
-            if edge.in_node.node_id != self.switch_id:
-                continue
-            _time_slot_allocator: TimeSlotAllocator = edge.time_slot_allocator
-            _allocation_blocks_m: List[AllocationBlock] = _time_slot_allocator.allocation_blocks_m
-            enhancement_gate_control_list: EnhancementGateControlList = EnhancementGateControlList()
-            port_no: PortNo = None
-            try:
-                port_no: PortNo = list(filter(lambda p: p[0] == edge_id, self.edge_port_pair_list))[0][1]# find port no
-            except:
-                print(edge_id)
-            self.port_gate_control_list[port_no] = enhancement_gate_control_list
-            self.edge_gate_control_list[edge_id] = enhancement_gate_control_list
-            hyper_period: float = config.GRAPH_CONFIG['hyper-period']
-            time: SimTime = SimTime(hyper_period)  # initial time length
-            enhancement_gate_control_list_item: EnhancementGateControlListItem = EnhancementGateControlListItem(
-                time, EXCLUSIVE_NON_TSN_GATE_STATES, FlowId(0), 0)
-            # if _allocation_blocks_m.__len__() != 0:  # no block has been allocated
-            if _allocation_blocks_m.__len__() == 0:  # no block has been allocated
-                enhancement_gate_control_list.add_item(enhancement_gate_control_list_item)
-            else:
-                # sort the block list based on send time offset
-                # sorted_allocation_blocks_m: List[AllocationBlock] = \
-                #     sorted(_allocation_blocks_m, key=lambda b: b.send_time_offset)
-                # sorted_allocation_blocks_m: List[AllocationBlock] = \
-                #     sorted(_allocation_blocks_m, key=lambda b: b.interval.lower)
-                sorted_allocation_blocks_m: List[AllocationBlock] = \
-                    _time_slot_allocator.sort_allocation_blocks(_allocation_blocks_m)
-                # note that the order of following code is very important
-                for i, block in enumerate(sorted_allocation_blocks_m):
-                    # the first one block
-                    # if i == 0 and block.send_time_offset > 0:
-                    if i == 0 and block.interval.lower > 0:
-                        next_block: AllocationBlock = sorted_allocation_blocks_m[0]
-                        # time = SimTime(next_block.send_time_offset)
-                        time = SimTime(next_block.interval.lower * _time_slot_allocator.time_slot_len)
-                        enhancement_gate_control_list_item = \
-                            EnhancementGateControlListItem(time, EXCLUSIVE_NON_TSN_GATE_STATES, FlowId(0), 0)
-                        enhancement_gate_control_list.add_item(enhancement_gate_control_list_item)
-                    # the tsn block
-                    if block.flow_id != 0:
-                        # the block before tsn block
-                        if i >= 1 and sorted_allocation_blocks_m[i - 1].interval.upper + 1 < block.interval.lower:
-                            time = \
-                                (block.interval.lower - (sorted_allocation_blocks_m[i - 1]).interval.upper - 1) * \
-                                _time_slot_allocator.time_slot_len
-                            enhancement_gate_control_list_item = \
-                                EnhancementGateControlListItem(time, EXCLUSIVE_NON_TSN_GATE_STATES, FlowId(0), 0)
-                            enhancement_gate_control_list.add_item(enhancement_gate_control_list_item)
-                        time = (block.interval.upper + 1 - block.interval.lower) * _time_slot_allocator.time_slot_len
-                        enhancement_gate_control_list_item = \
-                            EnhancementGateControlListItem(time, EXCLUSIVE_TSN_GATE_STATES, block.flow_id, block.phase)
-                        enhancement_gate_control_list.add_item(enhancement_gate_control_list_item)
-                    else:
-                        assert block.flow_id != 0
-                    # the last one block
-                    if i == sorted_allocation_blocks_m.__len__() - 1 \
-                            and (sorted_allocation_blocks_m[i].interval.upper + 1) * \
-                            _time_slot_allocator.time_slot_len < hyper_period:
-                        time = hyper_period - (sorted_allocation_blocks_m[i].interval.upper + 1) * \
-                               _time_slot_allocator.time_slot_len
-                        enhancement_gate_control_list_item = \
-                            EnhancementGateControlListItem(time, EXCLUSIVE_NON_TSN_GATE_STATES, FlowId(0), 0)
-                        enhancement_gate_control_list.add_item(enhancement_gate_control_list_item)
-                        # TODO 处理首尾相连的情况
+        super().parse(**kwargs)
+
+    def create_gate_control_list(self) -> GateControlList:
+        return EnhancementGateControlList()
 
 
 # used to configure tsn host
@@ -1,17 +1,29 @@
+from typing import Dict, List
+
 from src.net_envs.network_configurator.ConfigurationInfo import PortConfigurationInfo, \
     FilteringDatabaseConfigurationInfo
 from src.net_envs.network_configurator.NetworkDeviceConfigurator import NetworkDeviceConfigurator
 import src.utils.MacAddressGenerator as MAG
 import src.utils.RoutesGenerator as RG
 from src.net_envs.network_element.Switch import Switch
+from src.type import NodeId, MacAddress, PortNo
 
 
 class SwitchConfigurator(NetworkDeviceConfigurator):
     route_immediate_entity: RG.RouteImmediateEntity
+    node_mac_ports_dict: Dict[NodeId, Dict[MacAddress, List[PortNo]]]  # forwarding tables of all nodes
 
     def __init__(self, node_edge_mac_info: MAG.NodeEdgeMacInfo, route_immediate_entity: RG.RouteImmediateEntity):
         super().__init__(node_edge_mac_info)
         self.route_immediate_entity = route_immediate_entity
+        self.node_mac_ports_dict = None
+
+    def get_node_mac_ports_dict(self) -> Dict[NodeId, Dict[MacAddress, List[PortNo]]]:
+        # built once and shared by all switches configured by this configurator
+        if self.node_mac_ports_dict is None:
+            self.node_mac_ports_dict = FilteringDatabaseConfigurationInfo.build_node_mac_ports_dict(
+                self.node_edge_mac_info, self.route_immediate_entity)
+        return self.node_mac_ports_dict
 
     def configure(self, switch: Switch):
         # install NIC
@@ -23,5 +35,6 @@ class SwitchConfigurator(NetworkDeviceConfigurator):
         filtering_database_info: FilteringDatabaseConfigurationInfo = \
             FilteringDatabaseConfigurationInfo(switch.device_id)
         filtering_database_info.parse(
-            node_edge_mac_info=self.node_edge_mac_info, route_immediate_entity=self.route_immediate_entity)
+            node_edge_mac_info=self.node_edge_mac_info, route_immediate_entity=self.route_immediate_entity,
+            node_mac_ports_dict=self.get_node_mac_ports_dict())
         switch.set_filtering_database(filtering_database_info.filtering_database)
@@ -34,7 +34,8 @@ class TSNHostConfigurator(HostConfigurator):
             gate_control_list_configuration_info.parse(
                 graph=self.graph,
                 node_edge_mac_info=self.node_edge_mac_info,
-                route_immediate_entity=self.route_immediate_entity)
+                route_immediate_entity=self.route_immediate_entity,
+                ports=tsn_host.ports)
             tsn_host.port_gate_control_list = gate_control_list_configuration_info.port_gate_control_list
         else:
             enhancement_gate_control_list_configuration_info: EnhancementGateControlListConfigurationInfo = \
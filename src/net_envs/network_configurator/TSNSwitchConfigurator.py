@@ -1,6 +1,8 @@
 # use inheritance to implement tsn-switch-configurator
+from src import config
 from src.graph.Graph import Graph
-from src.net_envs.network_component.GateControlList import GateControlList, EnhancementGateControlList
+from src.net_envs.network_component.GateControlList import GateControlList, EnhancementGateControlList, \
+    GateControlListCompaction
 from src.net_envs.network_configurator.ConfigurationInfo import GateControlListConfigurationInfo, \
     EnhancementGateControlListConfigurationInfo
 from src.net_envs.network_configurator.SwitchConfigurator import SwitchConfigurator
@@ -13,12 +15,14 @@ from src.type import PortNo
 class TSNSwitchConfigurator(SwitchConfigurator):
     enhancement_enable: bool
     graph: Graph
+    compaction: GateControlListCompaction  # report of gcl compaction of all configured switches
 
     def __init__(self, node_edge_mac_info: MAG.NodeEdgeMacInfo, route_immediate_entity: RG.RouteImmediateEntity,
                  graph: Graph, enhancement_enable: bool = False):
         super().__init__(node_edge_mac_info, route_immediate_entity)
         self.enhancement_enable = enhancement_enable
         self.graph = graph
+        self.compaction = GateControlListCompaction()
 
     def configure(self, tsn_switch: TSNSwitch):
         assert self.graph, "instance variable 'graph' must be set"
@@ -32,7 +36,8 @@ class TSNSwitchConfigurator(SwitchConfigurator):
             gate_control_list_configuration_info.parse(
                 graph=self.graph,
                 node_edge_mac_info=self.node_edge_mac_info,
-                route_immediate_entity=self.route_immediate_entity)
+                route_immediate_entity=self.route_immediate_entity,
+                ports=tsn_switch.ports)
             tsn_switch.port_gate_control_list = gate_control_list_configuration_info.port_gate_control_list
         else:
             enhancement_gate_control_list_configuration_info: EnhancementGateControlListConfigurationInfo = \
@@ -44,6 +49,11 @@ class TSNSwitchConfigurator(SwitchConfigurator):
                 ports=tsn_switch.ports)
             tsn_switch.port_gate_control_list = enhancement_gate_control_list_configuration_info.port_gate_control_list
 
+        # compact gate control list
+        if config.XML_CONFIG['gcl-compaction']:
+            for gcl in tsn_switch.port_gate_control_list.values():
+                self.compaction.merge(gcl.compact(config.XML_CONFIG['gcl-min-gap']))
+
 
 # use decorator model to implement enhancement-tsn-switch-configurator,
 # note that decorator model is not equal to python decorator
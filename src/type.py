@@ -24,7 +24,8 @@ RELIABILITY_STRATEGY = Enum('RELIABILITY_STRATEGY', (
     'UNI_ROUTES_RELIABILITY_STRATEGY'))
 
 SCHEDULING_STRATEGY = Enum('SCHEDULING_STRATEGY', (
-    'LRF_REDUNDANT_SCHEDULING_STRATEGY'))
+    'LRF_REDUNDANT_SCHEDULING_STRATEGY',
+    'EXACT_REPAIR_SCHEDULING_STRATEGY'))
 
 ALLOCATING_STRATEGY = Enum('ALLOCATING_STRATEGY', (
     'AEAP_ALLOCATING_STRATEGY',
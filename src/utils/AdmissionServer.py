@@ -0,0 +1,305 @@
+import argparse
+import asyncio
+import bisect
+import json
+import logging
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Set, Tuple, Any
+
+from src.graph.Flow import Flow
+from src.graph.FlowStream import FlowReader, batched, record2flow
+from src.graph.SolutionStore import SolutionStore
+from src.graph.Solver import Solver, Solution
+
+logger = logging.getLogger(__name__)
+
+WRITE_OPS: List[str] = ['admit', 'admit_batch', 'withdraw']  # served by the single writer
+READ_OPS: List[str] = ['query', 'stats']  # served from the latest snapshot
+LATENCY_BUCKETS: List[float] = [1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 1e-1, 2.5e-1, 5e-1, 1.0]
+
+
+class LatencyHistogram:
+    buckets: List[float]  # upper bounds of buckets, [unit: s]
+    counts: List[int]  # counts of buckets, the last one counts latencies exceeding all bounds
+    count: int
+    sum: float
+
+    def __init__(self, buckets: List[float] = None):
+        self.buckets = LATENCY_BUCKETS if buckets is None else buckets
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, latency: float):
+        self.counts[bisect.bisect_left(self.buckets, latency)] += 1
+        self.count += 1
+        self.sum += latency
+
+    def quantile(self, q: float) -> float:
+        '''
+        upper bound of bucket which contains quantile q
+        :param q: quantile in [0, 1]
+        :return: latency bound, inf if quantile exceeds all buckets
+        '''
+        _rank: float = q * self.count
+        _n: int = 0
+        for _i, _c in enumerate(self.counts):
+            _n += _c
+            if _n >= _rank and _n != 0:
+                return self.buckets[_i] if _i < len(self.buckets) else float('inf')
+        return 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': {str(_b): _c for _b, _c in zip(self.buckets + ['inf'], self.counts)},
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99),
+        }
+
+
+def json2flow(d: Dict) -> Flow:
+    return record2flow(d)
+
+
+class AdmissionServer:
+    '''
+    long-running admission server over a json lines protocol, it keeps one solver warm in memory,
+    write requests are coalesced into batches applied by a single writer thread,
+    read requests are answered from the snapshot published after the last batch
+    '''
+    solver: Solver
+    batch_window: float  # time to wait for more write requests before applying a batch, [unit: s]
+    max_batch: int  # maximum number of write requests of a batch
+    snapshot: Dict  # read-only view of solution, replaced (never mutated) after every batch
+    histograms: Dict[str, LatencyHistogram]  # latency histograms per operation
+    batch_sizes: List[int]
+    __queue: asyncio.Queue
+    __executor: ThreadPoolExecutor
+    __writer_task: asyncio.Task
+    __server: asyncio.AbstractServer
+
+    def __init__(self, solver: Solver = None, batch_window: float = 0.002, max_batch: int = 64):
+        if solver is None:
+            raise RuntimeError('miss parameter "solver"')
+        self.solver = solver
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.histograms = {_op: LatencyHistogram() for _op in WRITE_OPS + READ_OPS}
+        self.batch_sizes = []
+        self.snapshot = self.take_snapshot()
+        self.__queue = None
+        self.__executor = None
+        self.__writer_task = None
+        self.__server = None
+
+    @classmethod
+    def from_solution_file(cls, filename: str, **kwargs) -> 'AdmissionServer':
+        solution: Solution = SolutionStore.load(filename)
+        return cls(Solver.from_solution(solution), **kwargs)
+
+    def take_snapshot(self) -> Dict:
+        _solution: Solution = self.solver.final_solution
+        _failure_flows: Set[int] = set(_solution.graph.failure_queue)
+        _failure_flows.update(_solution.failure_flows)
+        return {
+            'flows': {_f.flow_id: {'routes': _f.routes, 'admitted': _f.flow_id not in _failure_flows}
+                      for _f in _solution.flows},
+            'loads': {_eid: _e.time_slot_allocator.load for _eid, _e in _solution.graph.edge_mapper.items()},
+        }
+
+    def apply(self, request: Dict) -> Dict:
+        '''
+        apply one write request to solver, only called by the writer thread
+        :param request: write request
+        :return: response
+        '''
+        _op: str = request['op']
+        if _op == 'admit':
+            return {'admitted': self.solver.admit_flow(json2flow(request['flow']))}
+        elif _op == 'admit_batch':
+            return {'admitted': self.solver.admit_flows([json2flow(_d) for _d in request['flows']])}
+        else:
+            return {'withdrawn': self.solver.withdraw_flow(request['flow_id'])}
+
+    def apply_batch(self, requests: List[Dict]) -> Tuple[List[Dict], Dict]:
+        _responses: List[Dict] = []
+        for _request in requests:
+            try:
+                _response: Dict = self.apply(_request)
+                _response['ok'] = True
+            except Exception as e:
+                _response: Dict = {'ok': False, 'error': str(e)}
+            _responses.append(_response)
+        return _responses, self.take_snapshot()
+
+    def read(self, request: Dict) -> Dict:
+        _snapshot: Dict = self.snapshot
+        if request['op'] == 'stats':
+            return {'ok': True, 'latency': {_op: _h.to_dict() for _op, _h in self.histograms.items()},
+                    'batch_num': len(self.batch_sizes), 'request_num': sum(self.batch_sizes)}
+        if 'flow_id' in request:
+            _flow: Dict = _snapshot['flows'].get(request['flow_id'])
+            if _flow is None:
+                return {'ok': False, 'error': 'flow [{}] does not exist'.format(request['flow_id'])}
+            return dict(_flow, ok=True)
+        _loads: List[float] = list(_snapshot['loads'].values())
+        return {'ok': True,
+                'flow_num': len(_snapshot['flows']),
+                'admitted_flow_num': sum(1 for _f in _snapshot['flows'].values() if _f['admitted']),
+                'max_load': max(_loads) if len(_loads) != 0 else 0.0}
+
+    async def writer(self):
+        _loop = asyncio.get_running_loop()
+        while True:
+            _batch: List[Tuple[Dict, asyncio.Future]] = [await self.__queue.get()]
+            # coalesce requests arriving within batch window
+            _deadline: float = _loop.time() + self.batch_window
+            while len(_batch) < self.max_batch:
+                _timeout: float = _deadline - _loop.time()
+                if _timeout <= 0:
+                    break
+                try:
+                    _batch.append(await asyncio.wait_for(self.__queue.get(), _timeout))
+                except asyncio.TimeoutError:
+                    break
+            _requests: List[Dict] = [_r for _r, _ in _batch]
+            try:
+                _responses, _snapshot = await _loop.run_in_executor(self.__executor, self.apply_batch, _requests)
+            except Exception as e:
+                _responses, _snapshot = [{'ok': False, 'error': str(e)} for _ in _batch], self.snapshot
+            self.snapshot = _snapshot  # publish before answering, so clients read their own writes
+            self.batch_sizes.append(len(_batch))
+            for (_, _future), _response in zip(_batch, _responses):
+                _future.set_result(_response)
+
+    async def handle(self, request: Dict) -> Dict:
+        _op: str = request.get('op')
+        _start: float = time.perf_counter()
+        if _op in WRITE_OPS:
+            _future: asyncio.Future = asyncio.get_running_loop().create_future()
+            await self.__queue.put((request, _future))
+            _response: Dict = await _future
+        elif _op in READ_OPS:
+            _response: Dict = self.read(request)
+        else:
+            return {'ok': False, 'error': 'unknown operation "{}"'.format(_op)}
+        self.histograms[_op].observe(time.perf_counter() - _start)
+        return _response
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                _line: bytes = await reader.readline()
+                if not _line:
+                    break
+                _request: Any = None
+                try:
+                    _request = json.loads(_line)
+                    _response: Dict = await self.handle(_request)
+                except json.JSONDecodeError:
+                    _response: Dict = {'ok': False, 'error': 'malformed request'}
+                except Exception as e:
+                    # e.g. request is not an object or misses keys, connection keeps serving
+                    _response: Dict = {'ok': False, 'error': str(e)}
+                if isinstance(_request, dict) and 'id' in _request:
+                    _response['id'] = _request['id']
+                writer.write((json.dumps(_response) + '\n').encode())
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0, path: str = None) -> Any:
+        '''
+        start serving on tcp socket, or on unix socket if path is given
+        :param host:
+        :param port: 0 picks a free port
+        :param path: unix socket path
+        :return: bound socket address
+        '''
+        self.__queue = asyncio.Queue()
+        self.__executor = ThreadPoolExecutor(max_workers=1)  # single writer
+        self.__writer_task = asyncio.ensure_future(self.writer())
+        if path is not None:
+            self.__server = await asyncio.start_unix_server(self.handle_connection, path=path)
+        else:
+            self.__server = await asyncio.start_server(self.handle_connection, host=host, port=port)
+        _address: Any = self.__server.sockets[0].getsockname()
+        logger.info('admission server listens on %s', _address)
+        return _address
+
+    async def stop(self):
+        self.__server.close()
+        await self.__server.wait_closed()
+        self.__writer_task.cancel()
+        try:
+            await self.__writer_task
+        except asyncio.CancelledError:
+            pass
+        self.__executor.shutdown(wait=True)
+
+    async def serve_forever(self, host: str = '127.0.0.1', port: int = 0, path: str = None):
+        await self.start(host, port, path)
+        try:
+            await self.__server.serve_forever()
+        finally:
+            await self.stop()
+
+
+class AdmissionClient:
+    '''
+    blocking client of admission server, e.g. for load tests
+    '''
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, path: str = None):
+        if path is not None:
+            self.__socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.__socket.connect(path)
+        else:
+            self.__socket = socket.create_connection((host, port))
+        self.__file = self.__socket.makefile('rwb')
+
+    def request(self, request: Dict) -> Dict:
+        self.__file.write((json.dumps(request) + '\n').encode())
+        self.__file.flush()
+        return json.loads(self.__file.readline())
+
+    def replay(self, filename: str, batch_size: int = 64) -> List[int]:
+        '''
+        admit a recorded flow trace written by FlowWriter, records are sent batch by batch as they are read
+        :param filename: flow trace
+        :param batch_size: number of flows of each admit_batch request
+        :return: id list of admitted flows
+        '''
+        _admitted: List[int] = []
+        for _records in batched(FlowReader(filename).records(), batch_size):
+            _response: Dict = self.request({'op': 'admit_batch', 'flows': _records})
+            if not _response['ok']:
+                raise RuntimeError(_response['error'])
+            _admitted += _response['admitted']
+        return _admitted
+
+    def close(self):
+        self.__file.close()
+        self.__socket.close()
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description='serve incremental flow admission on a saved solution')
+    parser.add_argument('--solution', required=True, help='saved solution, e.g. one of res/solutions')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7000)
+    parser.add_argument('--unix', default=None, help='serve on unix socket instead of tcp')
+    parser.add_argument('--batch-window', type=float, default=0.002)
+    parser.add_argument('--max-batch', type=int, default=64)
+    args = parser.parse_args(argv)
+    server: AdmissionServer = AdmissionServer.from_solution_file(args.solution, batch_window=args.batch_window,
+                                                                 max_batch=args.max_batch)
+    asyncio.run(server.serve_forever(args.host, args.port, args.unix))
+
+
+if __name__ == '__main__':
+    main()
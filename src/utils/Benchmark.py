@@ -0,0 +1,340 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import zlib
+from typing import List, Dict, Callable, Any, Tuple
+
+import numpy as np
+
+from src import config
+
+logger = logging.getLogger(__name__)
+
+# parameter grids of benchmark suites, 'quick' is meant for every change, 'full' for nightly runs
+SUITES: Dict[str, Dict[str, List]] = {
+    'quick': {
+        'allocator-flow-num': [10, 20],
+        'flow-num': [10],
+        'core-node-num': [10],
+        'topo-strategy': ['ER', 'RRG'],
+        'repeat': [3],
+    },
+    'full': {
+        'allocator-flow-num': [10, 20, 30],
+        'flow-num': [10, 50, 100],
+        'core-node-num': [10, 20],
+        'topo-strategy': ['ER', 'BA', 'RRG', 'WS'],
+        'repeat': [5],
+    },
+}
+
+
+class BenchmarkCase:
+    name: str  # name of measured hot path
+    params: Dict  # workload parameters
+    setup: Callable[[], Any]  # build a fresh workload, not measured
+    func: Callable[[Any], Any]  # measured function, receives the workload built by setup
+
+    def __init__(self, name: str, params: Dict, setup: Callable[[], Any], func: Callable[[Any], Any]):
+        self.name = name
+        self.params = params
+        self.setup = setup
+        self.func = func
+
+    @property
+    def key(self) -> str:
+        return self.name + json.dumps(self.params, sort_keys=True)
+
+    @property
+    def seed(self) -> int:
+        return zlib.crc32(self.key.encode())
+
+
+def seed_all(seed: int):
+    random.seed(seed)
+    np.random.seed(seed % (2 ** 32))
+
+
+def build_topology(topo: str, core_node_num: int, edge_node_num: int):
+    '''
+    build core topology and attach edge nodes, random state must be seeded by caller
+    :param topo: abbreviation of topology strategy, i.e. ER, BA, RRG or WS
+    :param core_node_num: number of core nodes
+    :param edge_node_num: number of edge nodes
+    :return: networkx graph and edge nodes
+    '''
+    from src.graph.TopoGenerator import TopoGenerator
+    from src.graph.topo_strategy.TopoStrategyFactory import TopoStrategyFactory
+    _entities: Dict[str, Dict] = {str(_e['strategy']).split('.')[-1].replace('_STRATEGY', ''): _e
+                                  for _e in config.GRAPH_CONFIG['topo-strategy']}
+    _entity: Dict = dict(_entities[topo])
+    _entity['n'] = core_node_num
+    topo_generator: TopoGenerator = TopoGenerator()
+    topo_generator.topo_strategy = TopoStrategyFactory.get_instance(**_entity)
+    graph = topo_generator.generate_core_topo()
+    edge_nodes = topo_generator.attach_edge_nodes(graph, edge_node_num)
+    return graph, edge_nodes
+
+
+def build_solver(topo: str, core_node_num: int, flow_num: int, reliability_strategy=None):
+    from src.graph.FlowGenerator import FlowGenerator
+    from src.graph.Solver import Solver
+    from src.type import TOPO_STRATEGY, ROUTING_STRATEGY, SCHEDULING_STRATEGY, ALLOCATING_STRATEGY, \
+        RELIABILITY_STRATEGY
+    graph, edge_nodes = build_topology(topo, core_node_num, config.GRAPH_CONFIG['edge-node-num'])
+    flows = FlowGenerator.generate_flows(edge_nodes=edge_nodes, graph=graph, flow_num=flow_num)
+    return Solver(nx_graph=graph,
+                  flows=flows,
+                  topo_strategy=getattr(TOPO_STRATEGY, '{}_STRATEGY'.format(topo)),
+                  routing_strategy=ROUTING_STRATEGY.BACKTRACKING_REDUNDANT_ROUTING_STRATEGY,
+                  scheduling_strategy=SCHEDULING_STRATEGY.LRF_REDUNDANT_SCHEDULING_STRATEGY,
+                  allocating_strategy=ALLOCATING_STRATEGY.AEAP_ALLOCATING_STRATEGY,
+                  reliability_strategy=reliability_strategy if reliability_strategy is not None else
+                  RELIABILITY_STRATEGY.MULTI_ROUTES_RELIABILITY_STRATEGY)
+
+
+def build_allocator_flows(flow_num: int) -> Tuple[Any, List]:
+    from src.graph.Flow import Flow
+    from src.graph.TimeSlotAllocator import TimeSlotAllocator
+    _allocator: TimeSlotAllocator = TimeSlotAllocator(1, hp=config.GRAPH_CONFIG['hyper-period'], b=1)
+    _flows: List[Flow] = []
+    for _fid in range(1, flow_num + 1):
+        _size: int = random.choice(config.FLOW_CONFIG['size-set'])
+        _period: int = random.choice(config.FLOW_CONFIG['period-set'])
+        _flows.append(Flow(_fid, _size, _period, 0, [1], 0.9, int(1e8)))
+    return _allocator, _flows
+
+
+def allocate_all(strategy, allocator, flows: List):
+    for _flow in flows:
+        strategy.allocate(_flow, allocator, random.randrange(0, allocator.hyper_period, allocator.time_slot_len))
+
+
+def generate_cases(suite: str = 'quick') -> List[BenchmarkCase]:
+    '''
+    generate fixed-seed benchmark cases of suite
+    :param suite: name of suite
+    :return: benchmark cases
+    '''
+    from math import ceil
+    from src.graph.allocating_strategy.AllocatingStrategyFactory import AllocatingStrategyFactory
+    from src.graph.reliability_strategy.ReliabilityStrategyFactory import ReliabilityStrategyFactory
+    from src.graph.routing_strategy.RoutingStrategyFactory import RoutingStrategyFactory
+    from src.type import ALLOCATING_STRATEGY, RELIABILITY_STRATEGY, ROUTING_STRATEGY
+    if suite not in SUITES.keys():
+        raise RuntimeError('benchmark suite "{}" does not exist'.format(suite))
+    _grid: Dict[str, List] = SUITES[suite]
+    _cases: List[BenchmarkCase] = []
+
+    # time slot allocator
+    for _n in _grid['allocator-flow-num']:
+        def _setup_try_allocate(n=_n):
+            _allocator, _flows = build_allocator_flows(n)
+            allocate_all(AllocatingStrategyFactory.get_instance(ALLOCATING_STRATEGY.AEAP_ALLOCATING_STRATEGY),
+                         _allocator, _flows)
+            return _allocator
+
+        def _try_allocate(allocator):
+            _allocation_num: int = ceil(config.FLOW_CONFIG['size-set'][0] / allocator.time_slot_len)
+            for _t in range(0, allocator.hyper_period, allocator.time_slot_len * 4):
+                allocator.try_allocate(_t, 0, _allocation_num, 1, allocator.hyper_period)
+
+        _cases.append(BenchmarkCase('allocator.try_allocate', {'flow-num': _n}, _setup_try_allocate, _try_allocate))
+        for _strategy in ALLOCATING_STRATEGY:
+            def _setup_allocate(n=_n, strategy=_strategy):
+                _allocator, _flows = build_allocator_flows(n)
+                return AllocatingStrategyFactory.get_instance(strategy), _allocator, _flows
+
+            _cases.append(BenchmarkCase('allocating_strategy.allocate',
+                                        {'flow-num': _n, 'strategy': _strategy.name},
+                                        _setup_allocate, lambda w: allocate_all(*w)))
+
+    for _topo in _grid['topo-strategy']:
+        for _core_node_num in _grid['core-node-num']:
+            for _flow_num in _grid['flow-num']:
+                _params: Dict = {'topo': _topo, 'core-node-num': _core_node_num, 'flow-num': _flow_num}
+
+                # backtracking routing
+                def _setup_routing(topo=_topo, core_node_num=_core_node_num, flow_num=_flow_num):
+                    _solver = build_solver(topo, core_node_num, flow_num)
+                    _graph = _solver.final_solution.graph
+                    _routing_strategy = RoutingStrategyFactory.get_instance(
+                        ROUTING_STRATEGY.BACKTRACKING_REDUNDANT_ROUTING_STRATEGY, _graph)
+                    _routing_strategy.reliability_strategy = ReliabilityStrategyFactory.get_instance(
+                        RELIABILITY_STRATEGY.MULTI_ROUTES_RELIABILITY_STRATEGY, _graph)
+                    return _routing_strategy, [_flow.flow_id for _flow in _solver.final_solution.flows]
+
+                _cases.append(BenchmarkCase('routing.backtracking', _params, _setup_routing,
+                                            lambda w: w[0].route(w[1])))
+
+                # reliability of redundant routes
+                def _setup_reliability(topo=_topo, core_node_num=_core_node_num, flow_num=_flow_num):
+                    _solver = build_solver(topo, core_node_num, flow_num)
+                    _graph = _solver.final_solution.graph
+                    _routing_strategy = RoutingStrategyFactory.get_instance(
+                        ROUTING_STRATEGY.BACKTRACKING_REDUNDANT_ROUTING_STRATEGY, _graph)
+                    _routing_strategy.reliability_strategy = ReliabilityStrategyFactory.get_instance(
+                        RELIABILITY_STRATEGY.MULTI_ROUTES_RELIABILITY_STRATEGY, _graph)
+                    _routing_strategy.route([_flow.flow_id for _flow in _solver.final_solution.flows])
+                    _routes: List[Tuple] = []
+                    for _flow in _solver.final_solution.flows:
+                        for _o2o_routes in _flow.routes:
+                            if len(_o2o_routes) != 0:
+                                _dest = _graph.edge_mapper[_o2o_routes[0][-1]].out_node.node_id
+                                _routes.append((_o2o_routes, _flow.source, _dest))
+                    return _routing_strategy.reliability_strategy, _routes
+
+                def _reliability(workload):
+                    for _o2o_routes, _src, _dest in workload[1]:
+                        workload[0].compute_e2e_reliability(_o2o_routes, _src, _dest)
+
+                _cases.append(BenchmarkCase('reliability.compute_e2e_reliability', _params, _setup_reliability,
+                                            _reliability))
+
+                # whole solver
+                def _setup_solver(topo=_topo, core_node_num=_core_node_num, flow_num=_flow_num):
+                    return build_solver(topo, core_node_num, flow_num)
+
+                _cases.append(BenchmarkCase('solver.generate_init_solution', _params, _setup_solver,
+                                            lambda s: s.generate_init_solution()))
+
+                def _setup_optimize(topo=_topo, core_node_num=_core_node_num, flow_num=_flow_num):
+                    _solver = build_solver(topo, core_node_num, flow_num)
+                    _solver.generate_init_solution()
+                    return _solver
+
+                _cases.append(BenchmarkCase('solver.optimize', _params, _setup_optimize,
+                                            lambda s: s.optimize(max_iterations=2, max_no_improve=2)))
+    return _cases
+
+
+class Benchmark:
+    cases: List[BenchmarkCase]
+    repeat: int  # repetitions of every case, statistics are computed over them
+
+    def __init__(self, cases: List[BenchmarkCase] = None, repeat: int = 3):
+        self.cases = [] if cases is None else cases
+        self.repeat = repeat
+
+    def run_case(self, case: BenchmarkCase) -> Dict:
+        _times: List[float] = []
+        for _i in range(self.repeat):
+            # every repetition gets the same workload
+            seed_all(case.seed)
+            _workload: Any = case.setup()
+            _start: float = time.perf_counter()
+            case.func(_workload)
+            _times.append(time.perf_counter() - _start)
+        return {
+            'name': case.name,
+            'params': case.params,
+            'key': case.key,
+            'repeat': self.repeat,
+            'min': min(_times),
+            'median': statistics.median(_times),
+            'mean': statistics.mean(_times),
+            'stdev': statistics.stdev(_times) if len(_times) > 1 else 0.0,
+        }
+
+    def run(self, pattern: str = None) -> Dict:
+        '''
+        run benchmark cases
+        :param pattern: only run cases whose name contains pattern
+        :return: benchmark report
+        '''
+        _results: List[Dict] = []
+        for _case in self.cases:
+            if pattern is not None and pattern not in _case.name:
+                continue
+            _result: Dict = self.run_case(_case)
+            logger.info('%s %s: median %.6fs', _case.name, _case.params, _result['median'])
+            _results.append(_result)
+        return {
+            'meta': {
+                'python': sys.version.split()[0],
+                'platform': platform.platform(),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            },
+            'results': _results,
+        }
+
+
+def save_report(report: Dict, filename: str):
+    _dirname: str = os.path.dirname(filename)
+    if _dirname != '' and not os.path.exists(_dirname):
+        os.makedirs(_dirname)
+    with open(filename, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def load_report(filename: str) -> Dict:
+    with open(filename, 'r') as f:
+        return json.load(f)
+
+
+def compare_reports(report: Dict, baseline: Dict, threshold: float = 0.2, metric: str = 'median') -> List[Dict]:
+    '''
+    compare benchmark report against baseline, cases missing on either side are ignored
+    :param report: current report
+    :param baseline: baseline report
+    :param threshold: relative slowdown which is treated as regression, e.g. 0.2 means 20% slower
+    :param metric: statistic to compare
+    :return: comparison of every common case
+    '''
+    _baseline_results: Dict[str, Dict] = {_r['key']: _r for _r in baseline['results']}
+    _comparison: List[Dict] = []
+    for _r in report['results']:
+        if _r['key'] not in _baseline_results:
+            continue
+        _base: float = _baseline_results[_r['key']][metric]
+        _ratio: float = _r[metric] / _base if _base > 0 else float('inf')
+        _comparison.append({
+            'name': _r['name'],
+            'params': _r['params'],
+            'baseline': _base,
+            'current': _r[metric],
+            'ratio': _ratio,
+            'regression': _ratio > 1 + threshold,
+        })
+    return _comparison
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='benchmark hot paths of allocator, router, reliability and solver')
+    parser.add_argument('--suite', default='quick', choices=list(SUITES.keys()))
+    parser.add_argument('--filter', default=None, help='only run cases whose name contains this pattern')
+    parser.add_argument('--output', default=os.path.join(config.benchmark_res_dir, 'current.json'))
+    parser.add_argument('--baseline', default=None, help='baseline report to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2)
+    parser.add_argument('--save-baseline', action='store_true', help='store report as baseline instead of output')
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)  # keep solver logs out of measurements
+    _benchmark: Benchmark = Benchmark(generate_cases(args.suite), repeat=SUITES[args.suite]['repeat'][0])
+    _report: Dict = _benchmark.run(args.filter)
+    _report['meta']['suite'] = args.suite
+    logging.disable(logging.NOTSET)
+    if args.save_baseline:
+        save_report(_report, os.path.join(config.benchmark_res_dir, 'baseline.json'))
+    else:
+        save_report(_report, args.output)
+    _regressions: int = 0
+    if args.baseline is not None:
+        for _c in compare_reports(_report, load_report(args.baseline), threshold=args.threshold):
+            _regressions += int(_c['regression'])
+            print('{:<40} {:<70} {:>10.6f} {:>10.6f} {:>6.2f}x{}'.format(
+                _c['name'], json.dumps(_c['params']), _c['baseline'], _c['current'], _c['ratio'],
+                ' REGRESSION' if _c['regression'] else ''))
+    else:
+        for _r in _report['results']:
+            print('{:<40} {:<70} {:>10.6f}'.format(_r['name'], json.dumps(_r['params']), _r['median']))
+    return 1 if _regressions != 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,17 +1,17 @@
 import copy
+import functools
+import io
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
 from enum import Enum
-from typing import List, Dict, Tuple
-
-import jinja2
+from typing import List, Dict, Tuple, Set, Iterable, Iterator, Union, BinaryIO, Callable
 
 from src import config
 from src.graph.Flow import Flow
 from src.graph.Solver import Solution
 from src.net_envs.network.TSNNetwork import TSNNetwork
-from lxml import html
-
 from src.net_envs.network_component.FilteringDatabase import FilteringDatabase
 from src.net_envs.network_component.GateControlList import EnhancementGateControlList, GateControlList, \
     GateControlListItem, EnhancementGateControlListItem
@@ -22,21 +22,46 @@ from src.net_envs.network_element.TSNHost import TSNHost, TSNFlowInfo
 from src.net_envs.network_element.TSNSwitch import TSNSwitch
 from src.type import NodeId, MacAddress, PortNo, SimTime, FlowId, EdgeId
 import src.utils.MacAddressGenerator as MAG
+from src.utils.ScenarioWriter import ScenarioWriter
+from src.utils.logs import dump_enabled
 
-etree = html.etree  # ???
 logger = logging.getLogger(__name__)
 
+INI_TEMPLATE: str = 'test_scenario_template.ini'
+NED_TEMPLATE: str = 'test_scenario_template.ned'
+
+_templates: Dict[Tuple[str, int], object] = {}  # compiled templates, Dict[(path, mtime), template]
+_environments: Dict[str, object] = {}  # jinja2 environments, Dict[template directory, environment]
+_template_lock: threading.Lock = threading.Lock()
+
 
 class ConfigFileGenerator:
 
     @staticmethod
     def generate_routes_xml(tsn_network: TSNNetwork) -> str:
+        routes_content: str = xml2str(ConfigFileGenerator.write_routes_xml, tsn_network)
+        if dump_enabled(logger):
+            logger.info('\n%s', routes_content)
+        return routes_content
+
+    @staticmethod
+    def write_routes_xml(tsn_network: TSNNetwork, file: Union[str, BinaryIO]):
+        '''
+        write filtering databases of switches into file incrementally, one switch at a time
+        :param tsn_network:
+        :param file: filename or binary file
+        :return:
+        '''
+        write_xml(file, 'filteringDatabases', ConfigFileGenerator._routes_xml_elements(tsn_network))
+
+    @staticmethod
+    def _routes_xml_elements(tsn_network: TSNNetwork) -> Iterator:
+        from lxml import etree
         tsn_switch_list: List[TSNSwitch] = tsn_network.tsn_switch_list
-        root: etree.Element = etree.Element('filteringDatabases')
         for tsn_switch in tsn_switch_list:
             tsn_switch_id: NodeId = tsn_switch.device_id
             filtering_database: FilteringDatabase = tsn_switch.filtering_database
-            xml_filtering_database: etree.Element = etree.SubElement(root, 'filteringDatabase')
+            xml_filtering_database: etree.Element = etree.Element('filteringDatabase')
             xml_filtering_database.attrib['id'] = 'switch{}'.format(tsn_switch_id)
             if filtering_database.static is True:
                 xml_static: etree.Element = etree.SubElement(xml_filtering_database, 'static')
@@ -64,38 +89,59 @@ class ConfigFileGenerator:
             else:
                 # TODO non-static situation
                 pass
-        routes_content: str = str(
-            etree.tostring(root, pretty_print=True, xml_declaration=True, encoding='utf-8'), encoding='utf-8')
-        logger.info('\n' + routes_content)
-        return routes_content
+            yield xml_filtering_database
 
     @staticmethod
-    # TODO flat and hierarchical xml
-    def generate_switch_schedule_xml(tsn_network: TSNNetwork) -> str:
-        tsn_switch_list: List[TSNSwitch] = tsn_network.tsn_switch_list
-        # <root></root>
-        root: etree.Element = etree.Element('schedule')
+    def _time_comment():
+        from lxml import etree
         # <!--time-->
         if config.GRAPH_CONFIG['time-granularity'] is config.TIME_GRANULARITY.NS:
-            xml_time_comment: etree.Comment = etree.Comment('ns')
+            return etree.Comment('ns')
         elif config.GRAPH_CONFIG['time-granularity'] is config.TIME_GRANULARITY.US:
-            xml_time_comment: etree.Comment = etree.Comment('us')
+            return etree.Comment('us')
         elif config.GRAPH_CONFIG['time-granularity'] is config.TIME_GRANULARITY.MS:
-            xml_time_comment: etree.Comment = etree.Comment('ms')
+            return etree.Comment('ms')
         elif config.GRAPH_CONFIG['time-granularity'] is config.TIME_GRANULARITY.S:
-            xml_time_comment: etree.Comment = etree.Comment('s')
+            return etree.Comment('s')
         else:
             raise RuntimeError('unknown time type')
-        root.append(copy.copy(xml_time_comment))
+
+    @staticmethod
+    # TODO flat and hierarchical xml
+    def generate_switch_schedule_xml(tsn_network: TSNNetwork, hyper_period: int = None) -> str:
+        schedule_switch_content: str = xml2str(
+            functools.partial(ConfigFileGenerator.write_switch_schedule_xml, hyper_period=hyper_period), tsn_network)
+        if dump_enabled(logger):
+            logger.info('\n%s', schedule_switch_content)
+        return schedule_switch_content
+
+    @staticmethod
+    def write_switch_schedule_xml(tsn_network: TSNNetwork, file: Union[str, BinaryIO], hyper_period: int = None):
+        '''
+        write gate control lists of switches into file incrementally, one switch at a time
+        :param tsn_network:
+        :param file: filename or binary file
+        :param hyper_period: cycle of gate control lists, i.e. hyper period of graph, default is the configured one
+        :return:
+        '''
+        if hyper_period is None:
+            hyper_period = config.GRAPH_CONFIG['hyper-period']
+        write_xml(file, 'schedule', ConfigFileGenerator._switch_schedule_xml_elements(tsn_network, hyper_period))
+
+    @staticmethod
+    def _switch_schedule_xml_elements(tsn_network: TSNNetwork, hyper_period: int) -> Iterator:
+        from lxml import etree
+        tsn_switch_list: List[TSNSwitch] = tsn_network.tsn_switch_list
+        xml_time_comment: etree.Comment = ConfigFileGenerator._time_comment()
+        yield copy.copy(xml_time_comment)
         # <cycle></cycle>
         xml_cycle: etree.Element = etree.Element('cycle')
-        xml_cycle.text = str(config.GRAPH_CONFIG['hyper-period'])
-        root.append(xml_cycle)
+        xml_cycle.text = str(hyper_period)
+        yield xml_cycle
         for tsn_switch in tsn_switch_list:
             # <switch></switch>
             xml_switch: etree.Element = etree.Element('switch')
             xml_switch.attrib['name'] = 'switch{}'.format(tsn_switch.device_id)
-            root.append(xml_switch)
             # if tsn_switch.port_gate_control_list.__len__() == 0:  # this port has no gcl
             #     break
             for port_no, gcl in tsn_switch.port_gate_control_list.items():
@@ -127,10 +173,7 @@ class ConfigFileGenerator:
                         xml_phase: etree.Element = etree.Element('phase')
                         xml_phase.text = str(gcl_item.phase)
                         xml_entry.append(xml_phase)
-        schedule_switch_content: str = str(
-            etree.tostring(root, pretty_print=True, xml_declaration=True, encoding='utf-8'), encoding='utf-8')
-        logger.info('\n' + schedule_switch_content)
-        return schedule_switch_content
+            yield xml_switch
 
     @staticmethod
     def generate_host_schedule_xml(tsn_network: TSNNetwork) -> Dict[NodeId, Dict[FlowId, str]]:
@@ -141,74 +184,83 @@ class ConfigFileGenerator:
             #     break
             flows_content: Dict[FlowId, str] = {}
             for tsn_flow_info in tsn_host.tsn_flow_info_list:
-                # <root></root>
-                root: etree.Element = etree.Element('schedule')
-                # <!--time-->
-                if config.GRAPH_CONFIG['time-granularity'] is config.TIME_GRANULARITY.NS:
-                    xml_time_comment: etree.Comment = etree.Comment('ns')
-                elif config.GRAPH_CONFIG['time-granularity'] is config.TIME_GRANULARITY.US:
-                    xml_time_comment: etree.Comment = etree.Comment('us')
-                elif config.GRAPH_CONFIG['time-granularity'] is config.TIME_GRANULARITY.MS:
-                    xml_time_comment: etree.Comment = etree.Comment('ms')
-                elif config.GRAPH_CONFIG['time-granularity'] is config.TIME_GRANULARITY.S:
-                    xml_time_comment: etree.Comment = etree.Comment('s')
-                else:
-                    raise RuntimeError('unknown time type')
-                root.append(copy.copy(xml_time_comment))
-                # <cycle></cycle>
-                xml_cycle: etree.Element = etree.Element('cycle')
-                xml_cycle.text = str(tsn_flow_info.cycle_time)
-                root.append(xml_cycle)
-                # <!-- flow-id=fid -->
-                xml_flow_id_comment: etree.Comment = etree.Comment('flow-id={}'.format(tsn_flow_info.flow_id))
-                root.append(xml_flow_id_comment)
-                # <host></host>
-                xml_host: etree.Element = etree.Element('host')
-                xml_host.attrib['name'] = 'host{}'.format(tsn_host.device_id)
-                root.append(xml_host)
-                xml_entry: etree.Element = etree.Element('entry')
-                xml_host.append(xml_entry)
-                # <start></start>
-                xml_start: etree.Element = etree.Element('start')
-                xml_start.text = str(tsn_flow_info.start_time)
-                xml_entry.append(xml_start)
-                # <queue></queue>
-                xml_queue: etree.Element = etree.Element('queue')
-                xml_queue.text = str(tsn_flow_info.queue)
-                xml_entry.append(xml_queue)
-                # <dest></dest>
-                xml_dest: etree.Element = etree.Element('dest')
-                xml_dest.text = str(tsn_flow_info.dest_mac)
-                xml_entry.append(xml_dest)
-                # <size></size>
-                xml_size: etree.Element = etree.Element('size')
-                xml_size.text = str(int(tsn_flow_info.size / 8) - 50)  # TODO bit to byte and reduce overhead
-                xml_entry.append(xml_size)
-                # enhancement part
-                # <group></group>
-                xml_group: etree.Element = etree.Element('group')
-                xml_group.text = str(tsn_flow_info.group_mac)  # TODO get group mac
-                xml_entry.append(xml_group)
-                # <uniqueID></uniqueID>
-                xml_uniqueID: etree.Element = etree.Element('uniqueID')
-                xml_uniqueID.text = str(tsn_flow_info.flow_id)
-                xml_entry.append(xml_uniqueID)
-                # <phase></phase>
-                xml_phase: etree.Element = etree.Element('phase')
-                xml_phase.text = str(0)
-                xml_entry.append(xml_phase)
-                #
-                flow_content: str = str(
-                    etree.tostring(root, pretty_print=True, xml_declaration=True, encoding='utf-8'), encoding='utf-8')
+                flow_content: str = xml2str(ConfigFileGenerator.write_flow_schedule_xml, tsn_host, tsn_flow_info)
                 flows_content[tsn_flow_info.flow_id] = flow_content
-                logger.info('\n' + flow_content)
+                if dump_enabled(logger):
+                    logger.info('\n%s', flow_content)
             hosts_content[tsn_host.device_id] = flows_content
         return hosts_content
 
+    @staticmethod
+    def write_flow_schedule_xml(tsn_host: TSNHost, tsn_flow_info: TSNFlowInfo, file: Union[str, BinaryIO]):
+        write_xml(file, 'schedule', ConfigFileGenerator._flow_schedule_xml_elements(tsn_host, tsn_flow_info))
+
+    @staticmethod
+    def _flow_schedule_xml_elements(tsn_host: TSNHost, tsn_flow_info: TSNFlowInfo) -> Iterator:
+        from lxml import etree
+        yield ConfigFileGenerator._time_comment()
+        # <cycle></cycle>
+        xml_cycle: etree.Element = etree.Element('cycle')
+        xml_cycle.text = str(tsn_flow_info.cycle_time)
+        yield xml_cycle
+        # <!-- flow-id=fid -->
+        yield etree.Comment('flow-id={}'.format(tsn_flow_info.flow_id))
+        # <host></host>
+        xml_host: etree.Element = etree.Element('host')
+        xml_host.attrib['name'] = 'host{}'.format(tsn_host.device_id)
+        xml_entry: etree.Element = etree.Element('entry')
+        xml_host.append(xml_entry)
+        # <start></start>
+        xml_start: etree.Element = etree.Element('start')
+        xml_start.text = str(tsn_flow_info.start_time)
+        xml_entry.append(xml_start)
+        # <queue></queue>
+        xml_queue: etree.Element = etree.Element('queue')
+        xml_queue.text = str(tsn_flow_info.queue)
+        xml_entry.append(xml_queue)
+        # <dest></dest>
+        xml_dest: etree.Element = etree.Element('dest')
+        xml_dest.text = str(tsn_flow_info.dest_mac)
+        xml_entry.append(xml_dest)
+        # <size></size>
+        xml_size: etree.Element = etree.Element('size')
+        xml_size.text = str(int(tsn_flow_info.size / 8) - 50)  # TODO bit to byte and reduce overhead
+        xml_entry.append(xml_size)
+        # enhancement part
+        # <group></group>
+        xml_group: etree.Element = etree.Element('group')
+        xml_group.text = str(tsn_flow_info.group_mac)  # TODO get group mac
+        xml_entry.append(xml_group)
+        # <uniqueID></uniqueID>
+        xml_uniqueID: etree.Element = etree.Element('uniqueID')
+        xml_uniqueID.text = str(tsn_flow_info.flow_id)
+        xml_entry.append(xml_uniqueID)
+        # <phase></phase>
+        xml_phase: etree.Element = etree.Element('phase')
+        xml_phase.text = str(0)
+        xml_entry.append(xml_phase)
+        yield xml_host
+
     @staticmethod
     def generate_flows_xml(flows: List[Flow]) -> str:
-        # <flows></flows>
-        root_xml: etree.Element = etree.Element('flows')
+        flows_xml_str: str = xml2str(ConfigFileGenerator.write_flows_xml, flows)
+        if dump_enabled(logger):
+            logger.info('\n%s', flows_xml_str)
+        return flows_xml_str
+
+    @staticmethod
+    def write_flows_xml(flows: Iterable[Flow], file: Union[str, BinaryIO]):
+        '''
+        write flows into file incrementally, flows can be a lazy iterable, e.g., FlowReader
+        :param flows:
+        :param file: filename or binary file
+        :return:
+        '''
+        write_xml(file, 'flows', ConfigFileGenerator._flows_xml_elements(flows))
+
+    @staticmethod
+    def _flows_xml_elements(flows: Iterable[Flow]) -> Iterator:
+        from lxml import etree
         for flow in flows:
             flow_xml: etree.Element = etree.Element('flow')
             flow_xml.attrib['id'] = str(flow.flow_id)
@@ -222,23 +274,30 @@ class ConfigFileGenerator:
             flow_xml.attrib['cycle'] = str(flow.period)
             flow_xml.attrib['deadline'] = str(flow.deadline)
             flow_xml.attrib['reliability'] = str(flow.reliability)
-            root_xml.append(flow_xml)
-        # TODO save to file
-
-        flows_xml_str: str = str(
-            etree.tostring(root_xml, pretty_print=True, xml_declaration=True, encoding='utf-8'), encoding='utf-8')
-        logger.info('\n' + flows_xml_str)
-        return flows_xml_str
+            yield flow_xml
 
     @staticmethod
     def load_template(template_dir: str, template_filename: str):
-        template_loader = jinja2.FileSystemLoader(searchpath=template_dir)
-        template_env = jinja2.Environment(loader=template_loader)
-        template = template_env.get_template(template_filename)
-        return template
+        return load_template(template_dir, template_filename)
 
     @staticmethod
     def generate_ini_file(network_name: str = 'TestScenario', flows: List[Flow] = None) -> str:
+        return load_template(config.template_dir, INI_TEMPLATE).render(
+            **ConfigFileGenerator._ini_context(network_name, flows))
+
+    @staticmethod
+    def generate_ini_files(scenarios: Iterable[Tuple[str, List[Flow]]]) -> List[str]:
+        '''
+        render ini files of many scenarios from one compiled template
+        :param scenarios: network name and flows of each scenario
+        :return: content of ini files
+        '''
+        return list(render_template(config.template_dir, INI_TEMPLATE,
+                                    (ConfigFileGenerator._ini_context(network_name, flows)
+                                     for network_name, flows in scenarios)))
+
+    @staticmethod
+    def _ini_context(network_name: str, flows: List[Flow]) -> Dict:
         if network_name == '':
             raise RuntimeError('parameter "network_name" is required')
         flows = flows if flows is not None else []
@@ -250,161 +309,257 @@ class ConfigFileGenerator:
                 item['flows'].append({'flow_id': flow.flow_id})
             else:
                 hosts.append({'host_id': flow.source, 'flows': [{'flow_id': flow.flow_id}]})
-        # get template
-        template: jinja2.Template = ConfigFileGenerator.load_template(config.template_dir, 'test_scenario_template.ini')
-        return template.render(
-            network_name=network_name,
-            time_granularity='1ns',
-            process_delay='0us',
-            hosts=hosts
-        )
+        return {
+            'network_name': network_name,
+            'time_granularity': '1ns',
+            'process_delay': '0us',
+            'hosts': hosts
+        }
 
     @staticmethod
     def generate_ned_file(tsn_network: TSNNetwork = None, flows: List[Flow] = None, solution: Solution = None,
                           node_edge_mac_info: MAG.NodeEdgeMacInfo = None) -> str:
-        node_edge_port_pair_list: Dict[NodeId, List[Tuple[EdgeId, PortNo]]] = {}
+        return load_template(config.template_dir, NED_TEMPLATE).render(
+            **ConfigFileGenerator._ned_context(tsn_network, solution, node_edge_mac_info))
+
+    @staticmethod
+    def generate_ned_files(scenarios: Iterable[Tuple[TSNNetwork, Solution, MAG.NodeEdgeMacInfo]]) -> List[str]:
+        '''
+        render ned files of many scenarios from one compiled template
+        :param scenarios: tsn network, solution and node edge mac info of each scenario
+        :return: content of ned files
+        '''
+        return list(render_template(config.template_dir, NED_TEMPLATE,
+                                    (ConfigFileGenerator._ned_context(tsn_network, solution, node_edge_mac_info)
+                                     for tsn_network, solution, node_edge_mac_info in scenarios)))
+
+    @staticmethod
+    def _ned_context(tsn_network: TSNNetwork, solution: Solution, node_edge_mac_info: MAG.NodeEdgeMacInfo) -> Dict:
+        # (node, port) <-> edge indexes of all nodes, built once
+        node_port_edge_dict: Dict[NodeId, Dict[PortNo, EdgeId]] = {}
+        node_edge_port_dict: Dict[NodeId, Dict[EdgeId, PortNo]] = {}
         nodes: List[NetworkDevice] = tsn_network.tsn_switch_list + tsn_network.tsn_host_list
         for node in nodes:
             edge_port_pair_list: List[Tuple[EdgeId, PortNo]] = \
                 GateControlListConfigurationInfo.generate_edge_port_pair_list(
                     node_id=node.device_id, node_edge_mac_info=node_edge_mac_info, ports=node.ports)
-            node_edge_port_pair_list[node.device_id] = edge_port_pair_list
+            port_edge_dict: Dict[PortNo, EdgeId] = {}
+            edge_port_dict: Dict[EdgeId, PortNo] = {}
+            for edge_id, port_id in edge_port_pair_list:
+                # the first pair wins as a linear search over pair list does
+                port_edge_dict.setdefault(port_id, edge_id)
+                edge_port_dict.setdefault(edge_id, port_id)
+            node_port_edge_dict[node.device_id] = port_edge_dict
+            node_edge_port_dict[node.device_id] = edge_port_dict
+
+        def _generate_ports(device: NetworkDevice, excluded_peers: Set[NodeId]) -> List[Dict]:
+            ports: List[Dict] = []
+            for port in device.ports:
+                forward_edge_id: EdgeId = node_port_edge_dict[device.device_id][port.port_id]
+                peer_node_id: NodeId = NodeId(solution.graph.edge_mapper[forward_edge_id].out_node.node_id)
+                if peer_node_id in excluded_peers:
+                    continue
+                backward_edge_id: EdgeId = node_edge_mac_info.get_edge_by_nodes(peer_node_id, device.device_id)
+                peer_port_id: PortNo = node_edge_port_dict[peer_node_id][backward_edge_id]
+                ports.append(
+                    {'port_id': port.port_id - 1, 'peer_node_id': peer_node_id, 'peer_port_id': peer_port_id - 1})
+            return ports
+
         # TSN hosts
         tsn_hosts: List[TSNHost] = tsn_network.tsn_host_list
         hosts: List[Dict] = []
-        hosts_id: List[NodeId] = []
         for tsn_host in tsn_hosts:
             host: Dict = {'host_id': tsn_host.device_id, 'port_num': len(tsn_host.ports)}
-            hosts_id.append(tsn_host.device_id)
-            ports: List[Dict] = []
-            for port in tsn_host.ports:
-                forward_edge_id: EdgeId = \
-                    list(filter(lambda edge_port_pair: edge_port_pair[1] == port.port_id,
-                                node_edge_port_pair_list[tsn_host.device_id]))[0][0]
-                peer_node_id: NodeId = NodeId(solution.graph.edge_mapper[forward_edge_id].out_node.node_id)
-                backward_edge_id: EdgeId = list(filter(
-                    lambda eid: solution.graph.edge_mapper[eid].out_node.node_id == tsn_host.device_id and
-                                solution.graph.edge_mapper[eid].in_node.node_id == peer_node_id,
-                    solution.graph.edge_mapper))[0]
-                peer_port_id: PortNo = list(filter(lambda edge_port_pair: edge_port_pair[0] == backward_edge_id,
-                                                       node_edge_port_pair_list[peer_node_id]))[0][1]
-                port: Dict = \
-                    {'port_id': port.port_id - 1, 'peer_node_id': peer_node_id, 'peer_port_id': peer_port_id - 1}
-                ports.append(port)
-            host['ports'] = ports
+            host['ports'] = _generate_ports(tsn_host, set())
             hosts.append(host)
+        hosts_id: Set[NodeId] = {tsn_host.device_id for tsn_host in tsn_hosts}
         # TSN switches
         tsn_switches: List[TSNSwitch] = tsn_network.tsn_switch_list
         switches: List[Dict] = []
         for tsn_switch in tsn_switches:
             switch: Dict = {'switch_id': tsn_switch.device_id, 'port_num': len(tsn_switch.ports)}
-            ports: List[Dict] = []
-            for port in tsn_switch.ports:
-                forward_edge_id: EdgeId = \
-                    list(filter(lambda edge_port_pair: edge_port_pair[1] == port.port_id,
-                                node_edge_port_pair_list[tsn_switch.device_id]))[0][0]
-                peer_node_id: NodeId = NodeId(solution.graph.edge_mapper[forward_edge_id].out_node.node_id)
-                if peer_node_id in hosts_id:
-                    continue
-                backward_edge_id: EdgeId = list(filter(
-                    lambda eid: solution.graph.edge_mapper[eid].out_node.node_id == tsn_switch.device_id and
-                                solution.graph.edge_mapper[eid].in_node.node_id == peer_node_id,
-                    solution.graph.edge_mapper))[0]
-                peer_port_id: PortNo = list(filter(lambda edge_port_pair: edge_port_pair[0] == backward_edge_id,
-                                                   node_edge_port_pair_list[peer_node_id]))[0][1]
-                port: Dict = \
-                    {'port_id': port.port_id - 1, 'peer_node_id': peer_node_id, 'peer_port_id': peer_port_id - 1}
-                ports.append(port)
-            switch['ports'] = ports
+            switch['ports'] = _generate_ports(tsn_switch, hosts_id)
             switches.append(switch)
-        # load template
-        template: jinja2.Template = ConfigFileGenerator.load_template(config.template_dir, 'test_scenario_template.ned')
-        return template.render(
-            solution_name=solution.solution_name.lower(),
-            simlation_time='{}s'.format(config.TESTING['simulation-time']),
-            hosts=hosts,
-            switches=switches,
-            link={'delay': '{}ns'.format(config.GRAPH_CONFIG['all-propagation-delay']),
-                  'datarate': '{}Gbps'.format(config.GRAPH_CONFIG['all-bandwidth']),
-                  'per': '{}'.format(config.GRAPH_CONFIG['all-per'])})
+        return {
+            'solution_name': solution.solution_name.lower(),
+            'simlation_time': '{}s'.format(config.TESTING['simulation-time']),
+            'hosts': hosts,
+            'switches': switches,
+            'link': {'delay': '{}ns'.format(config.GRAPH_CONFIG['all-propagation-delay']),
+                     'datarate': '{}Gbps'.format(config.GRAPH_CONFIG['all-bandwidth']),
+                     'per': '{}'.format(config.GRAPH_CONFIG['all-per'])}}
 
     @staticmethod
     def create_test_scenario(tsn_network: TSNNetwork = None,
                              solution: Solution = None,
                              node_edge_mac_info: MAG.NodeEdgeMacInfo = None,
-                             test_scenario_dirname: str = None):
+                             test_scenario_dirname: str = None,
+                             max_workers: int = None,
+                             archive: str = None):
+        '''
+        export test scenario of solution, files of hosts and flat files are generated by a thread pool,
+        files of unchanged content are not rewritten on re-export and stale files are removed
+        :param tsn_network:
+        :param solution:
+        :param node_edge_mac_info:
+        :param test_scenario_dirname: root directory of test scenarios
+        :param max_workers: number of threads, default is decided by ThreadPoolExecutor
+        :param archive: 'zip' or 'tar' to export scenario as a single archive beside its directory
+        :return:
+        '''
         if test_scenario_dirname is not None:
             config.test_scenario_res_dir = test_scenario_dirname
         if not os.path.exists(config.test_scenario_res_dir):
             os.makedirs(config.test_scenario_res_dir)
         test_scenario_dir = os.path.join(config.test_scenario_res_dir, solution.solution_name.lower())
-        # generate content
+        # generate content, xml files are streamed into files later
         ini_file_content: str = ConfigFileGenerator.generate_ini_file(flows=solution.flows)
         ned_file_content: str = ConfigFileGenerator.generate_ned_file(tsn_network=tsn_network,
                                                                       solution=solution,
                                                                       node_edge_mac_info=node_edge_mac_info)
-        flows_flat_file_content: str = ConfigFileGenerator.generate_flows_xml(flows=solution.flows)
-        routes_flat_file_content: str = ConfigFileGenerator.generate_routes_xml(tsn_network=tsn_network)
-        GCLs_flat_file_conent: str = ConfigFileGenerator.generate_switch_schedule_xml(tsn_network=tsn_network)
-        hosts_flows_content: Dict[NodeId, Dict[FlowId, str]] = \
-            ConfigFileGenerator.generate_host_schedule_xml(tsn_network=tsn_network)
-        # generate dirname and filename
-        if os.path.exists(test_scenario_dir):
-            # remove directories and files
-            remove_dir(test_scenario_dir)
-        ned_filename: str = os.path.join(test_scenario_dir, '{}.ned'.format(solution.solution_name.lower()))
-        ini_filename: str = os.path.join(test_scenario_dir, '{}.ini'.format(solution.solution_name.lower()))
-        results_dir: str = os.path.join(test_scenario_dir, 'results')
-        xml_dir: str = os.path.join(test_scenario_dir, 'xml')
+        # generate dirname and filename, relative to test scenario directory
+        ned_filename: str = '{}.ned'.format(solution.solution_name.lower())
+        ini_filename: str = '{}.ini'.format(solution.solution_name.lower())
+        results_dir: str = 'results'
+        xml_dir: str = 'xml'
         flows_dir: str = os.path.join(xml_dir, 'flows')
         flows_flat_filename: str = os.path.join(flows_dir, 'flows_flat.xml')
         routes_dir: str = os.path.join(xml_dir, 'routes')
         routes_flat_filename: str = os.path.join(routes_dir, 'routes_flat.xml')
         schedules_dir: str = os.path.join(xml_dir, 'schedules')
         hosts_dir: str = os.path.join(schedules_dir, 'hosts')
-        hosts_flows_file: Dict[str, Dict[str, str]] = {}  # Dict[HostName, Dict[FlowFilename, FileContent]]
-        for host_id, host_content in hosts_flows_content.items():
-            flows: Dict[str, str] = {}
-            host_dir: str = os.path.join(hosts_dir, 'host{}'.format(host_id))
-            for flow_id, flow_content in host_content.items():
-                flow_filename: str = os.path.join(host_dir, 'flow{}.xml'.format(flow_id))
-                flows[flow_filename] = flow_content
-            hosts_flows_file[host_dir] = flows
         switches_dir: str = os.path.join(schedules_dir, 'switches')
         GCLs_flat_filename: str = os.path.join(switches_dir, 'GCLs_flat.xml')
         # create and write
-        os.makedirs(test_scenario_dir)
-        write_file(ned_filename, ned_file_content)
-        write_file(ini_filename, ini_file_content)
-        os.makedirs(results_dir)
-        os.makedirs(xml_dir)
-        os.makedirs(flows_dir)
-        write_file(flows_flat_filename, flows_flat_file_content)
-        os.makedirs(routes_dir)
-        write_file(routes_flat_filename, routes_flat_file_content)
-        os.makedirs(schedules_dir)
-        os.makedirs(switches_dir)
-        write_file(GCLs_flat_filename, GCLs_flat_file_conent)
-        os.makedirs(hosts_dir)
-        for host_dir, flows in hosts_flows_file.items():
-            os.makedirs(host_dir)
-            for flow_filename, file_content in flows.items():
-                write_file(flow_filename, file_content)
+        with ScenarioWriter(test_scenario_dir, archive=archive) as writer:
+
+            def _write(filename: str, write: Callable, *args):
+                with writer.open(filename) as f:
+                    write(*args, f)
+
+            def _write_host(tsn_host: TSNHost):
+                host_dir: str = os.path.join(hosts_dir, 'host{}'.format(tsn_host.device_id))
+                writer.makedirs(host_dir)
+                for tsn_flow_info in tsn_host.tsn_flow_info_list:
+                    _write(os.path.join(host_dir, 'flow{}.xml'.format(tsn_flow_info.flow_id)),
+                           ConfigFileGenerator.write_flow_schedule_xml, tsn_host, tsn_flow_info)
+
+            writer.write(ned_filename, ned_file_content.encode('utf-8'))
+            writer.write(ini_filename, ini_file_content.encode('utf-8'))
+            writer.makedirs(results_dir)
+            writer.makedirs(hosts_dir)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures: List[Future] = [
+                    executor.submit(_write, flows_flat_filename, ConfigFileGenerator.write_flows_xml, solution.flows),
+                    executor.submit(_write, routes_flat_filename, ConfigFileGenerator.write_routes_xml, tsn_network),
+                    executor.submit(_write, GCLs_flat_filename,
+                                    functools.partial(ConfigFileGenerator.write_switch_schedule_xml,
+                                                      hyper_period=solution.graph.hyper_period), tsn_network)]
+                futures += [executor.submit(_write_host, tsn_host) for tsn_host in tsn_network.tsn_host_list]
+                for future in as_completed(futures):
+                    future.result()  # raise error of worker
+
+
+def write_xml(file: Union[str, BinaryIO], tag: str, children: Iterable):
+    '''
+    write xml document of root tag and children incrementally, each child is serialized and released once built,
+    output is identical to pretty printed etree.tostring of the whole tree with xml declaration
+    :param file: filename or binary file
+    :param tag: tag of root
+    :param children: elements and comments under root
+    :return:
+    '''
+    if isinstance(file, str):
+        with open(file, 'wb') as f:
+            write_xml(f, tag, children)
+        return
+    from lxml import etree
+    _children: Iterator = iter(children)
+    _child = next(_children, None)
+    with etree.xmlfile(file, encoding='utf-8') as xf:
+        xf.write_declaration()
+        if _child is None:
+            xf.write(etree.Element(tag))
+        else:
+            with xf.element(tag):
+                while _child is not None:
+                    if isinstance(_child.tag, str):  # comments are not indented
+                        etree.indent(_child, space='  ', level=1)
+                    _child.tail = None
+                    xf.write('\n  ', _child)
+                    _child = next(_children, None)
+                xf.write('\n')
+    file.write(b'\n')
+
+
+def xml2str(write, *args) -> str:
+    '''
+    run xml writer into memory
+    :param write: writer of which file is the last parameter
+    :param args: other parameters of writer
+    :return: xml content
+    '''
+    _buffer: io.BytesIO = io.BytesIO()
+    write(*args, _buffer)
+    return _buffer.getvalue().decode('utf-8')
+
+
+def load_template(template_dir: str, template_filename: str):
+    '''
+    compiled template, cached by path and modification time of template file, so a template is compiled once
+    per process until it is edited, compiled code is also kept in bytecode cache across processes
+    :param template_dir:
+    :param template_filename:
+    :return: jinja2 template
+    '''
+    _path: str = os.path.abspath(os.path.join(template_dir, template_filename))
+    _key: Tuple[str, int] = (_path, os.stat(_path).st_mtime_ns)
+    _template = _templates.get(_key)
+    if _template is not None:
+        return _template
+    with _template_lock:
+        _template = _templates.get(_key)
+        if _template is None:
+            # entries of older versions of the template are dropped
+            for _k in [_k for _k in _templates if _k[0] == _path]:
+                del _templates[_k]
+            _template = _get_environment(os.path.dirname(_path)).get_template(os.path.basename(_path))
+            _templates[_key] = _template
+    return _template
+
+
+def render_template(template_dir: str, template_filename: str, contexts: Iterable[Dict]) -> Iterator[str]:
+    '''
+    render many contexts lazily with one compiled template
+    :param template_dir:
+    :param template_filename:
+    :param contexts: variables of each rendering
+    :return: rendered contents
+    '''
+    _template = load_template(template_dir, template_filename)
+    for _context in contexts:
+        yield _template.render(**_context)
+
+
+def clear_template_cache():
+    with _template_lock:
+        _templates.clear()
+        _environments.clear()
+
+
+def _get_environment(template_dir: str):
+    _env = _environments.get(template_dir)
+    if _env is None:
+        import jinja2
+        # templates are cached by load_template, the environment only compiles
+        _env = jinja2.Environment(loader=jinja2.FileSystemLoader(searchpath=template_dir),
+                                  bytecode_cache=jinja2.FileSystemBytecodeCache(directory=config.template_cache_dir),
+                                  cache_size=0, auto_reload=False)
+        _environments[template_dir] = _env
+    return _env
 
 
 def write_file(filename: str, file_content: str):
     with open(filename, 'w') as f:
         f.write(file_content)
 
-
-def remove_dir(dir: str):
-    import os
-    dir = dir.replace('\\', '/')
-    if os.path.isdir(dir):
-        for p in os.listdir(dir):
-            remove_dir(os.path.join(dir, p))
-        if os.path.exists(dir):
-            os.rmdir(dir)
-    else:
-        if os.path.exists(dir):
-            os.remove(dir)
@@ -97,6 +97,8 @@ class NodeEdgeMacInfo(object):
     edge_mac_dict: Dict[EdgeId, EdgeMacMapper]  # {e1: EdgeMacMapper, ...}
     node_mac_dict: Dict[NodeId, NodeMacMapper]  # {n1: NodeMacMapper, ...}
     flow_mac_dict: Dict[FlowId, FlowMacMapper]  # {f1: FlowMacMapper, ...}
+    mac_edge_dict: Dict[MacAddress, EdgeId]  # {outbound mac of e1: e1, ...}
+    node_pair_edge_dict: Dict[Tuple[NodeId, NodeId], EdgeId]  # {(in node of e1, out node of e1): e1, ...}
 
     def __init__(self, builder: NodeEdgeMacInfoBuilder):
         self.mac_list = builder.mac_list
@@ -104,6 +106,23 @@ class NodeEdgeMacInfo(object):
         self.edge_mac_dict = builder.edge_mac_dict
         self.node_mac_dict = builder.node_mac_dict
         self.flow_mac_dict = builder.flow_mac_dict
+        self.mac_edge_dict = {}
+        self.node_pair_edge_dict = {}
+        for _eid, _edge_mac_mapper in self.edge_mac_dict.items():
+            # the first edge wins as a linear search over edge mac dict does
+            self.mac_edge_dict.setdefault(_edge_mac_mapper.mac_pair[0], _eid)
+            self.node_pair_edge_dict.setdefault(_edge_mac_mapper.node_pair, _eid)
+
+    def get_edge_by_mac(self, mac: MacAddress) -> EdgeId:
+        '''
+        get edge whose outbound mac is given mac
+        :param mac:
+        :return: edge id
+        '''
+        return self.mac_edge_dict[mac]
+
+    def get_edge_by_nodes(self, in_node_id: NodeId, out_node_id: NodeId) -> EdgeId:
+        return self.node_pair_edge_dict[(in_node_id, out_node_id)]
 
 
 class MacAddressGenerator:
@@ -170,15 +189,14 @@ class MacAddressGenerator:
     @staticmethod
     def assign_mac_address_to_edge(macs: List[MacAddress], g: Graph) -> Dict[EdgeId, EdgeMacMapper]:
         _edge_mac_dict: Dict[EdgeId, EdgeMacMapper] = dict()
+        _node_pair_dict: Dict[Tuple[NodeId, NodeId], EdgeMacMapper] = dict()  # first mapper of each node pair
         _i = 0
         for _eid, _e in g.edge_mapper.items():
             _node1: NodeId = _e.in_node.node_id
             _node2: NodeId = _e.out_node.node_id
             _reversed_edge: Tuple[NodeId, NodeId] = (_node2, _node1)
-            _d: Dict[NodeId, EdgeMacMapper] = \
-                {_k: _v for _k, _v in _edge_mac_dict.items() if _v.node_pair == _reversed_edge}
-            if len(_d) != 0:
-                _edge_mac_mapper: EdgeMacMapper = list(_d.values())[0]
+            if _reversed_edge in _node_pair_dict:
+                _edge_mac_mapper: EdgeMacMapper = _node_pair_dict[_reversed_edge]
                 _mac1: MacAddress = _edge_mac_mapper.mac_pair[0]
                 _mac2: MacAddress = _edge_mac_mapper.mac_pair[1]
                 _edge_mac_mapper: EdgeMacMapper = EdgeMacMapper(_eid, (_node1, _mac2), (_node2, _mac1))
@@ -189,6 +207,7 @@ class MacAddressGenerator:
                 _i += 2
                 _edge_mac_mapper: EdgeMacMapper = EdgeMacMapper(_eid, (_node1, _mac1), (_node2, _mac2))
                 _edge_mac_dict[_eid] = _edge_mac_mapper
+            _node_pair_dict.setdefault((_node1, _node2), _edge_mac_dict[_eid])
         return _edge_mac_dict
 
     @staticmethod
@@ -0,0 +1,93 @@
+import time
+from contextlib import contextmanager, nullcontext, AbstractContextManager
+from typing import Dict, Any
+
+NULL_SPAN: AbstractContextManager = nullcontext()  # shared span of null profiler, entered again and again
+
+
+class SpanStat:
+    count: int
+    total: float  # [unit: s]
+    max: float  # [unit: s]
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, elapsed: float):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'total': self.total, 'max': self.max}
+
+
+class Profiler:
+    '''
+    lightweight instrumentation of one solver run, i.e. named spans, counters and per-key records (e.g. routing time
+    per flow), hot paths check "enabled" before measuring so that the null profiler costs nothing
+    '''
+    enabled: bool = True
+    spans: Dict[str, SpanStat]
+    counters: Dict[str, int]
+    records: Dict[str, Dict[Any, float]]  # Dict[span name, Dict[key, accumulated elapsed time]]
+
+    def __init__(self):
+        self.spans = {}
+        self.counters = {}
+        self.records = {}
+
+    def __deepcopy__(self, memo):
+        # solutions are deep copied during optimization, all copies keep reporting to the same profiler
+        return self
+
+    @contextmanager
+    def span(self, name: str, key: Any = None):
+        _start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - _start, key)
+
+    def add_time(self, name: str, elapsed: float, key: Any = None):
+        _stat: SpanStat = self.spans.get(name)
+        if _stat is None:
+            _stat = self.spans[name] = SpanStat()
+        _stat.add(elapsed)
+        if key is not None:
+            _records: Dict[Any, float] = self.records.setdefault(name, {})
+            _records[key] = _records.get(key, 0.0) + elapsed
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def reset(self):
+        self.spans = {}
+        self.counters = {}
+        self.records = {}
+
+    def to_dict(self) -> Dict:
+        return {
+            'spans': {_name: _stat.to_dict() for _name, _stat in self.spans.items()},
+            'counters': dict(self.counters),
+            'records': {_name: dict(_records) for _name, _records in self.records.items()},
+        }
+
+
+class NullProfiler(Profiler):
+    enabled: bool = False
+
+    def span(self, name: str, key: Any = None) -> AbstractContextManager:
+        return NULL_SPAN
+
+    def add_time(self, name: str, elapsed: float, key: Any = None):
+        pass
+
+    def count(self, name: str, n: int = 1):
+        pass
+
+
+NULL_PROFILER: NullProfiler = NullProfiler()  # default profiler of solver and strategies
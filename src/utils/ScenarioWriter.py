@@ -0,0 +1,229 @@
+import hashlib
+import io
+import logging
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+import zipfile
+from contextlib import contextmanager
+from typing import Set, Dict, Iterator, BinaryIO, Optional, Union, List
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_TYPES = ['zip', 'tar']  # archive types of single-archive output
+TMP_SUFFIX: str = '.tmp'  # suffix of files being written
+HASH_CHUNK: int = 1 << 20  # size of chunk when hashing existing file
+SPOOL_SIZE: int = 1 << 20  # size above which a completed file of archive is spooled to disk until close
+
+
+def file_digest(filename: str) -> Optional[bytes]:
+    '''
+    sha1 of file content
+    :param filename:
+    :return: digest, None if file does not exist
+    '''
+    if not os.path.isfile(filename):
+        return None
+    _h = hashlib.sha1()
+    with open(filename, 'rb') as f:
+        for _chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            _h.update(_chunk)
+    return _h.digest()
+
+
+class HashingFile(io.RawIOBase):
+    '''
+    binary file which hashes everything written through it
+    '''
+    file: BinaryIO
+    hash: 'hashlib._Hash'
+
+    def __init__(self, file: BinaryIO):
+        super().__init__()
+        self.file = file
+        self.hash = hashlib.sha1()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self.hash.update(b)
+        return self.file.write(b)
+
+
+class ScenarioWriter:
+    '''
+    sink of all files of a test scenario, safe to be shared by threads, files are either synchronized into
+    a directory, where files of unchanged content are not rewritten and files not written again are removed,
+    or collected into a single archive, completed files are spooled and added in sorted path order on close,
+    so the archive of the same scenario is identical whatever order files are completed in
+    '''
+    root_dir: str
+    archive: Optional[str]  # archive type, None if files are written into directory
+    written: int  # number of files written
+    skipped: int  # number of files skipped for unchanged content
+    removed: int  # number of stale files removed
+    __files: Set[str]  # relative paths of files written in this run
+    __dirs: Set[str]  # relative paths of directories created in this run
+    __spooled: Dict[str, BinaryIO]  # completed files of archive not added yet, Dict[relative path, content]
+    __archive_file: Union[zipfile.ZipFile, tarfile.TarFile]  # archive being written, None if not archived
+    __lock: threading.Lock
+
+    def __init__(self, root_dir: str, archive: str = None):
+        if archive is not None and archive not in ARCHIVE_TYPES:
+            raise RuntimeError('unknown archive type "{}"'.format(archive))
+        self.root_dir = root_dir
+        self.archive = archive
+        self.written = 0
+        self.skipped = 0
+        self.removed = 0
+        self.__files = set()
+        self.__dirs = set()
+        self.__spooled = {}
+        self.__archive_file = None
+        self.__lock = threading.Lock()
+        if archive is None:
+            os.makedirs(root_dir, exist_ok=True)
+        elif archive == 'zip':
+            self.__archive_file = zipfile.ZipFile(self.archive_filename + TMP_SUFFIX, 'w',
+                                                  compression=zipfile.ZIP_DEFLATED)
+        else:
+            self.__archive_file = tarfile.open(self.archive_filename + TMP_SUFFIX, 'w')
+
+    @property
+    def archive_filename(self) -> str:
+        return '{}.{}'.format(self.root_dir.rstrip('/\\'), self.archive)
+
+    def makedirs(self, relpath: str):
+        with self.__lock:
+            _created: List[str] = []
+            _path: str = relpath
+            while _path not in ('', os.curdir) and _path not in self.__dirs:
+                self.__dirs.add(_path)
+                _created.append(_path)
+                _path = os.path.dirname(_path)
+        if self.archive is None:
+            os.makedirs(os.path.join(self.root_dir, relpath), exist_ok=True)
+
+    @contextmanager
+    def open(self, relpath: str) -> Iterator[BinaryIO]:
+        '''
+        open file of scenario for writing, content is committed when context exits without error
+        :param relpath: path relative to root directory
+        :return: binary file
+        '''
+        self.makedirs(os.path.dirname(relpath))
+        if self.archive is not None:
+            _spool: BinaryIO = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+            try:
+                yield _spool
+            except BaseException:
+                _spool.close()
+                raise
+            with self.__lock:
+                self.__files.add(relpath)
+                self.__spooled[relpath] = _spool
+                self.written += 1
+            return
+        _filename: str = os.path.join(self.root_dir, relpath)
+        _tmp_filename: str = _filename + TMP_SUFFIX
+        try:
+            with open(_tmp_filename, 'wb') as f:
+                _file: HashingFile = HashingFile(f)
+                yield _file
+            if _file.hash.digest() == file_digest(_filename):
+                os.remove(_tmp_filename)
+                _written: bool = False
+            else:
+                os.replace(_tmp_filename, _filename)
+                _written: bool = True
+        except BaseException:
+            if os.path.exists(_tmp_filename):
+                os.remove(_tmp_filename)
+            raise
+        with self.__lock:
+            self.__files.add(relpath)
+            if _written:
+                self.written += 1
+            else:
+                self.skipped += 1
+
+    def write(self, relpath: str, content: bytes):
+        with self.open(relpath) as f:
+            f.write(content)
+
+    def close(self):
+        '''
+        remove stale files of directory, or complete archive
+        :return:
+        '''
+        if self.archive is None:
+            self.__remove_stale_files()
+        else:
+            # parents sort before their children
+            for _relpath in sorted(self.__dirs | self.__files, key=lambda p: p.split(os.sep)):
+                _spool: Optional[BinaryIO] = self.__spooled.pop(_relpath, None)
+                self.__add_entry(_relpath, _spool)
+                if _spool is not None:
+                    _spool.close()
+            self.__archive_file.close()
+            os.replace(self.archive_filename + TMP_SUFFIX, self.archive_filename)
+        logger.info('scenario [%s]: %d files written, %d unchanged, %d stale removed',
+                    self.root_dir, self.written, self.skipped, self.removed)
+
+    def abort(self):
+        # incomplete archive is discarded, existing archive of scenario is kept
+        if self.archive is not None:
+            for _spool in self.__spooled.values():
+                _spool.close()
+            self.__spooled.clear()
+            self.__archive_file.close()
+            os.remove(self.archive_filename + TMP_SUFFIX)
+
+    def __remove_stale_files(self):
+        for _root, _dirs, _files in os.walk(self.root_dir, topdown=False):
+            _relroot: str = os.path.relpath(_root, self.root_dir)
+            _relroot = '' if _relroot == os.curdir else _relroot
+            for _f in _files:
+                if os.path.join(_relroot, _f) not in self.__files:
+                    os.remove(os.path.join(_root, _f))
+                    self.removed += 1
+            if _relroot != '' and _relroot not in self.__dirs and len(os.listdir(_root)) == 0:
+                os.rmdir(_root)
+
+    def __add_entry(self, relpath: str, content: Optional[BinaryIO]):
+        # timestamps are fixed, so archive of same scenario is identical
+        _name: str = '/'.join([os.path.basename(self.root_dir.rstrip('/\\'))] + relpath.split(os.sep))
+        if content is not None:
+            _size: int = content.seek(0, io.SEEK_END)
+            content.seek(0)
+        if self.archive == 'zip':
+            if content is None:
+                self.__archive_file.writestr(zipfile.ZipInfo(_name + '/'), b'')
+            else:
+                _info: zipfile.ZipInfo = zipfile.ZipInfo(_name)
+                _info.compress_type = zipfile.ZIP_DEFLATED
+                _info.file_size = _size
+                with self.__archive_file.open(_info, 'w') as f:
+                    shutil.copyfileobj(content, f, HASH_CHUNK)
+        else:
+            _info: tarfile.TarInfo = tarfile.TarInfo(_name)
+            if content is None:
+                _info.type = tarfile.DIRTYPE
+                _info.mode = 0o755
+                self.__archive_file.addfile(_info)
+            else:
+                _info.size = _size
+                _info.mode = 0o644
+                self.__archive_file.addfile(_info, content)
+
+    def __enter__(self) -> 'ScenarioWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
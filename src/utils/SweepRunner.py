@@ -0,0 +1,250 @@
+import copy
+import csv
+import itertools
+import json
+import logging
+import os
+import random
+import time
+import traceback
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Set, Callable
+
+import numpy as np
+
+from src import config
+
+logger = logging.getLogger(__name__)
+
+CONFIG_DICTS: List[str] = ['GRAPH_CONFIG', 'FLOW_CONFIG', 'OPTIMIZATION']  # config dicts that grid can override
+SPECIAL_PARAMS: List[str] = ['round', 'topo-strategy']  # parameters interpreted by sweep runner itself
+TAIL_CHUNK: int = 1 << 12  # size of chunk when searching the last complete record backwards
+
+
+class SweepTask:
+    key: str  # stable identification of task, used to resume an interrupted sweep
+    params: Dict  # one point of parameter grid
+    seed: int  # seed of random and numpy.random of worker
+    configs: Dict[str, Dict]  # config copy of worker, Dict[config dict name, config dict]
+
+    def __init__(self, key: str, params: Dict, seed: int, configs: Dict[str, Dict]):
+        self.key = key
+        self.params = params
+        self.seed = seed
+        self.configs = configs
+
+
+def params2key(params: Dict) -> str:
+    '''
+    stable key of parameters, enum members and nested dicts are supported
+    :param params: one point of parameter grid
+    :return: json string with sorted keys
+    '''
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def apply_configs(configs: Dict[str, Dict], params: Dict):
+    '''
+    replace global config dicts in place (modules hold references to them) and override entries with parameters
+    :param configs: config copy, Dict[config dict name, config dict]
+    :param params: one point of parameter grid
+    :return:
+    '''
+    for _name, _d in configs.items():
+        _config: Dict = getattr(config, _name)
+        _config.clear()
+        _config.update(copy.deepcopy(_d))
+    for _k, _v in params.items():
+        if _k in SPECIAL_PARAMS:
+            continue
+        # keys shared by several config dicts, e.g. hyper-period, are overridden in all of them
+        for _name in CONFIG_DICTS:
+            _config: Dict = getattr(config, _name)
+            if _k in _config:
+                _config[_k] = _v
+
+
+def run_task(task: SweepTask) -> Dict:
+    '''
+    run one independent solver in worker process, global config of worker is replaced by the task's own copy
+    :param task: sweep task
+    :return: record of task
+    '''
+    from src.graph.FlowGenerator import FlowGenerator
+    from src.graph.Solver import Solver, Solution
+    from src.graph.TopoGenerator import TopoGenerator
+    from src.graph.topo_strategy.TopoStrategyFactory import TopoStrategyFactory
+    apply_configs(task.configs, task.params)
+    random.seed(task.seed)
+    np.random.seed(task.seed % (2 ** 32))
+    record: Dict = {'key': task.key, 'seed': task.seed, 'status': 'ok'}
+    start_time: float = time.perf_counter()
+    try:
+        topo_strategy_entity: Dict = dict(task.params['topo-strategy'])
+        topo_strategy_entity['n'] = config.GRAPH_CONFIG['core-node-num']
+        topo_generator: TopoGenerator = TopoGenerator()
+        topo_generator.topo_strategy = TopoStrategyFactory.get_instance(**topo_strategy_entity)
+        graph = topo_generator.generate_core_topo()
+        attached_edge_nodes = topo_generator.attach_edge_nodes(graph, config.GRAPH_CONFIG['edge-node-num'])
+        flows = FlowGenerator.generate_flows(edge_nodes=attached_edge_nodes, graph=graph,
+                                             flow_num=config.FLOW_CONFIG['flow-num'])
+        solver: Solver = Solver(nx_graph=graph,
+                                flows=flows,
+                                topo_strategy=topo_strategy_entity['strategy'],
+                                routing_strategy=config.GRAPH_CONFIG['routing-strategy'],
+                                scheduling_strategy=config.GRAPH_CONFIG['scheduling-strategy'],
+                                allocating_strategy=config.GRAPH_CONFIG['allocating-strategy'],
+                                reliability_strategy=config.GRAPH_CONFIG['reliability-strategy'])
+        solution: Solution = solver.generate_init_solution()
+        if config.OPTIMIZATION['enable'] is True:
+            solution = solver.optimize()
+        load_list: List[float] = [_e.time_slot_allocator.load for _e in solution.graph.edge_mapper.values()]
+        record['result'] = {
+            'flow_num': len(solution.flows),
+            'node_num': len(solution.graph.nodes),
+            'edge_num': len(solution.graph.edges),
+            'failure_flow_num': len(solution.failure_flows),
+            'runtime': solution.runtime,
+            'max_load': float(np.max(load_list)),
+            'average_load': float(np.average(load_list)),
+            'objective': Solver.objective_function(solution),
+        }
+    except Exception:
+        record['status'] = 'error'
+        record['error'] = traceback.format_exc()
+    record['elapsed'] = time.perf_counter() - start_time
+    return record
+
+
+class SweepRunner:
+    grid: Dict[str, List]  # declarative parameter grid, Dict[parameter name, values]
+    results_filename: str  # json lines file where records are appended as soon as tasks finish
+    max_workers: int  # number of worker processes, default is number of cpus
+    base_seed: int
+    task_func: Callable[[SweepTask], Dict]
+
+    def __init__(self, grid: Dict[str, List] = None, results_filename: str = None, max_workers: int = None,
+                 base_seed: int = 0, task_func: Callable[[SweepTask], Dict] = run_task):
+        if grid is None or len(grid) == 0:
+            raise RuntimeError('miss parameter "grid"')
+        if results_filename is None:
+            raise RuntimeError('miss parameter "results_filename"')
+        for _k in grid.keys():
+            if _k not in SPECIAL_PARAMS and not any(_k in getattr(config, _name) for _name in CONFIG_DICTS):
+                raise RuntimeError('unknown sweep parameter "{}"'.format(_k))
+        self.grid = grid
+        self.results_filename = results_filename
+        self.max_workers = max_workers
+        self.base_seed = base_seed
+        self.task_func = task_func
+
+    def generate_tasks(self) -> List[SweepTask]:
+        '''
+        expand parameter grid into tasks, the seed of a task only depends on its parameters,
+        so that a resumed sweep reproduces the same runs
+        :return: tasks
+        '''
+        _names: List[str] = sorted(self.grid.keys())
+        _configs: Dict[str, Dict] = {_name: copy.deepcopy(getattr(config, _name)) for _name in CONFIG_DICTS}
+        _tasks: List[SweepTask] = []
+        for _values in itertools.product(*[self.grid[_name] for _name in _names]):
+            _params: Dict = dict(zip(_names, _values))
+            _key: str = params2key(_params)
+            _seed: int = (zlib.crc32(_key.encode()) + self.base_seed) % (2 ** 32)
+            _tasks.append(SweepTask(_key, _params, _seed, _configs))
+        return _tasks
+
+    def load_records(self) -> List[Dict]:
+        if not os.path.exists(self.results_filename):
+            return []
+        _records: List[Dict] = []
+        with open(self.results_filename, 'r') as f:
+            for _line in f:
+                try:
+                    _records.append(json.loads(_line))
+                except json.JSONDecodeError:
+                    # the last line may be truncated if the sweep was killed while writing it
+                    logger.warning('skip broken record in %s', self.results_filename)
+        return _records
+
+    def truncate_broken_record(self):
+        '''
+        cut the truncated last line left by a killed sweep, so the next record starts on its own line
+        :return:
+        '''
+        if not os.path.exists(self.results_filename):
+            return
+        with open(self.results_filename, 'rb+') as f:
+            _end: int = f.seek(0, os.SEEK_END)
+            _pos: int = _end
+            while _pos > 0:
+                _start: int = max(0, _pos - TAIL_CHUNK)
+                f.seek(_start)
+                _chunk: bytes = f.read(_pos - _start)
+                if _pos == _end and _chunk.endswith(b'\n'):
+                    return
+                _i: int = _chunk.rfind(b'\n')
+                if _i != -1:
+                    _pos = _start + _i + 1
+                    break
+                _pos = _start
+            logger.warning('truncate broken record of %d bytes in %s', _end - _pos, self.results_filename)
+            f.truncate(_pos)
+
+    def completed_keys(self) -> Set[str]:
+        return {_r['key'] for _r in self.load_records() if _r.get('status') == 'ok'}
+
+    def save_record(self, record: Dict):
+        self.truncate_broken_record()
+        with open(self.results_filename, 'a') as f:
+            f.write(json.dumps(record, default=str) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def run(self) -> List[Dict]:
+        '''
+        run all pending tasks across a process pool, finished tasks of a previous run are skipped
+        :return: records of tasks run this time
+        '''
+        _completed: Set[str] = self.completed_keys()
+        _tasks: List[SweepTask] = [_t for _t in self.generate_tasks() if _t.key not in _completed]
+        logger.info('%d tasks pending, %d tasks completed', len(_tasks), len(_completed))
+        _dirname: str = os.path.dirname(self.results_filename)
+        if _dirname != '' and not os.path.exists(_dirname):
+            os.makedirs(_dirname)
+        _records: List[Dict] = []
+        if len(_tasks) == 0:
+            return _records
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            _futures = {executor.submit(self.task_func, _t): _t for _t in _tasks}
+            for _future in as_completed(_futures):
+                _task: SweepTask = _futures[_future]
+                try:
+                    _record: Dict = _future.result()
+                except Exception:
+                    _record: Dict = {'key': _task.key, 'seed': _task.seed, 'status': 'error',
+                                     'error': traceback.format_exc()}
+                _record['params'] = _task.params
+                self.save_record(_record)
+                _records.append(_record)
+                logger.info('task %s finished: %s', _task.key, _record['status'])
+        return _records
+
+    def to_csv(self, target_filename: str):
+        '''
+        flatten records of successful tasks into csv file, one column per parameter and per result
+        :param target_filename: csv filename
+        :return:
+        '''
+        _records: List[Dict] = [_r for _r in self.load_records() if _r.get('status') == 'ok']
+        if len(_records) == 0:
+            return
+        _param_names: List[str] = sorted(self.grid.keys())
+        _result_names: List[str] = list(_records[0]['result'].keys())
+        with open(target_filename, 'w', newline='') as file:
+            writer: csv.writer = csv.writer(file)
+            writer.writerow(_param_names + ['seed'] + _result_names)
+            for _r in _records:
+                writer.writerow([_r['params'].get(_name) for _name in _param_names] + [_r['seed']] +
+                                [_r['result'].get(_name) for _name in _result_names])
@@ -1,9 +1,11 @@
 from typing import List, Dict, Tuple
 
-import matplotlib.pyplot as plt
 import numpy as np
 import random
 
+# matplotlib is imported inside the drawing methods only, so that solver processes
+# which never draw (e.g. headless batch runs) do not pay for its initialization
+
 
 class GanttBlock:
     begin: int
@@ -33,6 +35,7 @@ class GanttEntry:
 
 class Visualizer:
     def __init__(self):
+        import matplotlib.pyplot as plt
         self.ax = plt.gca()
         [self.ax.spines[i].set_visible(False) for i in ["top", "right"]]
 
@@ -46,6 +49,7 @@ class Visualizer:
 
     @classmethod
     def gatt(cls, m, t):
+        import matplotlib.pyplot as plt
         for j in range(len(m)):  # 工序j
             i = m[j] - 1  # 机器编号i
             if j == 0:
@@ -58,6 +62,7 @@ class Visualizer:
     @classmethod
     def draw_gantt(cls, xlim: List[int], ylim: List[int], gantt_entries: List[GanttEntry],
                    title: str = None, filename: str = None):
+        import matplotlib.pyplot as plt
         plt.rcParams['savefig.dpi'] = 300  # 图片像素
         plt.rcParams['figure.dpi'] = 300  # 分辨率
         plt.rcParams.update({'font.size': 5})  # set font size
@@ -112,6 +117,7 @@ class Visualizer:
 
     @classmethod
     def test(cls):
+        import matplotlib.pyplot as plt
         m = np.random.randint(1, 7, 10)
         t = np.random.randint(15, 25, 10)
         cls.gatt(m, t)
@@ -120,6 +126,7 @@ class Visualizer:
 
     @classmethod
     def test_2(cls):
+        import matplotlib.pyplot as plt
         # Declaring a figure "gnt"
         fig, gnt = plt.subplots()
 
@@ -10,13 +10,12 @@ def softmax(x):
 
 
 def lcm_d(a, b):
-    # return a * b / math.gcd(a, b)
-    return b / math.gcd(a, b) * a
+    # exact integer arithmetic, float division loses precision once lcm exceeds 2^53
+    return b // math.gcd(a, b) * a
 
 
 def lcm_m(x):
     a = 1
     for i in range(len(x)):
-        t = math.gcd(int(a), x[i])
-        a = a / t * x[i]
+        a = lcm_d(a, int(x[i]))
     return a
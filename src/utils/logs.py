@@ -0,0 +1,14 @@
+import logging
+
+from src import config
+
+
+def dump_enabled(logger: logging.Logger, level: int = logging.INFO) -> bool:
+    '''
+    whether a structured dump (json of allocator, flow, node or xml content) is worth building,
+    i.e. quiet mode is off and the logger would actually emit a record of this level
+    :param logger: logger that emits the dump
+    :param level: logging level of the dump
+    :return: True if the dump should be built
+    '''
+    return not config.LOGGING_CONFIG['quiet'] and logger.isEnabledFor(level)
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import logging
+import random
+import unittest
+from typing import List, Dict
+
+import networkx as nx
+import numpy as np
+
+from src.graph.Flow import Flow
+from src.graph.FlowGenerator import FlowGenerator
+from src.graph.Solver import Solver
+from src.graph.TopoGenerator import TopoGenerator
+from src.graph.topo_strategy.ErdosRenyiStrategy import ErdosRenyiStrategy
+from src.graph.topo_strategy.TopoStrategyFactory import TopoStrategyFactory
+from src.type import TOPO_STRATEGY, ROUTING_STRATEGY, SCHEDULING_STRATEGY, ALLOCATING_STRATEGY, \
+    RELIABILITY_STRATEGY
+from src.utils.AdmissionServer import AdmissionServer, LatencyHistogram
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def flow2json(flow: Flow) -> Dict:
+    return {'flow_id': flow.flow_id, 'size': flow.size, 'period': flow.period, 'source': flow.source,
+            'destinations': flow.destinations, 'reliability': flow.reliability, 'deadline': flow.deadline}
+
+
+class AdmissionServerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+        np.random.seed(7)
+        topo_generator: TopoGenerator = TopoGenerator()
+        topo_generator.topo_strategy = TopoStrategyFactory.get_instance(
+            strategy=TOPO_STRATEGY.ER_STRATEGY, type=ErdosRenyiStrategy.ER_TYPE.GNP, n=8, m=12, p=0.4)
+        graph: nx.Graph = topo_generator.generate_core_topo()
+        attached_edge_nodes = topo_generator.attach_edge_nodes(graph, 8)
+        self.flows: List[Flow] = FlowGenerator.generate_flows(edge_nodes=attached_edge_nodes, graph=graph,
+                                                              flow_num=8)
+        solver: Solver = Solver(nx_graph=graph,
+                                flows=self.flows[:4],
+                                topo_strategy=TOPO_STRATEGY.ER_STRATEGY,
+                                routing_strategy=ROUTING_STRATEGY.BACKTRACKING_REDUNDANT_ROUTING_STRATEGY,
+                                scheduling_strategy=SCHEDULING_STRATEGY.LRF_REDUNDANT_SCHEDULING_STRATEGY,
+                                allocating_strategy=ALLOCATING_STRATEGY.AEAP_ALLOCATING_STRATEGY,
+                                reliability_strategy=RELIABILITY_STRATEGY.MULTI_ROUTES_RELIABILITY_STRATEGY)
+        solver.generate_init_solution()
+        self.server: AdmissionServer = AdmissionServer(Solver.from_solution(solver.final_solution),
+                                                       batch_window=0.05)
+
+    async def session(self) -> List[Dict]:
+        host, port = await self.server.start()
+        connections = [await asyncio.open_connection(host, port) for _ in range(4)]
+
+        async def call(i: int, request: Dict) -> Dict:
+            reader, writer = connections[i % len(connections)]
+            writer.write((json.dumps(request) + '\n').encode())
+            await writer.drain()
+            return json.loads(await reader.readline())
+
+        try:
+            # concurrent admissions are coalesced into one batch
+            responses: List[Dict] = list(await asyncio.gather(
+                *[call(i, {'id': i, 'op': 'admit', 'flow': flow2json(flow)}) for i, flow in
+                  enumerate(self.flows[4:8])]))
+            responses.append(await call(0, {'op': 'query', 'flow_id': self.flows[4].flow_id}))
+            responses.append(await call(0, {'op': 'withdraw', 'flow_id': self.flows[4].flow_id}))
+            responses.append(await call(0, {'op': 'query', 'flow_id': self.flows[4].flow_id}))
+            responses.append(await call(0, {'op': 'admit', 'flow': {'flow_id': 100}}))
+            responses.append(await call(0, {'op': 'no-such-operation'}))
+            # invalid requests are answered on the same connection
+            responses.append(await call(0, [1]))
+            responses.append(await call(0, {'id': 'q', 'op': 'query', 'flow_id': [1]}))
+            responses.append(await call(0, {'op': 'stats'}))
+        finally:
+            for _, writer in connections:
+                writer.close()
+            await self.server.stop()
+        return responses
+
+    def test_session(self):
+        responses: List[Dict] = asyncio.run(self.session())
+        admissions, (query, withdrawal, missing, malformed, unknown, not_object, bad_query, stats) = \
+            responses[:4], responses[4:]
+        self.assertEqual([response['id'] for response in admissions], [0, 1, 2, 3])
+        self.assertTrue(all(response['ok'] for response in admissions))
+        self.assertTrue(admissions[0]['admitted'])
+        self.assertTrue(query['admitted'])
+        self.assertTrue(withdrawal['withdrawn'])
+        self.assertFalse(missing['ok'])
+        self.assertFalse(malformed['ok'])
+        self.assertFalse(unknown['ok'])
+        self.assertFalse(not_object['ok'])
+        self.assertFalse(bad_query['ok'])
+        self.assertEqual(bad_query['id'], 'q')
+        self.assertTrue(stats['ok'])
+        # first batch holds all concurrent admissions
+        self.assertEqual(self.server.batch_sizes[0], 4)
+        self.assertEqual(stats['latency']['admit']['count'], 5)
+        self.assertEqual(stats['latency']['withdraw']['count'], 1)
+
+    def test_histogram(self):
+        histogram: LatencyHistogram = LatencyHistogram([0.001, 0.01])
+        for latency in [0.0005, 0.0005, 0.005, 0.5]:
+            histogram.observe(latency)
+        self.assertEqual(histogram.counts, [2, 1, 1])
+        self.assertEqual(histogram.quantile(0.5), 0.001)
+        self.assertEqual(histogram.quantile(1.0), float('inf'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import logging
+import random
+import unittest
+from typing import List, Dict
+
+import networkx as nx
+import numpy as np
+
+from src.graph.Flow import Flow
+from src.graph.FlowGenerator import FlowGenerator
+from src.graph.Solver import Solver, Solution
+from src.graph.TopoGenerator import TopoGenerator
+from src.graph.topo_strategy.ErdosRenyiStrategy import ErdosRenyiStrategy
+from src.graph.topo_strategy.TopoStrategyFactory import TopoStrategyFactory
+from src.type import TOPO_STRATEGY, ROUTING_STRATEGY, SCHEDULING_STRATEGY, ALLOCATING_STRATEGY, \
+    RELIABILITY_STRATEGY
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class AdmissionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+        np.random.seed(7)
+        topo_generator: TopoGenerator = TopoGenerator()
+        topo_generator.topo_strategy = TopoStrategyFactory.get_instance(
+            strategy=TOPO_STRATEGY.ER_STRATEGY, type=ErdosRenyiStrategy.ER_TYPE.GNP, n=8, m=12, p=0.4)
+        graph: nx.Graph = topo_generator.generate_core_topo()
+        attached_edge_nodes = topo_generator.attach_edge_nodes(graph, 8)
+        self.flows: List[Flow] = FlowGenerator.generate_flows(edge_nodes=attached_edge_nodes, graph=graph,
+                                                              flow_num=6)
+        self.solver: Solver = Solver(nx_graph=graph,
+                                     flows=self.flows[:4],
+                                     topo_strategy=TOPO_STRATEGY.ER_STRATEGY,
+                                     routing_strategy=ROUTING_STRATEGY.BACKTRACKING_REDUNDANT_ROUTING_STRATEGY,
+                                     scheduling_strategy=SCHEDULING_STRATEGY.LRF_REDUNDANT_SCHEDULING_STRATEGY,
+                                     allocating_strategy=ALLOCATING_STRATEGY.AEAP_ALLOCATING_STRATEGY,
+                                     reliability_strategy=RELIABILITY_STRATEGY.MULTI_ROUTES_RELIABILITY_STRATEGY)
+        self.solver.generate_init_solution()
+
+    @staticmethod
+    def fingerprint(solution: Solution) -> Dict:
+        return {
+            'flows': sorted(solution.graph.flows),
+            'failure_flows': sorted(solution.failure_flows),
+            'blocks': {eid: [(b.flow_id, b.interval.lower, b.interval.upper)
+                             for b in edge.time_slot_allocator.allocation_blocks]
+                       for eid, edge in solution.graph.edge_mapper.items()},
+            'load': {eid: edge.time_slot_allocator.load for eid, edge in solution.graph.edge_mapper.items()},
+            'flow_nums': {eid: (edge.time_slot_allocator.flow_num, edge.time_slot_allocator.flow_segment_num)
+                          for eid, edge in solution.graph.edge_mapper.items()},
+        }
+
+    def assertFlowNumsConsistent(self):
+        for edge in self.solver.final_solution.graph.edge_mapper.values():
+            allocator = edge.time_slot_allocator
+            self.assertEqual(allocator.flow_num, len(allocator.flow_times_mapper))
+            self.assertEqual(allocator.flow_segment_num, len(allocator.allocation_blocks))
+
+    def assertWeightsAlmostEqual(self, weights: Dict[int, float]):
+        for eid, edge in self.solver.final_solution.graph.edge_mapper.items():
+            self.assertAlmostEqual(edge.weight, weights[eid])
+
+    def weights(self) -> Dict[int, float]:
+        return {eid: edge.weight for eid, edge in self.solver.final_solution.graph.edge_mapper.items()}
+
+    def test_admit_and_withdraw(self):
+        expected: Dict = self.fingerprint(self.solver.final_solution)
+        weights: Dict[int, float] = self.weights()
+        flow: Flow = self.flows[4]
+        self.assertTrue(self.solver.admit_flow(flow))
+        self.assertIn(flow.flow_id, self.solver.final_solution.graph.flows)
+        self.assertTrue(any(flow.flow_id in edge.time_slot_allocator.flow_times_mapper
+                            for edge in self.solver.final_solution.graph.edge_mapper.values()))
+        self.assertFlowNumsConsistent()
+        self.assertTrue(self.solver.withdraw_flow(flow.flow_id))
+        self.assertFlowNumsConsistent()
+        self.assertFalse(self.solver.withdraw_flow(flow.flow_id))
+        self.assertEqual(self.fingerprint(self.solver.final_solution), expected)
+        self.assertWeightsAlmostEqual(weights)
+
+    def test_rejected_flow_leaves_no_residue(self):
+        expected: Dict = self.fingerprint(self.solver.final_solution)
+        weights: Dict[int, float] = self.weights()
+        template: Flow = self.flows[4]
+        # routable but deadline can never be met
+        flow: Flow = Flow(100, template.size, template.period, template.source, template.destinations,
+                          template.reliability, 1)
+        self.assertFalse(self.solver.admit_flow(flow))
+        self.assertEqual(self.fingerprint(self.solver.final_solution), expected)
+        self.assertEqual(self.weights(), weights)
+        self.assertNotIn(flow, self.solver.final_solution.flows)
+
+    def test_admit_batch(self):
+        template: Flow = self.flows[4]
+        rejected: Flow = Flow(100, template.size, template.period, template.source, template.destinations,
+                              template.reliability, 1)
+        admitted: List[int] = self.solver.admit_flows([self.flows[4], rejected, self.flows[5]])
+        self.assertEqual(admitted, [self.flows[4].flow_id, self.flows[5].flow_id])
+        with self.assertRaises(RuntimeError):
+            self.solver.admit_flow(self.flows[4])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import logging
+import os
+import tempfile
+import unittest
+from typing import List, Dict
+
+from src.utils.Benchmark import Benchmark, BenchmarkCase, generate_cases, compare_reports, save_report, \
+    load_report
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class BenchmarkTestCase(unittest.TestCase):
+
+    def test_cases_are_deterministic(self):
+        cases: List[BenchmarkCase] = generate_cases('quick')
+        self.assertEqual([case.key for case in cases], [case.key for case in generate_cases('quick')])
+        self.assertEqual(len({case.key for case in cases}), len(cases))
+        self.assertEqual(len({case.seed for case in cases}), len(cases))
+        with self.assertRaises(RuntimeError):
+            generate_cases('no-such-suite')
+
+    def test_run_and_compare(self):
+        cases: List[BenchmarkCase] = [case for case in generate_cases('quick')
+                                      if case.params.get('topo', 'ER') == 'ER' and case.params['flow-num'] == 10 and
+                                      case.name != 'solver.optimize']
+        report: Dict = Benchmark(cases, repeat=2).run()
+        self.assertEqual(len(report['results']), len(cases))
+        for result in report['results']:
+            self.assertLessEqual(result['min'], result['median'])
+            self.assertEqual(result['repeat'], 2)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename: str = os.path.join(tmp_dir, 'baseline.json')
+            save_report(report, filename)
+            baseline: Dict = load_report(filename)
+        self.assertEqual(baseline, report)
+        self.assertFalse(any(c['regression'] for c in compare_reports(report, baseline)))
+        # make the first case twice as slow as baseline
+        slower: Dict = {'meta': report['meta'], 'results': [dict(r) for r in report['results']]}
+        slower['results'][0]['median'] = report['results'][0]['median'] * 2
+        comparison: List[Dict] = compare_reports(slower, baseline, threshold=0.2)
+        self.assertEqual([c['regression'] for c in comparison],
+                         [True] + [False] * (len(comparison) - 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import copy
+import logging
+import random
+import unittest
+from typing import List, Dict
+
+import networkx as nx
+import numpy as np
+
+from src.graph.Flow import Flow
+from src.graph.FlowGenerator import FlowGenerator
+from src.graph.Graph import Graph
+from src.graph.Solver import Solver
+from src.graph.TopoGenerator import TopoGenerator
+from src.graph.scheduling_strategy.SchedulingStrategy import SchedulingStrategy
+from src.graph.scheduling_strategy.SchedulingStrategyFactory import SchedulingStrategyFactory
+from src.graph.topo_strategy.ErdosRenyiStrategy import ErdosRenyiStrategy
+from src.graph.topo_strategy.TopoStrategyFactory import TopoStrategyFactory
+from src.type import TOPO_STRATEGY, ROUTING_STRATEGY, SCHEDULING_STRATEGY, ALLOCATING_STRATEGY, \
+    RELIABILITY_STRATEGY
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SLOT_LEN: int = 512  # min flow size 512b over 1b/ns
+
+
+class ExactRepairSchedulingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+        np.random.seed(7)
+
+    @staticmethod
+    def schedule(scheduling_strategy: SCHEDULING_STRATEGY) -> SchedulingStrategy:
+        '''
+        flow 1 has redundant routes 1->3->4 and 2->3->4, it needs 4 time slots per hop within 14 time slots,
+        route 1->3->4 arrives at edge 3->4 at slot 7 and route 2->3->4 arrives at slot 10,
+        edge 3->4 is free only in time slots [0, 14)
+        '''
+        nx_graph: nx.DiGraph = nx.DiGraph([(1, 3), (2, 3), (3, 4)])
+        flows: List[Flow] = [Flow(1, 4 * SLOT_LEN, int(3e5), 1, [4], 0.0, 14 * SLOT_LEN)]
+        solver: Solver = Solver(nx_graph=nx_graph, flows=flows)
+        graph: Graph = solver.final_solution.graph
+        edge_ids: Dict[tuple, int] = {(e.in_node.node_id, e.out_node.node_id): eid
+                                      for eid, e in graph.edge_mapper.items()}
+        blocker: Flow = Flow(2, SLOT_LEN, int(3e5), 1, [4], 0.0, 0)
+        for edge, (send_slot, allocation_num) in {(1, 3): (0, 3), (2, 3): (0, 6), (3, 4): (14, 486)}.items():
+            graph.edge_mapper[edge_ids[edge]].time_slot_allocator.allocate(
+                blocker, send_slot * SLOT_LEN, send_slot * SLOT_LEN, 1, allocation_num)
+        graph.flow_mapper[1].routes = [[[edge_ids[(1, 3)], edge_ids[(3, 4)]], [edge_ids[(2, 3)], edge_ids[(3, 4)]]]]
+        strategy: SchedulingStrategy = SchedulingStrategyFactory.get_instance(scheduling_strategy, graph)
+        strategy.schedule([1])
+        return strategy
+
+    def test_repair(self):
+        # greedy sends route 1->3->4 at slot 7 which overlaps the only window of route 2->3->4
+        self.assertEqual(self.schedule(SCHEDULING_STRATEGY.LRF_REDUNDANT_SCHEDULING_STRATEGY).failure_queue, {1})
+        strategy: SchedulingStrategy = self.schedule(SCHEDULING_STRATEGY.EXACT_REPAIR_SCHEDULING_STRATEGY)
+        self.assertEqual(strategy.failure_queue, set())
+        # both routes are delayed to slot 10 and overlap fully on edge 3->4
+        edge = [e for e in strategy.edge_mapper.values() if e.out_node.node_id == 4][0]
+        self.assertEqual(sorted(b.send_time_offset for b in edge.time_slot_allocator.flow_times_mapper[1]),
+                         [10 * SLOT_LEN, 10 * SLOT_LEN])
+
+    def test_no_worse_than_heuristic(self):
+        topo_generator: TopoGenerator = TopoGenerator()
+        topo_generator.topo_strategy = TopoStrategyFactory.get_instance(
+            strategy=TOPO_STRATEGY.ER_STRATEGY, type=ErdosRenyiStrategy.ER_TYPE.GNP, n=8, m=12, p=0.4)
+        graph: nx.Graph = topo_generator.generate_core_topo()
+        attached_edge_nodes = topo_generator.attach_edge_nodes(graph, 8)
+        flows: List[Flow] = FlowGenerator.generate_flows(edge_nodes=attached_edge_nodes, graph=graph, flow_num=30)
+        failure_flows: List[set] = []
+        for scheduling_strategy in [SCHEDULING_STRATEGY.LRF_REDUNDANT_SCHEDULING_STRATEGY,
+                                    SCHEDULING_STRATEGY.EXACT_REPAIR_SCHEDULING_STRATEGY]:
+            solver: Solver = Solver(nx_graph=copy.deepcopy(graph),
+                                    flows=copy.deepcopy(flows),
+                                    topo_strategy=TOPO_STRATEGY.ER_STRATEGY,
+                                    routing_strategy=ROUTING_STRATEGY.BACKTRACKING_REDUNDANT_ROUTING_STRATEGY,
+                                    scheduling_strategy=scheduling_strategy,
+                                    allocating_strategy=ALLOCATING_STRATEGY.AEAP_ALLOCATING_STRATEGY,
+                                    reliability_strategy=RELIABILITY_STRATEGY.MULTI_ROUTES_RELIABILITY_STRATEGY)
+            failure_flows.append(set(solver.generate_init_solution().failure_flows))
+        self.assertLessEqual(failure_flows[1], failure_flows[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
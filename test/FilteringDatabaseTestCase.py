@@ -0,0 +1,135 @@
+import copy
+import logging
+import random
+import tempfile
+import unittest
+from typing import List, Dict
+
+import networkx as nx
+import numpy as np
+from lxml import etree
+
+from src import config
+from src.graph.Flow import Flow
+from src.graph.FlowGenerator import FlowGenerator
+from src.graph.RunConfig import RunConfig
+from src.graph.Solver import Solver, Solution
+from src.graph.TopoGenerator import TopoGenerator
+from src.graph.topo_strategy.ErdosRenyiStrategy import ErdosRenyiStrategy
+from src.graph.topo_strategy.TopoStrategyFactory import TopoStrategyFactory
+from src.net_envs.network.TSNNetwork import TSNNetwork
+from src.net_envs.network.TSNNetworkFactory import TSNNetworkFactory
+from src.net_envs.network_configurator.ConfigurationInfo import FilteringDatabaseConfigurationInfo, \
+    GateControlListConfigurationInfo
+from src.type import TOPO_STRATEGY, ROUTING_STRATEGY, SCHEDULING_STRATEGY, ALLOCATING_STRATEGY, \
+    RELIABILITY_STRATEGY
+from src.utils.ConfigFileGenerator import ConfigFileGenerator
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class FilteringDatabaseTestCase(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+        np.random.seed(7)
+        self.solutions_res_dir: str = config.solutions_res_dir
+        self.tmp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        config.solutions_res_dir = self.tmp_dir.name
+        topo_generator: TopoGenerator = TopoGenerator()
+        topo_generator.topo_strategy = TopoStrategyFactory.get_instance(
+            strategy=TOPO_STRATEGY.ER_STRATEGY, type=ErdosRenyiStrategy.ER_TYPE.GNP, n=8, m=12, p=0.4)
+        self.graph: nx.Graph = topo_generator.generate_core_topo()
+        attached_edge_nodes = topo_generator.attach_edge_nodes(self.graph, 8)
+        self.flows: List[Flow] = FlowGenerator.generate_flows(edge_nodes=attached_edge_nodes, graph=self.graph,
+                                                              flow_num=12)
+        self.tsn_network_factory: TSNNetworkFactory = TSNNetworkFactory()
+        self.tsn_network: TSNNetwork = self.product('fdb_probe')
+
+    def product(self, solution_name: str, run_config: RunConfig = None) -> TSNNetwork:
+        solver: Solver = Solver(nx_graph=copy.deepcopy(self.graph),
+                                flows=copy.deepcopy(self.flows),
+                                topo_strategy=TOPO_STRATEGY.ER_STRATEGY,
+                                routing_strategy=ROUTING_STRATEGY.BACKTRACKING_REDUNDANT_ROUTING_STRATEGY,
+                                scheduling_strategy=SCHEDULING_STRATEGY.LRF_REDUNDANT_SCHEDULING_STRATEGY,
+                                allocating_strategy=ALLOCATING_STRATEGY.AEAP_ALLOCATING_STRATEGY,
+                                reliability_strategy=RELIABILITY_STRATEGY.MULTI_ROUTES_RELIABILITY_STRATEGY,
+                                run_config=run_config)
+        self.solution: Solution = solver.generate_init_solution()
+        self.solution.solution_name = solution_name
+        solver.save_solution(solution=self.solution)
+        return self.tsn_network_factory.product(solution_filename=solution_name, enhancement_enable=True)
+
+    def tearDown(self):
+        config.solutions_res_dir = self.solutions_res_dir
+        self.tmp_dir.cleanup()
+
+    def forwarding_table(self, switch_id) -> Dict:
+        # search outbound edge and port of switch in every route
+        node_edge_mac_info = self.tsn_network_factory.node_edge_mac_info
+        edge_mac_dict = node_edge_mac_info.edge_mac_dict
+        mac_ports_dict: Dict = {}
+        for flow_id, flow_routes in self.tsn_network_factory.route_immediate_entity.flow_routes_dict.items():
+            for dest_node_id, redundant_routes in flow_routes.flow_routes.items():
+                for route in redundant_routes.redundant_routes:
+                    if switch_id not in route.node_route:
+                        continue
+                    outbound_edge = [eid for eid in route.edge_route if edge_mac_dict[eid].node_pair[0] == switch_id][0]
+                    outbound_port = [p for p, mac in node_edge_mac_info.node_mac_dict[switch_id].port_mac_pair_list
+                                     if mac == edge_mac_dict[outbound_edge].mac_pair[0]][0]
+                    for mac in [route.dest_mac, flow_routes.group_mac]:
+                        if outbound_port not in mac_ports_dict.setdefault(mac, []):
+                            mac_ports_dict[mac].append(outbound_port)
+        return mac_ports_dict
+
+    def test_forwarding_tables(self):
+        routed: int = 0
+        for tsn_switch in self.tsn_network.tsn_switch_list:
+            expected: Dict = self.forwarding_table(tsn_switch.device_id)
+            self.assertEqual({item.mac: item.ports for item in tsn_switch.filtering_database.items}, expected)
+            self.assertEqual([item.mac for item in tsn_switch.filtering_database.items], list(expected.keys()))
+            routed += len(expected) != 0
+        self.assertGreater(routed, 0)
+
+    def test_parse_without_tables(self):
+        tsn_switch = self.tsn_network.tsn_switch_list[0]
+        filtering_database_info: FilteringDatabaseConfigurationInfo = \
+            FilteringDatabaseConfigurationInfo(tsn_switch.device_id)
+        filtering_database_info.parse(node_edge_mac_info=self.tsn_network_factory.node_edge_mac_info,
+                                      route_immediate_entity=self.tsn_network_factory.route_immediate_entity)
+        self.assertEqual([(item.mac, item.ports) for item in filtering_database_info.filtering_database.items],
+                         [(item.mac, item.ports) for item in tsn_switch.filtering_database.items])
+
+    def test_plain_gate_control_list(self):
+        # plain lists are swept the same way as enhancement lists, only without flow and phase
+        for tsn_switch in self.tsn_network.tsn_switch_list:
+            gate_control_list_info: GateControlListConfigurationInfo = \
+                GateControlListConfigurationInfo(tsn_switch.device_id)
+            gate_control_list_info.parse(graph=self.tsn_network_factory.solution.graph,
+                                         node_edge_mac_info=self.tsn_network_factory.node_edge_mac_info,
+                                         route_immediate_entity=self.tsn_network_factory.route_immediate_entity,
+                                         ports=tsn_switch.ports)
+            self.assertEqual(gate_control_list_info.port_gate_control_list.keys(),
+                             tsn_switch.port_gate_control_list.keys())
+            for port_no, gcl in gate_control_list_info.port_gate_control_list.items():
+                self.assertEqual([(item.time, item.gate_states) for item in gcl.items],
+                                 [(item.time, item.gate_states)
+                                  for item in tsn_switch.port_gate_control_list[port_no].items])
+                self.assertEqual(sum(item.time for item in gcl.items), config.GRAPH_CONFIG['hyper-period'])
+
+    def test_hyper_period_of_graph(self):
+        # gate control lists cycle over hyper period of graph, which differs from the configured one if it is planned
+        hyper_period: int = config.GRAPH_CONFIG['hyper-period'] * 2
+        tsn_network: TSNNetwork = self.product('fdb_probe_hp', RunConfig.from_config(hyper_period=hyper_period))
+        self.assertEqual(self.tsn_network_factory.solution.graph.hyper_period, hyper_period)
+        for tsn_switch in tsn_network.tsn_switch_list:
+            for gcl in tsn_switch.port_gate_control_list.values():
+                self.assertEqual(sum(item.time for item in gcl.items), hyper_period)
+        xml_cycle = etree.fromstring(ConfigFileGenerator.generate_switch_schedule_xml(
+            tsn_network, hyper_period=self.solution.graph.hyper_period).encode('utf-8')).find('cycle')
+        self.assertEqual(int(xml_cycle.text), hyper_period)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import logging
+import random
+import time
+import unittest
+from unittest import mock
+
+import networkx as nx
+import numpy as np
+
+from src import config
+from src.graph.FlowGenerator import FlowGenerator, FlowSet, DestinationCandidates, smallest
+from src.graph.TopoGenerator import TopoGenerator
+from src.graph.topo_strategy.ErdosRenyiStrategy import ErdosRenyiStrategy
+from src.graph.topo_strategy.TopoStrategyFactory import TopoStrategyFactory
+from src.type import TOPO_STRATEGY
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class FlowSetTestCase(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+        np.random.seed(7)
+        topo_generator: TopoGenerator = TopoGenerator()
+        topo_generator.topo_strategy = TopoStrategyFactory.get_instance(
+            strategy=TOPO_STRATEGY.ER_STRATEGY, type=ErdosRenyiStrategy.ER_TYPE.GNP, n=8, m=12, p=0.4)
+        self.graph: nx.Graph = topo_generator.generate_core_topo()
+        self.edge_nodes = topo_generator.attach_edge_nodes(self.graph, 8)
+
+    def test_reproducible(self):
+        flow_sets = []
+        for s in [7, 11]:
+            random.seed(s)
+            np.random.seed(s)
+            flow_sets.append(FlowGenerator.generate_flow_set(self.edge_nodes, self.graph, flow_num=200, seed=3))
+        for k in ['flow_ids', 'sizes', 'periods', 'sources', 'destinations', 'destination_offsets',
+                  'reliabilities', 'deadlines']:
+            self.assertTrue(np.array_equal(getattr(flow_sets[0], k), getattr(flow_sets[1], k)), k)
+        other: FlowSet = FlowGenerator.generate_flow_set(self.edge_nodes, self.graph, flow_num=200, seed=4)
+        self.assertFalse(np.array_equal(other.sizes, flow_sets[0].sizes))
+
+    def test_destinations(self):
+        candidates: DestinationCandidates = DestinationCandidates(self.graph, self.edge_nodes)
+        flow_set: FlowSet = FlowGenerator.generate_flow_set(self.edge_nodes, self.graph, flow_num=500, seed=3,
+                                                            candidates=candidates)
+        self.assertEqual(len(flow_set), 500)
+        for flow in flow_set:
+            self.assertIn(len(flow.destinations), config.FLOW_CONFIG['dest-num-set'])
+            self.assertEqual(len(set(flow.destinations)), len(flow.destinations))
+            self.assertNotIn(flow.source, flow.destinations)
+            self.assertTrue(set(flow.destinations) <= set(self.edge_nodes))
+            self.assertIn(flow.size, config.FLOW_CONFIG['size-set'])
+            self.assertIn(flow.period, config.FLOW_CONFIG['period-set'])
+            self.assertIsInstance(flow.source, int)
+            # at most ceil((1 - un-neighbors_degree) * n) neighbors are destinations
+            neighbors = set(candidates.neighbors[flow.source].tolist())
+            self.assertLessEqual(len(neighbors & set(flow.destinations)), int(np.ceil(
+                (1 - config.FLOW_CONFIG['un-neighbors_degree']) * len(neighbors))))
+
+    def test_large_flow_set(self):
+        candidates: DestinationCandidates = DestinationCandidates(self.graph, self.edge_nodes)
+        _start: float = time.perf_counter()
+        flow_set: FlowSet = FlowGenerator.generate_flow_set(self.edge_nodes, self.graph, flow_num=100000, seed=3,
+                                                            candidates=candidates)
+        logger.info('generate 100000 flows in {:.3f}s'.format(time.perf_counter() - _start))
+        self.assertEqual(len(flow_set), 100000)
+        self.assertEqual(flow_set.destination_offsets[-1], len(flow_set.destinations))
+
+    def test_smallest(self):
+        keys: np.ndarray = np.random.random((50, 9))
+        for k in range(0, 11):
+            self.assertTrue(np.array_equal(smallest(keys, k), np.argsort(keys, axis=1)[:, :k]), k)
+
+    def test_sample_in_chunks(self):
+        candidates: DestinationCandidates = DestinationCandidates(self.graph, self.edge_nodes)
+        sources: np.ndarray = np.repeat(np.array(self.edge_nodes[:2]), 40)
+        dest_nums: np.ndarray = np.full(len(sources), 2)
+        expected = candidates.sample(sources, dest_nums, np.random.default_rng(3))
+        with mock.patch('src.graph.FlowGenerator.SAMPLE_CELLS', 1):
+            chunked = candidates.sample(sources, dest_nums, np.random.default_rng(3))
+        self.assertTrue(np.array_equal(chunked[1], expected[1]))
+        for o in self.edge_nodes[:2]:
+            for i in np.flatnonzero(sources == o):
+                self.assertNotIn(o, chunked[0][2 * i:2 * i + 2].tolist())
+                self.assertEqual(len(set(chunked[0][2 * i:2 * i + 2].tolist())), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import copy
+import logging
+import os
+import random
+import tempfile
+import types
+import unittest
+from typing import List
+
+import networkx as nx
+import numpy as np
+
+from src.graph.Flow import Flow
+from src.graph.FlowGenerator import FlowGenerator
+from src.graph.FlowStream import FlowWriter, FlowReader, flow2record, batched
+from src.graph.Solver import Solver
+from src.graph.TopoGenerator import TopoGenerator
+from src.graph.topo_strategy.ErdosRenyiStrategy import ErdosRenyiStrategy
+from src.graph.topo_strategy.TopoStrategyFactory import TopoStrategyFactory
+from src.type import TOPO_STRATEGY, ROUTING_STRATEGY, SCHEDULING_STRATEGY, ALLOCATING_STRATEGY, \
+    RELIABILITY_STRATEGY
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class FlowStreamTestCase(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+        np.random.seed(7)
+        topo_generator: TopoGenerator = TopoGenerator()
+        topo_generator.topo_strategy = TopoStrategyFactory.get_instance(
+            strategy=TOPO_STRATEGY.ER_STRATEGY, type=ErdosRenyiStrategy.ER_TYPE.GNP, n=8, m=12, p=0.4)
+        self.graph: nx.Graph = topo_generator.generate_core_topo()
+        self.edge_nodes = topo_generator.attach_edge_nodes(self.graph, 8)
+        self.tmp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.filename: str = os.path.join(self.tmp_dir.name, 'flows.jsonl')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_iter_flows(self):
+        flows = FlowGenerator.iter_flows(self.edge_nodes, self.graph, flow_num=50, seed=3)
+        self.assertIsInstance(flows, types.GeneratorType)
+        records: List = [flow2record(f) for f in flows]
+        # global random state does not matter
+        random.seed(11)
+        np.random.seed(11)
+        self.assertEqual([flow2record(f) for f in FlowGenerator.iter_flows(self.edge_nodes, self.graph,
+                                                                            flow_num=50, seed=3)], records)
+        self.assertEqual([r['flow_id'] for r in records], list(range(1, 51)))
+        for r in records:
+            self.assertNotIn(r['source'], r['destinations'])
+            self.assertEqual(len(set(r['destinations'])), len(r['destinations']))
+
+    def test_write_and_read(self):
+        flows: List[Flow] = list(FlowGenerator.iter_flows(self.edge_nodes, self.graph, flow_num=10, seed=3))
+        with FlowWriter(self.filename, append=False) as writer:
+            self.assertEqual(writer.write_all(flows[:6]), 6)
+        # appended later
+        with FlowWriter(self.filename) as writer:
+            writer.write_all(flows[6:])
+        reader: FlowReader = FlowReader(self.filename)
+        self.assertEqual([flow2record(f) for f in reader], [flow2record(f) for f in flows])
+        self.assertEqual([len(b) for b in reader.batches(4)], [4, 4, 2])
+        self.assertEqual(list(batched([], 3)), [])
+
+    def test_flows2json(self):
+        flows: List[Flow] = list(FlowGenerator.iter_flows(self.edge_nodes, self.graph, flow_num=3, seed=3))
+        flows[0].routes = [[[1, 2]]]
+        flows[0].walked_edges = {1, 2}
+        FlowGenerator.flows2json(flows)
+        self.assertEqual(flows[0].routes, [[[1, 2]]])
+        self.assertEqual(flows[0].walked_edges, {1, 2})
+
+    def test_admit_flow_stream(self):
+        flows: List[Flow] = list(FlowGenerator.iter_flows(self.edge_nodes, self.graph, flow_num=12, seed=3))
+        with FlowWriter(self.filename, append=False) as writer:
+            writer.write_all(flows[4:])
+        admitted: List[List[int]] = []
+        for stream in [True, False]:
+            solver: Solver = Solver(nx_graph=copy.deepcopy(self.graph),
+                                    flows=copy.deepcopy(flows[:4]),
+                                    topo_strategy=TOPO_STRATEGY.ER_STRATEGY,
+                                    routing_strategy=ROUTING_STRATEGY.BACKTRACKING_REDUNDANT_ROUTING_STRATEGY,
+                                    scheduling_strategy=SCHEDULING_STRATEGY.LRF_REDUNDANT_SCHEDULING_STRATEGY,
+                                    allocating_strategy=ALLOCATING_STRATEGY.AEAP_ALLOCATING_STRATEGY,
+                                    reliability_strategy=RELIABILITY_STRATEGY.MULTI_ROUTES_RELIABILITY_STRATEGY)
+            solver.generate_init_solution()
+            if stream:
+                admitted.append(solver.admit_flow_stream(FlowReader(self.filename), batch_size=3))
+            else:
+                admitted.append(solver.admit_flows(copy.deepcopy(flows[4:])))
+        self.assertEqual(admitted[0], admitted[1])
+        self.assertGreater(len(admitted[0]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import logging
+import types
+import unittest
+
+import numpy as np
+from intervals import IntInterval
+
+from src.graph.Analyzer import Analyzer
+from src.net_envs.network_component.GateControlList import EnhancementGateControlList, sweep_gate_entries, \
+    EXCLUSIVE_TSN_GATE_STATES, EXCLUSIVE_NON_TSN_GATE_STATES, GateControlList, GateControlListCompaction
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class GateControlListTestCase(unittest.TestCase):
+
+    def test_sweep(self):
+        # time slots [2, 3], [4, 4] and [8, 9] of 10 time slots
+        lengths, indexes = sweep_gate_entries(np.array([2, 4, 8]), np.array([3, 4, 9]), 100, 1000)
+        self.assertEqual(lengths.tolist(), [200, 200, 100, 300, 200])
+        self.assertEqual(indexes.tolist(), [-1, 0, 1, -1, 2])
+        # rest of hyper period
+        lengths, indexes = sweep_gate_entries(np.array([0]), np.array([4]), 100, 1000)
+        self.assertEqual(lengths.tolist(), [500, 500])
+        self.assertEqual(indexes.tolist(), [0, -1])
+        self.assertEqual(sum(sweep_gate_entries(np.array([1, 5]), np.array([2, 6]), 7, 70)[0].tolist()), 70)
+
+    def test_add_items(self):
+        gcl: EnhancementGateControlList = EnhancementGateControlList()
+        lengths, indexes = sweep_gate_entries(np.array([2, 4]), np.array([3, 4]), 100, 1000)
+        gcl.add_items(lengths, indexes, [7, 8], [0, 1])
+        self.assertEqual([(item.time, item.flow_id, item.phase) for item in gcl.items],
+                         [(200, 0, 0), (200, 7, 0), (100, 8, 1), (500, 0, 0)])
+        self.assertEqual([item.gate_states for item in gcl.items],
+                         [EXCLUSIVE_NON_TSN_GATE_STATES, EXCLUSIVE_TSN_GATE_STATES, EXCLUSIVE_TSN_GATE_STATES,
+                          EXCLUSIVE_NON_TSN_GATE_STATES])
+        self.assertIsInstance(gcl.items[0].time, int)
+
+    def test_compact(self):
+        gcl: EnhancementGateControlList = EnhancementGateControlList()
+        # gaps of 10 and 30 between windows of flow 7, flow 7 again and flow 8
+        lengths, indexes = sweep_gate_entries(np.array([1, 4, 11]), np.array([2, 7, 12]), 10, 200)
+        gcl.add_items(lengths, indexes, [7, 7, 8], [0, 0, 0])
+        self.assertEqual([item.time for item in gcl.items], [10, 20, 10, 40, 30, 20, 70])
+        report: GateControlListCompaction = gcl.compact(min_gap=20)
+        # the gap of 10 is given to flow 7 whose windows are merged, the leading gap, the gap of 30 and tail are kept
+        self.assertEqual([(item.time, item.flow_id) for item in gcl.items], [(10, 0), (70, 7), (30, 0), (20, 8),
+                                                                             (70, 0)])
+        self.assertEqual((report.entries_before, report.entries_after, report.reduction), (7, 5, 2))
+        self.assertEqual((report.coalesced_gaps, report.coalesced_time), (1, 10))
+        self.assertEqual(sum(item.time for item in gcl.items), 200)
+        # windows of different flows are never merged
+        report = gcl.compact(min_gap=100)
+        self.assertEqual([(item.time, item.flow_id) for item in gcl.items], [(10, 0), (100, 7), (20, 8), (70, 0)])
+        self.assertEqual(report.reduction, 1)
+
+    def test_compact_plain(self):
+        gcl: GateControlList = GateControlList()
+        for time, gate_states in [(5, EXCLUSIVE_TSN_GATE_STATES), (5, EXCLUSIVE_TSN_GATE_STATES),
+                                  (1, EXCLUSIVE_NON_TSN_GATE_STATES), (5, EXCLUSIVE_TSN_GATE_STATES),
+                                  (9, EXCLUSIVE_NON_TSN_GATE_STATES)]:
+            gcl.product_and_add_item(time, gate_states)
+        self.assertEqual(gcl.compact().reduction, 1)
+        self.assertEqual([item.time for item in gcl.items], [10, 1, 5, 9])
+        self.assertEqual(gcl.compact(min_gap=2).reduction, 2)
+        self.assertEqual([item.time for item in gcl.items], [16, 9])
+
+    def test_guard_band(self):
+        blocks = [types.SimpleNamespace(interval=IntInterval.closed(lower, upper))
+                  for lower, upper in [(0, 1), (3, 4), (10, 11), (12, 13)]]
+        allocator = types.SimpleNamespace(allocation_blocks_m=blocks, time_slot_len=10)
+        self.assertEqual(Analyzer.calculate_guard_band_on_edge(allocator), 2)
+        self.assertEqual(Analyzer.calculate_guard_band_on_edge(allocator, min_gap=20), 1)
+        self.assertEqual(Analyzer.calculate_guard_band_on_edge(allocator, min_gap=100), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import json
+import logging
+import math
+import pickle
+import random
+import unittest
+from typing import List, Dict, Set
+
+import networkx as nx
+import numpy as np
+
+from src.graph.Analyzer import Analyzer
+from src.graph.Flow import Flow
+from src.graph.FlowGenerator import FlowGenerator
+from src.graph.Graph import Graph
+from src.graph.Solver import Solver, Solution
+from src.graph.TopoGenerator import TopoGenerator
+from src.graph.topo_strategy.ErdosRenyiStrategy import ErdosRenyiStrategy
+from src.graph.topo_strategy.TopoStrategyFactory import TopoStrategyFactory
+from src.type import TOPO_STRATEGY, ROUTING_STRATEGY, SCHEDULING_STRATEGY, ALLOCATING_STRATEGY, \
+    RELIABILITY_STRATEGY
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class GraphIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+        np.random.seed(7)
+        topo_generator: TopoGenerator = TopoGenerator()
+        topo_generator.topo_strategy = TopoStrategyFactory.get_instance(
+            strategy=TOPO_STRATEGY.ER_STRATEGY, type=ErdosRenyiStrategy.ER_TYPE.GNP, n=8, m=12, p=0.4)
+        graph: nx.Graph = topo_generator.generate_core_topo()
+        attached_edge_nodes = topo_generator.attach_edge_nodes(graph, 8)
+        flows: List[Flow] = FlowGenerator.generate_flows(edge_nodes=attached_edge_nodes, graph=graph, flow_num=8)
+        self.solver: Solver = Solver(nx_graph=graph,
+                                     flows=flows,
+                                     topo_strategy=TOPO_STRATEGY.ER_STRATEGY,
+                                     routing_strategy=ROUTING_STRATEGY.BACKTRACKING_REDUNDANT_ROUTING_STRATEGY,
+                                     scheduling_strategy=SCHEDULING_STRATEGY.LRF_REDUNDANT_SCHEDULING_STRATEGY,
+                                     allocating_strategy=ALLOCATING_STRATEGY.AEAP_ALLOCATING_STRATEGY,
+                                     reliability_strategy=RELIABILITY_STRATEGY.MULTI_ROUTES_RELIABILITY_STRATEGY)
+        self.solver.generate_init_solution()
+
+    @staticmethod
+    def scan_edge_flows(graph: Graph) -> Dict[int, Set[int]]:
+        # reference index built by scanning routes of all flows
+        edge_flows: Dict[int, Set[int]] = {}
+        for fid, flow in graph.flow_mapper.items():
+            for eid in Graph.get_flow_edges(flow):
+                edge_flows.setdefault(eid, set()).add(fid)
+        return edge_flows
+
+    def assert_index_consistent(self, graph: Graph):
+        edge_flows: Dict[int, Set[int]] = {eid: fids for eid, fids in graph.get_edge_flows().items() if fids}
+        self.assertEqual(edge_flows, self.scan_edge_flows(graph))
+        node_flows: Dict[int, Set[int]] = {}
+        for eid, fids in edge_flows.items():
+            edge = graph.edge_mapper[eid]
+            node_flows.setdefault(edge.in_node.node_id, set()).update(fids)
+            node_flows.setdefault(edge.out_node.node_id, set()).update(fids)
+        self.assertEqual({nid: fids for nid, fids in graph.get_node_flows().items() if fids}, node_flows)
+
+    def test_index_after_routing(self):
+        graph: Graph = self.solver.final_solution.graph
+        self.assertNotEqual(graph.get_edge_flows(), {})
+        self.assert_index_consistent(graph)
+
+    def test_index_after_route_changes(self):
+        graph: Graph = self.solver.final_solution.graph
+        fid: int = next(fid for fid in graph.flows if graph.flow_mapper[fid].routes)
+        edges: Set[int] = Graph.get_flow_edges(graph.flow_mapper[fid])
+        graph.flow_mapper[fid].assign_routes([])
+        self.assert_index_consistent(graph)
+        self.assertTrue(all(fid not in graph.get_edge_flows()[eid] for eid in edges))
+        self.solver.withdraw_flow(graph.flows[-1])
+        self.assert_index_consistent(graph)
+
+    def test_index_of_copies(self):
+        solution: Solution = self.solver.perturbate(0.5)
+        self.assert_index_consistent(solution.graph)
+        self.assert_index_consistent(self.solver.final_solution.graph)
+        _solution: Solution = pickle.loads(pickle.dumps(self.solver.final_solution))
+        self.assertIs(_solution.flows[0]._graph, _solution.graph)
+        self.assert_index_consistent(_solution.graph)
+
+    def test_e2e_delay(self):
+        graph: Graph = self.solver.final_solution.graph
+        for fid in set(graph.flows) - graph.failure_queue:
+            flow: Flow = graph.flow_mapper[fid]
+            delays: List[int] = []
+            for edge in graph.edge_mapper.values():
+                if edge.out_node.node_id in flow.destinations:
+                    for block in edge.time_slot_allocator.flow_times_mapper[fid]:
+                        delays.append(block.send_time_offset +
+                                      math.ceil(flow.size / edge.time_slot_allocator.bandwidth))
+            self.assertEqual(Analyzer.calculate_e2e_delay(graph, flow), int(np.mean(delays)))
+
+    def test_flows2json(self):
+        flows: List[Flow] = self.solver.final_solution.flows
+        for f in json.loads(FlowGenerator.flows2json(flows)).values():
+            self.assertNotIn('_graph', json.loads(f))
+
+
+if __name__ == '__main__':
+    unittest.main()
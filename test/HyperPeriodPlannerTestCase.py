@@ -0,0 +1,77 @@
+import logging
+import unittest
+from typing import List
+
+import networkx as nx
+
+from src.graph.Flow import Flow
+from src.graph.FlowGenerator import FlowGenerator
+from src.graph.HyperPeriodPlanner import HyperPeriodPlanner, HyperPeriodPlan
+from src.graph.RunConfig import RunConfig
+from src.graph.Solver import Solver
+from src.utils.computing import lcm_m
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class HyperPeriodPlannerTestCase(unittest.TestCase):
+
+    def test_exact_lcm(self):
+        self.assertEqual(lcm_m([3, 8, 6]), 24)
+        # float arithmetic is not exact beyond 2^53
+        self.assertEqual(lcm_m([10007 * 10 ** 9, 10009 * 10 ** 9]), 10007 * 10009 * 10 ** 9)
+        flows: List[Flow] = [Flow(1, 512, int(1e5), 1, [2], 0.0, 0), Flow(2, 512, int(1.5e5), 1, [2], 0.0, 0)]
+        self.assertEqual(FlowGenerator.compute_hyper_period(flows), int(3e5))
+
+    def test_harmonize_period(self):
+        self.assertEqual(HyperPeriodPlanner.harmonize_period(600, 100), 100)
+        self.assertEqual(HyperPeriodPlanner.harmonize_period(600, 130), 120)
+        self.assertEqual(HyperPeriodPlanner.harmonize_period(600, 700), 600)
+        # prime hyper period has no divisor close to period, period is never collapsed to 1 ns
+        self.assertEqual(HyperPeriodPlanner.harmonize_period(100003, 100000), 100000)
+        self.assertEqual(HyperPeriodPlanner.harmonize_period(2 * 100003, 100000), 100000)
+        self.assertEqual(HyperPeriodPlanner.harmonize_period(2 * 100003, 100003 * 2 - 1), 100003)
+        self.assertEqual(HyperPeriodPlanner.harmonize_period(600, 130, min_period=150), 130)
+        planner: HyperPeriodPlanner = HyperPeriodPlanner(time_slot_len=512, max_time_slot_num=100)
+        plan: HyperPeriodPlan = planner.plan([100000, 100003], harmonize=True)
+        self.assertEqual(plan.periods, {100000: 100000, 100003: 100003})
+        self.assertFalse(plan.harmonized)
+        self.assertIn('periods [100000] are kept', plan.warnings[-1])
+
+    def test_plan(self):
+        planner: HyperPeriodPlanner = HyperPeriodPlanner(time_slot_len=512, max_time_slot_num=1000)
+        periods: List[int] = [int(1e5), int(1.5e5), int(3e5)]
+        plan: HyperPeriodPlan = planner.plan(periods, hyper_period=int(3e5), edge_num=10, route_edge_num=4)
+        self.assertEqual(plan.hyper_period, int(3e5))
+        self.assertEqual(plan.warnings, [])
+        self.assertEqual(plan.phase_num, 3 + 2 + 1)
+        self.assertEqual(plan.block_num, 6 * 4)
+        self.assertGreater(plan.memory, 0)
+        self.assertGreater(plan.runtime, 0)
+        # lcm of co-prime periods explodes slot count
+        periods = [int(1e5) + 7, int(1.5e5) + 11, int(3e5)]
+        plan = planner.plan(periods)
+        self.assertFalse(plan.harmonized)
+        self.assertEqual(len(plan.warnings), 1)
+        plan = planner.plan(periods, harmonize=True)
+        self.assertTrue(plan.harmonized)
+        self.assertEqual(plan.hyper_period, int(3e5))
+        self.assertTrue(all(q <= p and plan.hyper_period % q == 0 for p, q in plan.periods.items()))
+
+    def test_solver(self):
+        nx_graph: nx.DiGraph = nx.DiGraph([(1, 2), (2, 1)])
+        flows: List[Flow] = [Flow(1, 512, int(1e5) + 7, 1, [2], 0.0, 0), Flow(2, 512, int(3e5), 1, [2], 0.0, 0)]
+        run_config: RunConfig = RunConfig.from_config(auto_hyper_period=True, harmonize_periods=True,
+                                                      max_time_slot_num=1000)
+        solver: Solver = Solver(nx_graph=nx_graph, flows=flows, run_config=run_config)
+        self.assertTrue(solver.hyper_period_plan.harmonized)
+        self.assertEqual(flows[0].period, int(1e5))
+        self.assertEqual(solver.run_config.hyper_period, int(3e5))
+        for edge in solver.final_solution.graph.edge_mapper.values():
+            self.assertEqual(edge.time_slot_allocator.hyper_period, int(3e5))
+            self.assertEqual(edge.time_slot_allocator.time_slot_num, int(3e5) // 512)
+
+
+if __name__ == '__main__':
+    unittest.main()
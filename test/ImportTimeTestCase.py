@@ -0,0 +1,54 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+import unittest
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_TIME_BUDGET = 1.0  # import time budget of solver modules, [unit: s]
+LAZY_MODULES = ['matplotlib', 'lxml', 'jinja2']  # modules which should only be loaded when drawing or exporting
+PROBE = '''
+import json, sys, time
+_t = time.perf_counter()
+import {module}
+_t = time.perf_counter() - _t
+print(json.dumps({{'time': _t, 'loaded': [_m for _m in {lazy_modules} if _m in sys.modules]}}))
+'''
+
+
+def measure(module: str) -> dict:
+    '''
+    import module in a fresh interpreter, just like a pool worker does
+    :param module: module to import
+    :return: import time and lazy modules loaded by the import
+    '''
+    _output: bytes = subprocess.check_output(
+        [sys.executable, '-c', PROBE.format(module=module, lazy_modules=LAZY_MODULES)], cwd=ROOT_DIR)
+    return json.loads(_output.decode().strip().splitlines()[-1])
+
+
+class ImportTimeTestCase(unittest.TestCase):
+
+    def test_solver_import(self):
+        _res: dict = measure('src.graph.Solver')
+        logger.info('import src.graph.Solver: %.3fs', _res['time'])
+        self.assertEqual(_res['loaded'], [])
+        self.assertLess(_res['time'], IMPORT_TIME_BUDGET)
+
+    def test_network_factory_import(self):
+        _res: dict = measure('src.net_envs.network.TSNNetworkFactory')
+        logger.info('import src.net_envs.network.TSNNetworkFactory: %.3fs', _res['time'])
+        self.assertEqual(_res['loaded'], [])
+        self.assertLess(_res['time'], IMPORT_TIME_BUDGET)
+
+    def test_config_file_generator_import(self):
+        _res: dict = measure('src.utils.ConfigFileGenerator')
+        self.assertEqual(_res['loaded'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
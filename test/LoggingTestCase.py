@@ -0,0 +1,45 @@
+import logging
+import unittest
+from unittest import mock
+
+from src import config
+from src.graph.TimeSlotAllocator import TimeSlotAllocator
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class LoggingTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.quiet = config.LOGGING_CONFIG['quiet']
+        self.allocator_logger = logging.getLogger('src.graph.TimeSlotAllocator')
+        self.level = self.allocator_logger.level
+        self.allocator = TimeSlotAllocator(1, hp=300000, b=1)
+
+    def tearDown(self) -> None:
+        config.LOGGING_CONFIG['quiet'] = self.quiet
+        self.allocator_logger.setLevel(self.level)
+
+    def test_dump_when_enabled(self):
+        config.LOGGING_CONFIG['quiet'] = False
+        with self.assertLogs('src.graph.TimeSlotAllocator', level=logging.INFO) as cm:
+            self.allocator.to_string()
+        self.assertIn('"edge id": 1', cm.output[0])
+
+    def test_skip_dump_in_quiet_mode(self):
+        config.LOGGING_CONFIG['quiet'] = True
+        with mock.patch('src.graph.TimeSlotAllocator.json.dumps') as dumps:
+            self.allocator.to_string()
+            dumps.assert_not_called()
+
+    def test_skip_dump_when_level_disabled(self):
+        config.LOGGING_CONFIG['quiet'] = False
+        self.allocator_logger.setLevel(logging.WARNING)
+        with mock.patch('src.graph.TimeSlotAllocator.json.dumps') as dumps:
+            self.allocator.to_string()
+            dumps.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import logging
+import random
+import re
+import tempfile
+import unittest
+from typing import List, Set, Tuple
+
+import networkx as nx
+import numpy as np
+
+from src import config
+from src.graph.Flow import Flow
+from src.graph.FlowGenerator import FlowGenerator
+from src.graph.Solver import Solver, Solution
+from src.graph.TopoGenerator import TopoGenerator
+from src.graph.topo_strategy.ErdosRenyiStrategy import ErdosRenyiStrategy
+from src.graph.topo_strategy.TopoStrategyFactory import TopoStrategyFactory
+from src.net_envs.network.TSNNetwork import TSNNetwork
+from src.net_envs.network.TSNNetworkFactory import TSNNetworkFactory
+from src.type import TOPO_STRATEGY, ROUTING_STRATEGY, SCHEDULING_STRATEGY, ALLOCATING_STRATEGY, \
+    RELIABILITY_STRATEGY
+from src.utils.ConfigFileGenerator import ConfigFileGenerator
+import src.utils.MacAddressGenerator as MAG
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class NedFileTestCase(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+        np.random.seed(7)
+        self.solutions_res_dir: str = config.solutions_res_dir
+        self.tmp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        config.solutions_res_dir = self.tmp_dir.name
+        topo_generator: TopoGenerator = TopoGenerator()
+        topo_generator.topo_strategy = TopoStrategyFactory.get_instance(
+            strategy=TOPO_STRATEGY.ER_STRATEGY, type=ErdosRenyiStrategy.ER_TYPE.GNP, n=8, m=12, p=0.4)
+        graph: nx.Graph = topo_generator.generate_core_topo()
+        attached_edge_nodes = topo_generator.attach_edge_nodes(graph, 8)
+        flows: List[Flow] = FlowGenerator.generate_flows(edge_nodes=attached_edge_nodes, graph=graph, flow_num=8)
+        solver: Solver = Solver(nx_graph=graph,
+                                flows=flows,
+                                topo_strategy=TOPO_STRATEGY.ER_STRATEGY,
+                                routing_strategy=ROUTING_STRATEGY.BACKTRACKING_REDUNDANT_ROUTING_STRATEGY,
+                                scheduling_strategy=SCHEDULING_STRATEGY.LRF_REDUNDANT_SCHEDULING_STRATEGY,
+                                allocating_strategy=ALLOCATING_STRATEGY.AEAP_ALLOCATING_STRATEGY,
+                                reliability_strategy=RELIABILITY_STRATEGY.MULTI_ROUTES_RELIABILITY_STRATEGY)
+        self.solution: Solution = solver.generate_init_solution()
+        self.solution.solution_name = 'ned_probe'
+        solver.save_solution(solution=self.solution)
+        tsn_network_factory: TSNNetworkFactory = TSNNetworkFactory()
+        self.tsn_network: TSNNetwork = tsn_network_factory.product(solution_filename='ned_probe',
+                                                                   enhancement_enable=True)
+        self.node_edge_mac_info: MAG.NodeEdgeMacInfo = tsn_network_factory.node_edge_mac_info
+
+    def tearDown(self):
+        config.solutions_res_dir = self.solutions_res_dir
+        self.tmp_dir.cleanup()
+
+    def test_indexes(self):
+        edge_mac_dict = self.node_edge_mac_info.edge_mac_dict
+        for eid, edge_mac_mapper in edge_mac_dict.items():
+            mac = edge_mac_mapper.mac_pair[0]
+            self.assertEqual(self.node_edge_mac_info.get_edge_by_mac(mac),
+                             list(filter(lambda e: edge_mac_dict[e].mac_pair[0] == mac, edge_mac_dict))[0])
+            self.assertEqual(self.node_edge_mac_info.get_edge_by_nodes(*edge_mac_mapper.node_pair), eid)
+        # both directions of a link share the pair of macs
+        for eid, edge_mac_mapper in edge_mac_dict.items():
+            reversed_eid = self.node_edge_mac_info.get_edge_by_nodes(*reversed(edge_mac_mapper.node_pair))
+            self.assertEqual(edge_mac_dict[reversed_eid].mac_pair, tuple(reversed(edge_mac_mapper.mac_pair)))
+
+    def test_generate_ned_file(self):
+        ned: str = ConfigFileGenerator.generate_ned_file(tsn_network=self.tsn_network, solution=self.solution,
+                                                         node_edge_mac_info=self.node_edge_mac_info)
+        links: Set[Tuple[str, ...]] = set(re.findall(
+            r'switch(\d+)\.ethg\$o\[(\d+)\] --> C --> switch(\d+)\.ethg\$i\[(\d+)\]', ned))
+        self.assertGreater(len(links), 0)
+        # every link between switches is connected in both directions on the same ports
+        for u, p, v, q in links:
+            self.assertIn((v, q, u, p), links)
+        hosts: List[Tuple[str, ...]] = re.findall(r'host(\d+)\.ethg\$o --> C --> switch(\d+)\.ethg', ned)
+        self.assertEqual(len(hosts), len(self.tsn_network.tsn_host_list))
+        # batch rendering shares the compiled template
+        self.assertEqual(ConfigFileGenerator.generate_ned_files(
+            [(self.tsn_network, self.solution, self.node_edge_mac_info)] * 2), [ned, ned])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import bisect
+import logging
+import random
+import unittest
+from math import ceil
+
+from src.graph.Flow import Flow
+from src.graph.TimeSlotAllocator import TimeSlotAllocator, Occupancy, SparseOccupancy, DenseOccupancy, gallop_left
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class OccupancyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+
+    def test_gallop_left(self):
+        a = sorted(random.randrange(0, 100) for _ in range(50))
+        for x in range(-2, 103):
+            for hint in [0, 10, 25, 49, 50]:
+                self.assertEqual(gallop_left(a, x, hint), bisect.bisect_left(a, x))
+
+    def try_both(self, allocator: TimeSlotAllocator, time_offset: int, flow: Flow, allocation_num: int,
+                 overlaped: bool) -> bool:
+        phase_num: int = ceil(allocator.hyper_period / flow.period)
+        allocator.occupancy_enabled = True
+        indexed: bool = allocator.try_allocate(time_offset, flow.flow_id, allocation_num, phase_num, flow.period,
+                                               overlaped=overlaped)
+        allocator.occupancy_enabled = False
+        scanned: bool = allocator.try_allocate(time_offset, flow.flow_id, allocation_num, phase_num, flow.period,
+                                               overlaped=overlaped)
+        self.assertEqual(indexed, scanned, (time_offset, flow.flow_id, allocation_num, overlaped))
+        return indexed
+
+    def check_same_as_scanning(self, hp: int):
+        allocator: TimeSlotAllocator = TimeSlotAllocator(1, hp=hp, b=1)
+        allocator.phase_folding = False
+        flows = [Flow(fid, 512, random.choice([int(1e5), int(1.5e5), int(3e5)]), 0, [1], 0.0, 0)
+                 for fid in range(1, 80)]
+        representations = set()
+        for i in range(150):
+            flow: Flow = random.choice(flows)
+            allocation_num: int = random.randint(1, 8)
+            time_offset: int = random.randrange(0, hp)
+            if flow.flow_id in allocator.flow_times_mapper and random.random() < 0.5:
+                # synchronize with existing blocks of the same flow, e.g. redundant routes
+                time_offset = allocator.flow_times_mapper[flow.flow_id][0].send_time_offset
+            if random.random() < 0.05:
+                allocator.save_scene()
+            if self.try_both(allocator, time_offset, flow, allocation_num, overlaped=random.random() < 0.5):
+                allocator.allocate(flow, time_offset, time_offset, ceil(hp / flow.period), allocation_num)
+                if random.random() < 0.05:
+                    allocator.recover_scene()
+            if random.random() < 0.03:
+                allocator.release_flow(random.choice(flows).flow_id)
+            representations.add(type(allocator.get_occupancy()))
+            self.check_index(allocator)
+        return representations
+
+    def check_index(self, allocator: TimeSlotAllocator):
+        # index kept up to date in place answers the same as index rebuilt from blocks
+        occupancy: Occupancy = allocator.get_occupancy()
+        rebuilt: Occupancy = Occupancy.build(allocator.allocation_blocks, allocator.time_slot_num)
+        self.assertEqual(occupancy.block_num, len(allocator.allocation_blocks))
+        for lower in range(0, allocator.time_slot_num, 7):
+            self.assertEqual(occupancy.conflict(lower, lower + 3), rebuilt.conflict(lower, lower + 3), lower)
+        # runs cover exactly the occupied time slots
+        mask = [False] * allocator.time_slot_num
+        for start, end in zip(*occupancy.runs()):
+            self.assertFalse(any(mask[max(start - 1, 0):end + 1]))  # disjoint and not adjacent
+            mask[start:end + 1] = [True] * (end - start + 1)
+        self.assertEqual(mask, allocator.get_occupied_mask().tolist())
+
+    def test_same_as_scanning(self):
+        self.assertIn(SparseOccupancy, self.check_same_as_scanning(int(3e5)))
+
+    def test_long_hyper_period(self):
+        # many phases of short periods fill 11718 time slots of 6 ms hyper period enough for dense representation
+        self.assertIn(DenseOccupancy, self.check_same_as_scanning(int(6e6)))
+
+    def test_build(self):
+        allocator: TimeSlotAllocator = TimeSlotAllocator(1, hp=int(6e6), b=1)
+        flow: Flow = Flow(1, 512, int(3e6), 0, [1], 0.0, 0)
+        allocator.allocate(flow, 0, 0, 2, 1)
+        self.assertIsInstance(allocator.get_occupancy(), SparseOccupancy)
+        flow = Flow(2, 512, int(5e3), 0, [1], 0.0, 0)
+        allocator.allocate(flow, 1024, 1024, 1200, 1)
+        self.assertIsInstance(allocator.get_occupancy(), DenseOccupancy)
+        self.assertTrue(allocator.get_occupancy().conflict(2, 2))
+        self.assertFalse(allocator.get_occupancy().conflict(3, 3))
+        allocator.release_flow(2)
+        self.assertIsInstance(allocator.get_occupancy(), SparseOccupancy)
+
+    def test_remove(self):
+        for occupancy in [SparseOccupancy(100), DenseOccupancy(100)]:
+            allocator: TimeSlotAllocator = TimeSlotAllocator(1, hp=int(3e5), b=1)
+            allocator.allocate(Flow(1, 512, int(1e5), 0, [1], 0.0, 0), 0, 0, 3, 2)
+            allocator.allocate(Flow(2, 512, int(1e5), 0, [1], 0.0, 0), 1024, 1024, 3, 2)
+            for block in allocator.allocation_blocks:
+                occupancy.insert(block)
+            for block in allocator.flow_times_mapper[1]:
+                occupancy.remove(block)
+            self.assertEqual(occupancy.block_num, 3)
+            self.assertFalse(occupancy.conflict(0, 1))
+            self.assertTrue(occupancy.conflict(2, 3))
+            self.assertFalse(occupancy.conflict(2, 3, flow_id=2, time_offset=1024, allocation_num=2))
+        # release removes blocks of flow from index instead of dropping it
+        occupancy = allocator.get_occupancy()
+        allocator.release_flow(2)
+        self.assertIs(allocator.occupancy, occupancy)
+        self.assertEqual(occupancy.block_num, 3)
+        self.assertFalse(occupancy.conflict(2, 3))
+        self.assertRaises(TypeError, Occupancy, 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
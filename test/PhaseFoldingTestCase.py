@@ -0,0 +1,96 @@
+import logging
+import random
+import unittest
+from math import ceil
+from typing import List
+from unittest import mock
+
+from src.graph.Edge import Edge
+from src.graph.Flow import Flow
+from src.graph.Node import Node
+from src.graph.RunConfig import RunConfig
+from src.graph.TimeSlotAllocator import TimeSlotAllocator
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SLOT_LEN: int = 512  # min flow size 512b over 1b/ns
+HYPER_PERIOD: int = SLOT_LEN * 600
+PERIODS: List[int] = [SLOT_LEN * 100, SLOT_LEN * 150, SLOT_LEN * 200, SLOT_LEN * 300, SLOT_LEN * 600]
+
+
+class PhaseFoldingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+        self.allocator: TimeSlotAllocator = TimeSlotAllocator(1, hp=HYPER_PERIOD, b=1, s=SLOT_LEN, max_b=1)
+
+    def try_both(self, time_offset: int, flow: Flow, allocation_num: int, overlaped: bool = False) -> bool:
+        phase_num: int = ceil(HYPER_PERIOD / flow.period)
+        self.allocator.phase_folding = True
+        folded: bool = self.allocator.try_allocate(time_offset, flow.flow_id, allocation_num, phase_num, flow.period,
+                                                   overlaped=overlaped)
+        self.allocator.phase_folding = False
+        expanded: bool = self.allocator.try_allocate(time_offset, flow.flow_id, allocation_num, phase_num,
+                                                     flow.period, overlaped=overlaped)
+        self.assertEqual(folded, expanded, (time_offset, flow.period, allocation_num))
+        return folded
+
+    def test_aligned(self):
+        self.assertTrue(self.allocator.is_aligned(6, PERIODS[0]))
+        self.assertFalse(self.allocator.is_aligned(3, int(1e5)))
+
+    def test_same_as_expanding_phases(self):
+        allocated: int = 0
+        for fid in range(1, 300):
+            flow: Flow = Flow(fid, SLOT_LEN, random.choice(PERIODS), 0, [1], 0.0, 0)
+            allocation_num: int = random.randint(1, 6)
+            time_offset: int = random.randrange(0, HYPER_PERIOD)
+            if self.try_both(time_offset, flow, allocation_num, overlaped=random.random() < 0.5):
+                self.allocator.allocate(flow, time_offset, time_offset, ceil(HYPER_PERIOD / flow.period),
+                                        allocation_num)
+                allocated += 1
+        self.assertGreater(allocated, 10)
+        self.assertLess(allocated, 299)
+
+    def test_release(self):
+        flow: Flow = Flow(1, SLOT_LEN, PERIODS[0], 0, [1], 0.0, 0)
+        self.allocator.allocate(flow, 0, 0, 6, 3)
+        other: Flow = Flow(2, SLOT_LEN, PERIODS[1], 0, [1], 0.0, 0)
+        self.assertFalse(self.try_both(SLOT_LEN * 50, other, 2))
+        self.allocator.release_flow(flow.flow_id)
+        self.assertTrue(self.try_both(SLOT_LEN * 50, other, 2))
+
+    def test_scene(self):
+        flow: Flow = Flow(1, SLOT_LEN, PERIODS[0], 0, [1], 0.0, 0)
+        self.allocator.save_scene()
+        self.allocator.allocate(flow, 0, 0, 6, 3)
+        self.allocator.recover_scene()
+        self.assertEqual(self.allocator.reservations, {})
+
+    def test_folding_happens(self):
+        self.assertFalse(self.allocator.phase_folding)  # off by default
+        run_config: RunConfig = RunConfig.from_config(min_flow_size=SLOT_LEN, max_bandwidth=1).replace(
+            phase_folding=True)
+        allocator: TimeSlotAllocator = Edge(1, Node(1), Node(2), b=1, hp=HYPER_PERIOD,
+                                            run_config=run_config).time_slot_allocator
+        self.assertTrue(allocator.phase_folding)
+        allocator.allocate(Flow(1, SLOT_LEN, PERIODS[0], 0, [1], 0.0, 0), 0, 0, 6, 3)
+        with mock.patch.object(allocator, 'try_allocate_smart', wraps=allocator.try_allocate_smart) as smart:
+            self.assertFalse(allocator.try_allocate(SLOT_LEN * 50, 2, 2, 4, PERIODS[1]))
+            self.assertTrue(allocator.try_allocate(SLOT_LEN * 10, 2, 2, 4, PERIODS[1]))
+            self.assertEqual(smart.call_count, 2)
+        # a reservation off the time slot grid disables folding until it is released
+        allocator.allocate(Flow(3, SLOT_LEN, SLOT_LEN * 100 + 1, 0, [1], 0.0, 0), 0, SLOT_LEN * 20, 6, 1)
+        self.assertEqual(allocator.misaligned_num, 1)
+        self.assertFalse(allocator.can_fold(2, 4, PERIODS[1]))
+        allocator.release_flow(3)
+        self.assertTrue(allocator.can_fold(2, 4, PERIODS[1]))
+        allocator.save_scene()
+        allocator.allocate(Flow(3, SLOT_LEN, SLOT_LEN * 100 + 1, 0, [1], 0.0, 0), 0, SLOT_LEN * 20, 6, 1)
+        allocator.recover_scene()
+        self.assertTrue(allocator.can_fold(2, 4, PERIODS[1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import copy
+import csv
+import logging
+import os
+import random
+import tempfile
+import unittest
+from typing import List
+
+import networkx as nx
+import numpy as np
+
+from src.graph.Analyzer import Analyzer
+from src.graph.Flow import Flow
+from src.graph.FlowGenerator import FlowGenerator
+from src.graph.Solver import Solver, Solution
+from src.graph.TopoGenerator import TopoGenerator
+from src.graph.topo_strategy.ErdosRenyiStrategy import ErdosRenyiStrategy
+from src.graph.topo_strategy.TopoStrategyFactory import TopoStrategyFactory
+from src.type import TOPO_STRATEGY, ROUTING_STRATEGY, SCHEDULING_STRATEGY, ALLOCATING_STRATEGY, \
+    RELIABILITY_STRATEGY
+from src.utils.Profiler import Profiler, NULL_PROFILER
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ProfilerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+        np.random.seed(7)
+        topo_generator: TopoGenerator = TopoGenerator()
+        topo_generator.topo_strategy = TopoStrategyFactory.get_instance(
+            strategy=TOPO_STRATEGY.ER_STRATEGY, type=ErdosRenyiStrategy.ER_TYPE.GNP, n=8, m=12, p=0.4)
+        self.graph: nx.Graph = topo_generator.generate_core_topo()
+        attached_edge_nodes = topo_generator.attach_edge_nodes(self.graph, 8)
+        self.flows: List[Flow] = FlowGenerator.generate_flows(edge_nodes=attached_edge_nodes, graph=self.graph,
+                                                              flow_num=8)
+
+    def solve(self, profiler: Profiler = None) -> Solution:
+        solver: Solver = Solver(nx_graph=copy.deepcopy(self.graph),
+                                flows=copy.deepcopy(self.flows),
+                                topo_strategy=TOPO_STRATEGY.ER_STRATEGY,
+                                routing_strategy=ROUTING_STRATEGY.BACKTRACKING_REDUNDANT_ROUTING_STRATEGY,
+                                scheduling_strategy=SCHEDULING_STRATEGY.LRF_REDUNDANT_SCHEDULING_STRATEGY,
+                                allocating_strategy=ALLOCATING_STRATEGY.AEAP_ALLOCATING_STRATEGY,
+                                reliability_strategy=RELIABILITY_STRATEGY.MULTI_ROUTES_RELIABILITY_STRATEGY,
+                                profiler=profiler)
+        return solver.generate_init_solution()
+
+    def test_disabled_by_default(self):
+        solution: Solution = self.solve()
+        self.assertEqual(solution.profile, {})
+        self.assertEqual(NULL_PROFILER.to_dict(), {'spans': {}, 'counters': {}, 'records': {}})
+        # spans of null profiler share one no-op context
+        self.assertIs(NULL_PROFILER.span('routing'), NULL_PROFILER.span('scheduling', key=1))
+        with NULL_PROFILER.span('routing'):
+            pass
+
+    def test_profile(self):
+        solution: Solution = self.solve(Profiler())
+        spans = solution.profile['spans']
+        counters = solution.profile['counters']
+        for name in ['routing', 'scheduling', 'routing.flow', 'scheduling.flow', 'reliability',
+                     'allocating.AEAPAllocatingStrategy']:
+            self.assertIn(name, spans)
+        self.assertGreater(counters['reliability.evaluation'], 0)
+        self.assertGreater(counters['allocator.try_allocate'], 0)
+        # routing time is recorded per flow
+        self.assertEqual(set(solution.profile['records']['routing.flow'].keys()),
+                         {flow.flow_id for flow in self.flows})
+        self.assertLessEqual(spans['routing.flow']['total'], spans['routing']['total'])
+
+    def test_same_solution(self):
+        disabled: Solution = self.solve()
+        enabled: Solution = self.solve(Profiler())
+        self.assertEqual(disabled.failure_flows, enabled.failure_flows)
+        self.assertEqual([flow.routes for flow in disabled.flows], [flow.routes for flow in enabled.flows])
+
+    def test_analyze_profile(self):
+        solution: Solution = self.solve(Profiler())
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename: str = os.path.join(tmp_dir, 'profile')
+            Analyzer.analyze_profile(solution, filename)
+            with open(filename + '_profile.csv', 'r') as file:
+                rows: List[List[str]] = list(csv.reader(file))
+        self.assertIn(['routing', 'span'], [[row[2], row[1]] for row in rows])
+        self.assertTrue(all(row[0] == solution.solution_name for row in rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import logging
+import random
+import unittest
+from typing import List, Dict, Set
+
+import networkx as nx
+import numpy as np
+
+from src.graph.Edge import Edge
+from src.graph.Flow import Flow
+from src.graph.FlowGenerator import FlowGenerator
+from src.graph.Graph import Graph
+from src.graph.Solver import Solver, RecoveryReport
+from src.graph.TopoGenerator import TopoGenerator
+from src.graph.topo_strategy.ErdosRenyiStrategy import ErdosRenyiStrategy
+from src.graph.topo_strategy.TopoStrategyFactory import TopoStrategyFactory
+from src.type import TOPO_STRATEGY, ROUTING_STRATEGY, SCHEDULING_STRATEGY, ALLOCATING_STRATEGY, \
+    RELIABILITY_STRATEGY
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class RecoveryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+        np.random.seed(7)
+        topo_generator: TopoGenerator = TopoGenerator()
+        topo_generator.topo_strategy = TopoStrategyFactory.get_instance(
+            strategy=TOPO_STRATEGY.ER_STRATEGY, type=ErdosRenyiStrategy.ER_TYPE.GNP, n=8, m=12, p=0.4)
+        graph: nx.Graph = topo_generator.generate_core_topo()
+        attached_edge_nodes = topo_generator.attach_edge_nodes(graph, 8)
+        flows: List[Flow] = FlowGenerator.generate_flows(edge_nodes=attached_edge_nodes, graph=graph, flow_num=8)
+        self.solver: Solver = Solver(nx_graph=graph,
+                                     flows=flows,
+                                     topo_strategy=TOPO_STRATEGY.ER_STRATEGY,
+                                     routing_strategy=ROUTING_STRATEGY.BACKTRACKING_REDUNDANT_ROUTING_STRATEGY,
+                                     scheduling_strategy=SCHEDULING_STRATEGY.LRF_REDUNDANT_SCHEDULING_STRATEGY,
+                                     allocating_strategy=ALLOCATING_STRATEGY.AEAP_ALLOCATING_STRATEGY,
+                                     reliability_strategy=RELIABILITY_STRATEGY.MULTI_ROUTES_RELIABILITY_STRATEGY)
+        self.solver.generate_init_solution()
+        self.graph: Graph = self.solver.final_solution.graph
+
+    def busiest_core_edge(self) -> int:
+        edge_flows: Dict[int, Set[int]] = self.graph.get_edge_flows()
+        core_edges: List[int] = [eid for eid in edge_flows if
+                                 len(self.graph.edge_mapper[eid].in_node.in_edge) > 1 and
+                                 len(self.graph.edge_mapper[eid].out_node.out_edge) > 1]
+        return max(core_edges, key=lambda eid: len(edge_flows[eid]))
+
+    def blocks(self, flow_ids: Set[int]) -> Dict:
+        return {eid: [(b.flow_id, b.interval.lower, b.interval.upper)
+                      for b in edge.time_slot_allocator.allocation_blocks if b.flow_id in flow_ids]
+                for eid, edge in self.graph.edge_mapper.items()}
+
+    def test_recover_edge(self):
+        eid: int = self.busiest_core_edge()
+        affected: Set[int] = self.graph.get_edge_flows()[eid] - self.graph.failure_queue
+        unaffected: Set[int] = set(self.graph.flows) - affected
+        expected: Dict = self.blocks(unaffected)
+        report: RecoveryReport = self.solver.recover(failed_edges=[eid])
+        self.assertEqual(set(report.affected_flows), affected)
+        self.assertEqual(set(report.recovered_flows) | set(report.unrecovered_flows), affected)
+        # reservations of unaffected flows are untouched
+        self.assertEqual(self.blocks(unaffected), expected)
+        failed_edge: Edge = self.graph.edge_mapper[eid]
+        self.assertTrue(failed_edge.failed)
+        self.assertEqual(failed_edge.time_slot_allocator.allocation_blocks, [])
+        for fid in report.recovered_flows:
+            self.assertNotIn(eid, Graph.get_flow_edges(self.graph.flow_mapper[fid]))
+            self.assertIn(fid, report.delay_changes)
+        for fid in report.unrecovered_flows:
+            self.assertIn(fid, self.solver.final_solution.failure_flows)
+        self.assertLess(report.runtime, 1.0)
+
+    def test_recover_node(self):
+        eid: int = self.busiest_core_edge()
+        nid: int = self.graph.edge_mapper[eid].out_node.node_id
+        report: RecoveryReport = self.solver.recover(failed_nodes=[nid])
+        self.assertIn(eid, report.failed_edges)
+        for fid in report.recovered_flows:
+            flow_edges: Set[int] = Graph.get_flow_edges(self.graph.flow_mapper[fid])
+            self.assertEqual(flow_edges & set(report.failed_edges), set())
+
+    def test_time_budget(self):
+        eid: int = self.busiest_core_edge()
+        report: RecoveryReport = self.solver.recover(failed_edges=[eid], time_budget=0)
+        self.assertEqual(set(report.skipped_flows), set(report.affected_flows))
+        self.assertTrue(set(report.skipped_flows) <= set(self.solver.final_solution.failure_flows))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import copy
+import logging
+import random
+import unittest
+from math import ceil
+from typing import List, Dict
+from unittest import mock
+
+import networkx as nx
+import numpy as np
+
+from src.graph.Flow import Flow
+from src.graph.FlowGenerator import FlowGenerator
+from src.graph.Solver import Solver
+from src.graph.TimeSlotAllocator import TimeSlotAllocator
+from src.graph.TopoGenerator import TopoGenerator
+from src.graph.allocating_strategy.AEAPAllocatingStrategy import AEAPAllocatingStrategy
+from src.graph.allocating_strategy.AllocatingStrategy import AllocatingStrategy
+from src.graph.topo_strategy.ErdosRenyiStrategy import ErdosRenyiStrategy
+from src.graph.topo_strategy.TopoStrategyFactory import TopoStrategyFactory
+from src.type import TOPO_STRATEGY, ROUTING_STRATEGY, SCHEDULING_STRATEGY, ALLOCATING_STRATEGY, \
+    RELIABILITY_STRATEGY
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class RouteAllocationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+        np.random.seed(7)
+
+    @staticmethod
+    def blocks(solver: Solver) -> Dict:
+        return {eid: [(b.flow_id, b.interval.lower, b.interval.upper, b.send_time_offset)
+                      for b in edge.time_slot_allocator.allocation_blocks]
+                for eid, edge in solver.final_solution.graph.edge_mapper.items()}
+
+    def test_earliest_offset(self):
+        strategy: AEAPAllocatingStrategy = AEAPAllocatingStrategy()
+        allocator: TimeSlotAllocator = TimeSlotAllocator(1, hp=int(3e5), b=1)
+        for fid in range(1, 40):
+            flow: Flow = Flow(fid, random.choice([512, 1600, 5000]), random.choice([int(1e5), int(1.5e5), int(3e5)]),
+                              0, [1], 0.0, int(1e8))
+            allocation_num: int = ceil(flow.size / allocator.time_slot_len)
+            phase_num: int = ceil(allocator.hyper_period / flow.period)
+            arrival_time_offset: int = random.randrange(0, allocator.hyper_period)
+            earliest: int = strategy.find_earliest_offset(flow, allocator, allocator.get_occupied_mask(),
+                                                          arrival_time_offset, allocation_num, phase_num)
+            # _allocate allocates at the earliest offset it finds
+            self.assertEqual(earliest, strategy._allocate(flow, allocator, arrival_time_offset, allocation_num,
+                                                          phase_num))
+        self.assertGreater(len(allocator.allocation_blocks), 40)
+
+    def test_earliest_offset_in_runs(self):
+        strategy: AEAPAllocatingStrategy = AEAPAllocatingStrategy()
+        for hyper_period in [int(3e5), int(6e6)]:
+            allocator: TimeSlotAllocator = TimeSlotAllocator(1, hp=hyper_period, b=1)
+            for fid in range(1, 60):
+                flow: Flow = Flow(fid, random.choice([512, 1600, 5000]),
+                                  random.choice([int(1e5), int(1.5e5), int(3e5)]), 0, [1], 0.0, int(1e8))
+                allocation_num: int = ceil(flow.size / allocator.time_slot_len)
+                phase_num: int = ceil(allocator.hyper_period / flow.period)
+                arrival_time_offset: int = random.randrange(0, allocator.hyper_period)
+                earliest: int = strategy.find_earliest_offset_in_runs(
+                    flow, allocator, allocator.get_occupied_runs(), arrival_time_offset, allocation_num, phase_num)
+                self.assertEqual(earliest, strategy.find_earliest_offset(
+                    flow, allocator, allocator.get_occupied_mask(), arrival_time_offset, allocation_num, phase_num))
+                if earliest != -1:
+                    allocator.allocate(flow, arrival_time_offset, earliest, phase_num, allocation_num)
+            self.assertGreater(len(allocator.allocation_blocks), 60)
+        # sparse occupancy of long hyper period is searched without a mask of time slots
+        flow: Flow = Flow(100, 512, int(1e5), 0, [1], 0.0, int(1e8))
+        with mock.patch.object(allocator, 'get_occupied_mask') as get_occupied_mask:
+            _, feasible = strategy.plan_route(flow, [allocator])
+        self.assertTrue(feasible)
+        get_occupied_mask.assert_not_called()
+
+    def test_same_as_hop_by_hop(self):
+        topo_generator: TopoGenerator = TopoGenerator()
+        topo_generator.topo_strategy = TopoStrategyFactory.get_instance(
+            strategy=TOPO_STRATEGY.ER_STRATEGY, type=ErdosRenyiStrategy.ER_TYPE.GNP, n=8, m=12, p=0.4)
+        graph: nx.Graph = topo_generator.generate_core_topo()
+        attached_edge_nodes = topo_generator.attach_edge_nodes(graph, 8)
+        flows: List[Flow] = FlowGenerator.generate_flows(edge_nodes=attached_edge_nodes, graph=graph, flow_num=16)
+        solvers: List[Solver] = []
+        for _ in range(2):
+            solvers.append(Solver(nx_graph=copy.deepcopy(graph),
+                                  flows=copy.deepcopy(flows),
+                                  topo_strategy=TOPO_STRATEGY.ER_STRATEGY,
+                                  routing_strategy=ROUTING_STRATEGY.BACKTRACKING_REDUNDANT_ROUTING_STRATEGY,
+                                  scheduling_strategy=SCHEDULING_STRATEGY.LRF_REDUNDANT_SCHEDULING_STRATEGY,
+                                  allocating_strategy=ALLOCATING_STRATEGY.AEAP_ALLOCATING_STRATEGY,
+                                  reliability_strategy=RELIABILITY_STRATEGY.MULTI_ROUTES_RELIABILITY_STRATEGY))
+        solvers[0].generate_init_solution()
+        with mock.patch.object(AEAPAllocatingStrategy, 'allocate_route', AllocatingStrategy.allocate_route):
+            solvers[1].generate_init_solution()
+        self.assertEqual(solvers[0].final_solution.failure_flows, solvers[1].final_solution.failure_flows)
+        self.assertEqual(self.blocks(solvers[0]), self.blocks(solvers[1]))
+        self.assertNotEqual(self.blocks(solvers[0]), {eid: [] for eid in self.blocks(solvers[0])})
+
+
+if __name__ == '__main__':
+    unittest.main()
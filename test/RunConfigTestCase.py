@@ -0,0 +1,92 @@
+import copy
+import dataclasses
+import logging
+import random
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict
+
+import networkx as nx
+import numpy as np
+
+from src import config
+from src.graph.Flow import Flow
+from src.graph.FlowGenerator import FlowGenerator
+from src.graph.RunConfig import RunConfig
+from src.graph.Solver import Solver, Solution
+from src.graph.TopoGenerator import TopoGenerator
+from src.graph.topo_strategy.ErdosRenyiStrategy import ErdosRenyiStrategy
+from src.graph.topo_strategy.TopoStrategyFactory import TopoStrategyFactory
+from src.type import TOPO_STRATEGY, ROUTING_STRATEGY, SCHEDULING_STRATEGY, ALLOCATING_STRATEGY, \
+    RELIABILITY_STRATEGY
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class RunConfigTestCase(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+        np.random.seed(7)
+        topo_generator: TopoGenerator = TopoGenerator()
+        topo_generator.topo_strategy = TopoStrategyFactory.get_instance(
+            strategy=TOPO_STRATEGY.ER_STRATEGY, type=ErdosRenyiStrategy.ER_TYPE.GNP, n=8, m=12, p=0.4)
+        self.graph: nx.Graph = topo_generator.generate_core_topo()
+        attached_edge_nodes = topo_generator.attach_edge_nodes(self.graph, 8)
+        self.flows: List[Flow] = FlowGenerator.generate_flows(edge_nodes=attached_edge_nodes, graph=self.graph,
+                                                              flow_num=8)
+
+    def solve(self, run_config: RunConfig) -> Solution:
+        solver: Solver = Solver(nx_graph=copy.deepcopy(self.graph),
+                                flows=copy.deepcopy(self.flows),
+                                topo_strategy=TOPO_STRATEGY.ER_STRATEGY,
+                                routing_strategy=ROUTING_STRATEGY.BACKTRACKING_REDUNDANT_ROUTING_STRATEGY,
+                                scheduling_strategy=SCHEDULING_STRATEGY.LRF_REDUNDANT_SCHEDULING_STRATEGY,
+                                allocating_strategy=ALLOCATING_STRATEGY.AEAP_ALLOCATING_STRATEGY,
+                                reliability_strategy=RELIABILITY_STRATEGY.MULTI_ROUTES_RELIABILITY_STRATEGY,
+                                run_config=run_config)
+        return solver.generate_init_solution()
+
+    @staticmethod
+    def fingerprint(solution: Solution) -> Dict:
+        return {
+            'failure_flows': sorted(solution.failure_flows),
+            'routes': [flow.routes for flow in solution.flows],
+            'blocks': {eid: [(b.flow_id, b.interval.lower, b.interval.upper)
+                             for b in edge.time_slot_allocator.allocation_blocks]
+                       for eid, edge in solution.graph.edge_mapper.items()},
+        }
+
+    def test_frozen(self):
+        run_config: RunConfig = RunConfig.from_config()
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            run_config.max_hops = 1
+
+    def test_snapshot_of_global_config(self):
+        hyper_period: int = config.GRAPH_CONFIG['hyper-period']
+        run_config: RunConfig = RunConfig.from_config(max_hops=3)
+        try:
+            config.GRAPH_CONFIG['hyper-period'] = hyper_period * 2
+            self.assertEqual(run_config.hyper_period, hyper_period)
+            self.assertEqual(run_config.max_hops, 3)
+            self.assertEqual(run_config.replace(max_hops=4).max_hops, 4)
+        finally:
+            config.GRAPH_CONFIG['hyper-period'] = hyper_period
+
+    def test_threaded_solves(self):
+        run_configs: List[RunConfig] = [
+            RunConfig.from_config(),
+            RunConfig.from_config(hyper_period=config.GRAPH_CONFIG['hyper-period'] * 2, max_hops=4),
+        ]
+        expected: List[Dict] = [self.fingerprint(self.solve(run_config)) for run_config in run_configs]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            solutions: List[Solution] = list(executor.map(self.solve, run_configs))
+        self.assertEqual([self.fingerprint(solution) for solution in solutions], expected)
+        for solution, run_config in zip(solutions, run_configs):
+            for edge in solution.graph.edge_mapper.values():
+                self.assertEqual(edge.time_slot_allocator.hyper_period, run_config.hyper_period)
+
+
+if __name__ == '__main__':
+    unittest.main()
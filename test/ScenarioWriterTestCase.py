@@ -0,0 +1,94 @@
+import logging
+import os
+import tarfile
+import tempfile
+import unittest
+import zipfile
+
+from src.utils.ScenarioWriter import ScenarioWriter
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ScenarioWriterTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.root_dir: str = os.path.join(self.tmp_dir.name, 'scenario')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def export(self, files: dict, archive: str = None) -> ScenarioWriter:
+        with ScenarioWriter(self.root_dir, archive=archive) as writer:
+            writer.makedirs('results')
+            for relpath, content in files.items():
+                writer.write(relpath, content)
+        return writer
+
+    def test_skip_unchanged(self):
+        writer: ScenarioWriter = self.export({'a.ned': b'a', os.path.join('xml', 'b.xml'): b'b'})
+        self.assertEqual((writer.written, writer.skipped, writer.removed), (2, 0, 0))
+        filename: str = os.path.join(self.root_dir, 'a.ned')
+        mtime: int = os.stat(filename).st_mtime_ns
+        writer = self.export({'a.ned': b'a', os.path.join('xml', 'b.xml'): b'c'})
+        self.assertEqual((writer.written, writer.skipped, writer.removed), (1, 1, 0))
+        self.assertEqual(os.stat(filename).st_mtime_ns, mtime)
+        with open(os.path.join(self.root_dir, 'xml', 'b.xml'), 'rb') as f:
+            self.assertEqual(f.read(), b'c')
+
+    def test_remove_stale(self):
+        self.export({'a.ned': b'a', os.path.join('xml', 'hosts', 'host1', 'flow1.xml'): b'f'})
+        with open(os.path.join(self.root_dir, 'results', 'old.sca'), 'w') as f:
+            f.write('old')
+        writer: ScenarioWriter = self.export({'a.ned': b'a'})
+        self.assertEqual(writer.removed, 2)
+        self.assertFalse(os.path.exists(os.path.join(self.root_dir, 'xml')))
+        self.assertEqual(os.listdir(os.path.join(self.root_dir, 'results')), [])
+        self.assertEqual(sorted(os.listdir(self.root_dir)), ['a.ned', 'results'])
+
+    def test_error(self):
+        with self.assertRaises(ValueError):
+            with ScenarioWriter(self.root_dir) as writer:
+                with writer.open('a.ned') as f:
+                    f.write(b'a')
+                    raise ValueError()
+        self.assertEqual(os.listdir(self.root_dir), [])
+
+    def test_archive(self):
+        files: dict = {'a.ned': b'a', os.path.join('xml', 'b.xml'): b'b'}
+        writer: ScenarioWriter = self.export(files, archive='zip')
+        self.assertFalse(os.path.exists(self.root_dir))
+        with zipfile.ZipFile(writer.archive_filename) as f:
+            self.assertEqual(f.read('scenario/xml/b.xml'), b'b')
+            self.assertIn('scenario/results/', f.namelist())
+        with open(writer.archive_filename, 'rb') as f:
+            content: bytes = f.read()
+        # archive of the same scenario is identical whatever order files are completed in
+        with open(self.export(dict(reversed(list(files.items()))), archive='zip').archive_filename, 'rb') as f:
+            self.assertEqual(f.read(), content)
+        # entries are added in sorted path order, parents first
+        with zipfile.ZipFile(writer.archive_filename) as f:
+            self.assertEqual(f.namelist(), ['scenario/a.ned', 'scenario/results/', 'scenario/xml/',
+                                            'scenario/xml/b.xml'])
+            self.assertEqual(f.read('scenario/a.ned'), b'a')
+        writer = self.export(files, archive='tar')
+        with tarfile.open(writer.archive_filename) as f:
+            self.assertEqual(f.extractfile('scenario/a.ned').read(), b'a')
+        self.assertRaises(RuntimeError, ScenarioWriter, self.root_dir, 'rar')
+
+    def test_archive_error(self):
+        writer: ScenarioWriter = self.export({'a.ned': b'a'}, archive='tar')
+        with self.assertRaises(ValueError):
+            with ScenarioWriter(self.root_dir, archive='tar') as writer:
+                writer.write('b.ned', b'b')
+                raise ValueError()
+        # previous archive is kept and no temporary file is left
+        self.assertEqual(os.listdir(self.tmp_dir.name), ['scenario.tar'])
+        with tarfile.open(writer.archive_filename) as f:
+            self.assertEqual(f.getnames(), ['scenario/a.ned', 'scenario/results'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import json
+import logging
+import os
+import pickle
+import random
+import tempfile
+import unittest
+from typing import List, Dict
+
+import networkx as nx
+import numpy as np
+
+from src.graph.Flow import Flow
+from src.graph.FlowGenerator import FlowGenerator
+from src.graph.SolutionStore import SolutionStore, SolutionReader, FORMAT_VERSION
+from src.graph.Solver import Solver, Solution
+from src.graph.TopoGenerator import TopoGenerator
+from src.graph.topo_strategy.ErdosRenyiStrategy import ErdosRenyiStrategy
+from src.graph.topo_strategy.TopoStrategyFactory import TopoStrategyFactory
+from src.type import TOPO_STRATEGY, ROUTING_STRATEGY, SCHEDULING_STRATEGY, ALLOCATING_STRATEGY, \
+    RELIABILITY_STRATEGY
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class SolutionStoreTestCase(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+        np.random.seed(7)
+        topo_generator: TopoGenerator = TopoGenerator()
+        topo_generator.topo_strategy = TopoStrategyFactory.get_instance(
+            strategy=TOPO_STRATEGY.ER_STRATEGY, type=ErdosRenyiStrategy.ER_TYPE.GNP, n=8, m=12, p=0.4)
+        graph: nx.Graph = topo_generator.generate_core_topo()
+        attached_edge_nodes = topo_generator.attach_edge_nodes(graph, 8)
+        flows: List[Flow] = FlowGenerator.generate_flows(edge_nodes=attached_edge_nodes, graph=graph, flow_num=16)
+        self.solver: Solver = Solver(nx_graph=graph,
+                                     flows=flows,
+                                     topo_strategy=TOPO_STRATEGY.ER_STRATEGY,
+                                     routing_strategy=ROUTING_STRATEGY.BACKTRACKING_REDUNDANT_ROUTING_STRATEGY,
+                                     scheduling_strategy=SCHEDULING_STRATEGY.LRF_REDUNDANT_SCHEDULING_STRATEGY,
+                                     allocating_strategy=ALLOCATING_STRATEGY.AEAP_ALLOCATING_STRATEGY,
+                                     reliability_strategy=RELIABILITY_STRATEGY.MULTI_ROUTES_RELIABILITY_STRATEGY)
+        self.solution: Solution = self.solver.generate_init_solution()
+        self.tmp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.filename: str = os.path.join(self.tmp_dir.name, self.solution.solution_name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    @staticmethod
+    def schedule(solution: Solution) -> Dict:
+        return {eid: ([(b.flow_id, b.phase, b.interval.lower, b.interval.upper, b.arrival_time_offset,
+                        b.send_time_offset) for b in e.time_slot_allocator.allocation_blocks],
+                      {fid: [(b.phase, b.interval.lower) for b in B]
+                       for fid, B in e.time_slot_allocator.flow_times_mapper.items()},
+                      e.time_slot_allocator.time_slot_used)
+                for eid, e in solution.graph.edge_mapper.items()}
+
+    def test_round_trip(self):
+        self.solver.save_solution(filename=self.filename)
+        self.assertTrue(SolutionStore.is_store(self.filename))
+        solution: Solution = SolutionStore.load(self.filename)
+        self.assertEqual(solution.solution_name, self.solution.solution_name)
+        self.assertEqual(solution.routing_strategy, self.solution.routing_strategy)
+        self.assertEqual(solution.failure_flows, self.solution.failure_flows)
+        self.assertEqual(solution.graph.edges, self.solution.graph.edges)
+        self.assertEqual(solution.graph.edge_flows, self.solution.graph.edge_flows)
+        self.assertEqual([(f.flow_id, f.period, f.deadline, f.routes) for f in solution.flows],
+                         [(f.flow_id, f.period, f.deadline, f.routes) for f in self.solution.flows])
+        self.assertEqual(self.schedule(solution), self.schedule(self.solution))
+        # routing load of edges is kept, so admitted flows see occupied bandwidth
+        weights: Dict[int, float] = {eid: e.weight for eid, e in self.solution.graph.edge_mapper.items()}
+        self.assertNotEqual(set(weights.values()), {0})
+        self.assertEqual({eid: e.weight for eid, e in solution.graph.edge_mapper.items()}, weights)
+        # loaded solution keeps admitting flows
+        for eid, e in solution.graph.edge_mapper.items():
+            self.assertEqual(e.time_slot_allocator.get_occupied_mask().tolist(),
+                             self.solution.graph.edge_mapper[eid].time_slot_allocator.get_occupied_mask().tolist())
+
+    def test_partial_read(self):
+        SolutionStore.save(self.solution, self.filename)
+        reader: SolutionReader = SolutionStore.open(self.filename)
+        self.assertIsInstance(reader.array('route_edges'), np.memmap)
+        flows: List[Flow] = reader.read_flows()
+        self.assertEqual([f.routes for f in flows], [f.routes for f in self.solution.flows])
+        eid, edge = max(self.solution.graph.edge_mapper.items(),
+                        key=lambda x: len(x[1].time_slot_allocator.allocation_blocks))
+        schedule: Dict[str, np.ndarray] = reader.read_edge_schedule(eid)
+        self.assertEqual(sorted(zip(schedule['flow_id'].tolist(), schedule['lower'].tolist())),
+                         sorted((b.flow_id, b.interval.lower) for b in edge.time_slot_allocator.allocation_blocks))
+
+    def test_pickle_fallback(self):
+        with open(self.filename, 'wb') as f:
+            pickle.dump(self.solution, f)
+        self.assertFalse(SolutionStore.is_store(self.filename))
+        self.assertEqual(self.schedule(SolutionStore.load(self.filename)), self.schedule(self.solution))
+
+    def test_version(self):
+        arrays: Dict[str, np.ndarray] = SolutionStore.to_arrays(self.solution)
+        meta: Dict = json.loads(bytes(arrays['meta']).decode('utf-8'))
+        meta['version'] = FORMAT_VERSION + 1
+        arrays['meta'] = np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8)
+        with open(self.filename, 'wb') as f:
+            np.savez(f, **arrays)
+        self.assertRaises(RuntimeError, SolutionStore.open, self.filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
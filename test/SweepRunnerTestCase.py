@@ -0,0 +1,97 @@
+import copy
+import logging
+import os
+import tempfile
+import unittest
+from typing import Dict
+
+from src import config
+from src.graph.topo_strategy.ErdosRenyiStrategy import ErdosRenyiStrategy
+from src.type import TOPO_STRATEGY, ROUTING_STRATEGY, RELIABILITY_STRATEGY
+from src.utils.SweepRunner import SweepRunner, apply_configs, CONFIG_DICTS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class SweepRunnerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.results_filename = os.path.join(self.tmp_dir.name, 'sweep.jsonl')
+        self.grid = {
+            'round': [1],
+            'topo-strategy': [
+                {
+                    'strategy': TOPO_STRATEGY.ER_STRATEGY,
+                    'type': ErdosRenyiStrategy.ER_TYPE.GNP,
+                    'n': 8,
+                    'm': 12,
+                    'p': 0.5,
+                },
+            ],
+            'core-node-num': [8],
+            'edge-node-num': [8],
+            'edge-nodes-distribution-degree': [2],
+            'flow-num': [4],
+            'routing-strategy': [ROUTING_STRATEGY.BACKTRACKING_REDUNDANT_ROUTING_STRATEGY,
+                                 ROUTING_STRATEGY.DIJKSTRA_SINGLE_ROUTING_STRATEGY],
+            'reliability-strategy': [RELIABILITY_STRATEGY.UNI_ROUTES_RELIABILITY_STRATEGY],
+        }
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_run_and_resume(self):
+        flow_num: int = config.FLOW_CONFIG['flow-num']
+        runner: SweepRunner = SweepRunner(grid=self.grid, results_filename=self.results_filename, max_workers=2)
+        records = runner.run()
+        self.assertEqual(len(records), 2)
+        for record in records:
+            self.assertEqual(record['status'], 'ok', record.get('error'))
+            self.assertEqual(record['result']['flow_num'], 4)
+        # parent config is never touched by workers
+        self.assertEqual(config.FLOW_CONFIG['flow-num'], flow_num)
+        # everything is recorded, nothing left to resume
+        self.assertEqual(len(runner.run()), 0)
+        self.assertEqual(len(runner.completed_keys()), 2)
+
+    def test_resume_after_interruption(self):
+        runner: SweepRunner = SweepRunner(grid=self.grid, results_filename=self.results_filename, max_workers=1)
+        tasks = runner.generate_tasks()
+        runner.save_record({'key': tasks[0].key, 'seed': tasks[0].seed, 'status': 'ok', 'params': {}, 'result': {}})
+        with open(self.results_filename, 'a') as f:
+            f.write('{"key": "trunc')  # killed while writing
+        records = runner.run()
+        self.assertEqual([record['key'] for record in records], [tasks[1].key])
+        # record written after the broken line is not lost
+        self.assertEqual(sorted(record['key'] for record in runner.load_records()),
+                         sorted([tasks[0].key, tasks[1].key]))
+        self.assertEqual(runner.completed_keys(), {tasks[0].key, tasks[1].key})
+        self.assertEqual(runner.run(), [])
+
+    def test_seed_only_depends_on_params(self):
+        runner: SweepRunner = SweepRunner(grid=self.grid, results_filename=self.results_filename)
+        seeds = [task.seed for task in runner.generate_tasks()]
+        self.grid['routing-strategy'].reverse()
+        reversed_runner: SweepRunner = SweepRunner(grid=self.grid, results_filename=self.results_filename)
+        self.assertEqual(sorted(seeds), sorted([task.seed for task in reversed_runner.generate_tasks()]))
+
+    def test_shared_config_keys(self):
+        configs: Dict[str, Dict] = {name: copy.deepcopy(getattr(config, name)) for name in CONFIG_DICTS}
+        hyper_period: int = config.GRAPH_CONFIG['hyper-period'] * 2
+        try:
+            apply_configs(configs, {'round': 1, 'hyper-period': hyper_period})
+            self.assertEqual(config.GRAPH_CONFIG['hyper-period'], hyper_period)
+            self.assertEqual(config.FLOW_CONFIG['hyper-period'], hyper_period)
+        finally:
+            apply_configs(configs, {})
+
+    def test_unknown_parameter(self):
+        self.grid['no-such-parameter'] = [1]
+        with self.assertRaises(RuntimeError):
+            SweepRunner(grid=self.grid, results_filename=self.results_filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
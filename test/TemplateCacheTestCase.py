@@ -0,0 +1,63 @@
+import logging
+import os
+import tempfile
+import unittest
+from typing import List
+
+from src import config
+from src.graph.Flow import Flow
+from src.utils.ConfigFileGenerator import ConfigFileGenerator, load_template, render_template, clear_template_cache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TemplateCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.template_cache_dir: str = config.template_cache_dir
+        self.tmp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.template_dir: str = os.path.join(self.tmp_dir.name, 'templates')
+        os.makedirs(self.template_dir)
+        config.template_cache_dir = os.path.join(self.tmp_dir.name, 'cache')
+        os.makedirs(config.template_cache_dir)
+        self.write_template('hello {{ name }}')
+        clear_template_cache()
+
+    def tearDown(self):
+        clear_template_cache()
+        config.template_cache_dir = self.template_cache_dir
+        self.tmp_dir.cleanup()
+
+    def write_template(self, content: str, mtime_ns: int = None):
+        filename: str = os.path.join(self.template_dir, 'probe.txt')
+        with open(filename, 'w') as f:
+            f.write(content)
+        if mtime_ns is not None:
+            os.utime(filename, ns=(mtime_ns, mtime_ns))
+
+    def test_cache(self):
+        template = load_template(self.template_dir, 'probe.txt')
+        self.assertIs(load_template(self.template_dir, 'probe.txt'), template)
+        self.assertEqual(template.render(name='tsn'), 'hello tsn')
+        # compiled code is kept in bytecode cache
+        self.assertGreater(len(os.listdir(config.template_cache_dir)), 0)
+        # edited template is compiled again
+        self.write_template('bye {{ name }}', mtime_ns=os.stat(template.filename).st_mtime_ns + 10 ** 9)
+        self.assertEqual(load_template(self.template_dir, 'probe.txt').render(name='tsn'), 'bye tsn')
+
+    def test_render_template(self):
+        self.assertEqual(list(render_template(self.template_dir, 'probe.txt', [{'name': 'a'}, {'name': 'b'}])),
+                         ['hello a', 'hello b'])
+
+    def test_generate_ini_files(self):
+        flows: List[Flow] = [Flow(1, 512, 10000, 1, [2], 0.0, 0), Flow(2, 512, 10000, 1, [3], 0.0, 0),
+                             Flow(3, 512, 10000, 2, [1], 0.0, 0)]
+        scenarios = [('TestScenario', flows), ('Another', flows[:1])]
+        self.assertEqual(ConfigFileGenerator.generate_ini_files(scenarios),
+                         [ConfigFileGenerator.generate_ini_file(network_name=n, flows=f) for n, f in scenarios])
+        self.assertRaises(RuntimeError, ConfigFileGenerator.generate_ini_files, [('', flows)])
+
+
+if __name__ == '__main__':
+    unittest.main()
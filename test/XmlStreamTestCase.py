@@ -0,0 +1,120 @@
+import io
+import logging
+import os
+import random
+import tempfile
+import unittest
+import zipfile
+from typing import List
+
+import networkx as nx
+import numpy as np
+from lxml import etree
+
+from src import config
+from src.graph.Flow import Flow
+from src.graph.FlowGenerator import FlowGenerator
+from src.graph.Solver import Solver, Solution
+from src.graph.TopoGenerator import TopoGenerator
+from src.graph.topo_strategy.ErdosRenyiStrategy import ErdosRenyiStrategy
+from src.graph.topo_strategy.TopoStrategyFactory import TopoStrategyFactory
+from src.net_envs.network.TSNNetwork import TSNNetwork
+from src.net_envs.network.TSNNetworkFactory import TSNNetworkFactory
+from src.type import TOPO_STRATEGY, ROUTING_STRATEGY, SCHEDULING_STRATEGY, ALLOCATING_STRATEGY, \
+    RELIABILITY_STRATEGY
+from src.utils.ConfigFileGenerator import ConfigFileGenerator, write_xml
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def pretty(content: bytes) -> bytes:
+    # serialization of the whole tree in memory
+    _root = etree.fromstring(content, etree.XMLParser(remove_blank_text=True))
+    return etree.tostring(_root, pretty_print=True, xml_declaration=True, encoding='utf-8')
+
+
+class XmlStreamTestCase(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+        np.random.seed(7)
+        self.solutions_res_dir: str = config.solutions_res_dir
+        self.test_scenario_res_dir: str = config.test_scenario_res_dir
+        self.tmp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        config.solutions_res_dir = self.tmp_dir.name
+        topo_generator: TopoGenerator = TopoGenerator()
+        topo_generator.topo_strategy = TopoStrategyFactory.get_instance(
+            strategy=TOPO_STRATEGY.ER_STRATEGY, type=ErdosRenyiStrategy.ER_TYPE.GNP, n=8, m=12, p=0.4)
+        graph: nx.Graph = topo_generator.generate_core_topo()
+        attached_edge_nodes = topo_generator.attach_edge_nodes(graph, 8)
+        flows: List[Flow] = FlowGenerator.generate_flows(edge_nodes=attached_edge_nodes, graph=graph, flow_num=8)
+        solver: Solver = Solver(nx_graph=graph,
+                                flows=flows,
+                                topo_strategy=TOPO_STRATEGY.ER_STRATEGY,
+                                routing_strategy=ROUTING_STRATEGY.BACKTRACKING_REDUNDANT_ROUTING_STRATEGY,
+                                scheduling_strategy=SCHEDULING_STRATEGY.LRF_REDUNDANT_SCHEDULING_STRATEGY,
+                                allocating_strategy=ALLOCATING_STRATEGY.AEAP_ALLOCATING_STRATEGY,
+                                reliability_strategy=RELIABILITY_STRATEGY.MULTI_ROUTES_RELIABILITY_STRATEGY)
+        self.solution: Solution = solver.generate_init_solution()
+        self.solution.solution_name = 'xml_probe'
+        solver.save_solution(solution=self.solution)
+        tsn_network_factory: TSNNetworkFactory = TSNNetworkFactory()
+        self.tsn_network: TSNNetwork = tsn_network_factory.product(solution_filename='xml_probe',
+                                                                   enhancement_enable=True)
+        self.node_edge_mac_info = tsn_network_factory.node_edge_mac_info
+
+    def tearDown(self):
+        config.solutions_res_dir = self.solutions_res_dir
+        config.test_scenario_res_dir = self.test_scenario_res_dir
+        self.tmp_dir.cleanup()
+
+    def test_identical_to_tree(self):
+        for content in [ConfigFileGenerator.generate_routes_xml(self.tsn_network),
+                        ConfigFileGenerator.generate_switch_schedule_xml(self.tsn_network),
+                        ConfigFileGenerator.generate_flows_xml(self.solution.flows)] + \
+                       [c for d in ConfigFileGenerator.generate_host_schedule_xml(self.tsn_network).values()
+                        for c in d.values()]:
+            self.assertEqual(content.encode('utf-8'), pretty(content.encode('utf-8')))
+        self.assertEqual(ConfigFileGenerator.generate_flows_xml([]),
+                         "<?xml version='1.0' encoding='utf-8'?>\n<flows/>\n")
+
+    def test_write_file(self):
+        filename: str = os.path.join(self.tmp_dir.name, 'GCLs_flat.xml')
+        ConfigFileGenerator.write_switch_schedule_xml(self.tsn_network, filename)
+        with open(filename, 'r') as f:
+            self.assertEqual(f.read(), ConfigFileGenerator.generate_switch_schedule_xml(self.tsn_network))
+
+    def test_create_test_scenario(self):
+        scenarios_dir: str = os.path.join(self.tmp_dir.name, 'test_scenario')
+        filenames: List[str] = []
+        for max_workers in [1, 4]:
+            ConfigFileGenerator.create_test_scenario(tsn_network=self.tsn_network, solution=self.solution,
+                                                     node_edge_mac_info=self.node_edge_mac_info,
+                                                     test_scenario_dirname=scenarios_dir, max_workers=max_workers)
+            filenames.append(sorted(os.path.relpath(os.path.join(root, f), scenarios_dir)
+                                    for root, dirs, files in os.walk(scenarios_dir) for f in files))
+        self.assertEqual(filenames[0], filenames[1])
+        with open(os.path.join(scenarios_dir, 'xml_probe', 'xml', 'schedules', 'switches', 'GCLs_flat.xml')) as f:
+            self.assertEqual(f.read(), ConfigFileGenerator.generate_switch_schedule_xml(self.tsn_network))
+        ConfigFileGenerator.create_test_scenario(tsn_network=self.tsn_network, solution=self.solution,
+                                                 node_edge_mac_info=self.node_edge_mac_info,
+                                                 test_scenario_dirname=scenarios_dir, archive='zip')
+        with zipfile.ZipFile(os.path.join(scenarios_dir, 'xml_probe.zip')) as f:
+            self.assertEqual(sorted(os.path.join(scenarios_dir, n) for n in f.namelist() if not n.endswith('/')),
+                             [os.path.join(scenarios_dir, n) for n in filenames[0]])
+
+    def test_lazy_children(self):
+        def children():
+            for i in range(3):
+                element = etree.Element('flow')
+                element.attrib['id'] = str(i)
+                yield element
+        buffer: io.BytesIO = io.BytesIO()
+        write_xml(buffer, 'flows', children())
+        self.assertEqual(buffer.getvalue(), pretty(buffer.getvalue()))
+        self.assertEqual(len(etree.fromstring(buffer.getvalue())), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()